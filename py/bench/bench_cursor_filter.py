@@ -0,0 +1,208 @@
+# py/bench/bench_cursor_filter.py
+# ---------------------------------------------------------------------------
+# Cursor smoothing: added latency vs jitter, fixed-alpha EMA vs One Euro (per mode)
+#
+# 녹화 세션(.gosr)의 커서손 palm center를 HandsAgent와 같은 경로
+# (ControlMapper.map_control_to_screen -> filter)로 흘려서 측정한다.
+# 세션을 안 주면 합성 세션(정지 + 흔들림 / 빠른 이동 + 노이즈)을 .gosr로 녹화해서 그걸 재생한다.
+#
+#   jitter px : 손이 멈춰 있는 구간(멈춘 뒤 0.4s 이후)에서 필터 출력의 프레임간 이동 RMS (1920px 기준)
+#   lag ms    : 움직이는 구간에서 출력과 가장 잘 맞는 기준 궤적의 지연
+#               (기준 = raw의 centered moving average, 0.5ms 단위 탐색, 음수 = 앞서감)
+#   err px    : 움직이는 구간에서 화면에 보일 때(t + 파이프라인 지연)의 실제 손 위치와의 RMS 거리
+#               -> predictor(cv / kalman)가 지연을 얼마나 메우는지
+#
+# 실행 (py/ 에서):
+#   python bench/bench_cursor_filter.py [SESSION.gosr] [--hand=Right] [--landmarks] [--latency-ms=40]
+#   --landmarks : 21개 landmark 전체 필터(LandmarkFilter) 후 palm center 도 같이 측정
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.config import AgentConfig  # noqa: E402
+from gestureos_agent.features import HandFeatures  # noqa: E402
+from gestureos_agent.filters import DEFAULT_ONE_EURO, CursorFilter, LandmarkFilter  # noqa: E402
+from gestureos_agent.predict import CursorPredictor  # noqa: E402
+from gestureos_agent.session_rec import SessionReader, SessionRecorder  # noqa: E402
+
+SCREEN_W = 1920.0
+SCREEN_H = 1080.0
+REF_WIN = 5  # centered moving average (frames) for the reference path
+STILL_SETTLE_SEC = 0.4
+
+
+def make_synthetic(path: str, seconds: float = 20.0, fps: float = 30.0, noise: float = 0.0025, seed: int = 0):
+    """Hold / move segments of one Right hand, MediaPipe-like per-landmark noise."""
+    rng = np.random.default_rng(seed)
+    shape = rng.normal(0.0, 0.04, size=(21, 3)).astype(np.float32)
+    shape[:, 2] *= 0.2
+
+    rec = SessionRecorder()
+    rec.start(path, state={"synthetic": True})
+    n = int(seconds * fps)
+    pos = np.array([0.5, 0.6])
+    target = pos.copy()
+    seg_start = 0
+    seg_len = 1
+    start = pos.copy()
+    for i in range(n):
+        if i - seg_start >= seg_len:
+            # alternate hold / sweep
+            seg_start = i
+            start = pos.copy()
+            if rng.random() < 0.5:
+                target = pos.copy()
+                seg_len = int(rng.uniform(0.5, 1.5) * fps)
+            else:
+                target = rng.uniform([0.3, 0.35], [0.7, 0.9])
+                seg_len = int(rng.uniform(0.25, 0.8) * fps)
+        # minimum-jerk blend
+        s = min(1.0, (i - seg_start) / max(1, seg_len))
+        s = 10 * s**3 - 15 * s**4 + 6 * s**5
+        pos = start + (target - start) * s
+        lm = shape.copy()
+        lm[:, 0] += pos[0]
+        lm[:, 1] += pos[1]
+        lm += rng.normal(0.0, noise, size=lm.shape).astype(np.float32)
+        rec.write_frame(1000.0 + i / fps, [{"handed": "Right", "score": 0.99, "lm": lm}])
+    rec.stop()
+
+
+def load_track(path: str, hand: str):
+    """(t, lm) of the cursor hand per frame (falls back to the first hand)."""
+    ts, lms = [], []
+    for t, hands in SessionReader(path).frames():
+        if not hands:
+            continue
+        pick = next((h for h in hands if h.get("handed") == hand), hands[0])
+        ts.append(t)
+        lms.append(pick["lm"])
+    return np.asarray(ts), lms
+
+
+def _cfg_default(name: str):
+    return AgentConfig.__dataclass_fields__[name].default
+
+
+def _map(cx, cy):
+    # ControlMapper.map_control_to_screen with AgentConfig defaults (control.py pulls in pyautogui)
+    minx, miny, maxx, maxy = _cfg_default("control_box")
+    g = float(_cfg_default("control_gain"))
+    ux = min(1.0, max(0.0, (cx - minx) / max(1e-6, maxx - minx)))
+    uy = min(1.0, max(0.0, (cy - miny) / max(1e-6, maxy - miny)))
+    return min(1.0, max(0.0, 0.5 + (ux - 0.5) * g)), min(1.0, max(0.0, 0.5 + (uy - 0.5) * g))
+
+
+def _screen(lms):
+    return np.array([_map(*HandFeatures(lm).palm_center) for lm in lms])
+
+
+def run_filter(t, xy, filt, pred=None):
+    filt.reset()
+    out = [filt(float(x), float(y), float(tt)) for tt, (x, y) in zip(t, xy)]
+    if pred is not None:
+        pred.reset()
+        out = [pred(x, y, float(tt)) for tt, (x, y) in zip(t, out)]
+    return np.array(out)
+
+
+def _ref(xy):
+    k = np.ones(REF_WIN) / REF_WIN
+    pad = REF_WIN // 2
+    out = np.empty_like(xy)
+    for j in range(2):
+        p = np.pad(xy[:, j], pad, mode="edge")
+        out[:, j] = np.convolve(p, k, mode="valid")
+    return out
+
+
+def measure(t, raw, out, latency_s=0.0):
+    px = np.array([SCREEN_W, SCREEN_H])
+    ref = _ref(raw) * px
+    out = out * px
+    speed = np.r_[0.0, np.hypot(*np.diff(ref, axis=0).T) / np.maximum(np.diff(t), 1e-6)]
+    # still: slow for the last STILL_SETTLE_SEC too (so filter lag after a sweep is not counted as jitter)
+    slow = speed < 60.0  # px/s
+    settle = max(1, int(round(STILL_SETTLE_SEC / max(1e-6, float(np.median(np.diff(t)))))))
+    still = np.array([slow[max(0, i - settle) : i + 1].all() for i in range(len(slow))])
+    moving = speed > 600.0
+
+    step = np.r_[0.0, np.hypot(*np.diff(out, axis=0).T)]
+    jitter = float(np.sqrt(np.mean(step[still] ** 2))) if still.any() else 0.0
+
+    lag_ms = 0.0
+    if moving.any():
+        best = None
+        for d in np.arange(-0.1, 0.2005, 0.0005):
+            rx = np.interp(t - d, t, ref[:, 0])
+            ry = np.interp(t - d, t, ref[:, 1])
+            err = float(np.mean((out[moving, 0] - rx[moving]) ** 2 + (out[moving, 1] - ry[moving]) ** 2))
+            if best is None or err < best[0]:
+                best = (err, d)
+        lag_ms = best[1] * 1000.0
+
+    err = 0.0
+    if moving.any():
+        # what the user sees at t + latency vs where the hand is then
+        fx = np.interp(t + latency_s, t, ref[:, 0])
+        fy = np.interp(t + latency_s, t, ref[:, 1])
+        err = float(np.sqrt(np.mean((out[moving, 0] - fx[moving]) ** 2 + (out[moving, 1] - fy[moving]) ** 2)))
+    return jitter, lag_ms, err
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    path = ""
+    hand = "Right"
+    with_lm = "--landmarks" in argv
+    latency_ms = 40.0
+    for a in argv:
+        if a.startswith("--latency-ms="):
+            latency_ms = float(a.split("=", 1)[1])
+        elif a.startswith("--hand="):
+            hand = a.split("=", 1)[1]
+        elif not a.startswith("--"):
+            path = a
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), "gestureos_bench_cursor.gosr")
+        make_synthetic(path)
+
+    t, lms = load_track(path, hand)
+    raw = _screen(lms)
+
+    print(f"[BENCH] cursor filter on {os.path.basename(path)}: {len(t)} frames")
+    print(f"  pipeline latency {latency_ms:g} ms (err px = distance to the hand when the cursor is shown)")
+    print(f"  {'filter':<34}{'jitter px':>10}{'lag ms':>9}{'err px':>9}")
+    rows = [("raw", raw)]
+    for a in (0.22, 0.45):
+        rows.append((f"ema alpha={a}", run_filter(t, raw, CursorFilter("ema", ema_alpha=a))))
+    for mode in ("MOUSE", "DRAW"):
+        f = CursorFilter("one_euro")
+        f.set_mode(mode)
+        p = DEFAULT_ONE_EURO[mode]
+        rows.append((f"one_euro {mode} ({p.min_cutoff:g}/{p.beta:g})", run_filter(t, raw, f)))
+    for kind in ("cv", "kalman"):
+        f = CursorFilter("one_euro")
+        f.set_mode("MOUSE")
+        pred = CursorPredictor(kind, extra_ms=0.0)
+        pred.latency_ms = latency_ms
+        rows.append((f"one_euro MOUSE + predict {kind}", run_filter(t, raw, f, pred)))
+    if with_lm:
+        lf = LandmarkFilter()
+        filt_lms = [lf("cursor", lm.copy(), float(tt)) for tt, lm in zip(t, lms)]
+        rows.append(("landmarks one_euro", _screen(filt_lms)))
+
+    for name, out in rows:
+        jitter, lag, err = measure(t, raw, out, latency_ms / 1000.0)
+        print(f"  {name:<34}{jitter:>10.2f}{lag:>9.1f}{err:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
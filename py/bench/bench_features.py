@@ -0,0 +1,86 @@
+# py/bench/bench_features.py
+# ---------------------------------------------------------------------------
+# Per-hand analysis cost per frame (2 hands): raw landmarks vs HandFeatures
+#
+# 한 프레임에서 HandsAgent가 손마다 하던 호출 패턴 그대로:
+#   rush picker _pack (palm_center + classify) -> 손 선택 palm_center
+#   -> pinch threshold -> classify(th) -> learner extract (+ capture 시 pinch ratio)
+#
+#   before: 매 호출이 landmark 배열에서 다시 계산
+#   after : 프레임당 HandFeatures 하나, 처음 접근 때만 계산 (memo)
+#
+# 실행 (py/ 에서):
+#   python bench/bench_features.py [--frames=20000] [--capture]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.features import HandFeatures  # noqa: E402
+from gestureos_agent.gestures import classify_gesture, palm_center  # noqa: E402
+from gestureos_agent.learner_mlp import MLPLearner, _pinch_ratio  # noqa: E402
+
+
+def _pinch_thresh(lm, ratio=0.35):
+    # HandsAgent._pinch_thresh_from_ratio without importing the agent (pyautogui/mediapipe)
+    return HandFeatures.of(lm).pinch_thresh(ratio, 0.06)
+
+
+def before(hands, learner, capture):
+    out = []
+    for lm in hands:
+        pack = (palm_center(lm), classify_gesture(lm))          # rush_lr._pack
+        cx = palm_center(lm)                                    # hand selection / cursor pos
+        th = HandFeatures(lm).pinch_thresh(0.35, 0.06)          # _pinch_thresh_from_ratio
+        g = classify_gesture(lm, th)
+        v = learner.extract_array(lm)                           # learner.predict
+        r = _pinch_ratio(lm) if capture else None               # learner.add_sample
+        out.append((pack, cx, g, v, r))
+    return out
+
+
+def after(hands, learner, capture):
+    out = []
+    for lm in hands:
+        f = HandFeatures(lm)
+        pack = (f.palm_center, f.gesture())
+        cx = f.palm_center
+        th = _pinch_thresh(f)
+        g = f.gesture(th)
+        v = learner.extract_array(f)
+        r = _pinch_ratio(f) if capture else None
+        out.append((pack, cx, g, v, r))
+    return out
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    frames = 20000
+    capture = "--capture" in argv
+    for a in argv:
+        if a.startswith("--frames="):
+            frames = max(100, int(a.split("=", 1)[1]))
+
+    rng = np.random.default_rng(0)
+    seq = [[rng.random((21, 3)).astype(np.float32) for _ in range(2)] for _ in range(64)]
+    learner = MLPLearner.__new__(MLPLearner)  # extract_array only (no profile I/O)
+
+    print(f"[BENCH] per-hand features, 2 hands/frame, {frames} frames, capture={capture}")
+    print(f"  {'path':<8}{'us/frame':>10}")
+    for name, fn in (("before", before), ("after", after)):
+        fn(seq[0], learner, capture)
+        t0 = time.perf_counter()
+        for i in range(frames):
+            fn(seq[i & 63], learner, capture)
+        us = (time.perf_counter() - t0) * 1e6 / frames
+        print(f"  {name:<8}{us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# py/bench/bench_frame_path.py
+# ---------------------------------------------------------------------------
+# Frame path micro-benchmark (per frame: time + temporary allocations)
+#
+#   old : cv2.flip(frame) -> cv2.cvtColor(RGB) (새 배열 2개) -> preview는 flip된 프레임에 그림
+#   new : flip 없음 -> cvtColor(dst=재사용 버퍼) -> landmark 좌표 미러링 -> preview만 재사용 버퍼로 flip
+#
+# 실행 (py/ 에서):
+#   python bench/bench_frame_path.py [--frames=300] [--no-preview]
+#
+# alloc KB = tracemalloc peak per frame (numpy/cv2 배열 할당 포함)
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.framebuf import FrameBuffers, mirror_hands  # noqa: E402
+
+SIZES = ((640, 480), (1280, 720))
+
+
+def _fake_hands():
+    rng = np.random.default_rng(0)
+    return [
+        {"handed": hd, "score": 0.9, "lm": [tuple(p) for p in rng.random((21, 3)).tolist()]}
+        for hd in ("Left", "Right")
+    ]
+
+
+def _draw(img):
+    cv2.putText(img, "mode=MOUSE enabled=True", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 255, 0), 2)
+
+
+def old_path(frame, hands, preview):
+    f = cv2.flip(frame, 1)
+    rgb = cv2.cvtColor(f, cv2.COLOR_BGR2RGB)
+    if preview:
+        _draw(f)
+    return rgb
+
+
+def new_path(frame, hands, preview, fbuf):
+    rgb = fbuf.rgb(frame)
+    mirror_hands(hands)
+    if preview:
+        _draw(fbuf.mirrored(frame))
+    return rgb
+
+
+def _measure(fn, frames):
+    # warm-up (first call allocates the reused buffers)
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    ms = (time.perf_counter() - t0) * 1000.0 / frames
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(min(frames, 50)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return ms, peak / 1024.0
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    frames = 300
+    preview = True
+    for a in argv:
+        if a.startswith("--frames="):
+            frames = max(10, int(a.split("=", 1)[1]))
+        elif a == "--no-preview":
+            preview = False
+
+    print(f"[BENCH] frame path, {frames} frames, preview={preview}")
+    print(f"  {'size':<10}{'path':<6}{'ms/frame':>10}{'alloc KB':>10}")
+    for w, h in SIZES:
+        frame = np.random.default_rng(1).integers(0, 255, (h, w, 3), dtype=np.uint8)
+        fbuf = FrameBuffers()
+        rows = (
+            ("old", lambda: old_path(frame, _fake_hands(), preview)),
+            ("new", lambda: new_path(frame, _fake_hands(), preview, fbuf)),
+        )
+        for name, fn in rows:
+            ms, kb = _measure(fn, frames)
+            print(f"  {f'{w}x{h}':<10}{name:<6}{ms:>10.3f}{kb:>10.1f}")
+        print(f"  {'':<10}reused buffers: {fbuf.nbytes() // 1024}KB, allocs={fbuf.allocs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# py/bench/bench_gesture_batch.py
+# ---------------------------------------------------------------------------
+# Rule gestures: per-hand scalar path (HandFeatures) vs classify_batch (N, 21, 3)
+#
+# 손 N개를 분류 (gesture + palm center + pinch distance, ratio 기반 threshold):
+#   scalar: 손마다 HandFeatures -> pinch_thresh -> gesture / palm_center (라이브 루프 경로)
+#   batch : gesture_batch.classify_batch 한 번
+#
+# 실행 (py/ 에서):
+#   python bench/bench_gesture_batch.py [--hands=2,8,64,1024,100000]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.features import HandFeatures  # noqa: E402
+from gestureos_agent.gesture_batch import classify_batch  # noqa: E402
+
+RATIO = 0.35
+
+
+def scalar(lms):
+    out = []
+    for lm in lms:
+        f = HandFeatures(lm)
+        out.append((f.gesture(f.pinch_thresh(RATIO)), f.palm_center, f.pinch_dist))
+    return out
+
+
+def batch(lms):
+    return classify_batch(lms, pinch_ratio=RATIO)
+
+
+def _time(fn, arg, n_hands):
+    reps = max(1, 200000 // n_hands)
+    fn(arg)
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn(arg)
+    return (time.perf_counter() - t0) * 1e6 / reps
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    sizes = [2, 8, 64, 1024, 100000]
+    for a in argv:
+        if a.startswith("--hands="):
+            sizes = [max(1, int(v)) for v in a.split("=", 1)[1].split(",") if v]
+
+    rng = np.random.default_rng(0)
+    print("[BENCH] rule gestures, scalar (HandFeatures) vs classify_batch")
+    print(f"  {'hands':>7}{'scalar us':>12}{'batch us':>12}{'us/hand s':>11}{'us/hand b':>11}")
+    for n in sizes:
+        lms = rng.random((n, 21, 3)).astype(np.float32)
+        s_us = _time(scalar, lms, n)
+        b_us = _time(batch, lms, n)
+        print(f"  {n:>7}{s_us:>12.1f}{b_us:>12.1f}{s_us / n:>11.3f}{b_us / n:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
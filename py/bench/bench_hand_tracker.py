@@ -0,0 +1,145 @@
+# py/bench/bench_hand_tracker.py
+# ---------------------------------------------------------------------------
+# Hand identity: per-frame MediaPipe handedness vs HandTracker (track vote)
+#
+# 합성 양손 스트림 (오른손/왼손이 좌우로 움직이고 가끔 교차, handedness가 확률 p로 한 프레임 뒤집힘,
+# 가끔 한 손이 몇 프레임 사라짐)에서 cursor 손(= Right)이 실제 오른손이 아닌 프레임 수와
+# cursor 손이 바뀐 횟수(커서 튐)를 센다.
+#   label   : 그 프레임의 handedness 그대로 (이전 방식)
+#   tracker : HandTracker.update -> track.handed, 현재 cursor track 유지
+# tracker update 의 프레임당 비용도 같이 잰다.
+# burst 2 = 뒤집힘이 두 프레임 연속. two-frame flip 표: 안정된 Right track 에 Left 2프레임 (score별) -> jumps 0 이어야 함.
+#
+# 실행 (py/ 에서):
+#   python bench/bench_hand_tracker.py [--frames=20000] [--flip=0.02,0.05,0.1] [--burst=1,2]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.hand_tracker import HandTracker  # noqa: E402
+
+
+def make_stream(n: int, flip: float, seed: int = 0, burst: int = 1):
+    """[(t, [(true_hand, label, score, cx, cy), ...]), ...] at 30 fps (a flip lasts `burst` frames)."""
+    rng = random.Random(seed)
+    out = []
+    gone = {"Right": 0, "Left": 0}
+    flipped = {"Right": 0, "Left": 0}
+    for i in range(n):
+        t = 1000.0 + i / 30.0
+        dets = []
+        for hand, x0, ph in (("Right", 0.35, 0.0), ("Left", 0.65, 1.3)):
+            if gone[hand] > 0:
+                gone[hand] -= 1
+                continue
+            if rng.random() < 0.003:
+                gone[hand] = rng.randint(2, 8)
+            cx = x0 + 0.22 * math.sin(i / 25.0 + ph) + rng.gauss(0.0, 0.003)
+            cy = 0.55 + 0.1 * math.cos(i / 31.0 + ph) + rng.gauss(0.0, 0.003)
+            label = hand
+            if flipped[hand] <= 0 and rng.random() < flip:
+                flipped[hand] = burst
+            if flipped[hand] > 0:
+                flipped[hand] -= 1
+                label = "Left" if hand == "Right" else "Right"
+            dets.append((hand, label, rng.uniform(0.8, 0.99), cx, cy))
+        rng.shuffle(dets)
+        out.append((t, dets))
+    return out
+
+
+def pick_label(stream):
+    picks = []
+    for _, dets in stream:
+        rights = [d for d in dets if d[1] == "Right"]
+        picks.append(max(rights, key=lambda d: d[2])[0] if rights else None)
+    return picks
+
+
+def pick_tracker(stream):
+    trk = HandTracker()
+    cur = None
+    picks = []
+    t0 = time.perf_counter()
+    for t, dets in stream:
+        tracks = trk.update(t, [(d[1], d[2], d[3], d[4]) for d in dets])
+        rights = [(d, tr) for d, tr in zip(dets, tracks) if tr.handed == "Right"]
+        best = next((x for x in rights if x[1].id == cur), None)
+        if best is None and rights:
+            best = max(rights, key=lambda x: x[0][2])
+        cur = best[1].id if best is not None else cur
+        picks.append(best[0][0] if best is not None else None)
+    us = (time.perf_counter() - t0) * 1e6 / max(1, len(stream))
+    return picks, us
+
+
+def two_frame_flip(score_: float, at: int = 60, frames: int = 120):
+    """Right hand alone at a steady score, labeled Left on frames `at` and `at + 1`."""
+    out = []
+    for i in range(frames):
+        label = "Left" if i in (at, at + 1) else "Right"
+        out.append((1000.0 + i / 30.0, [("Right", label, score_, 0.4 + 0.001 * i, 0.5)]))
+    return out
+
+
+def track_jumps(stream) -> int:
+    """Frames where the track's stable label changed."""
+    trk = HandTracker()
+    prev = None
+    jumps = 0
+    for t, dets in stream:
+        tr = trk.update(t, [(d[1], d[2], d[3], d[4]) for d in dets])[0]
+        if prev is not None and tr.handed != prev:
+            jumps += 1
+        prev = tr.handed
+    return jumps
+
+
+def score(picks):
+    wrong = sum(1 for p in picks if p == "Left")
+    seen = [p for p in picks if p is not None]
+    switches = sum(1 for a, b in zip(seen, seen[1:]) if a != b)
+    return wrong, switches
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    frames = 20000
+    flips = [0.02, 0.05, 0.1]
+    bursts = [1, 2]
+    for a in argv:
+        if a.startswith("--frames="):
+            frames = max(100, int(a.split("=", 1)[1]))
+        elif a.startswith("--flip="):
+            flips = [float(x) for x in a.split("=", 1)[1].split(",") if x.strip()]
+        elif a.startswith("--burst="):
+            bursts = [max(1, int(x)) for x in a.split("=", 1)[1].split(",") if x.strip()]
+
+    print(f"[BENCH] hand identity, {frames} frames (wrong = cursor on the left hand, jumps = cursor hand changes)")
+    print(
+        f"  {'flip p':>7}{'burst':>6}{'label wrong':>13}{'label jumps':>13}"
+        f"{'track wrong':>13}{'track jumps':>13}{'track us':>10}"
+    )
+    for burst in bursts:
+        for p in flips:
+            stream = make_stream(frames, p, burst=burst)
+            lw, lj = score(pick_label(stream))
+            picks, us = pick_tracker(stream)
+            tw, tj = score(picks)
+            print(f"  {p:>7.2f}{burst:>6}{lw:>13}{lj:>13}{tw:>13}{tj:>13}{us:>10.2f}")
+
+    print("[BENCH] two-frame flip on a steady Right track (jumps = stable label changes)")
+    print(f"  {'score':>7}{'track jumps':>13}")
+    for sc in (0.95, 0.8, 0.6):
+        print(f"  {sc:>7.2f}{track_jumps(two_frame_flip(sc)):>13}")
+
+
+if __name__ == "__main__":
+    main()
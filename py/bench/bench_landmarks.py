@@ -0,0 +1,173 @@
+# py/bench/bench_landmarks.py
+# ---------------------------------------------------------------------------
+# Landmark path micro-benchmark: list of tuples (old) vs (21, 3) float32 array (new)
+#
+# 한 프레임(손 2개) 기준:
+#   MediaPipe 결과 변환 -> mirror -> classify_gesture / palm_center / pinch thresh
+#   -> learner feature (extract) -> STATUS payload
+#
+# 실행 (py/ 에서):
+#   python bench/bench_landmarks.py [--frames=20000]
+#
+# alloc KB = tracemalloc peak per frame
+# objects  = 프레임 동안 들고 다니는 landmark 객체 수 (hands_meta 안의 list/tuple/float/ndarray)
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.gestures import classify_gesture, palm_center  # noqa: E402
+from gestureos_agent.landmarks import from_mediapipe, mirror_x, to_payload  # noqa: E402
+from gestureos_agent.learner_mlp import MLPLearner  # noqa: E402
+
+
+# ---- fake MediaPipe result objects (same attribute shape as NormalizedLandmarkList) ----
+class _P:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class _LmList:
+    def __init__(self, arr):
+        self.landmark = [_P(float(x), float(y), float(z)) for x, y, z in arr]
+
+
+# ---- old path (pre-array code, kept here for comparison only) ----
+def _legacy_classify(lm, pinch_thresh=0.06):
+    folded = sum(1 for t, p in zip((8, 12, 16, 20), (6, 10, 14, 18)) if lm[t][1] > lm[p][1])
+    if folded >= 3:
+        return "FIST"
+    if math.hypot(lm[4][0] - lm[8][0], lm[4][1] - lm[8][1]) < pinch_thresh:
+        return "PINCH_INDEX"
+    ext = [lm[t][1] < lm[p][1] for t, p in zip((8, 12, 16, 20), (6, 10, 14, 18))]
+    if ext[0] and ext[1] and not ext[2] and not ext[3] and math.hypot(lm[8][0] - lm[12][0], lm[8][1] - lm[12][1]) > 0.06:
+        return "V_SIGN"
+    if all(ext):
+        return "OPEN_PALM"
+    return "OTHER"
+
+
+def _legacy_palm(lm):
+    idx = [0, 5, 9, 13, 17]
+    xs = [lm[i][0] for i in idx]
+    ys = [lm[i][1] for i in idx]
+    return (sum(xs) / len(xs), sum(ys) / len(ys))
+
+
+def _legacy_extract(lm):
+    x0, y0, z0 = lm[0]
+    pts = [(x - x0, y - y0, z - z0) for (x, y, z) in lm]
+    sx, sy, sz = pts[9]
+    scale = math.sqrt(sx * sx + sy * sy + sz * sz) or 1.0
+    inv = 1.0 / scale
+    vec = []
+    for (x, y, z) in pts:
+        vec.extend([x * inv, y * inv, z * inv])
+    return np.asarray(vec, dtype=np.float32)
+
+
+def _legacy_pinch_thresh(lm, ratio=0.35):
+    x0, y0, _ = lm[0]
+    x9, y9, _ = lm[9]
+    palm = math.sqrt((x0 - x9) ** 2 + (y0 - y9) ** 2)
+    return max(0.01, min(0.20, ratio * palm))
+
+
+def _pinch_thresh(a, ratio=0.35):
+    # same as HandsAgent's _pinch_thresh_from_ratio (not imported: pulls in pyautogui/mediapipe)
+    palm = math.hypot(a.item(0, 0) - a.item(9, 0), a.item(0, 1) - a.item(9, 1))
+    return max(0.01, min(0.20, ratio * palm))
+
+
+def _retained(obj, seen=None) -> int:
+    """Objects reachable through list/tuple/dict (ndarray counts as one)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    n = 1
+    if isinstance(obj, (list, tuple)):
+        for v in obj:
+            n += _retained(v, seen)
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            n += _retained(v, seen)
+    return n
+
+
+def old_frame(res, keep_lm=False):
+    out = []
+    for lm_obj in res:
+        lm = [(p.x, p.y, p.z) for p in lm_obj.landmark]
+        lm = [(1.0 - x, y, z) for (x, y, z) in lm]
+        g = _legacy_classify(lm, _legacy_pinch_thresh(lm))
+        c = _legacy_palm(lm)
+        v = _legacy_extract(lm)
+        pl = [{"x": float(p[0]), "y": float(p[1]), "z": float(p[2])} for p in lm]
+        out.append(lm if keep_lm else (g, c, v, pl))
+    return out
+
+
+def new_frame(res, learner, keep_lm=False):
+    out = []
+    for lm_obj in res:
+        lm = mirror_x(from_mediapipe(lm_obj))
+        g = classify_gesture(lm, _pinch_thresh(lm))
+        c = palm_center(lm)
+        v = learner.extract_array(lm)
+        pl = to_payload(lm)
+        out.append(lm if keep_lm else (g, c, v, pl))
+    return out
+
+
+def _measure(fn, frames):
+    objects = sum(_retained(lm) for lm in fn(keep_lm=True))
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    us = (time.perf_counter() - t0) * 1e6 / frames
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(min(frames, 200)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return us, peak / 1024.0, objects
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    frames = 20000
+    for a in argv:
+        if a.startswith("--frames="):
+            frames = max(100, int(a.split("=", 1)[1]))
+
+    rng = np.random.default_rng(0)
+    res = [_LmList(rng.random((21, 3))) for _ in range(2)]
+    learner = MLPLearner.__new__(MLPLearner)  # extract_array only (no profile I/O)
+
+    print(f"[BENCH] landmark path, 2 hands/frame, {frames} frames")
+    print(f"  {'path':<6}{'us/frame':>10}{'alloc KB':>10}{'objects':>9}")
+    for name, fn in (
+        ("old", lambda keep_lm=False: old_frame(res, keep_lm)),
+        ("new", lambda keep_lm=False: new_frame(res, learner, keep_lm)),
+    ):
+        us, kb, objects = _measure(fn, frames)
+        print(f"  {name:<6}{us:>10.2f}{kb:>10.1f}{objects:>9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# py/bench/bench_learner.py
+# ---------------------------------------------------------------------------
+# MLPLearner.predict latency: JSON weights per call (이전 방식) vs CompiledMLP
+#
+# 합성 샘플(라벨별 손 모양 + 노이즈)로 두 손 모델을 학습한 뒤 같은 입력으로
+#   legacy   : 매 호출마다 self.mlp[hand] 의 중첩 리스트 -> np.asarray + 정규화 + forward
+#   compiled : learner._predict_mlp (mean/std 접힌 float32 가중치 + 미리 잡은 버퍼)
+#   predict  : learner.predict 전체 (HandFeatures 벡터 재사용 + min_conf 판정)
+# 호출당 us 와 두 경로의 라벨 일치 / 최대 확률 차이를 출력한다.
+#
+# --train: 라벨당 샘플 수별 학습 시간 / epoch / 중단 이유 / 따로 만든 테스트 셋 정확도
+#   legacy : full batch 220 epoch (LEGACY_TRAIN_PARAMS, 이전 방식)
+#   new    : mini-batch + 검증 split + early stopping (TRAIN_PARAMS, TRAIN_BUDGET_SEC/2 per hand)
+#
+# --io: 학습된 프로필 파일 save / load 시간과 파일 크기
+#   json   : mlp_v1 JSON 전체 json.dump / json.load (이전 방식)
+#   npz    : mlp_v2 npz (JSON 은 내용이 같으면 안 씀) / npz 읽기 + JSON json_sig 확인
+#   switch : TRAIN_SET_PROFILE 한 번 (save + load + save)
+#
+# --store: 샘플 저장소 (라벨당 900, 양손)
+#   append   : add_sample 1개 (파일 끝 레코드 추가) vs 이전 방식 (list.append(vec.tolist()))
+#   snapshot : 학습 시작 시 샘플 -> 학습 입력 X (float32) 까지
+#              lists = 리스트 복사 스냅샷 + np.asarray (이전 방식), store = 매핑에서 라벨별 배열로 모음
+#
+# 프로필 파일은 임시 폴더(TEMP)에만 쓴다.
+#
+# 실행 (py/ 에서):
+#   python bench/bench_learner.py [--calls=2000] [--samples=120] [--train[=60,300,900]] [--io[=20]] [--store]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+os.environ["TEMP"] = tempfile.mkdtemp(prefix="gestureos_bench_learner_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.features import HandFeatures  # noqa: E402
+from gestureos_agent.learner_file import to_json_obj  # noqa: E402
+from gestureos_agent.learner_mlp import (  # noqa: E402
+    LEGACY_TRAIN_PARAMS,
+    TRAIN_BUDGET_SEC,
+    TRAIN_PARAMS,
+    CompiledMLP,
+    MLPLearner,
+    _softmax,
+    _train_mlp,
+)
+
+
+def make_learner(samples: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    ln = MLPLearner("bench")
+    ln.enabled = True
+    shapes = {lab: rng.random((21, 3)).astype(np.float32) * 0.2 for lab in MLPLearner.DEFAULT_LABELS}
+    for hand in ("cursor", "other"):
+        for lab, base in shapes.items():
+            for _ in range(samples):
+                lm = base + rng.normal(0.0, 0.01, size=base.shape).astype(np.float32) + 0.4
+                ln.add_sample(hand, lab, lm)
+    ln.train()
+    return ln, shapes
+
+
+def legacy_predict(m: dict, vec):
+    """_predict_mlp before CompiledMLP (weights re-created from JSON lists every call)."""
+    labels = m.get("labels") or []
+    mean = np.asarray(m.get("mean"), dtype=np.float32)
+    std = np.asarray(m.get("std"), dtype=np.float32)
+    x = np.asarray(vec, dtype=np.float32)
+    x = (x - mean) / (std + 1e-6)
+    x = x.reshape(1, -1)
+    W1 = np.asarray(m.get("W1"), dtype=np.float32); b1 = np.asarray(m.get("b1"), dtype=np.float32)
+    W2 = np.asarray(m.get("W2"), dtype=np.float32); b2 = np.asarray(m.get("b2"), dtype=np.float32)
+    W3 = np.asarray(m.get("W3"), dtype=np.float32); b3 = np.asarray(m.get("b3"), dtype=np.float32)
+    z1 = x @ W1 + b1; a1 = np.maximum(z1, 0.0)
+    z2 = a1 @ W2 + b2; a2 = np.maximum(z2, 0.0)
+    p = _softmax(a2 @ W3 + b3)[0]
+    idx = int(np.argmax(p))
+    return str(labels[idx]), float(p[idx])
+
+
+def make_set(shapes, per_label: int, noise: float, rng):
+    """{label: [vec, ...]} (MLPLearner.extract 와 같은 벡터)"""
+    out = {}
+    for lab, base in shapes.items():
+        out[lab] = [
+            HandFeatures(base + rng.normal(0.0, noise, size=base.shape).astype(np.float32) + 0.4).vector.tolist()
+            for _ in range(per_label)
+        ]
+    return out
+
+
+def bench_train(sizes, noise: float = 0.12):
+    rng = np.random.default_rng(3)
+    shapes = {lab: rng.random((21, 3)).astype(np.float32) * 0.2 for lab in MLPLearner.DEFAULT_LABELS}
+    test = make_set(shapes, 100, noise, rng)
+    print(f"[BENCH] learner training per hand (noise {noise:g}, test 100/label)")
+    print(f"  {'n/label':>8}  {'params':<8}{'ms':>9}{'epochs':>8}  {'stop':<11}{'val acc':>8}{'test acc':>9}")
+    for per in sizes:
+        mp = make_set(shapes, per, noise, rng)
+        for name, params, budget in (("legacy", LEGACY_TRAIN_PARAMS, 0.0), ("new", TRAIN_PARAMS, TRAIN_BUDGET_SEC / 2)):
+            deadline = (time.monotonic() + budget) if budget > 0 else None
+            t0 = time.perf_counter()
+            mlp, met = _train_mlp(mp, 50, MLPLearner.DEFAULT_LABELS, params=params, deadline=deadline)
+            ms = (time.perf_counter() - t0) * 1000.0
+            cm = CompiledMLP(mlp)
+            ok = tot = 0
+            for lab, vecs in test.items():
+                for v in vecs:
+                    ok += cm.predict(np.asarray(v, dtype=np.float32))[0] == lab
+                    tot += 1
+            va = met.get("valAcc")
+            print(
+                f"  {per:>8}  {name:<8}{ms:>9.0f}{met['epochs']:>8}  {met['stop']:<11}"
+                f"{(f'{va:.3f}' if va is not None else '-'):>8}{ok / tot:>9.3f}"
+            )
+
+
+def legacy_save(ln: MLPLearner):
+    """save() before the npz format: whole mlp_v1 JSON every time."""
+    path = ln._model_path()
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(to_json_obj(ln._state()), f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def legacy_load(ln: MLPLearner):
+    """load() before the npz format: json.load + compile."""
+    with open(ln._model_path(), "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    ln.mlp = obj["mlp"]
+    ln.proto = obj["proto"]
+    ln._compile()
+
+
+def bench_io(ln: MLPLearner, reps: int):
+    ln.save()
+    js = os.path.getsize(ln._model_path())
+    npz = os.path.getsize(ln._npz_path())
+
+    def ms(fn) -> float:
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            fn()
+        return (time.perf_counter() - t0) * 1000.0 / reps
+
+    def json_rewrite():
+        ln._json_src = None  # 학습 직후처럼 JSON 도 다시 씀
+        ln.save()
+
+    j_save, j_load = ms(lambda: legacy_save(ln)), ms(lambda: legacy_load(ln))
+    ln.load()
+    n_save, n_load, n_both = ms(ln.save), ms(ln.load), ms(json_rewrite)
+    print(f"[BENCH] learner profile file, {reps} reps (json {js / 1024:.0f} KiB, npz {npz / 1024:.0f} KiB)")
+    print(f"  {'format':<8}{'save ms':>9}{'load ms':>9}{'switch ms':>11}")
+    print(f"  {'json':<8}{j_save:>9.2f}{j_load:>9.2f}{2 * j_save + j_load:>11.2f}")
+    print(f"  {'npz':<8}{n_save:>9.2f}{n_load:>9.2f}{2 * n_save + n_load:>11.2f}")
+    print(f"  npz save + JSON rewrite (after training): {n_both:.2f} ms")
+
+
+def bench_store():
+    rng = np.random.default_rng(4)
+    ln = MLPLearner("bench_store")
+    shapes = {lab: rng.random((21, 3)).astype(np.float32) * 0.2 for lab in MLPLearner.DEFAULT_LABELS}
+    lms = [base + rng.normal(0.0, 0.01, size=base.shape).astype(np.float32) + 0.4 for base in shapes.values()]
+    per = 900
+    old = {"cursor": {}, "other": {}}
+
+    t0 = time.perf_counter()
+    for hand in ("cursor", "other"):
+        for i, lab in enumerate(shapes):
+            for _ in range(per):
+                old[hand].setdefault(lab, []).append(HandFeatures(lms[i]).vector.tolist())
+    us_list = (time.perf_counter() - t0) * 1e6 / (2 * per * len(shapes))
+    t0 = time.perf_counter()
+    for hand in ("cursor", "other"):
+        for i, lab in enumerate(shapes):
+            for _ in range(per):
+                ln.add_sample(hand, lab, lms[i])
+    us_store = (time.perf_counter() - t0) * 1e6 / (2 * per * len(shapes))
+
+    def from_lists():
+        snap = {hand: {lab: list(vs) for lab, vs in mp.items()} for hand, mp in old.items()}
+        return [np.asarray([v for vs in mp.values() for v in vs], dtype=np.float32) for mp in snap.values()]
+
+    def from_store():
+        snap = ln.store.snapshot()
+        return [np.concatenate(list(mp.values()), axis=0) for mp in snap.values()]
+
+    def ms(fn, reps=10) -> float:
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            fn()
+        return (time.perf_counter() - t0) * 1000.0 / reps
+
+    same = all(np.array_equal(a, b) for a, b in zip(from_lists(), from_store()))
+    info = ln.store.info()
+    print(f"[BENCH] sample store, {info['live']} samples ({os.path.getsize(ln.store.path) / 1024:.0f} KiB on disk)")
+    print(f"  {'path':<10}{'append us':>11}{'snapshot ms':>13}")
+    print(f"  {'lists':<10}{us_list:>11.1f}{ms(from_lists):>13.2f}")
+    print(f"  {'store':<10}{us_store:>11.1f}{ms(from_store):>13.2f}")
+    print(f"  same X: {'yes' if same else 'NO'}")
+
+
+def _time(fn, xs) -> float:
+    t0 = time.perf_counter()
+    for x in xs:
+        fn(x)
+    return (time.perf_counter() - t0) * 1e6 / len(xs)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    calls = 2000
+    samples = 120
+    train_sizes = None
+    io_reps = 0
+    store = False
+    for a in argv:
+        if a == "--train":
+            train_sizes = [60, 300, 900]
+        elif a.startswith("--train="):
+            train_sizes = [int(x) for x in a.split("=", 1)[1].split(",") if x.strip()]
+        elif a == "--store":
+            store = True
+        elif a == "--io":
+            io_reps = 20
+        elif a.startswith("--io="):
+            io_reps = max(1, int(a.split("=", 1)[1]))
+        if a.startswith("--calls="):
+            calls = max(10, int(a.split("=", 1)[1]))
+        elif a.startswith("--samples="):
+            samples = max(50, int(a.split("=", 1)[1]))
+
+    ln, shapes = make_learner(samples)
+    rng = np.random.default_rng(1)
+    bases = list(shapes.values())
+    feats = [
+        HandFeatures(bases[i % len(bases)] + rng.normal(0.0, 0.02, size=(21, 3)).astype(np.float32) + 0.4)
+        for i in range(calls)
+    ]
+    vecs = [f.vector for f in feats]
+    m = to_json_obj(ln._state())["mlp"]["cursor"]  # nested lists, as json.load gives
+
+    a = [legacy_predict(m, v) for v in vecs]
+    b = [ln._predict_mlp("cursor", v) for v in vecs]
+    same = sum(1 for x, y in zip(a, b) if x[0] == y[0])
+    dconf = max(abs(x[1] - y[1]) for x, y in zip(a, b))
+
+    us_legacy = _time(lambda v: legacy_predict(m, v), vecs)
+    us_comp = _time(lambda v: ln._predict_mlp("cursor", v), vecs)
+    us_pred = _time(lambda f: ln.predict("cursor", f), feats)
+
+    cm = ln.compiled["cursor"]
+    print(f"[BENCH] MLPLearner predict, {calls} calls, net {cm.W1.shape[0]}-{cm.W1.shape[1]}-{cm.W2.shape[1]}-{len(cm.labels)}")
+    print(f"  {'path':<24}{'us/call':>10}")
+    print(f"  {'legacy (JSON lists)':<24}{us_legacy:>10.1f}")
+    print(f"  {'compiled _predict_mlp':<24}{us_comp:>10.1f}")
+    print(f"  {'predict()':<24}{us_pred:>10.1f}")
+    print(f"  same label {same}/{calls}, max |conf diff| {dconf:.2e}")
+
+    if train_sizes:
+        bench_train(train_sizes)
+    if io_reps:
+        bench_io(ln, io_reps)
+    if store:
+        bench_store()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# py/bench/bench_roi.py
+# ---------------------------------------------------------------------------
+# --roi MediaPipe cost: one Hands instance vs tracking + probe instances (roi.py 헤더)
+#
+# 손이 나오는 영상을 AdaptiveRoi 로 돌리면서 hands.process 프레임당 ms 를 잰다.
+#   full   : --roi 없음 (매 프레임 full frame, tracking 인스턴스 하나)
+#   single : --roi, full_every probe 도 같은 tracking 인스턴스 (이전 방식)
+#   split  : --roi, probe 는 static_image_mode 인스턴스, crop 이 움직이면 tracking reset (현재)
+# mediapipe 가 설치된 환경에서만 돈다 (없으면 안내만 출력).
+#
+# 실행 (py/ 에서):
+#   python bench/bench_roi.py --clip=hand.mp4 [--frames=600] [--full-every=15]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.mp_worker import HANDS_KW, PROBE_KW, parse_hands, reset_tracking  # noqa: E402
+from gestureos_agent.roi import AdaptiveRoi  # noqa: E402
+
+
+def read_clip(path: str, frames: int):
+    cap = cv2.VideoCapture(path)
+    out = []
+    while len(out) < frames:
+        ok, f = cap.read()
+        if not ok:
+            break
+        out.append(f)
+    cap.release()
+    return out
+
+
+def run(clip, mode: str, full_every: int, mp_hands):
+    hands = mp_hands.Hands(**HANDS_KW)
+    probe = mp_hands.Hands(**PROBE_KW) if mode == "split" else None
+    roi = AdaptiveRoi(full_every=full_every) if mode != "full" else None
+    ms = []
+    found = 0
+    for i, frame in enumerate(clip):
+        t = i / 30.0
+        r = roi.plan(frame.shape[1], frame.shape[0], t) if roi is not None else None
+        src = AdaptiveRoi.crop(frame, r) if r is not None else frame
+        rgb = cv2.cvtColor(src, cv2.COLOR_BGR2RGB)
+        t0 = time.perf_counter()
+        if probe is not None and roi.probe:
+            res = probe.process(rgb)
+        else:
+            if probe is not None and roi.moved:
+                hands = reset_tracking(hands, lambda: mp_hands.Hands(**HANDS_KW))
+            res = hands.process(rgb)
+        ms.append((time.perf_counter() - t0) * 1000.0)
+        meta = [{"handed": hd, "score": sc, "lm": lm} for hd, sc, lm in parse_hands(res)]
+        if r is not None:
+            AdaptiveRoi.map_back(meta, r)
+        if roi is not None:
+            roi.update(meta, t, r)
+        found += bool(meta)
+    hands.close()
+    if probe is not None:
+        probe.close()
+    ms = ms[10:] or ms  # graph warm-up
+    ms.sort()
+    st = roi.status() if roi is not None else {}
+    return {
+        "mean": sum(ms) / len(ms),
+        "p95": ms[int(0.95 * (len(ms) - 1))],
+        "found": found,
+        "probes": st.get("probeFrames", 0),
+        "resets": st.get("trackResets", 0),
+    }
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    clip_path = ""
+    frames = 600
+    full_every = 15
+    for a in argv:
+        if a.startswith("--clip="):
+            clip_path = a.split("=", 1)[1]
+        elif a.startswith("--frames="):
+            frames = max(30, int(a.split("=", 1)[1]))
+        elif a.startswith("--full-every="):
+            full_every = max(1, int(a.split("=", 1)[1]))
+
+    try:
+        import mediapipe
+    except ImportError:
+        print("[BENCH] mediapipe is not installed (pip install mediapipe)")
+        return
+    if not clip_path:
+        print("[BENCH] --clip=PATH required (a video with a hand in it)")
+        return
+    clip = read_clip(clip_path, frames)
+    if not clip:
+        print("[BENCH] no frames in", clip_path)
+        return
+
+    h, w = clip[0].shape[:2]
+    print(f"[BENCH] --roi mediapipe cost, {len(clip)} frames {w}x{h}, full_every={full_every}")
+    print(f"  {'mode':<8}{'ms mean':>9}{'ms p95':>9}{'hands':>8}{'probes':>8}{'resets':>8}")
+    for mode in ("full", "single", "split"):
+        r = run(clip, mode, full_every, mediapipe.solutions.hands)
+        print(f"  {mode:<8}{r['mean']:>9.2f}{r['p95']:>9.2f}{r['found']:>8}{r['probes']:>8}{r['resets']:>8}")
+
+
+if __name__ == "__main__":
+    main()
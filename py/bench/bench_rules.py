@@ -0,0 +1,130 @@
+# py/bench/bench_rules.py
+# ---------------------------------------------------------------------------
+# Hold/cooldown rule evaluation cost vs rule count
+#
+# 무작위 규칙 N개(cursor/other 제스처, flags, mode, hold, cooldown)를
+# 제스처가 몇 프레임씩 유지되는 무작위 손 상태 스트림에 돌려서 프레임당 비용을 잰다.
+#   engine : RuleEngine.update (cursor 제스처별 후보만 평가)
+#   scan   : 같은 의미로 매 프레임 모든 규칙을 평가 (비교용)
+# 두 경로의 발동 결과가 같은지도 확인한다.
+#
+# 실행 (py/ 에서):
+#   python bench/bench_rules.py [--frames=20000] [--rules=8,32,128,512]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gestureos_agent.rules import HoldRule, RuleEngine, RuleFrame  # noqa: E402
+
+GESTURES = ("OPEN_PALM", "PINCH_INDEX", "V_SIGN", "FIST", "OTHER", "NONE")
+FLAGS = ("enabled", "locked", "ui_locked", "palette")
+MODES = ("MOUSE", "KEYBOARD", "PRESENTATION", "DRAW", "VKEY")
+
+
+def make_rules(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(n):
+        two = rng.random() < 0.5
+        rules.append(
+            HoldRule(
+                f"R{i}",
+                hold_sec=rng.choice((0.2, 0.35, 0.6, 0.9)),
+                cursor=rng.choice(GESTURES[:4]),
+                other=rng.choice(GESTURES[:4]) if two else None,
+                need_cursor=True,
+                need_other=two,
+                require=frozenset(rng.sample(FLAGS[:2], rng.randint(0, 1))),
+                forbid=frozenset(rng.sample(FLAGS[2:], rng.randint(0, 2))),
+                modes=frozenset(rng.sample(MODES, 2)) if rng.random() < 0.3 else None,
+                cooldown_sec=rng.choice((0.0, 0.6, 1.5)),
+            )
+        )
+    return rules
+
+
+def make_frames(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    out = []
+    t = 1000.0
+    cur, oth, mode = "OPEN_PALM", "NONE", "MOUSE"
+    flags = frozenset({"enabled"})
+    for _ in range(n):
+        if rng.random() < 0.05:
+            cur = rng.choice(GESTURES)
+        if rng.random() < 0.05:
+            oth = rng.choice(GESTURES)
+        if rng.random() < 0.005:
+            mode = rng.choice(MODES)
+        if rng.random() < 0.01:
+            flags = frozenset(f for f in FLAGS if rng.random() < (0.8 if f == "enabled" else 0.2))
+        got_other = oth != "NONE"
+        out.append(RuleFrame(t=t, cursor=cur, other=oth, got_cursor=True, got_other=got_other, mode=mode, flags=flags))
+        t += 1.0 / 30.0
+    return out
+
+
+class Scan:
+    """Same semantics as RuleEngine, every rule every frame."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._start = {}
+        self._last = {}
+
+    def update(self, f: RuleFrame):
+        fired = []
+        t = f.t
+        for r in self.rules:
+            if not r.matches(f):
+                self._start.pop(r.name, None)
+                continue
+            t0 = self._start.setdefault(r.name, t)
+            if (t - t0) < r.hold_sec:
+                continue
+            key = r.cooldown_key or r.name
+            if t < self._last.get(key, 0.0) + r.cooldown_sec:
+                continue
+            self._last[key] = t
+            self._start.pop(r.name, None)
+            fired.append(r.name)
+        return tuple(fired)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    frames = 20000
+    counts = [8, 32, 128, 512]
+    for a in argv:
+        if a.startswith("--frames="):
+            frames = max(100, int(a.split("=", 1)[1]))
+        elif a.startswith("--rules="):
+            counts = [int(x) for x in a.split("=", 1)[1].split(",") if x.strip()]
+
+    stream = make_frames(frames)
+    print(f"[BENCH] hold/cooldown rules, {frames} frames")
+    print(f"  {'rules':>6}{'engine us':>11}{'scan us':>10}{'fired':>8}{'same':>6}")
+    for n in counts:
+        rules = make_rules(n)
+        eng = RuleEngine(rules)
+        t0 = time.perf_counter()
+        a = [eng.update(f) for f in stream]
+        us_e = (time.perf_counter() - t0) * 1e6 / frames
+
+        scan = Scan(rules)
+        t0 = time.perf_counter()
+        b = [scan.update(f) for f in stream]
+        us_s = (time.perf_counter() - t0) * 1e6 / frames
+
+        fired = sum(len(x) for x in a)
+        print(f"  {n:>6}{us_e:>11.2f}{us_s:>10.2f}{fired:>8}{'yes' if a == b else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ from websocket import WebSocketApp
 from ..config import AgentConfig
 from ..timeutil import now
 from ..ws_client import WSClient
+from ..sources import FrameSource, make_source
+from ..camneg import FormatCache
 
 class ColorRushAgent:
     """
@@ -83,38 +85,29 @@ class ColorRushAgent:
             print("[PY] cmd SET_PREVIEW ->", self.preview)
 
     # -------- camera --------
-    def open_camera(self):
-        backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF, 0]
-        cam_idxs = [0, 1, 2]
-        for idx in cam_idxs:
-            for be in backends:
-                try:
-                    cap = cv2.VideoCapture(idx, be) if isinstance(be, int) else cv2.VideoCapture(idx)
-                except Exception:
-                    cap = cv2.VideoCapture(idx)
-                if not cap or not cap.isOpened():
-                    try:
-                        cap.release()
-                    except Exception:
-                        pass
-                    continue
-
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.FRAME_W)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.FRAME_H)
-                cap.set(cv2.CAP_PROP_FPS, 60)
-
-                ok, frame = cap.read()
-                if ok and frame is not None:
-                    print(f"[CAM] opened idx={idx}, backend={be}")
-                    return cap
-
-                try:
-                    cap.release()
-                except Exception:
-                    pass
-
-        raise RuntimeError("webcam open failed. 카메라 점유 앱 종료/권한/인덱스 확인 필요")
+    def open_camera(self) -> FrameSource:
+        # camera: indices/backends brute-force (first readable wins), then format negotiation
+        src = make_source(
+            getattr(self.cfg, "source", "camera"),
+            rate=getattr(self.cfg, "source_rate", "native"),
+            loop=bool(getattr(self.cfg, "source_loop", False)),
+            width=self.FRAME_W,
+            height=self.FRAME_H,
+            camera_kwargs={
+                "indices": (0, 1, 2),
+                "backends": (cv2.CAP_DSHOW, cv2.CAP_MSMF, 0),
+                "fps": 60,
+                "verify_read": True,
+                "negotiate": True,
+                "cache": FormatCache(),
+            },
+        )
+        try:
+            src.open()
+        except Exception as e:
+            raise RuntimeError(f"{e}. 카메라 점유 앱 종료/권한/인덱스 확인 필요")
+        print(f"[CAM] opened {src.describe()}")
+        return src
 
     # -------- tracking helpers --------
     @staticmethod
@@ -269,6 +262,8 @@ class ColorRushAgent:
         while True:
             ok, frame = cap.read()
             if not ok or frame is None:
+                if cap.exhausted:
+                    break
                 time.sleep(0.01)
                 continue
 
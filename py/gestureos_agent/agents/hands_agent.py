@@ -3,20 +3,37 @@ import os
 import time
 import ctypes
 import subprocess
-import math
 
-from typing import Any, List, Optional, Tuple
+from typing import List, Optional
 
 os.environ.setdefault("GLOG_minloglevel", "2")
 
 import cv2
-import mediapipe as mp
+
+try:
+    import mediapipe as mp
+except Exception:  # replay(--replay)은 mediapipe 없이도 동작
+    mp = None
 
 from ..config import AgentConfig
 from ..timeutil import now
-from ..gestures import palm_center, classify_gesture
-from ..control import ControlMapper
+from ..control import ControlMapper, CursorInjector
+from ..screen import get_screen
 from ..ws_client import WSClient
+from ..capture import FrameCapture
+from ..sources import make_source
+from ..camneg import FormatCache
+from ..session_rec import SessionRecorder
+from ..perf import PerfStats
+from ..roi import AdaptiveRoi
+from ..scheduler import InferenceScheduler
+from ..mp_worker import HANDS_KW, PROBE_KW, HandsWorker, parse_hands, reset_tracking
+from ..framebuf import FrameBuffers, mirror_hands
+from ..landmarks import to_payload
+from ..features import HandFeatures
+from ..filters import LandmarkFilter
+from ..hand_tracker import HandTracker
+from ..rules import HoldRule, RuleEngine, RuleFrame
 
 # =============================================================================
 # Camera optional behavior
@@ -32,6 +49,63 @@ CAM_RETRY_SEC = float(os.environ.get("GESTUREOS_CAM_RETRY_SEC", "2.0"))
 NO_CAMERA_POLL_SEC = float(os.environ.get("GESTUREOS_NO_CAMERA_POLL_SEC", "0.20"))
 NO_CAMERA_STATUS_SEC = float(os.environ.get("GESTUREOS_NO_CAMERA_STATUS_SEC", "0.25"))
 
+# format negotiation (camneg.py): MJPG@60 preferred, winner cached per device
+CAM_NEGOTIATE = os.environ.get("GESTUREOS_CAM_NEGOTIATE", "1").strip() in ("1", "true", "True", "YES", "yes")
+CAM_WIDTH = int(os.environ.get("GESTUREOS_CAM_WIDTH", "640"))
+CAM_HEIGHT = int(os.environ.get("GESTUREOS_CAM_HEIGHT", "480"))
+
+# =============================================================================
+# Per-stage latency stats (perf block in STATUS, PERF_DUMP)
+# =============================================================================
+PERF_ENABLED = os.environ.get("GESTUREOS_PERF", "1").strip() in ("1", "true", "True", "YES", "yes")
+PERF_WINDOW = int(os.environ.get("GESTUREOS_PERF_WINDOW", "600"))
+PERF_STATUS_SEC = float(os.environ.get("GESTUREOS_PERF_STATUS_SEC", "1.0"))
+
+# =============================================================================
+# Adaptive inference ROI (--roi)
+# =============================================================================
+ROI_MAX_SIDE = int(os.environ.get("GESTUREOS_ROI_MAX_SIDE", "320"))
+ROI_FULL_EVERY = int(os.environ.get("GESTUREOS_ROI_FULL_EVERY", "15"))
+ROI_PAD = float(os.environ.get("GESTUREOS_ROI_PAD", "0.60"))
+
+# =============================================================================
+# Idle inference scheduler (no hands -> low-rate MediaPipe probe)
+# =============================================================================
+IDLE_SCHED = os.environ.get("GESTUREOS_IDLE_SCHED", "1").strip() in ("1", "true", "True", "YES", "yes")
+IDLE_AFTER_SEC = float(os.environ.get("GESTUREOS_IDLE_AFTER_SEC", "3.0"))
+IDLE_PROBE_HZ = float(os.environ.get("GESTUREOS_IDLE_PROBE_HZ", "8.0"))
+IDLE_MOTION = os.environ.get("GESTUREOS_IDLE_MOTION", "1").strip() in ("1", "true", "True", "YES", "yes")
+IDLE_MOTION_THRESH = float(os.environ.get("GESTUREOS_IDLE_MOTION_THRESH", "4.0"))
+
+# =============================================================================
+# RUSH_COLOR pipeline: color tracker every frame, MediaPipe only as a low-rate probe
+# (global START/STOP/UI-lock gestures keep working). 0 = never run MediaPipe.
+# =============================================================================
+RUSH_COLOR_PROBE_HZ = float(os.environ.get("GESTUREOS_RUSH_COLOR_PROBE_HZ", "4.0"))
+
+# =============================================================================
+# Out-of-process MediaPipe (--mp-worker): frames submitted ahead of post-processing
+# =============================================================================
+MP_WORKER_DEPTH = max(1, int(os.environ.get("GESTUREOS_MP_WORKER_DEPTH", "1")))
+MP_WORKER_WAIT_SEC = float(os.environ.get("GESTUREOS_MP_WORKER_WAIT_SEC", "5.0"))
+
+# =============================================================================
+# Smoothing: cursor filter ("one_euro" | "ema"), optional One Euro on all 21 landmarks
+# (per-mode One Euro params / kind / ema_alpha can be changed via UPDATE_SETTINGS)
+# =============================================================================
+CURSOR_FILTER = os.environ.get("GESTUREOS_CURSOR_FILTER", "one_euro").strip().lower()
+LM_FILTER = os.environ.get("GESTUREOS_LM_FILTER", "0").strip() in ("1", "true", "True", "YES", "yes")
+# latency-compensating cursor predictor ("off" | "cv" | "kalman"), off during PINCH click / drag
+CURSOR_PREDICT = os.environ.get("GESTUREOS_CURSOR_PREDICT", "off").strip().lower()
+PREDICT_EXTRA_MS = float(os.environ.get("GESTUREOS_PREDICT_EXTRA_MS", "8.0"))
+# cursor injector thread: interpolated moves at this rate between frame targets (0 = off, move per frame)
+INJECT_HZ = float(os.environ.get("GESTUREOS_INJECT_HZ", "240" if os.name == "nt" else "0"))
+# UPDATE_SETTINGS keys handled by _apply_filter_settings (kept out of the gesture bindings)
+_SMOOTHING_KEYS = (
+    "cursor_filter", "cursorFilter", "cursor_predict", "cursorPredict",
+    "ema_alpha", "emaAlpha", "one_euro", "oneEuro",
+)
+
 # =============================================================================
 # SAFE imports for modes (import 실패해도 NameError로 죽지 않게)
 # =============================================================================
@@ -63,7 +137,7 @@ UIModeMenu = _safe_import("gestureos_agent.modes.ui_menu", "UIModeMenu")
 RushLRPicker = _safe_import("gestureos_agent.modes.rush_lr", "RushLRPicker")
 ColorStickTracker = _safe_import("gestureos_agent.modes.rush_color", "ColorStickTracker")
 
-from ..bindings import DEFAULT_SETTINGS, deep_copy, merge_settings, get_binding
+from ..bindings import DEFAULT_BINDINGS, DEFAULT_SETTINGS, compile_bindings, deep_copy, merge_settings
 from ..learner_mlp import MLPLearner
 from collections import deque, Counter
 
@@ -71,37 +145,13 @@ from collections import deque, Counter
 # =============================================================================
 # OS cursor helpers
 # =============================================================================
-class _POINT(ctypes.Structure):
-    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
-
-
 def _get_os_cursor_norm01():
     """Return (x01,y01) normalized to Windows virtual screen (multi-monitor).
-    Returns (None,None) if not available."""
+    Returns (None,None) if not available. Geometry / cursor come from the shared screen cache."""
     if os.name != "nt":
         return (None, None)
     try:
-        user32 = ctypes.windll.user32
-        SM_XVIRTUALSCREEN = 76
-        SM_YVIRTUALSCREEN = 77
-        SM_CXVIRTUALSCREEN = 78
-        SM_CYVIRTUALSCREEN = 79
-
-        vx = user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
-        vy = user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
-        vw = user32.GetSystemMetrics(SM_CXVIRTUALSCREEN)
-        vh = user32.GetSystemMetrics(SM_CYVIRTUALSCREEN)
-
-        pt = _POINT()
-        if not user32.GetCursorPos(ctypes.byref(pt)):
-            return (None, None)
-
-        x01 = (pt.x - vx) / max(1, vw)
-        y01 = (pt.y - vy) / max(1, vh)
-
-        x01 = 0.0 if x01 < 0.0 else (1.0 if x01 > 1.0 else float(x01))
-        y01 = 0.0 if y01 < 0.0 else (1.0 if y01 > 1.0 else float(y01))
-        return (x01, y01)
+        return get_screen().cursor_norm01()
     except Exception:
         return (None, None)
 
@@ -110,11 +160,8 @@ def _get_os_cursor_xy():
     if os.name != "nt":
         return (None, None)
     try:
-        user32 = ctypes.windll.user32
-        pt = _POINT()
-        if not user32.GetCursorPos(ctypes.byref(pt)):
-            return (None, None)
-        return (int(pt.x), int(pt.y))
+        c = get_screen().cursor_px(fresh=True)
+        return (None, None) if c is None else (int(c[0]), int(c[1]))
     except Exception:
         return (None, None)
 
@@ -208,23 +255,51 @@ APP_START_HOLD_SEC = 0.9
 APP_STOP_HOLD_SEC = 0.9
 APP_CMD_COOLDOWN_SEC = 1.5
 
+# =============================================================================
+# Hold/cooldown gesture rules (rules.py) - 표 순서 = 우선순위
+# flags: enabled / locked / ui_locked / palette(팔레트 열림) / hover(팔레트 항목 위)
+#        / ui_lock_hold(이번 프레임 UI_LOCK 홀드 중)
+# 단계별 표: palette modal -> global -> (UI menu) -> mode
+# =============================================================================
+PALETTE_RULES = (
+    HoldRule("PALETTE_OPEN", PALETTE_OPEN_HOLD, cursor="V_SIGN", other="V_SIGN", need_other=True,
+             require=frozenset({"enabled"}), forbid=frozenset({"palette"})),
+    HoldRule("PALETTE_CONFIRM", PALETTE_CONFIRM_HOLD, cursor="PINCH_INDEX", require=frozenset({"palette", "hover"})),
+    HoldRule("PALETTE_CANCEL", PALETTE_CANCEL_HOLD, cursor="FIST", require=frozenset({"palette"})),
+)
+
+GLOBAL_RULES = (
+    # 정지 상태 Start: 양손 V_SIGN / 실행 상태 Stop: 양손 FIST (OPEN_PALM은 이동이랑 충돌 -> 사용 금지)
+    HoldRule("APP_START", APP_START_HOLD_SEC, cursor="V_SIGN", other="V_SIGN", need_cursor=True, need_other=True,
+             forbid=frozenset({"palette", "enabled"}), cooldown_sec=APP_CMD_COOLDOWN_SEC, cooldown_key="APP"),
+    HoldRule("APP_STOP", APP_STOP_HOLD_SEC, cursor="FIST", other="FIST", need_cursor=True, need_other=True,
+             require=frozenset({"enabled"}), forbid=frozenset({"palette"}),
+             cooldown_sec=APP_CMD_COOLDOWN_SEC, cooldown_key="APP"),
+    HoldRule("UI_LOCK", UI_LOCK_HOLD_SEC, cursor="FIST", need_cursor=True, require=frozenset({"enabled"}),
+             not_modes=frozenset({"VKEY"}), cooldown_sec=UI_LOCK_COOLDOWN_SEC),
+)
+
+MODE_RULES = (
+    HoldRule("OSK_TOGGLE", OSK_TOGGLE_HOLD_SEC, cursor="FIST", require=frozenset({"enabled"}),
+             forbid=frozenset({"palette", "ui_locked", "ui_lock_hold"}), modes=frozenset({"VKEY"}),
+             cooldown_sec=OSK_TOGGLE_COOLDOWN_SEC),
+    # NEXT_MODE when locked: both OPEN_PALM hold
+    HoldRule("NEXT_MODE", MODE_HOLD_SEC, cursor="OPEN_PALM", other="OPEN_PALM", need_other=True,
+             require=frozenset({"enabled", "locked"}), forbid=frozenset({"palette", "ui_locked"}),
+             cooldown_sec=MODE_COOLDOWN_SEC),
+)
+
 
 def _lm_to_payload(lm):
-    if lm is None:
-        return []
-    return [{"x": float(p[0]), "y": float(p[1]), "z": float(p[2])} for p in lm]
+    return to_payload(lm)
 
 
 def _pinch_thresh_from_ratio(lm, ratio: float, fallback: float = 0.06) -> float:
+    """lm: landmarks or HandFeatures (palm scale memoized per frame)."""
     try:
         if lm is None or len(lm) != 21:
             return float(fallback)
-        x0, y0, _ = lm[0]
-        x9, y9, _ = lm[9]
-        palm = math.sqrt((x0 - x9) ** 2 + (y0 - y9) ** 2)
-        if palm < 1e-6:
-            return float(fallback)
-        return float(max(0.01, min(0.20, ratio * palm)))
+        return HandFeatures.of(lm).pinch_thresh(ratio, fallback)
     except Exception:
         return float(fallback)
 
@@ -351,7 +426,12 @@ class HandsAgent:
             ema_alpha=float(getattr(cfg, "ema_alpha", 0.45)),
             deadzone_px=float(getattr(cfg, "deadzone_px", 2.0)),
             move_interval_sec=(1.0 / max(1e-6, float(getattr(cfg, "move_hz", 60.0)))),
+            filter_kind=CURSOR_FILTER,
+            predict_kind=CURSOR_PREDICT,
         )
+        self.control.predictor.extra_ms = PREDICT_EXTRA_MS
+        self.control.set_filter_mode(self.mode)
+        self.lm_filter = LandmarkFilter() if LM_FILTER else None
 
         # mode handlers (None guard)
         self.mouse_click = MouseClickDrag() if MouseClickDrag else None
@@ -363,10 +443,25 @@ class HandsAgent:
         self.draw = DrawHandler() if DrawHandler else None
         self.ppt = PresentationHandler() if PresentationHandler else None
 
+        # high-rate cursor injector (started in run(); replay / --no-inject never move the cursor)
+        if INJECT_HZ > 0 and (not getattr(cfg, "no_inject", False)) and (not getattr(cfg, "replay", "")):
+            self.control.injector = CursorInjector(hz=INJECT_HZ, deadzone_px=int(self.control.deadzone_px))
+            # button down/up lands the glide on the target first (click / right-click / pen where the hand is)
+            for h in (self.mouse_click, self.mouse_right, self.draw):
+                if h is not None:
+                    h.before_button = self.control.flush_cursor
+
         self.ui_menu = UIModeMenu() if UIModeMenu else None
 
         # ---- user settings (gesture bindings) ----
         self.settings: dict = deep_copy(DEFAULT_SETTINGS)
+        # compiled from self.settings on every apply_settings (read-only, used by the frame loop)
+        self.bindings = DEFAULT_BINDINGS
+
+        # persistent hand ids (cursor/other selection + rush lanes)
+        self.hand_tracker = HandTracker()
+        self.cursor_track_id: Optional[int] = None
+        self.other_track_id: Optional[int] = None
 
         # rush handlers
         self.rush_lr = RushLRPicker() if RushLRPicker else None
@@ -390,15 +485,25 @@ class HandsAgent:
         self.last_cursor_gesture = "NONE"
         self.reacquire_until = 0.0
 
-        # NEXT_MODE hold
-        self.mode_hold_start = None
-        self.last_mode_event_ts = 0.0
+        # ---- hold/cooldown gesture rules (APP START/STOP, UI lock, OSK toggle, NEXT_MODE, palette) ----
+        self.palette_rules = RuleEngine(PALETTE_RULES)
+        self.global_rules = RuleEngine(GLOBAL_RULES)
+        self.mode_rules = RuleEngine(MODE_RULES)
+        self._rule_actions = {
+            "PALETTE_OPEN": self._rule_palette_open,
+            "PALETTE_CONFIRM": self._rule_palette_confirm,
+            "PALETTE_CANCEL": self._rule_palette_cancel,
+            "APP_START": self._rule_app_start,
+            "APP_STOP": self._rule_app_stop,
+            "UI_LOCK": self._rule_ui_lock,
+            "OSK_TOGGLE": self._rule_osk_toggle,
+            "NEXT_MODE": self._rule_next_mode,
+        }
+        self._palette_hover = None
+        self._ui_lock_hold = False
 
         # ---- Palette modal state ----
         self.palette_active = False
-        self.palette_open_start = None
-        self.palette_confirm_start = None
-        self.palette_cancel_start = None
 
         # HUD tip bubble override
         self.cursor_bubble = None
@@ -420,31 +525,27 @@ class HandsAgent:
         # ---- OSK state ----
         self.osk_open = False
         self._osk_proc = None  # ✅ 내가 띄운 osk pid 추적(가능한 경우)
-        self.osk_toggle_hold_start = None
-        self.last_osk_toggle_ts = 0.0
-
-        # ---- UI lock toggle state (FIST hold) ----
-        self.ui_lock_hold_start = None
-        self.last_ui_lock_toggle_ts = 0.0
-
-        # ✅✅ APP start/stop state
-        self.app_start_hold_start = None
-        self.app_stop_hold_start = None
-        self.last_app_cmd_ts = 0.0
 
         # 팔레트 열기 직전 OSK 상태 저장(“열려있었으면 닫고, 닫힐 때 복구”)
         self.palette_prev_osk_open = False
 
-        # mediapipe hands
-        self.mp_hands = mp.solutions.hands
+        # replay: landmarks come from a recorded session (no camera / no mediapipe)
+        self.replay_path = str(getattr(cfg, "replay", "") or "")
 
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            model_complexity=0,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
+        # ---- out-of-process MediaPipe (--mp-worker) ----
+        # worker is spawned on the first frame (ring slot size = frame size)
+        self.mp_worker = None
+        if getattr(cfg, "mp_worker", False) and not self.replay_path:
+            self.mp_worker = HandsWorker(slots=MP_WORKER_DEPTH + 2, drain_timeout=MP_WORKER_WAIT_SEC)
+        self._jobs = deque()
+        self._pipe_latency_ms = 0.0
+
+        # mediapipe hands (in-process; lazily created if the worker goes away)
+        self.mp_hands = None
+        self.hands = None
+        self.hands_probe = None  # --roi full-frame probe (static_image_mode, lazily created)
+        if not self.replay_path and self.mp_worker is None:
+            self.hands = self._make_hands()
 
         # learner (personalized MLP)
         self.learner = MLPLearner()
@@ -485,12 +586,60 @@ class HandsAgent:
         )
 
         # ---- camera state (optional) ----
-        self._cap = None
-        self._cam_ok = False
-        self._cam_err = ""
-        self._cam_last_try_wall = 0.0
+        # capture thread owns the FrameSource (open/retry) and keeps only the newest frame
+        self.source = None
+        self._capture = None
+        if not self.replay_path:
+            self.source = make_source(
+                getattr(cfg, "source", "camera"),
+                rate=getattr(cfg, "source_rate", "native"),
+                loop=bool(getattr(cfg, "source_loop", False)),
+                width=CAM_WIDTH,
+                height=CAM_HEIGHT,
+                camera_kwargs={"negotiate": CAM_NEGOTIATE, "cache": FormatCache() if CAM_NEGOTIATE else None},
+            )
+            self._capture = FrameCapture(self.source, retry_sec=CAM_RETRY_SEC, name=self.source.kind)
         self._last_nocam_status_wall = 0.0
 
+        # ---- session recording (REC_START / REC_STOP) ----
+        self.recorder = SessionRecorder()
+
+        # ---- per-stage latency (STATUS perf block, PERF_DUMP) ----
+        self.perf = PerfStats(window=PERF_WINDOW, enabled=PERF_ENABLED)
+        self._perf_status_ts = 0.0
+
+        # ---- reused scratch images (RGB for MediaPipe, mirrored preview) ----
+        self.fbuf = FrameBuffers()
+
+        # ---- adaptive inference ROI (crop/downscale before MediaPipe) ----
+        self.roi = (
+            AdaptiveRoi(
+                loss_grace_sec=LOSS_GRACE_SEC,
+                hard_loss_sec=HARD_LOSS_SEC,
+                pad=ROI_PAD,
+                max_side=ROI_MAX_SIDE,
+                full_every=ROI_FULL_EVERY,
+            )
+            if (getattr(cfg, "roi", False) and not self.replay_path)
+            else None
+        )
+
+        # ---- idle scheduler (MediaPipe at probe rate while nobody is in front of the camera) ----
+        self.sched = (
+            InferenceScheduler(
+                idle_after_sec=IDLE_AFTER_SEC,
+                probe_hz=IDLE_PROBE_HZ,
+                motion=IDLE_MOTION,
+                motion_thresh=IDLE_MOTION_THRESH,
+            )
+            if (IDLE_SCHED and not self.replay_path)
+            else None
+        )
+
+        # ---- RUSH_COLOR hand probe ----
+        self._rush_probe_ts = 0.0
+        self._rush_probe_gestures = ("NONE", "NONE")
+
         # boot: start_vkey면 바로 OSK 띄우기
         if str(self.mode).upper() == "VKEY":
             self._enter_vkey_mode()
@@ -645,9 +794,7 @@ class HandsAgent:
             except Exception:
                 pass
         self.palette_active = False
-        self.palette_open_start = None
-        self.palette_confirm_start = None
-        self.palette_cancel_start = None
+        self.palette_rules.reset()
 
     def _on_command(self, data: dict):
         typ = data.get("type")
@@ -664,15 +811,41 @@ class HandsAgent:
             "UNLOCK",
             "TRAIN_CAPTURE",
             "TRAIN_TRAIN",
+            "TRAIN_CANCEL",
             "TRAIN_ENABLE",
             "TRAIN_RESET",
             "TRAIN_SET_PROFILE",
             "TRAIN_PROFILE_CREATE",
             "TRAIN_PROFILE_DELETE",
             "TRAIN_PROFILE_RENAME",
+            "TRAIN_SAMPLES_EXPORT",
+            "TRAIN_SAMPLES_IMPORT",
+            "REC_START",
+            "REC_STOP",
+            "PERF_DUMP",
+            "SET_CAMERA",
         ):
             print("[PY] cmd:", data, flush=True)
 
+        if typ == "PERF_DUMP":
+            self._perf_dump(data)
+            return
+
+        if typ == "SET_CAMERA":
+            self._set_camera(data)
+            return
+
+        # user is about to gesture -> leave idle probing right away
+        if typ in ("ENABLE", "SET_MODE") and self.sched is not None:
+            self.sched.force_active(now())
+
+        if typ in ("REC_START", "REC_STOP"):
+            self._on_rec_command(typ, data)
+            return
+
+        if self.recorder.active:
+            self.recorder.write_command(now(), data)
+
         if typ == "ENABLE":
             self.enabled = True
             self.locked = False
@@ -737,7 +910,11 @@ class HandsAgent:
             self.learner.start_capture(hand=hand, label=label, seconds=seconds, hz=hz)
 
         elif typ == "TRAIN_TRAIN":
-            self.learner.train()
+            # background thread on a sample snapshot; the model is swapped in by _process_hands
+            self.learner.train_async()
+
+        elif typ == "TRAIN_CANCEL":
+            self.learner.cancel_training()
 
         elif typ == "TRAIN_ENABLE":
             self.learner.enabled = bool(data.get("enabled", True))
@@ -774,6 +951,88 @@ class HandsAgent:
             if src and dst:
                 self.learner.rename_profile(str(src), str(dst))
 
+        elif typ == "TRAIN_SAMPLES_EXPORT":
+            p = data.get("payload") or {}
+            try:
+                path, n = self.learner.export_samples(p.get("path"))
+                print(f"[LEARN] exported {n} samples -> {path}", flush=True)
+                self.send_event("TRAIN_SAMPLES", {"op": "export", "profile": self.learner.profile, "path": path, "count": n})
+            except Exception as e:
+                print("[LEARN] sample export failed:", e, flush=True)
+
+        elif typ == "TRAIN_SAMPLES_IMPORT":
+            p = data.get("payload") or {}
+            path = p.get("path")
+            if path:
+                try:
+                    n = self.learner.import_samples(str(path), replace=bool(p.get("replace", False)))
+                    print(f"[LEARN] imported {n} samples <- {path}", flush=True)
+                    self.send_event("TRAIN_SAMPLES", {"op": "import", "profile": self.learner.profile, "path": str(path), "count": n})
+                except Exception as e:
+                    print("[LEARN] sample import failed:", e, flush=True)
+
+    # ---------- perf ----------
+    def _perf_dump(self, data: dict):
+        """PERF_DUMP: print the full stage table and answer with EVENT PERF (payload.reset=true clears it)."""
+        try:
+            print(self.perf.format_table(), flush=True)
+            self.send_event("PERF", self.perf.summary())
+            p = data.get("payload") or {}
+            if bool(p.get("reset", data.get("reset", False))):
+                self.perf.reset()
+        except Exception as e:
+            print("[PERF] dump error:", e, flush=True)
+
+    # ---------- camera ----------
+    def _set_camera(self, data: dict):
+        """SET_CAMERA {payload: {width, height}} or {payload: {resolution: "1280x720"}}: live size switch."""
+        src = self.source
+        if src is None or not hasattr(src, "request_resolution"):
+            print("[CAM] SET_CAMERA ignored: source is", src.describe() if src is not None else "replay", flush=True)
+            return
+        p = data.get("payload") or data
+        try:
+            res = p.get("resolution")
+            if res:
+                w, h = (int(v) for v in str(res).lower().split("x", 1))
+            else:
+                w, h = int(p.get("width")), int(p.get("height"))
+        except Exception:
+            print("[CAM] SET_CAMERA: bad size:", p, flush=True)
+            return
+        src.request_resolution(w, h)
+        # ROI rect was planned for the old frame size
+        if self.roi is not None:
+            self.roi.reset()
+
+    # ---------- session recording ----------
+    def _session_state(self) -> dict:
+        """Initial state stored in the .gosr header (replay.py restores it)."""
+        return {
+            "mode": str(self.mode),
+            "enabled": bool(self.enabled),
+            "locked": bool(self.locked),
+            "uiLocked": bool(self.ui_locked),
+            "cursorHand": str(self.cursor_hand_label),
+            "settings": deep_copy(self.settings),
+            "learnProfile": str(getattr(self.learner, "profile", "default")),
+            "learnEnabled": bool(getattr(self.learner, "enabled", False)),
+            "frameSource": self.source.describe() if self.source is not None else "",
+            "ts": now(),
+        }
+
+    def _on_rec_command(self, typ: str, data: dict):
+        if self.replay_path:
+            return
+        try:
+            if typ == "REC_START":
+                p = data.get("payload") or {}
+                self.recorder.start(path=p.get("path") or data.get("path"), state=self._session_state())
+            else:
+                self.recorder.stop()
+        except Exception as e:
+            print("[REC] error:", e, flush=True)
+
     # ---------- mode + state ----------
     def _reset_side_effects(self):
         if self.mouse_click:
@@ -794,10 +1053,59 @@ class HandsAgent:
         self._reset_side_effects()
         self._force_hide_menu()
 
+    def _apply_filter_settings(self, incoming: dict):
+        """
+        UPDATE_SETTINGS smoothing keys (like control_gain, not stored in bindings):
+          cursor_filter: "one_euro" | "ema"
+          ema_alpha: 0.01~1.0
+          cursor_predict: "off" | "cv" | "kalman"
+          one_euro: {"MOUSE": {"min_cutoff", "beta", "d_cutoff"}, "DRAW": {...}}
+                    (flat {"min_cutoff", ...} = current mode)
+        """
+        cf = self.control.cursor_filter
+
+        kind = incoming.get("cursor_filter", incoming.get("cursorFilter", None))
+        if kind is not None:
+            cf.set_kind(str(kind))
+            print(f"[PY] cursor_filter applied -> {cf.kind}", flush=True)
+
+        pk = incoming.get("cursor_predict", incoming.get("cursorPredict", None))
+        if pk is not None:
+            self.control.predictor.set_kind(str(pk))
+            print(f"[PY] cursor_predict applied -> {self.control.predictor.kind}", flush=True)
+
+        a = incoming.get("ema_alpha", incoming.get("emaAlpha", None))
+        if a is not None:
+            a = max(0.01, min(1.0, float(a)))
+            self.control.ema_alpha = a
+            cf.ema_alpha = a
+            print(f"[PY] ema_alpha applied -> {a}", flush=True)
+
+        oe = incoming.get("one_euro", incoming.get("oneEuro", None))
+        if isinstance(oe, dict):
+            flat_keys = ("min_cutoff", "minCutoff", "beta", "d_cutoff", "dCutoff")
+            if any(k in oe for k in flat_keys):
+                oe = {cf.mode: oe}
+            for mode, params in oe.items():
+                if isinstance(params, dict):
+                    cf.set_params(str(mode), params)
+                    print(f"[PY] one_euro applied -> {str(mode).upper()} {cf.params_for(mode).to_dict()}", flush=True)
+
     def apply_settings(self, incoming: dict):
         try:
+            if isinstance(incoming, dict):
+                try:
+                    self._apply_filter_settings(incoming)
+                except Exception as e:
+                    print("[PY] filter settings apply failed:", repr(e), flush=True)
+                # smoothing blocks are not gesture bindings
+                incoming = {k: v for k, v in incoming.items() if k not in _SMOOTHING_KEYS}
+
             self.settings = merge_settings(self.settings, incoming)
+            self.bindings = compile_bindings(self.settings)
             print("[PY] apply_settings -> version", self.settings.get("version"), flush=True)
+            for c in self.bindings.conflicts:
+                print("[PY] binding conflict:", c, flush=True)
 
             g = None
             if isinstance(incoming, dict):
@@ -866,7 +1174,7 @@ class HandsAgent:
         if prev_mode == "VKEY" and nm != "VKEY":
             self._osk_close()
 
-        self.control.reset_ema()
+        self.control.reset_filter()
 
         if self.mode == "DRAW" and nm != "DRAW":
             if self.draw:
@@ -891,6 +1199,7 @@ class HandsAgent:
             self.draw.reset()
 
         self.mode = nm
+        self.control.set_filter_mode(nm)
 
         if self._learn_profile_by_mode:
             cur_p = str(getattr(self.learner, "profile", "default"))
@@ -912,43 +1221,13 @@ class HandsAgent:
     # -------------------------------------------------------------------------
     # capture
     # -------------------------------------------------------------------------
-    def _open_camera(self):
-        try:
-            cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-        except Exception:
-            cap = cv2.VideoCapture(0)
-
-        if not cap.isOpened():
-            raise RuntimeError("webcam open failed")
+    @property
+    def _cam_ok(self) -> bool:
+        return bool(self._capture.ok) if self._capture is not None else True
 
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        return cap
-
-    def _close_camera(self):
-        if self._cap is not None:
-            try:
-                self._cap.release()
-            except Exception:
-                pass
-        self._cap = None
-        self._cam_ok = False
-
-    def _try_open_camera(self) -> bool:
-        self._cam_last_try_wall = time.time()
-        try:
-            self._cap = self._open_camera()
-            self._cam_ok = True
-            self._cam_err = ""
-            print("[PY] camera opened", flush=True)
-            return True
-        except Exception as e:
-            self._cap = None
-            self._cam_ok = False
-            self._cam_err = f"{type(e).__name__}: {e}"
-            print("[PY] camera not available:", self._cam_err, flush=True)
-            return False
+    @property
+    def _cam_err(self) -> str:
+        return str(self._capture.err or "") if self._capture is not None else ""
 
     def _send_status_no_camera(self, fps: float = 0.0):
         self.cursor_bubble = f"NO CAMERA • retry {CAM_RETRY_SEC:.1f}s"
@@ -1013,92 +1292,151 @@ class HandsAgent:
             self._force_hide_menu()
             return False
 
-        # open trigger
-        if (
-            (not self.palette_active)
-            and self.enabled
-            and got_other
-            and (cursor_gesture == "V_SIGN")
-            and (other_gesture == "V_SIGN")
-        ):
-            if self.palette_open_start is None:
-                self.palette_open_start = t
-
-            if (t - self.palette_open_start) >= PALETTE_OPEN_HOLD:
-                self.palette_prev_osk_open = bool(self.osk_open)
-                if self.palette_prev_osk_open:
-                    self._osk_close()
-
-                self.palette_active = True
-                self.palette_open_start = None
-                self.palette_confirm_start = None
-                self.palette_cancel_start = None
-
-                cx, cy = _get_os_cursor_xy()
-                if cx is not None and cy is not None:
-                    hud.show_menu(center_xy=(cx, cy))
-                else:
-                    hud.show_menu()
-
-                self._reset_side_effects()
-        else:
-            self.palette_open_start = None
+        # open / confirm / cancel holds (PALETTE_RULES)
+        self._palette_hover = hud.get_menu_hover() if self.palette_active else None
+        fired = self.palette_rules.update(
+            RuleFrame(
+                t=t,
+                cursor=cursor_gesture,
+                other=other_gesture,
+                got_cursor=got_cursor,
+                got_other=got_other,
+                flags=self._rule_flags(),
+            ),
+            self._on_rule,
+        )
 
-        if not self.palette_active:
+        if not (self.palette_active or ("PALETTE_CONFIRM" in fired) or ("PALETTE_CANCEL" in fired)):
             return False
 
-        hover = hud.get_menu_hover()
+        hover = self._palette_hover
         self.cursor_bubble = f"MENU • {hover or '...'} (PINCH=확정, FIST=취소)"
 
         no_inject = bool(getattr(self.cfg, "no_inject", False))
-        if (not no_inject) and (t >= self.reacquire_until) and got_cursor and (cursor_gesture == "OPEN_PALM"):
+        if (
+            self.palette_active
+            and (not no_inject)
+            and (t >= self.reacquire_until)
+            and got_cursor
+            and (cursor_gesture == "OPEN_PALM")
+        ):
             ux, uy = self.control.map_control_to_screen(cursor_cx, cursor_cy)
-            ex, ey = self.control.apply_ema(ux, uy)
+            ex, ey = self.control.apply_filter(ux, uy, t)
             self.control.move_cursor(ex, ey, t)
 
-        if (cursor_gesture == "PINCH_INDEX") and hover:
-            if self.palette_confirm_start is None:
-                self.palette_confirm_start = t
-            if (t - self.palette_confirm_start) >= PALETTE_CONFIRM_HOLD:
-                picked = PALETTE_MAP.get(str(hover).upper(), "MOUSE")
+        return bool(self.palette_active)
 
-                self.apply_set_mode(picked)
+    # -------------------------------------------------------------------------
+    # hold/cooldown rule actions (rules.py)
+    # -------------------------------------------------------------------------
+    def _rule_flags(self) -> frozenset:
+        f = set()
+        if self.enabled:
+            f.add("enabled")
+        if self.locked:
+            f.add("locked")
+        if self.ui_locked:
+            f.add("ui_locked")
+        if self.palette_active:
+            f.add("palette")
+        if self._palette_hover:
+            f.add("hover")
+        if self._ui_lock_hold:
+            f.add("ui_lock_hold")
+        return frozenset(f)
+
+    def _on_rule(self, rule: HoldRule, frame: RuleFrame):
+        fn = self._rule_actions.get(rule.name)
+        if fn is not None:
+            fn(frame)
+        # later rules in the same pass see the new state
+        return self._rule_flags()
+
+    def _rule_palette_open(self, frame: RuleFrame):
+        hud = getattr(self.cfg, "hud", None)
+        self.palette_prev_osk_open = bool(self.osk_open)
+        if self.palette_prev_osk_open:
+            self._osk_close()
 
-                try:
-                    hud.hide_menu()
-                except Exception:
-                    pass
-                self.palette_active = False
-                self.palette_confirm_start = None
-                self.palette_cancel_start = None
-                self._reset_side_effects()
+        self.palette_active = True
+        self.palette_rules.reset()
 
-                if str(self.mode).upper() == "VKEY" and self.palette_prev_osk_open:
-                    self._osk_open()
-                self.palette_prev_osk_open = False
+        cx, cy = _get_os_cursor_xy()
+        if cx is not None and cy is not None:
+            hud.show_menu(center_xy=(cx, cy))
         else:
-            self.palette_confirm_start = None
+            hud.show_menu()
 
-        if cursor_gesture == "FIST":
-            if self.palette_cancel_start is None:
-                self.palette_cancel_start = t
-            if (t - self.palette_cancel_start) >= PALETTE_CANCEL_HOLD:
-                try:
-                    hud.hide_menu()
-                except Exception:
-                    pass
-                self.palette_active = False
-                self.palette_confirm_start = None
-                self.palette_cancel_start = None
-                self._reset_side_effects()
+        self._reset_side_effects()
+        self._palette_hover = hud.get_menu_hover()
+
+    def _rule_palette_confirm(self, frame: RuleFrame):
+        picked = PALETTE_MAP.get(str(self._palette_hover).upper(), "MOUSE")
+        self.apply_set_mode(picked)
+        self._close_palette()
+
+    def _rule_palette_cancel(self, frame: RuleFrame):
+        self._close_palette()
+
+    def _close_palette(self):
+        hud = getattr(self.cfg, "hud", None)
+        try:
+            hud.hide_menu()
+        except Exception:
+            pass
+        self.palette_active = False
+        self.palette_rules.reset()
+        self._reset_side_effects()
+
+        if str(self.mode).upper() == "VKEY" and self.palette_prev_osk_open:
+            self._osk_open()
+        self.palette_prev_osk_open = False
+
+    def _rule_app_start(self, frame: RuleFrame):
+        # ✅ 로컬에서 즉시 start 처리 (WS 의존 제거)
+        self.enabled = True
+        self.locked = False
+        # ui_locked는 유지(원하면 여기서 False로 풀어도 됨)
+        self.cursor_bubble = "START!"
+
+        # 알림용 이벤트(옵션)
+        try:
+            self.send_event("APP_START", {"source": "gesture"})
+        except Exception:
+            pass
+
+    def _rule_app_stop(self, frame: RuleFrame):
+        # ✅ 로컬에서 즉시 stop 처리 (DISABLE과 동일한 처리)
+        self.enabled = False
+        self._reset_side_effects()
+        self._osk_close()
+        self._force_hide_menu()
+        self.cursor_bubble = "STOP!"
 
-                if str(self.mode).upper() == "VKEY" and self.palette_prev_osk_open:
-                    self._osk_open()
-                self.palette_prev_osk_open = False
+        try:
+            self.send_event("APP_STOP", {"source": "gesture"})
+        except Exception:
+            pass
+
+    def _rule_ui_lock(self, frame: RuleFrame):
+        self.ui_locked = (not self.ui_locked)
+        if self.ui_locked:
+            self._apply_ui_locked_side_effects()
+            self.cursor_bubble = "UI 잠금!"
         else:
-            self.palette_cancel_start = None
+            self.cursor_bubble = "UI 해제!"
 
-        return bool(self.palette_active)
+        try:
+            self.send_event("UI_LOCK", {"locked": bool(self.ui_locked)})
+        except Exception:
+            pass
+
+    def _rule_osk_toggle(self, frame: RuleFrame):
+        self._osk_toggle()
+        self.cursor_bubble = "OSK 토글!"
+
+    def _rule_next_mode(self, frame: RuleFrame):
+        self.send_event("NEXT_MODE", None)
 
     # -------------------------------------------------------------------------
     # main loop helpers
@@ -1125,794 +1463,954 @@ class HandsAgent:
 
         return (lab, avg)
 
-    # -------------------------------------------------------------------------
-    # main loop
-    # -------------------------------------------------------------------------
-    def run(self):
-        print("[PY] running:", os.path.abspath(__file__), flush=True)
-        print(
-            "[PY] WS_URL:",
-            getattr(self.cfg, "ws_url", ""),
-            "(disabled)" if getattr(self.cfg, "no_ws", False) else "",
-            flush=True,
-        )
-
-        self.ws.start()
-        self._try_open_camera()
-
-        if REQUIRE_CAMERA and (self._cap is None):
-            print("[PY] REQUIRE_CAMERA=1 but camera open failed -> exit", flush=True)
-            self._send_status_no_camera(fps=0.0)
-            return
+    def _make_hands(self, kw=HANDS_KW):
+        if mp is None:
+            raise RuntimeError("mediapipe is not installed")
+        self.mp_hands = mp.solutions.hands
+        return self.mp_hands.Hands(**kw)
 
-        prev_t = now()
-        fps = 0.0
+    def _infer_hands(self, rgb, probe: bool = False, reset: bool = False) -> List[dict]:
+        """MediaPipe Hands -> hands_meta [{"handed", "score", "lm"}, ...]
 
-        while True:
-            # ==========================
-            # NO CAMERA mode (keep alive)
-            # ==========================
-            if self._cap is None:
-                wall = time.time()
+        probe: --roi periodic full frame on its own static instance (tracking instance untouched)
+        reset: tracking instance input moved (ROI re-centred / crop <-> full) -> drop its tracking ROI
+        """
+        if probe:
+            if self.hands_probe is None:
+                self.hands_probe = self._make_hands(PROBE_KW)
+            res = self.hands_probe.process(rgb)
+        else:
+            if self.hands is None:
+                self.hands = self._make_hands()
+            elif reset:
+                self.hands = reset_tracking(self.hands, self._make_hands)
+            res = self.hands.process(rgb)
 
-                if self.window_open:
-                    try:
-                        cv2.destroyWindow("GestureOS Agent")
-                    except Exception:
-                        try:
-                            cv2.destroyAllWindows()
-                        except Exception:
-                            pass
-                    self.window_open = False
-                    self._request_close_preview = False
+        # hands_meta: richer info for reliable main/aux hand selection
+        return [{"handed": handed, "score": score, "lm": lm} for handed, score, lm in parse_hands(res)]
 
-                if (wall - self._last_nocam_status_wall) >= NO_CAMERA_STATUS_SEC:
-                    self._last_nocam_status_wall = wall
-                    self._send_status_no_camera(fps=0.0)
+    def _process_hands(
+        self, t: float, hands_meta: List[dict], frame=None, fps: float = 0.0, capture_ts: Optional[float] = None
+    ) -> dict:
+        """
+        Everything after inference (hand selection, gestures, learner, modes, injection, STATUS).
+        - frame is only needed by RUSH_COLOR (None in replay)
+        - capture_ts: when the camera grabbed the frame (cursor prediction latency; None = t)
+        - returns the bits the preview overlay needs
+        """
+        # frame boundary: a finished background training replaces the learner model here,
+        # never in the middle of this frame's predictions
+        if self.learner.poll_training():
+            print(f"[LEARN] model swapped in (profile={self.learner.profile})", flush=True)
+
+        # one HandFeatures per hand per frame: palm centre / pinch / extension flags / learner vector /
+        # rule gesture are computed on first use and shared by the hand tracker, rush picker,
+        # hand selection, classification and the learner
+        for h in hands_meta:
+            if h.get("lm") is not None and h.get("feat") is None:
+                h["feat"] = HandFeatures(h["lm"])
+
+        # persistent hand ids: min-cost matching on palm position/velocity, handedness voted per track
+        live = [h for h in hands_meta if h.get("feat") is not None]
+        tracks = self.hand_tracker.update(
+            t, [(h.get("handed"), float(h.get("score", 0.0)), *h["feat"].palm_center) for h in live]
+        )
+        for h, tr in zip(live, tracks):
+            h["track"] = tr
+
+        if self.lm_filter is not None:
+            # One Euro on all 21 landmarks (in place, one state per hand track), before any other feature
+            for h in live:
+                self.lm_filter(f"#{h['track'].id}", h["lm"], t)
+                h["feat"] = HandFeatures(h["lm"])
+
+        # rush left/right packs: HSV sticks in RUSH_COLOR, hands otherwise
+        rush_left, rush_right = (None, None)
+        if str(self.mode).upper() == "RUSH_COLOR" and self.rush_color:
+            if frame is not None:
+                rush_left, rush_right = self._track_rush_color(frame, t)
+        elif self.rush_lr:
+            rush_left, rush_right = self.rush_lr.pick(t, [(h["track"].id, h["feat"]) for h in live])
+        self.perf.lap("color")
+
+        # ✅ Main hand policy: physical RIGHT hand is always the main/cursor hand.
+        # Handedness is the track's voted label (MediaPipe handedness after MIRROR swap, smoothed
+        # per track), so a one-frame label flip does not swap cursor/other. The current cursor
+        # track keeps the role while it is still labeled RIGHT. If handedness is missing
+        # (rare), we fall back to x-position with mirror awareness.
+        cursor_f: Optional[HandFeatures] = None  # main (RIGHT)
+        other_f: Optional[HandFeatures] = None   # aux  (LEFT)
+        main_h = aux_h = None
+
+        if live:
+            rights = [h for h in live if h["track"].handed == "Right"]
+            lefts = [h for h in live if h["track"].handed == "Left"]
+
+            def _best(xs, keep_id=None):
+                for h in xs:
+                    if h["track"].id == keep_id:
+                        return h
+                return max(xs, key=lambda h: float(h.get("score", 0.0))) if xs else None
+
+            main_h = _best(rights, self.cursor_track_id)
+            aux_h = _best(lefts, self.other_track_id)
+
+            if main_h is not None:
+                if aux_h is None:
+                    # If there is another hand but it wasn't labeled LEFT, keep it as aux
+                    aux_h = _best([h for h in live if h is not main_h], self.other_track_id)
+            elif aux_h is None:
+                # Fallback when handedness is missing/None for all hands:
+                # In mirrored frame, physical RIGHT hand tends to appear on the LEFT side.
+                # Use the rightmost hand as aux only (strict main policy: cursor_f stays None).
+                aux_h = max(live, key=lambda h: h["feat"].palm_center[0])
+            # else: strict main-hand policy, RIGHT hand not present -> cursor_f=None, LEFT still aux for the UI
+
+        cursor_f = main_h["feat"] if main_h is not None else None
+        other_f = aux_h["feat"] if aux_h is not None else None
+        if main_h is not None:
+            self.cursor_track_id = main_h["track"].id
+        elif self.hand_tracker.get(self.cursor_track_id) is None:
+            self.cursor_track_id = None
+        if aux_h is not None:
+            self.other_track_id = aux_h["track"].id
+        elif self.hand_tracker.get(self.other_track_id) is None:
+            self.other_track_id = None
+        self.learner.tick_capture(cursor_lm=cursor_f, other_lm=other_f)
+        self.perf.lap("handedness")
+
+        got_cursor = (cursor_f is not None)
+        cursor_lm = cursor_f.lm if cursor_f is not None else None
+        other_lm = other_f.lm if other_f is not None else None
+
+        if got_cursor:
+            cursor_cx, cursor_cy = cursor_f.palm_center
+
+            ratio = float(getattr(self.learner, "pinch_ratio_thresh", {}).get("cursor", 0.35))
+            base = _pinch_thresh_from_ratio(cursor_f, ratio, fallback=0.06)
+            pth = base * (self._pinch_hys_off if self._pinch_down else self._pinch_hys_on)
+
+            cursor_gesture_raw = cursor_f.gesture(pth)
+            self.perf.lap("classify")
+
+            # frame time (not wall clock) so replay stays deterministic
+            now_s = t
+            raw_is_pinch = (cursor_gesture_raw == "PINCH_INDEX")
+            pinch_down = self._update_pinch_state(raw_is_pinch, now_s)
+
+            if pinch_down:
+                cursor_gesture_rule = "PINCH_INDEX"
+            else:
+                cursor_gesture_rule = "OPEN_PALM" if cursor_gesture_raw == "PINCH_INDEX" else cursor_gesture_raw
 
-                if (wall - self._cam_last_try_wall) >= CAM_RETRY_SEC:
-                    self._try_open_camera()
+            cursor_gesture = cursor_gesture_rule
 
-                time.sleep(max(0.01, NO_CAMERA_POLL_SEC))
-                continue
+            self.learner.tick_capture(cursor_lm=cursor_f, other_lm=other_f)
 
-            # ==========================
-            # CAMERA OK mode
-            # ==========================
-            ok, frame = self._cap.read()
-            if not ok or frame is None:
-                self._cam_ok = False
-                self._cam_err = "camera_read_failed"
-                self._close_camera()
-                continue
+            pred, score = self.learner.predict("cursor", cursor_f)
+            sm_pred, sm_score = self._smooth_pred("cursor", pred, score, cursor_gesture_rule)
+            self.perf.lap("learner")
 
-            frame = cv2.flip(frame, 1)  # mirror
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            mode_u = str(self.mode).upper()
 
-            t = now()
-            dt = max(t - prev_t, 1e-6)
-            prev_t = t
-            fps = 0.9 * fps + 0.1 * (1.0 / dt)
+            # ✅ FIX: PINCH는 learner가 절대 덮어쓰지 못하게 rule 우선
+            if cursor_gesture_rule == "PINCH_INDEX":
+                cursor_gesture = "PINCH_INDEX"
+            else:
+                if mode_u in ("DRAW", "VKEY", "KEYBOARD"):
+                    cursor_gesture = cursor_gesture_rule
+                else:
+                    if sm_pred is not None and str(sm_pred) != "PINCH_INDEX":
+                        cursor_gesture = sm_pred
+                    else:
+                        cursor_gesture = cursor_gesture_rule
 
-            res = self.hands.process(rgb)
+            self.learner.last_pred = {
+                "hand": "cursor",
+                "label": sm_pred,
+                "score": float(sm_score),
+                "rule": cursor_gesture_rule,
+                "rawLabel": pred,
+                "rawScore": float(score),
+            }
 
-            # NOTE: frame is mirrored (cv2.flip(frame, 1)). MediaPipe handedness labels
-            # must be swapped to match the user's physical left/right.
-            MIRROR_MODE = False
+            self.last_seen_ts = t
+            self.last_cursor_lm = cursor_lm
+            self.last_cursor_cxcy = (cursor_cx, cursor_cy)
+            self.last_cursor_gesture = cursor_gesture
 
-            # hands_list keeps the legacy shape: [(label, lm), ...] for downstream modules
-            hands_list: List[Tuple[Optional[str], Any]] = []
-            # hands_meta: richer info for reliable main/aux hand selection
-            hands_meta: List[dict] = []
+        else:
+            if self.last_cursor_lm is not None and (t - self.last_seen_ts) <= LOSS_GRACE_SEC:
+                cursor_cx, cursor_cy = self.last_cursor_cxcy
+                cursor_gesture = self.last_cursor_gesture
+                cursor_lm = self.last_cursor_lm
+                got_cursor = True
+            else:
+                cursor_gesture = "NONE"
+                cursor_cx, cursor_cy = (0.5, 0.5)
+                if self.last_cursor_lm is None or (t - self.last_seen_ts) >= HARD_LOSS_SEC:
+                    self.reacquire_until = t + REACQUIRE_BLOCK_SEC
+                    self._pinch_down = False
+                    self._pinch_t0 = 0.0
 
-            if res.multi_hand_landmarks:
-                labels: List[Optional[str]] = []
-                scores: List[float] = []
+        got_other = (other_f is not None)
+        other_gesture = "NONE"
+        other_cx, other_cy = (0.5, 0.5)
+        if got_other:
+            other_cx, other_cy = other_f.palm_center
+            ratio_o = float(getattr(self.learner, "pinch_ratio_thresh", {}).get("other", 0.35))
+            pth_o = _pinch_thresh_from_ratio(other_f, ratio_o, fallback=0.06)
+            other_gesture = other_f.gesture(pth_o)
+        self.perf.lap("classify")
 
-                if res.multi_handedness:
-                    for h in res.multi_handedness:
-                        cls = h.classification[0]
-                        labels.append(getattr(cls, "label", None))
-                        try:
-                            scores.append(float(getattr(cls, "score", 0.0)))
-                        except Exception:
-                            scores.append(0.0)
-                else:
-                    labels = [None] * len(res.multi_hand_landmarks)
-                    scores = [0.0] * len(res.multi_hand_landmarks)
+        mode_u = str(self.mode).upper()
+        effective_locked = bool(self.ui_locked) or bool(self.locked)
 
-                for i, lm_obj in enumerate(res.multi_hand_landmarks):
-                    lm = [(p.x, p.y, p.z) for p in lm_obj.landmark]
-                    handed = labels[i] if i < len(labels) else None
-                    score = scores[i] if i < len(scores) else 0.0
+        # Palette modal (최우선)
+        block_by_palette = False
+        if not self.ui_locked:
+            block_by_palette = self._update_palette_modal(
+                t=t,
+                got_cursor=got_cursor,
+                got_other=got_other,
+                cursor_gesture=cursor_gesture,
+                other_gesture=other_gesture,
+                cursor_cx=cursor_cx,
+                cursor_cy=cursor_cy,
+            )
+        else:
+            self._force_hide_menu()
 
-                    # Swap handedness if we mirrored the frame
-                    if MIRROR_MODE and handed in ("Left", "Right"):
-                        handed = "Right" if handed == "Left" else "Left"
+        # -----------------------------------------------------------------
+        # ✅ APP START/STOP + UI 잠금 토글 (GLOBAL_RULES, 즉시 로컬 적용 + WS EVENT는 알림용)
+        # -----------------------------------------------------------------
+        self._ui_lock_hold = False
+        rule_frame = RuleFrame(
+            t=t,
+            cursor=cursor_gesture,
+            other=other_gesture,
+            got_cursor=got_cursor,
+            got_other=got_other,
+            mode=mode_u,
+            flags=self._rule_flags(),
+        )
+        self.global_rules.update(rule_frame, self._on_rule)
+        # UI_LOCK 홀드 중에는 OSK 토글 막음
+        self._ui_lock_hold = "UI_LOCK" in self.global_rules.matched
+
+        # UI menu (HUD)
+        if (not block_by_palette) and (not self.ui_locked) and self.ui_menu:
+            _ = self.ui_menu.update(
+                t=t,
+                enabled=self.enabled,
+                mode=self.mode,
+                cursor_gesture=cursor_gesture,
+                other_gesture=other_gesture,
+                got_other=got_other,
+                send_event=lambda name, payload: self.send_event(name, payload),
+            )
 
-                    hands_list.append((handed, lm))
-                    hands_meta.append({"handed": handed, "score": float(score), "lm": lm})
+        # VKEY OSK 토글 (FIST 홀드) / NEXT_MODE (locked + 양손 OPEN_PALM) (MODE_RULES)
+        self.mode_rules.update(RuleFrame(
+            t=t,
+            cursor=cursor_gesture,
+            other=other_gesture,
+            got_cursor=got_cursor,
+            got_other=got_other,
+            mode=mode_u,
+            flags=self._rule_flags(),
+        ), self._on_rule)
+
+        bt = self.bindings
+        mouse_move_g = bt.mouse.move
+        mouse_click_g = bt.mouse.click_drag
+        mouse_right_g = bt.mouse.right_click
+        mouse_lock_g = bt.mouse.lock_toggle
+        mouse_scroll_hold_g = bt.mouse.scroll_hold
+
+        # LOCK only in MOUSE
+        if (not block_by_palette) and (not self.ui_locked) and mode_u == "MOUSE" and self.mouse_lock:
+            self.locked = self.mouse_lock.update(
+                t=t,
+                cursor_gesture=cursor_gesture,
+                cx=cursor_cx,
+                cy=cursor_cy,
+                got_cursor=got_cursor,
+                got_other=got_other,
+                enabled=self.enabled,
+                locked=self.locked,
+                toggle_gesture=mouse_lock_g,
+            )
+        else:
+            if self.mouse_lock:
+                self.mouse_lock.reset()
 
-            # rush left/right packs (hands-based default)
-            rush_left, rush_right = (None, None)
-            if self.rush_lr:
-                rush_left, rush_right = self.rush_lr.pick(t, hands_list)
-
-            # RUSH_COLOR: override with HSV stick tracking
-            if str(self.mode).upper() == "RUSH_COLOR" and self.rush_color:
-                try:
-                    rush_left, rush_right = self.rush_color.process(frame, t)
-                except Exception as e:
-                    print("[RUSH_COLOR] tracker error:", e, flush=True)
+        no_inject = bool(getattr(self.cfg, "no_inject", False))
+        can_mouse_inject = (
+            self.enabled
+            and (mode_u == "MOUSE")
+            and (t >= self.reacquire_until)
+            and (not effective_locked)
+            and (not no_inject)
+        )
+        can_draw_inject = (
+            self.enabled
+            and (mode_u == "DRAW")
+            and (t >= self.reacquire_until)
+            and (not effective_locked)
+            and (not no_inject)
+        )
+        can_kb_inject = (
+            self.enabled
+            and (mode_u == "KEYBOARD")
+            and (t >= self.reacquire_until)
+            and (not effective_locked)
+            and (not no_inject)
+        )
 
-            # ✅ Main hand policy: physical RIGHT hand is always the main/cursor hand.
-            # We prefer MediaPipe handedness (after MIRROR swap above). If handedness is missing
-            # (rare), we fall back to x-position with mirror awareness.
-            cursor_lm = None  # main (RIGHT)
-            other_lm = None   # aux  (LEFT)
+        kb_mouse_mod_g = bt.keyboard.mouse_mod
+        kb_mouse_gate = bool(got_other and (other_gesture == kb_mouse_mod_g))
+
+        # HUD/status에 게이트 상태도 노출(설정 바꿔도 말풍선/패널이 따라오게)
+        self._kb_mouse_gate = bool(kb_mouse_gate)
+        self._kb_mouse_mod_g = str(kb_mouse_mod_g)
+
+        # ✅ KEYBOARD에서 '두손 조합'일 때만 마우스 커서/클릭 허용
+        can_mouse_inject_kb = (
+            self.enabled
+            and (mode_u == "KEYBOARD")
+            and (t >= self.reacquire_until)
+            and (not effective_locked)
+            and (not no_inject)
+            and kb_mouse_gate
+        )
 
-            if hands_meta:
-                rights = [h for h in hands_meta if h.get("handed") == "Right"]
-                lefts = [h for h in hands_meta if h.get("handed") == "Left"]
+        # HUD/상태 표시용(말풍선에서 KEYBOARD 내 마우스 게이트 구분)
+        try:
+            self._kb_mouse_gate = bool(can_mouse_inject_kb)
+            self._kb_mouse_mod_g = str(kb_mouse_mod_g)
+        except Exception:
+            pass
 
-                def _best(xs):
-                    return max(xs, key=lambda h: float(h.get("score", 0.0))) if xs else None
 
-                main_h = _best(rights)
-                aux_h = _best(lefts)
+        can_ppt_inject = (
+            self.enabled
+            and (mode_u == "PRESENTATION")
+            and (t >= self.reacquire_until)
+            and (not effective_locked)
+            and (not no_inject)
+        )
+        can_vkey_detect = self.enabled and (mode_u == "VKEY")
+        can_vkey_click = can_vkey_detect
 
-                if main_h is not None:
-                    cursor_lm = main_h["lm"]
-                    if aux_h is not None:
-                        other_lm = aux_h["lm"]
-                    else:
-                        # If there is another hand but it wasn't labeled LEFT, keep it as aux
-                        others = [h for h in hands_meta if h is not main_h]
-                        if others:
-                            other_lm = _best(others)["lm"]
-                else:
-                    # Strict main-hand policy: if RIGHT hand is not present, keep cursor_lm=None.
-                    # Still expose LEFT as aux so UI can show it.
-                    if aux_h is not None:
-                        other_lm = aux_h["lm"]
-
-                    # Fallback when handedness is missing/None for all hands:
-                    if (main_h is None) and (aux_h is None) and hands_list:
-                        hands_with_pos = []
-                        for label, lm in hands_list:
-                            try:
-                                cx, cy = palm_center(lm)
-                            except Exception:
-                                cx, cy = (0.5, 0.5)
-                            hands_with_pos.append((cx, lm))
-                        hands_with_pos.sort(key=lambda x: x[0])  # left -> right in mirrored frame
-
-                        # In mirrored frame, physical RIGHT hand tends to appear on the LEFT side.
-                        # Use the remaining hand as aux only (strict main policy).
-                        if len(hands_with_pos) >= 1:
-                            other_lm = hands_with_pos[-1][1]
-            self.learner.tick_capture(cursor_lm=cursor_lm, other_lm=other_lm)
-
-            got_cursor = (cursor_lm is not None)
-
-            if got_cursor:
-                cursor_cx, cursor_cy = palm_center(cursor_lm)
-
-                ratio = float(getattr(self.learner, "pinch_ratio_thresh", {}).get("cursor", 0.35))
-                base = _pinch_thresh_from_ratio(cursor_lm, ratio, fallback=0.06)
-                pth = base * (self._pinch_hys_off if self._pinch_down else self._pinch_hys_on)
-
-                cursor_gesture_raw = classify_gesture(cursor_lm, pinch_thresh=pth)
-
-                now_s = time.time()
-                raw_is_pinch = (cursor_gesture_raw == "PINCH_INDEX")
-                pinch_down = self._update_pinch_state(raw_is_pinch, now_s)
-
-                if pinch_down:
-                    cursor_gesture_rule = "PINCH_INDEX"
+        if mode_u.startswith("RUSH"):
+            can_mouse_inject = False
+            can_draw_inject = False
+            can_kb_inject = False
+            can_ppt_inject = False
+            can_vkey_detect = False
+            can_vkey_click = False
+            can_mouse_inject_kb = False
+
+        # VKEY: OSK는 띄우기만, 입력은 OS 커서 이동+클릭으로 처리
+        if mode_u == "VKEY":
+            self.locked = False
+            can_mouse_inject = (
+                self.enabled
+                and (t >= self.reacquire_until)
+                and (not no_inject)
+                and (not self.ui_locked)
+            )
+            can_draw_inject = False
+            can_kb_inject = False
+            can_ppt_inject = False
+            can_vkey_detect = True
+            can_vkey_click = True
+
+        # Palette active면 기존 동작 모두 차단
+        if block_by_palette:
+            can_mouse_inject = False
+            can_draw_inject = False
+            can_kb_inject = False
+            can_ppt_inject = False
+            can_vkey_detect = False
+            can_vkey_click = False
+            can_mouse_inject_kb = False
+
+        # UI 잠금이면 최종적으로 전부 차단
+        if self.ui_locked:
+            can_mouse_inject = False
+            can_draw_inject = False
+            can_kb_inject = False
+            can_ppt_inject = False
+            can_vkey_detect = False
+            can_vkey_click = False
+            can_mouse_inject_kb = False
+
+        self.perf.lap("modes")
+
+        # pointer move
+        can_pointer_inject = (can_mouse_inject or can_draw_inject or can_ppt_inject or can_kb_inject)
+        if (not block_by_palette) and can_pointer_inject and got_cursor:
+            do_move = False
+            if mode_u in ("MOUSE", "VKEY"):
+                dragging = bool(getattr(self.mouse_click, "dragging", False)) if self.mouse_click else False
+                do_move = (cursor_gesture == mouse_move_g) or (dragging and cursor_gesture == mouse_click_g)
+            elif mode_u == "DRAW":
+                down = bool(getattr(self.draw, "down", False)) if self.draw else False
+                do_move = (cursor_gesture in ("OPEN_PALM", "PINCH_INDEX")) or down
+            elif mode_u == "PRESENTATION":
+                do_move = (cursor_gesture == "OPEN_PALM")
+            elif mode_u == "KEYBOARD":
+                # KEYBOARD: other-hand gate(MOUSE_MOD)일 때만 커서 이동
+                if can_mouse_inject_kb:
+                    dragging = bool(getattr(self.mouse_click, "dragging", False)) if self.mouse_click else False
+                    do_move = (cursor_gesture == mouse_move_g) or (dragging and cursor_gesture == mouse_click_g)
                 else:
-                    cursor_gesture_rule = "OPEN_PALM" if cursor_gesture_raw == "PINCH_INDEX" else cursor_gesture_raw
+                    do_move = False
 
-                cursor_gesture = cursor_gesture_rule
 
-                self.learner.tick_capture(cursor_lm=cursor_lm, other_lm=other_lm)
+            if do_move:
+                ux, uy = self.control.map_control_to_screen(cursor_cx, cursor_cy)
+                ex, ey = self.control.apply_filter(ux, uy, t)
+                # no extrapolation while a click/drag may be in progress (click drift)
+                pred_hold = (
+                    bool(self._pinch_down)
+                    or (cursor_gesture in ("PINCH_INDEX", mouse_click_g))
+                    or (bool(getattr(self.mouse_click, "dragging", False)) if self.mouse_click else False)
+                )
+                ex, ey = self.control.predict(ex, ey, t, hold=pred_hold, capture_ts=capture_ts)
+                self.control.move_cursor(ex, ey, t)
+
+        # -------------------------------------------------------------
+        # ✅ 핵심: VKEY/KEYBOARD에서 PINCH를 SendInput 좌클릭으로 강제 주입
+        # -------------------------------------------------------------
+        if _IS_WIN and (mode_u == "VKEY") and self.enabled and (not self.ui_locked) and (not block_by_palette):
+            is_pinch = (str(cursor_gesture).upper() == "PINCH_INDEX")
+            if is_pinch and (not self._vkey_prev_pinch):
+                if (t >= (self._vkey_last_click_ts + self._vkey_click_cd)) and (t >= self.reacquire_until) and (not no_inject):
+                    try:
+                        self.control.flush_cursor()
+                        _win_left_click()
+                        self._vkey_last_click_ts = t
+                    except Exception:
+                        pass
+            self._vkey_prev_pinch = is_pinch
+        else:
+            self._vkey_prev_pinch = False
+        self.perf.lap("inject")
+
+        # mouse actions
+        if mode_u in ("MOUSE", "KEYBOARD"):
+            allow_click = (
+                (can_mouse_inject and (not block_by_palette))
+                or (can_mouse_inject_kb and (not block_by_palette))
+            )
 
-                pred, score = self.learner.predict("cursor", cursor_lm)
-                sm_pred, sm_score = self._smooth_pred("cursor", pred, score, cursor_gesture_rule)
+            if self.mouse_click:
+                self.mouse_click.update(
+                    t,
+                    cursor_gesture,
+                    allow_click,
+                    click_gesture=mouse_click_g,
+                )
 
-                mode_u = str(self.mode).upper()
+            # 우클릭: MOUSE, KEYBOARD(두손 조합 게이트일 때)
+            if self.mouse_right:
+                can_rc = (can_mouse_inject if mode_u == "MOUSE" else can_mouse_inject_kb) and (not block_by_palette)
+                self.mouse_right.update(
+                    t,
+                    cursor_gesture,
+                    can_rc,
+                    gesture=mouse_right_g,
+                )
 
-                # ✅ FIX: PINCH는 learner가 절대 덮어쓰지 못하게 rule 우선
-                if cursor_gesture_rule == "PINCH_INDEX":
-                    cursor_gesture = "PINCH_INDEX"
-                else:
-                    if mode_u in ("DRAW", "VKEY", "KEYBOARD"):
-                        cursor_gesture = cursor_gesture_rule
-                    else:
-                        if sm_pred is not None and str(sm_pred) != "PINCH_INDEX":
-                            cursor_gesture = sm_pred
-                        else:
-                            cursor_gesture = cursor_gesture_rule
-
-                self.learner.last_pred = {
-                    "hand": "cursor",
-                    "label": sm_pred,
-                    "score": float(sm_score),
-                    "rule": cursor_gesture_rule,
-                    "rawLabel": pred,
-                    "rawScore": float(score),
-                }
-
-                self.last_seen_ts = t
-                self.last_cursor_lm = cursor_lm
-                self.last_cursor_cxcy = (cursor_cx, cursor_cy)
-                self.last_cursor_gesture = cursor_gesture
+        else:
+            # ✅ VKEY 포함: MouseClickDrag/RightClick 완전 OFF (VKEY는 _win_left_click()만 사용)
+            if self.mouse_click:
+                self.mouse_click.update(t, cursor_gesture, False, click_gesture=mouse_click_g)
+            if self.mouse_right:
+                self.mouse_right.update(t, cursor_gesture, False, gesture=mouse_right_g)
 
-            else:
-                if self.last_cursor_lm is not None and (t - self.last_seen_ts) <= LOSS_GRACE_SEC:
-                    cursor_cx, cursor_cy = self.last_cursor_cxcy
-                    cursor_gesture = self.last_cursor_gesture
-                    cursor_lm = self.last_cursor_lm
-                    got_cursor = True
-                else:
-                    cursor_gesture = "NONE"
-                    cursor_cx, cursor_cy = (0.5, 0.5)
-                    if self.last_cursor_lm is None or (t - self.last_seen_ts) >= HARD_LOSS_SEC:
-                        self.reacquire_until = t + REACQUIRE_BLOCK_SEC
-                        self._pinch_down = False
-                        self._pinch_t0 = 0.0
-
-            got_other = (other_lm is not None)
-            other_gesture = "NONE"
-            other_cx, other_cy = (0.5, 0.5)
-            if got_other:
-                other_cx, other_cy = palm_center(other_lm)
-                ratio_o = float(getattr(self.learner, "pinch_ratio_thresh", {}).get("other", 0.35))
-                pth_o = _pinch_thresh_from_ratio(other_lm, ratio_o, fallback=0.06)
-                other_gesture = classify_gesture(other_lm, pinch_thresh=pth_o)
 
-            mode_u = str(self.mode).upper()
-            effective_locked = bool(self.ui_locked) or bool(self.locked)
-
-            # Palette modal (최우선)
-            block_by_palette = False
-            if not self.ui_locked:
-                block_by_palette = self._update_palette_modal(
-                    t=t,
-                    got_cursor=got_cursor,
-                    got_other=got_other,
-                    cursor_gesture=cursor_gesture,
-                    other_gesture=other_gesture,
-                    cursor_cx=cursor_cx,
-                    cursor_cy=cursor_cy,
+        # draw
+        if mode_u == "DRAW" and self.draw:
+            if not block_by_palette:
+                self.draw.update_draw(t, cursor_gesture, can_draw_inject)
+                self.draw.update_selection_shortcuts(
+                    t, cursor_gesture, other_gesture, got_other, can_draw_inject
                 )
             else:
-                self._force_hide_menu()
+                self.draw.reset()
+        else:
+            if self.draw:
+                self.draw.reset()
 
-            # -----------------------------------------------------------------
-            # ✅ APP START/STOP (gesture -> 즉시 로컬 적용 + WS EVENT는 알림용)
-            # - OPEN_PALM은 이동이랑 충돌 -> 사용 금지
-            # - 정지 상태 Start: 양손 V_SIGN 홀드
-            # - 실행 상태 Stop: 양손 FIST 홀드
-            # -----------------------------------------------------------------
-            if (not block_by_palette) and got_cursor and got_other:
-                can_fire = (t >= (self.last_app_cmd_ts + APP_CMD_COOLDOWN_SEC))
-
-                # START: enabled=False일 때만
-                if (not self.enabled) and (cursor_gesture == "V_SIGN") and (other_gesture == "V_SIGN"):
-                    if self.app_start_hold_start is None:
-                        self.app_start_hold_start = t
-                    if can_fire and (t - self.app_start_hold_start) >= APP_START_HOLD_SEC:
-                        # ✅ 로컬에서 즉시 start 처리 (WS 의존 제거)
-                        self.enabled = True
-                        self.locked = False
-                        # ui_locked는 유지(원하면 여기서 False로 풀어도 됨)
-
-                        self.last_app_cmd_ts = t
-                        self.app_start_hold_start = None
-                        self.cursor_bubble = "START!"
-
-                        # 알림용 이벤트(옵션)
-                        try:
-                            self.send_event("APP_START", {"source": "gesture"})
-                        except Exception:
-                            pass
-                else:
-                    self.app_start_hold_start = None
-
-                # STOP: enabled=True일 때만
-                if self.enabled and (cursor_gesture == "FIST") and (other_gesture == "FIST"):
-                    if self.app_stop_hold_start is None:
-                        self.app_stop_hold_start = t
-                    if can_fire and (t - self.app_stop_hold_start) >= APP_STOP_HOLD_SEC:
-                        # ✅ 로컬에서 즉시 stop 처리 (DISABLE과 동일한 처리)
-                        self.enabled = False
-                        self._reset_side_effects()
-                        self._osk_close()
-                        self._force_hide_menu()
-
-                        self.last_app_cmd_ts = t
-                        self.app_stop_hold_start = None
-                        self.cursor_bubble = "STOP!"
-
-                        # 알림용 이벤트(옵션)
-                        try:
-                            self.send_event("APP_STOP", {"source": "gesture"})
-                        except Exception:
-                            pass
-                else:
-                    self.app_stop_hold_start = None
+        # presentation
+        if mode_u == "PRESENTATION" and self.ppt:
+            if not block_by_palette:
+                self.ppt.update(
+                    t,
+                    can_ppt_inject,
+                    got_cursor,
+                    cursor_gesture,
+                    got_other,
+                    other_gesture,
+                    bindings=bt.presentation,
+                )
             else:
-                self.app_start_hold_start = None
-                self.app_stop_hold_start = None
-
-
-            # UI 잠금 토글 (FIST 홀드)
-            block_osk_toggle_by_ui_lock = False
+                self.ppt.reset()
+        else:
+            if self.ppt:
+                self.ppt.reset()
 
-            if self.enabled and got_cursor and (cursor_gesture == "FIST") and (mode_u != "VKEY"):
-                block_osk_toggle_by_ui_lock = True
+        # scroll (MOUSE only)
+        scroll_active = False
+        if (
+            (mode_u == "MOUSE")
+            and (not block_by_palette)
+            and can_mouse_inject
+            and got_other
+            and self.mouse_scroll
+        ):
+            sa = (other_gesture == mouse_scroll_hold_g)
+            self.mouse_scroll.update(t, sa, other_cy, True)
+            scroll_active = sa
+        else:
+            if self.mouse_scroll:
+                self.mouse_scroll.update(t, False, 0.5, False)
+
+        # keyboard (KEYBOARD 모드에서도 키입력은 유지하되, 마우스 게이트 중 충돌 제스처는 무시)
+        # keyboard
+        if (not block_by_palette) and self.kb:
+            # ✅ 키보드 입력은 KEYBOARD 모드에서 항상 켠다
+            kb_can = can_kb_inject
+
+            # ✅ KEYBOARD에서 다른 손 FIST(MOUSE_MOD)로 마우스 게이트가 켜진 상태면
+            # OPEN_PALM/PINCH_INDEX는 "마우스 이동/클릭"로 쓰이므로
+            # 키보드 방향키(UP/DOWN)로도 같이 발사되는 걸 막는다.
+            cursor_g_for_kb = cursor_gesture
+            if can_mouse_inject_kb:
+                if cursor_gesture in (mouse_move_g, mouse_click_g):  # 기본: OPEN_PALM, PINCH_INDEX
+                    cursor_g_for_kb = "NONE"
+
+            # 디버그: 키보드 파이프라인 상태(왜 안 나가는지) 출력
+            if os.getenv("KEYBOARD_DEBUG", "0") in ("1", "true", "True", "YES", "yes"):
+                try:
+                    if (t - float(getattr(self, "_kb_dbg_last_ts", 0.0))) >= 0.25:
+                        self._kb_dbg_last_ts = t
+                        print(
+                            "[KB_PIPE]",
+                            f"enabled={self.enabled}",
+                            f"mode={mode_u}",
+                            f"kb_can={kb_can}",
+                            f"kb_mouse_gate={can_mouse_inject_kb}",
+                            f"ui_locked={self.ui_locked}",
+                            f"locked={self.locked}",
+                            f"reacquire_in={max(0.0, self.reacquire_until - t):.3f}",
+                            f"got_cursor={got_cursor}",
+                            f"cursor={cursor_gesture}->{cursor_g_for_kb}",
+                            f"got_other={got_other}",
+                            f"other={other_gesture}",
+                            flush=True,
+                        )
+                except Exception:
+                    pass
 
-                if self.ui_lock_hold_start is None:
-                    self.ui_lock_hold_start = t
+            self.kb.update(
+                t,
+                kb_can,
+                got_cursor,
+                cursor_g_for_kb,
+                got_other,
+                other_gesture,
+                bindings=bt.keyboard,
+            )
+        else:
+            if self.kb:
+                self.kb.reset()
+        self.perf.lap("modes")
 
-                if (t - self.ui_lock_hold_start) >= UI_LOCK_HOLD_SEC and t >= (
-                    self.last_ui_lock_toggle_ts + UI_LOCK_COOLDOWN_SEC
-                ):
-                    self.ui_locked = (not self.ui_locked)
-                    self.last_ui_lock_toggle_ts = t
-                    self.ui_lock_hold_start = None
+        self._send_status(
+            fps=fps,
+            cursor_gesture=cursor_gesture,
+            other_gesture=other_gesture,
+            scroll_active=scroll_active,
+            can_mouse=(can_mouse_inject or can_draw_inject or can_ppt_inject or can_mouse_inject_kb or (mode_u == "VKEY")),
+            can_key=(can_kb_inject or can_ppt_inject),
+            rush_left=rush_left,
+            rush_right=rush_right,
+            cursor_lm=cursor_lm,
+            other_lm=other_lm,
+            cursor_cx=cursor_cx,
+            cursor_cy=cursor_cy,
+            got_cursor=got_cursor,
+        )
+        self.perf.lap("status")
 
-                    if self.ui_locked:
-                        self._apply_ui_locked_side_effects()
-                        self.cursor_bubble = "UI 잠금!"
-                    else:
-                        self.cursor_bubble = "UI 해제!"
+        if mode_u == "RUSH_COLOR":
+            self._rush_probe_gestures = (cursor_gesture, other_gesture)
 
-                    try:
-                        self.send_event("UI_LOCK", {"locked": bool(self.ui_locked)})
-                    except Exception:
-                        pass
-            else:
-                self.ui_lock_hold_start = None
-
-            # UI menu (HUD)
-            if (not block_by_palette) and (not self.ui_locked) and self.ui_menu:
-                _ = self.ui_menu.update(
-                    t=t,
-                    enabled=self.enabled,
-                    mode=self.mode,
-                    cursor_gesture=cursor_gesture,
-                    other_gesture=other_gesture,
-                    got_other=got_other,
-                    send_event=lambda name, payload: self.send_event(name, payload),
-                )
+        return {
+            "mode": mode_u,
+            "cursor_gesture": cursor_gesture,
+            "other_gesture": other_gesture,
+            "rush_left": rush_left,
+            "rush_right": rush_right,
+        }
 
-            # VKEY에서 OSK 토글 사인: FIST 홀드
-            if (
-                (not block_by_palette)
-                and (not self.ui_locked)
-                and (not block_osk_toggle_by_ui_lock)
-                and mode_u == "VKEY"
-                and self.enabled
-            ):
-                if cursor_gesture == "FIST":
-                    if self.osk_toggle_hold_start is None:
-                        self.osk_toggle_hold_start = t
-                    if (t - self.osk_toggle_hold_start) >= OSK_TOGGLE_HOLD_SEC and t >= (
-                        self.last_osk_toggle_ts + OSK_TOGGLE_COOLDOWN_SEC
-                    ):
-                        self._osk_toggle()
-                        self.last_osk_toggle_ts = t
-                        self.osk_toggle_hold_start = None
-                        self.cursor_bubble = "OSK 토글!"
-                else:
-                    self.osk_toggle_hold_start = None
-            else:
-                self.osk_toggle_hold_start = None
+    # -------------------------------------------------------------------------
+    # RUSH_COLOR pipeline
+    # -------------------------------------------------------------------------
+    def _track_rush_color(self, frame, t: float):
+        try:
+            # frame is the raw (unmirrored) camera image: mirror the packs, not the pixels
+            return self.rush_color.process(frame, t, mirror_x=True)
+        except Exception as e:
+            print("[RUSH_COLOR] tracker error:", e, flush=True)
+            return (None, None)
 
-            # NEXT_MODE when locked: both OPEN_PALM hold
-            if (
-                (not block_by_palette)
-                and (not self.ui_locked)
-                and self.enabled
-                and self.locked
-                and got_other
-                and (cursor_gesture == "OPEN_PALM")
-                and (other_gesture == "OPEN_PALM")
-            ):
-                if self.mode_hold_start is None:
-                    self.mode_hold_start = t
-                if (t - self.mode_hold_start) >= MODE_HOLD_SEC and t >= (
-                    self.last_mode_event_ts + MODE_COOLDOWN_SEC
-                ):
-                    self.send_event("NEXT_MODE", None)
-                    self.last_mode_event_ts = t
-                    self.mode_hold_start = None
-            else:
-                self.mode_hold_start = None
-
-            mouse_move_g = get_binding(self.settings, "MOUSE", "MOVE", default="OPEN_PALM")
-            mouse_click_g = get_binding(self.settings, "MOUSE", "CLICK_DRAG", default="PINCH_INDEX")
-            mouse_right_g = get_binding(self.settings, "MOUSE", "RIGHT_CLICK", default="V_SIGN")
-            mouse_lock_g = get_binding(self.settings, "MOUSE", "LOCK_TOGGLE", default="FIST")
-            mouse_scroll_hold_g = get_binding(self.settings, "MOUSE", "SCROLL_HOLD", default="FIST")
-
-            kb_bindings = ((self.settings.get("bindings") or {}).get("KEYBOARD") or {})
-            ppt_bindings = ((self.settings.get("bindings") or {}).get("PRESENTATION") or {})
-
-            # LOCK only in MOUSE
-            if (not block_by_palette) and (not self.ui_locked) and mode_u == "MOUSE" and self.mouse_lock:
-                self.locked = self.mouse_lock.update(
-                    t=t,
-                    cursor_gesture=cursor_gesture,
-                    cx=cursor_cx,
-                    cy=cursor_cy,
-                    got_cursor=got_cursor,
-                    got_other=got_other,
-                    enabled=self.enabled,
-                    locked=self.locked,
-                    toggle_gesture=mouse_lock_g,
-                )
-            else:
-                if self.mouse_lock:
-                    self.mouse_lock.reset()
+    def _color_only_frame(self, t: float) -> bool:
+        """RUSH_COLOR: True unless this frame is due for the low-rate hand probe."""
+        if str(self.mode).upper() != "RUSH_COLOR" or (not self.rush_color):
+            return False
+        if RUSH_COLOR_PROBE_HZ <= 0.0:
+            return True
+        if (t - self._rush_probe_ts) >= (1.0 / RUSH_COLOR_PROBE_HZ):
+            self._rush_probe_ts = t
+            return False
+        return True
 
-            no_inject = bool(getattr(self.cfg, "no_inject", False))
-            can_mouse_inject = (
-                self.enabled
-                and (mode_u == "MOUSE")
-                and (t >= self.reacquire_until)
-                and (not effective_locked)
-                and (not no_inject)
-            )
-            can_draw_inject = (
-                self.enabled
-                and (mode_u == "DRAW")
-                and (t >= self.reacquire_until)
-                and (not effective_locked)
-                and (not no_inject)
-            )
-            can_kb_inject = (
-                self.enabled
-                and (mode_u == "KEYBOARD")
-                and (t >= self.reacquire_until)
-                and (not effective_locked)
-                and (not no_inject)
-            )
+    def _process_rush_color(self, t: float, frame, fps: float = 0.0) -> dict:
+        """Color tracker only (no MediaPipe / gestures / learner). Gestures shown are from the last probe."""
+        rush_left, rush_right = self._track_rush_color(frame, t)
+        self.perf.lap("color")
 
-            kb_mouse_mod_g = get_binding(self.settings, "KEYBOARD", "MOUSE_MOD", default="FIST")
-            kb_mouse_gate = bool(got_other and (other_gesture == kb_mouse_mod_g))
+        cursor_gesture, other_gesture = self._rush_probe_gestures
+        self._send_status(
+            fps=fps,
+            cursor_gesture=cursor_gesture,
+            other_gesture=other_gesture,
+            scroll_active=False,
+            can_mouse=False,
+            can_key=False,
+            rush_left=rush_left,
+            rush_right=rush_right,
+            cursor_lm=None,
+            other_lm=None,
+            cursor_cx=0.5,
+            cursor_cy=0.5,
+            got_cursor=False,
+        )
+        self.perf.lap("status")
+
+        return {
+            "mode": "RUSH_COLOR",
+            "cursor_gesture": cursor_gesture,
+            "other_gesture": other_gesture,
+            "rush_left": rush_left,
+            "rush_right": rush_right,
+        }
 
-            # HUD/status에 게이트 상태도 노출(설정 바꿔도 말풍선/패널이 따라오게)
-            self._kb_mouse_gate = bool(kb_mouse_gate)
-            self._kb_mouse_mod_g = str(kb_mouse_mod_g)
+    # -------------------------------------------------------------------------
+    # main loop
+    # -------------------------------------------------------------------------
+    def run(self):
+        print("[PY] running:", os.path.abspath(__file__), flush=True)
+        print(
+            "[PY] WS_URL:",
+            getattr(self.cfg, "ws_url", ""),
+            "(disabled)" if getattr(self.cfg, "no_ws", False) else "",
+            flush=True,
+        )
 
-            # ✅ KEYBOARD에서 '두손 조합'일 때만 마우스 커서/클릭 허용
-            can_mouse_inject_kb = (
-                self.enabled
-                and (mode_u == "KEYBOARD")
-                and (t >= self.reacquire_until)
-                and (not effective_locked)
-                and (not no_inject)
-                and kb_mouse_gate
-            )
+        self.ws.start()
+        self._capture.start()
 
-            # HUD/상태 표시용(말풍선에서 KEYBOARD 내 마우스 게이트 구분)
-            try:
-                self._kb_mouse_gate = bool(can_mouse_inject_kb)
-                self._kb_mouse_mod_g = str(kb_mouse_mod_g)
-            except Exception:
-                pass
+        if REQUIRE_CAMERA and (not self._capture.ok):
+            print("[PY] REQUIRE_CAMERA=1 but camera open failed -> exit", flush=True)
+            self._send_status_no_camera(fps=0.0)
+            self._capture.stop()
+            return
 
+        if self.control.injector is not None:
+            self.control.injector.start()
 
-            can_ppt_inject = (
-                self.enabled
-                and (mode_u == "PRESENTATION")
-                and (t >= self.reacquire_until)
-                and (not effective_locked)
-                and (not no_inject)
-            )
-            can_vkey_detect = self.enabled and (mode_u == "VKEY")
-            can_vkey_click = can_vkey_detect
-
-            if mode_u.startswith("RUSH"):
-                can_mouse_inject = False
-                can_draw_inject = False
-                can_kb_inject = False
-                can_ppt_inject = False
-                can_vkey_detect = False
-                can_vkey_click = False
-                can_mouse_inject_kb = False
-
-            # VKEY: OSK는 띄우기만, 입력은 OS 커서 이동+클릭으로 처리
-            if mode_u == "VKEY":
-                self.locked = False
-                can_mouse_inject = (
-                    self.enabled
-                    and (t >= self.reacquire_until)
-                    and (not no_inject)
-                    and (not self.ui_locked)
-                )
-                can_draw_inject = False
-                can_kb_inject = False
-                can_ppt_inject = False
-                can_vkey_detect = True
-                can_vkey_click = True
-
-            # Palette active면 기존 동작 모두 차단
-            if block_by_palette:
-                can_mouse_inject = False
-                can_draw_inject = False
-                can_kb_inject = False
-                can_ppt_inject = False
-                can_vkey_detect = False
-                can_vkey_click = False
-                can_mouse_inject_kb = False
-
-            # UI 잠금이면 최종적으로 전부 차단
-            if self.ui_locked:
-                can_mouse_inject = False
-                can_draw_inject = False
-                can_kb_inject = False
-                can_ppt_inject = False
-                can_vkey_detect = False
-                can_vkey_click = False
-                can_mouse_inject_kb = False
-
-            # pointer move
-            can_pointer_inject = (can_mouse_inject or can_draw_inject or can_ppt_inject or can_kb_inject)
-            if (not block_by_palette) and can_pointer_inject and got_cursor:
-                do_move = False
-                if mode_u in ("MOUSE", "VKEY"):
-                    dragging = bool(getattr(self.mouse_click, "dragging", False)) if self.mouse_click else False
-                    do_move = (cursor_gesture == mouse_move_g) or (dragging and cursor_gesture == mouse_click_g)
-                elif mode_u == "DRAW":
-                    down = bool(getattr(self.draw, "down", False)) if self.draw else False
-                    do_move = (cursor_gesture in ("OPEN_PALM", "PINCH_INDEX")) or down
-                elif mode_u == "PRESENTATION":
-                    do_move = (cursor_gesture == "OPEN_PALM")
-                elif mode_u == "KEYBOARD":
-                    # KEYBOARD: other-hand gate(MOUSE_MOD)일 때만 커서 이동
-                    if can_mouse_inject_kb:
-                        dragging = bool(getattr(self.mouse_click, "dragging", False)) if self.mouse_click else False
-                        do_move = (cursor_gesture == mouse_move_g) or (dragging and cursor_gesture == mouse_click_g)
-                    else:
-                        do_move = False
+        prev_t = now()
+        fps = 0.0
+        run_t0 = time.perf_counter()
 
+        while True:
+            # file source without --source-loop: stop after the last frame
+            if self._capture.finished():
+                self._drain_jobs(flush=True)
+                el = max(1e-6, time.perf_counter() - run_t0)
+                n = int(self._capture.processed)
+                print(f"[PY] source finished: {n} frames in {el:.2f}s ({n / el:.1f} fps)", flush=True)
+                break
 
-                if do_move:
-                    ux, uy = self.control.map_control_to_screen(cursor_cx, cursor_cy)
-                    ex, ey = self.control.apply_ema(ux, uy)
-                    self.control.move_cursor(ex, ey, t)
+            # ==========================
+            # NO CAMERA mode (keep alive)
+            # - reopen/retry is handled by the capture thread
+            # ==========================
+            if (not self._capture.ok) and (not self._capture.eof):
+                wall = time.time()
 
-            # -------------------------------------------------------------
-            # ✅ 핵심: VKEY/KEYBOARD에서 PINCH를 SendInput 좌클릭으로 강제 주입
-            # -------------------------------------------------------------
-            if _IS_WIN and (mode_u == "VKEY") and self.enabled and (not self.ui_locked) and (not block_by_palette):
-                is_pinch = (str(cursor_gesture).upper() == "PINCH_INDEX")
-                if is_pinch and (not self._vkey_prev_pinch):
-                    if (t >= (self._vkey_last_click_ts + self._vkey_click_cd)) and (t >= self.reacquire_until) and (not no_inject):
+                if self.window_open:
+                    try:
+                        cv2.destroyWindow("GestureOS Agent")
+                    except Exception:
                         try:
-                            _win_left_click()
-                            self._vkey_last_click_ts = t
+                            cv2.destroyAllWindows()
                         except Exception:
                             pass
-                self._vkey_prev_pinch = is_pinch
-            else:
-                self._vkey_prev_pinch = False
+                    self.window_open = False
+                    self._request_close_preview = False
 
-            # mouse actions
-            if mode_u in ("MOUSE", "KEYBOARD"):
-                allow_click = (
-                    (can_mouse_inject and (not block_by_palette))
-                    or (can_mouse_inject_kb and (not block_by_palette))
-                )
+                if (wall - self._last_nocam_status_wall) >= NO_CAMERA_STATUS_SEC:
+                    self._last_nocam_status_wall = wall
+                    self._send_status_no_camera(fps=0.0)
 
-                if self.mouse_click:
-                    self.mouse_click.update(
-                        t,
-                        cursor_gesture,
-                        allow_click,
-                        click_gesture=mouse_click_g,
-                    )
+                time.sleep(max(0.01, NO_CAMERA_POLL_SEC))
+                continue
 
-                # 우클릭: MOUSE, KEYBOARD(두손 조합 게이트일 때)
-                if self.mouse_right:
-                    can_rc = (can_mouse_inject if mode_u == "MOUSE" else can_mouse_inject_kb) and (not block_by_palette)
-                    self.mouse_right.update(
-                        t,
-                        cursor_gesture,
-                        can_rc,
-                        gesture=mouse_right_g,
-                    )
+            # ==========================
+            # CAMERA OK mode
+            # - newest frame only (stale frames are dropped by the capture stage)
+            # ==========================
+            frame, frame_ts = self._capture.read(timeout=0.1)
+            if frame is None:
+                continue
 
-            else:
-                # ✅ VKEY 포함: MouseClickDrag/RightClick 완전 OFF (VKEY는 _win_left_click()만 사용)
-                if self.mouse_click:
-                    self.mouse_click.update(t, cursor_gesture, False, click_gesture=mouse_click_g)
-                if self.mouse_right:
-                    self.mouse_right.update(t, cursor_gesture, False, gesture=mouse_right_g)
-
-
-            # draw
-            if mode_u == "DRAW" and self.draw:
-                if not block_by_palette:
-                    self.draw.update_draw(t, cursor_gesture, can_draw_inject)
-                    self.draw.update_selection_shortcuts(
-                        t, cursor_gesture, other_gesture, got_other, can_draw_inject
-                    )
-                else:
-                    self.draw.reset()
-            else:
-                if self.draw:
-                    self.draw.reset()
-
-            # presentation
-            if mode_u == "PRESENTATION" and self.ppt:
-                if not block_by_palette:
-                    self.ppt.update(
-                        t,
-                        can_ppt_inject,
-                        got_cursor,
-                        cursor_gesture,
-                        got_other,
-                        other_gesture,
-                        bindings=ppt_bindings,
-                    )
-                else:
-                    self.ppt.reset()
-            else:
-                if self.ppt:
-                    self.ppt.reset()
+            self.perf.begin()
+            # capture: frame age (grabbed by the capture thread -> picked up here)
+            self.perf.add("capture", max(0.0, (now() - frame_ts) * 1000.0))
 
-            # scroll (MOUSE only)
-            scroll_active = False
-            if (
-                (mode_u == "MOUSE")
-                and (not block_by_palette)
-                and can_mouse_inject
-                and got_other
-                and self.mouse_scroll
-            ):
-                sa = (other_gesture == mouse_scroll_hold_g)
-                self.mouse_scroll.update(t, sa, other_cy, True)
-                scroll_active = sa
-            else:
-                if self.mouse_scroll:
-                    self.mouse_scroll.update(t, False, 0.5, False)
-
-            # keyboard (KEYBOARD 모드에서도 키입력은 유지하되, 마우스 게이트 중 충돌 제스처는 무시)
-            # keyboard
-            if (not block_by_palette) and self.kb:
-                # ✅ 키보드 입력은 KEYBOARD 모드에서 항상 켠다
-                kb_can = can_kb_inject
-
-                # ✅ KEYBOARD에서 다른 손 FIST(MOUSE_MOD)로 마우스 게이트가 켜진 상태면
-                # OPEN_PALM/PINCH_INDEX는 "마우스 이동/클릭"로 쓰이므로
-                # 키보드 방향키(UP/DOWN)로도 같이 발사되는 걸 막는다.
-                cursor_g_for_kb = cursor_gesture
-                if can_mouse_inject_kb:
-                    if cursor_gesture in (mouse_move_g, mouse_click_g):  # 기본: OPEN_PALM, PINCH_INDEX
-                        cursor_g_for_kb = "NONE"
+            # no pixel flip: inference runs on the raw frame and landmarks are mirrored
+            # in _post_frame (preview mirrors into a reused buffer only when shown)
 
-                # 디버그: 키보드 파이프라인 상태(왜 안 나가는지) 출력
-                if os.getenv("KEYBOARD_DEBUG", "0") in ("1", "true", "True", "YES", "yes"):
-                    try:
-                        if (t - float(getattr(self, "_kb_dbg_last_ts", 0.0))) >= 0.25:
-                            self._kb_dbg_last_ts = t
-                            print(
-                                "[KB_PIPE]",
-                                f"enabled={self.enabled}",
-                                f"mode={mode_u}",
-                                f"kb_can={kb_can}",
-                                f"kb_mouse_gate={can_mouse_inject_kb}",
-                                f"ui_locked={self.ui_locked}",
-                                f"locked={self.locked}",
-                                f"reacquire_in={max(0.0, self.reacquire_until - t):.3f}",
-                                f"got_cursor={got_cursor}",
-                                f"cursor={cursor_gesture}->{cursor_g_for_kb}",
-                                f"got_other={got_other}",
-                                f"other={other_gesture}",
-                                flush=True,
-                            )
-                    except Exception:
-                        pass
+            t = now()
+            dt = max(t - prev_t, 1e-6)
+            prev_t = t
+            fps = 0.9 * fps + 0.1 * (1.0 / dt)
 
-                self.kb.update(
-                    t,
-                    kb_can,
-                    got_cursor,
-                    cursor_g_for_kb,
-                    got_other,
-                    other_gesture,
-                    bindings=kb_bindings,
-                )
-            else:
-                if self.kb:
-                    self.kb.reset()
+            # RUSH_COLOR: color tracker only, except for the periodic hand probe
+            color_only = self._color_only_frame(t)
+
+            # idle: no hands for a while -> MediaPipe only at probe rate / on motion
+            # (RUSH_COLOR probes are already low-rate, no need to ask the scheduler)
+            infer = not color_only
+            if infer and self.sched is not None and str(self.mode).upper() != "RUSH_COLOR":
+                infer = self.sched.should_infer(frame, t)
+            self.perf.lap("schedule")
+
+            job = {
+                "frame": frame,
+                "t": t,
+                "frame_ts": frame_ts,
+                "fps": fps,
+                "color_only": color_only,
+                "infer": infer,
+                "roi": None,
+                "seq": None,
+                "hands": [],
+            }
+            if infer:
+                # --roi: MediaPipe sees only the region around the last hands (crop before cvtColor)
+                roi = self.roi.plan(frame.shape[1], frame.shape[0], t) if self.roi is not None else None
+                src = AdaptiveRoi.crop(frame, roi) if roi is not None else frame
+                job["roi"] = roi
+                probe = self.roi is not None and self.roi.probe
+                reset = self.roi is not None and self.roi.moved
+
+                if self.mp_worker is not None:
+                    # worker does cvtColor + hands.process; result is collected below (in order)
+                    job["seq"] = self._worker_submit(src, probe, reset)
+                if job["seq"] is None:
+                    rgb = self.fbuf.rgb(src)
+                    self.perf.lap("cvtColor")
+                    job["hands"] = self._infer_hands(rgb, probe, reset)
+                self.perf.lap("mediapipe")
+            self._jobs.append(job)
+
+            # post-process finished frames in order (worker: keep MP_WORKER_DEPTH frames in flight)
+            keep_running = self._drain_jobs(flush=False)
+            self.perf.end_frame()
+            if not keep_running:
+                break
 
+        # cleanup
+        self._capture.stop()
+        if self.control.injector is not None:
+            self.control.injector.stop()
+        self.recorder.stop()
+        if self.mp_worker is not None:
+            self.mp_worker.stop()
+        try:
+            cv2.destroyAllWindows()
+        except Exception:
+            pass
 
-            self._send_status(
-                fps=fps,
-                cursor_gesture=cursor_gesture,
-                other_gesture=other_gesture,
-                scroll_active=scroll_active,
-                can_mouse=(can_mouse_inject or can_draw_inject or can_ppt_inject or can_mouse_inject_kb or (mode_u == "VKEY")),
-                can_key=(can_kb_inject or can_ppt_inject),
-                rush_left=rush_left,
-                rush_right=rush_right,
-                cursor_lm=cursor_lm,
-                other_lm=other_lm,
-                cursor_cx=cursor_cx,
-                cursor_cy=cursor_cy,
-                got_cursor=got_cursor,
-            )
+    # -------------------------------------------------------------------------
+    # frame pipeline (inline or --mp-worker)
+    # -------------------------------------------------------------------------
+    def _worker_submit(self, src, probe: bool = False, reset: bool = False) -> Optional[int]:
+        try:
+            return self.mp_worker.submit(src, probe=probe, reset=reset)
+        except Exception as e:
+            self._drop_worker(f"submit failed: {e}")
+            return None
+
+    def _worker_status(self):
+        w = self.mp_worker
+        if w is None:
+            return None
+        infer_ms = float(w.infer_ms)
+        return {
+            "ok": bool(w.ok),
+            "depth": int(MP_WORKER_DEPTH),
+            "inflight": int(w.inflight),
+            "inferMs": round(infer_ms, 2),
+            # frame time -> post-processing start; minus worker compute = pipeline/IPC cost
+            "latencyMs": round(self._pipe_latency_ms, 2),
+            "addedMs": round(max(0.0, self._pipe_latency_ms - infer_ms), 2),
+        }
 
-            # preview
-            if bool(getattr(self.cfg, "headless", False)) and (not self.preview):
-                time.sleep(0.001)
-                continue
+    def _drop_worker(self, why: str):
+        """Worker is gone -> back to in-process MediaPipe (frames in flight are lost)."""
+        print("[MP_WORKER] disabled, falling back to in-process MediaPipe:", why, flush=True)
+        w, self.mp_worker = self.mp_worker, None
+        if w is not None:
+            w.stop()
+        for job in self._jobs:
+            job["seq"] = None
+
+    def _drain_jobs(self, flush: bool) -> bool:
+        """Post-process queued frames whose landmarks are ready. Returns False when preview asked to quit."""
+        while self._jobs:
+            head = self._jobs[0]
+            if head["seq"] is not None:
+                # block only when the pipeline is deeper than configured (or when flushing)
+                block = flush or (len(self._jobs) > MP_WORKER_DEPTH)
+                res = self.mp_worker.collect(timeout=MP_WORKER_WAIT_SEC if block else None)
+                if res is None:
+                    if not self.mp_worker.ok:
+                        self._drop_worker(self.mp_worker.err or "no result")
+                    elif block:
+                        self._drop_worker(f"no result in {MP_WORKER_WAIT_SEC}s")
+                    else:
+                        return True
+                else:
+                    seq, hands_meta, _infer_ms = res
+                    if seq != head["seq"]:
+                        self._drop_worker(f"out of order result {seq} != {head['seq']}")
+                    else:
+                        head["hands"] = hands_meta
+                        head["seq"] = None
+                if head["seq"] is not None:
+                    continue
+                self.perf.lap("mediapipe")
+
+            self._jobs.popleft()
+            if not self._post_frame(head):
+                return False
+        return True
 
-            if self.preview:
-                if not self.window_open:
-                    cv2.namedWindow("GestureOS Agent", cv2.WINDOW_NORMAL)
-                    self.window_open = True
+    def _post_frame(self, job: dict) -> bool:
+        """Landmarks are in: ROI mapping, scheduler feedback, gestures/modes/STATUS, preview."""
+        frame = job["frame"]
+        t = job["t"]
+        fps = job["fps"]
+        hands_meta: List[dict] = job["hands"]
+
+        if self.mp_worker is not None:
+            lat = (now() - t) * 1000.0
+            self._pipe_latency_ms = lat if self._pipe_latency_ms <= 0.0 else (0.9 * self._pipe_latency_ms + 0.1 * lat)
+
+        if job["infer"]:
+            roi = job["roi"]
+            if roi is not None:
+                AdaptiveRoi.map_back(hands_meta, roi)
+            if self.roi is not None:
+                # ROI lives in raw-frame coordinates -> feed back before mirroring
+                self.roi.update(hands_meta, t, roi)
+            mirror_hands(hands_meta)
+            if self.sched is not None:
+                self.sched.observe(bool(hands_meta), t)
+
+        if job["color_only"]:
+            out = self._process_rush_color(t, frame, fps=fps)
+        else:
+            if self.recorder.active:
+                self.recorder.write_frame(t, hands_meta)
+            out = self._process_hands(t, hands_meta, frame=frame, fps=fps, capture_ts=job["frame_ts"])
+        mode_u = out["mode"]
+        cursor_gesture = out["cursor_gesture"]
+        other_gesture = out["other_gesture"]
+        rush_left = out["rush_left"]
+        rush_right = out["rush_right"]
+
+        # preview
+        if bool(getattr(self.cfg, "headless", False)) and (not self.preview):
+            time.sleep(0.001)
+            return True
 
-                lp = _pack_xy(rush_left)
-                rp = _pack_xy(rush_right)
+        if self.preview:
+            if not self.window_open:
+                cv2.namedWindow("GestureOS Agent", cv2.WINDOW_NORMAL)
+                self.window_open = True
 
-                line1 = (
-                    f"mode={mode_u} enabled={self.enabled} locked={self.locked} ui_locked={self.ui_locked} "
-                    f"cur={cursor_gesture} oth={other_gesture} palette={self.palette_active}"
+            view = self.fbuf.mirrored(frame)
+            lp = _pack_xy(rush_left)
+            rp = _pack_xy(rush_right)
+
+            line1 = (
+                f"mode={mode_u} enabled={self.enabled} locked={self.locked} ui_locked={self.ui_locked} "
+                f"cur={cursor_gesture} oth={other_gesture} palette={self.palette_active}"
+            )
+            cv2.putText(view, line1, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 255, 0), 2)
+
+            if lp is not None:
+                cv2.putText(
+                    view,
+                    f"RUSH L: ({lp[0]:.2f},{lp[1]:.2f})",
+                    (10, 100),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.55,
+                    (255, 255, 0),
+                    2,
+                )
+            if rp is not None:
+                cv2.putText(
+                    view,
+                    f"RUSH R: ({rp[0]:.2f},{rp[1]:.2f})",
+                    (10, 125),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.55,
+                    (255, 0, 255),
+                    2,
                 )
-                cv2.putText(frame, line1, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 255, 0), 2)
-
-                if lp is not None:
-                    cv2.putText(
-                        frame,
-                        f"RUSH L: ({lp[0]:.2f},{lp[1]:.2f})",
-                        (10, 100),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.55,
-                        (255, 255, 0),
-                        2,
-                    )
-                if rp is not None:
-                    cv2.putText(
-                        frame,
-                        f"RUSH R: ({rp[0]:.2f},{rp[1]:.2f})",
-                        (10, 125),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.55,
-                        (255, 0, 255),
-                        2,
-                    )
 
-                cv2.imshow("GestureOS Agent", frame)
+            cv2.imshow("GestureOS Agent", view)
 
-                key = cv2.waitKey(1) & 0xFF
-                if key == 27:
-                    break
+            key = cv2.waitKey(1) & 0xFF
+            self.perf.lap("preview")
+            if key == 27:
+                return False
 
-            else:
-                if self._request_close_preview or self.window_open:
+        else:
+            if self._request_close_preview or self.window_open:
+                try:
+                    cv2.destroyWindow("GestureOS Agent")
+                except Exception:
                     try:
-                        cv2.destroyWindow("GestureOS Agent")
+                        cv2.destroyAllWindows()
                     except Exception:
-                        try:
-                            cv2.destroyAllWindows()
-                        except Exception:
-                            pass
-                    self.window_open = False
-                    self._request_close_preview = False
-
-        # cleanup
-        self._close_camera()
-        try:
-            cv2.destroyAllWindows()
-        except Exception:
-            pass
+                        pass
+                self.window_open = False
+                self._request_close_preview = False
+            self.perf.lap("preview")
+        return True
 
     # -------------------------------------------------------------------------
     # status
@@ -1967,15 +2465,32 @@ class HandsAgent:
             "connected": bool(self.ws.connected),
             "cameraOk": bool(self._cam_ok),
             "cameraErr": str(self._cam_err) if self._cam_err else "",
+            "cameraFrames": self._capture.stats() if self._capture is not None else {},
+            "frameSource": self.source.describe() if self.source is not None else f"replay:{os.path.basename(self.replay_path)}",
+            "cameraFormat": self.source.status() if self.source is not None else None,
+            "recording": self.recorder.status(),
+            "roi": self.roi.status() if self.roi is not None else None,
+            "scheduler": self.sched.status(now()) if self.sched is not None else None,
+            "mpWorker": self._worker_status(),
             "learnProfile": str(getattr(self.learner, "profile", "default")),
             "learnProfiles": list(getattr(self.learner, "list_profiles", lambda: ["default"])()),
             "learnEnabled": bool(self.learner.enabled),
             "learnCounts": self.learner.counts(),
             "learnLastPred": self.learner.last_pred,
             "learnLastTrainTs": float(self.learner.last_train_ts or 0.0),
+            "learnTrain": self.learner.train_status(),
+            "learnMetrics": self.learner.train_metrics,
             "learnCapture": self.learner.capture,
             "learnHasBackup": bool(getattr(self.learner, "has_backup", lambda: False)()),
             "gain": float(getattr(self.control, "gain", 1.0)),
+            "cursorFilter": self.control.cursor_filter.status(),
+            "cursorPredict": self.control.predictor.status(),
+            "cursorInjector": self.control.injector.status() if self.control.injector is not None else None,
+            "screen": get_screen().status(),
+            "bindingConflicts": list(self.bindings.conflicts),
+            "handTracks": self.hand_tracker.status(),
+            "cursorTrackId": self.cursor_track_id,
+            "otherTrackId": self.other_track_id,
         }
 
         # --- mode-specific extra fields ---
@@ -2055,7 +2570,8 @@ class HandsAgent:
             payload["isTracking"] = True
 
         elif got_cursor:
-            x01, y01 = _get_os_cursor_norm01()
+            # replay: OS 커서 위치는 세션마다 달라서 제외 (결정적 출력)
+            x01, y01 = _get_os_cursor_norm01() if not self.replay_path else (None, None)
             if x01 is not None and y01 is not None:
                 payload["pointerX"] = float(x01)
                 payload["pointerY"] = float(y01)
@@ -2067,6 +2583,13 @@ class HandsAgent:
 
         payload["tracking"] = bool(payload.get("isTracking", False))
 
+        # --- perf block (low rate; percentiles are computed only here) ---
+        if self.perf.enabled:
+            wall = time.time()
+            if (wall - self._perf_status_ts) >= PERF_STATUS_SEC:
+                self._perf_status_ts = wall
+                payload["perf"] = self.perf.compact()
+
         # --- send WS + HUD ---
         self.ws.send_dict(payload)
 
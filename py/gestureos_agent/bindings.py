@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import copy
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 
 ALLOWED_GESTURES = {
@@ -148,3 +150,168 @@ def get_binding(settings: Dict[str, Any], *path: str, default: str) -> str:
         v = _sanitize_gesture(cur)
         return v or default
     return default
+
+
+# ---------------------------------------------------------------------------
+# Compiled binding table
+#
+# settings dict -> 모드별로 미리 풀어둔 읽기 전용 테이블 (apply_settings 때 한 번만 만든다)
+#   - action -> gesture : 기본값 / sanitize 적용이 끝난 값
+#   - gesture -> action : inverse (같은 레이어에서는 우선순위가 앞인 action이 이김, 핸들러의 pick 순서와 같음)
+#   - conflicts         : 같은 레이어에서 한 제스처에 action이 여러 개 묶인 경우 등 (뒤쪽 action은 절대 안 걸림)
+# 핸들러는 매 프레임 dict 재구성 / upper() / get_binding() 없이 table lookup만 한다.
+# ---------------------------------------------------------------------------
+MOUSE_CURSOR_ORDER = ("MOVE", "CLICK_DRAG", "RIGHT_CLICK", "LOCK_TOGGLE")
+KB_BASE_ORDER = ("LEFT", "RIGHT", "UP", "DOWN")
+KB_FN_ORDER = ("BACKSPACE", "SPACE", "ENTER", "ESC")
+PPT_NAV_ORDER = ("NEXT", "PREV")
+PPT_INTERACT_ORDER = ("TAB", "SHIFT_TAB", "ENTER", "PLAY_PAUSE")
+
+# PRESENTATION: PINCH_INDEX 는 클릭(선택) 고정
+PPT_CLICK_GESTURE = "PINCH_INDEX"
+
+
+def _frozen(d: Mapping[str, str]) -> Mapping[str, str]:
+    return MappingProxyType(dict(d))
+
+
+def _inverse(actions: Mapping[str, Any], order: Sequence[str]) -> Mapping[str, str]:
+    """gesture -> first action in `order` bound to it."""
+    inv: Dict[str, str] = {}
+    for tok in order:
+        g = actions.get(tok)
+        if isinstance(g, str) and g not in inv:
+            inv[g] = tok
+    return MappingProxyType(inv)
+
+
+def _duplicates(layer: str, actions: Mapping[str, Any], order: Sequence[str]) -> List[str]:
+    """Gestures bound to more than one action of the same layer (NONE = unbound, ignored)."""
+    seen: Dict[str, List[str]] = {}
+    for tok in order:
+        g = actions.get(tok)
+        if isinstance(g, str) and g != "NONE":
+            seen.setdefault(g, []).append(tok)
+    return [f"{layer}: {g} -> {', '.join(toks)}" for g, toks in seen.items() if len(toks) > 1]
+
+
+def _block(settings: Dict[str, Any], mode: str, key: Optional[str] = None) -> Dict[str, Any]:
+    cur: Any = settings.get("bindings", {}) if isinstance(settings, dict) else {}
+    cur = cur.get(mode) if isinstance(cur, dict) else None
+    if key is not None:
+        cur = cur.get(key) if isinstance(cur, dict) else None
+    return cur if isinstance(cur, dict) else {}
+
+
+@dataclass(frozen=True)
+class MouseBindings:
+    move: str = "OPEN_PALM"
+    click_drag: str = "PINCH_INDEX"
+    right_click: str = "V_SIGN"
+    lock_toggle: str = "FIST"
+    scroll_hold: str = "FIST"  # other hand
+    by_gesture: Mapping[str, str] = field(default_factory=dict)  # cursor hand: gesture -> action
+
+
+@dataclass(frozen=True)
+class KeyboardBindings:
+    base: Mapping[str, str] = field(default_factory=dict)  # action -> gesture
+    fn: Mapping[str, str] = field(default_factory=dict)
+    base_by_gesture: Mapping[str, str] = field(default_factory=dict)  # gesture -> action
+    fn_by_gesture: Mapping[str, str] = field(default_factory=dict)
+    fn_hold: str = "PINCH_INDEX"  # other-hand gate
+    mouse_mod: str = "FIST"  # other-hand gate
+
+
+@dataclass(frozen=True)
+class PresentationBindings:
+    nav: Mapping[str, str] = field(default_factory=dict)
+    interact: Mapping[str, str] = field(default_factory=dict)
+    nav_by_gesture: Mapping[str, str] = field(default_factory=dict)
+    interact_by_gesture: Mapping[str, str] = field(default_factory=dict)
+    interact_hold: str = "NONE"  # other-hand gate (NONE = layer off)
+    activate: Optional[str] = None  # optional click mapping (INTERACT.ACTIVATE)
+
+
+@dataclass(frozen=True)
+class BindingTable:
+    version: int = 1
+    mouse: MouseBindings = field(default_factory=MouseBindings)
+    keyboard: KeyboardBindings = field(default_factory=KeyboardBindings)
+    presentation: PresentationBindings = field(default_factory=PresentationBindings)
+    conflicts: Tuple[str, ...] = ()
+
+
+def compile_bindings(settings: Dict[str, Any]) -> BindingTable:
+    """Resolve merged settings into a read-only BindingTable (+ conflict list)."""
+    conflicts: List[str] = []
+
+    # MOUSE
+    m = {
+        "MOVE": get_binding(settings, "MOUSE", "MOVE", default="OPEN_PALM"),
+        "CLICK_DRAG": get_binding(settings, "MOUSE", "CLICK_DRAG", default="PINCH_INDEX"),
+        "RIGHT_CLICK": get_binding(settings, "MOUSE", "RIGHT_CLICK", default="V_SIGN"),
+        "LOCK_TOGGLE": get_binding(settings, "MOUSE", "LOCK_TOGGLE", default="FIST"),
+    }
+    mouse = MouseBindings(
+        move=m["MOVE"],
+        click_drag=m["CLICK_DRAG"],
+        right_click=m["RIGHT_CLICK"],
+        lock_toggle=m["LOCK_TOGGLE"],
+        scroll_hold=get_binding(settings, "MOUSE", "SCROLL_HOLD", default="FIST"),
+        by_gesture=_inverse(m, MOUSE_CURSOR_ORDER),
+    )
+    conflicts += _duplicates("MOUSE", m, MOUSE_CURSOR_ORDER)
+
+    # KEYBOARD (BASE / FN: defaults + user overrides)
+    kb_default = DEFAULT_SETTINGS["bindings"]["KEYBOARD"]
+    base: Dict[str, str] = dict(kb_default["BASE"])
+    fn: Dict[str, str] = dict(kb_default["FN"])
+    for k, v in _block(settings, "KEYBOARD", "BASE").items():
+        base[str(k).upper()] = str(v).upper()
+    for k, v in _block(settings, "KEYBOARD", "FN").items():
+        fn[str(k).upper()] = str(v).upper()
+    keyboard = KeyboardBindings(
+        base=_frozen(base),
+        fn=_frozen(fn),
+        base_by_gesture=_inverse(base, KB_BASE_ORDER),
+        fn_by_gesture=_inverse(fn, KB_FN_ORDER),
+        fn_hold=get_binding(settings, "KEYBOARD", "FN_HOLD", default=kb_default["FN_HOLD"]),
+        mouse_mod=get_binding(settings, "KEYBOARD", "MOUSE_MOD", default=kb_default["MOUSE_MOD"]),
+    )
+    conflicts += _duplicates("KEYBOARD.BASE", base, KB_BASE_ORDER)
+    conflicts += _duplicates("KEYBOARD.FN", fn, KB_FN_ORDER)
+    if keyboard.fn_hold != "NONE" and keyboard.fn_hold == keyboard.mouse_mod:
+        conflicts.append(f"KEYBOARD: {keyboard.fn_hold} -> FN_HOLD, MOUSE_MOD (other-hand gates overlap)")
+
+    # PRESENTATION (NAV / INTERACT as given, no defaults)
+    nav = dict(_block(settings, "PRESENTATION", "NAV"))
+    inter = dict(_block(settings, "PRESENTATION", "INTERACT"))
+    hold = _block(settings, "PRESENTATION").get("INTERACT_HOLD")
+    act = inter.get("ACTIVATE")
+    presentation = PresentationBindings(
+        nav=_frozen(nav),
+        interact=_frozen(inter),
+        nav_by_gesture=_inverse(nav, PPT_NAV_ORDER),
+        interact_by_gesture=_inverse(inter, PPT_INTERACT_ORDER),
+        interact_hold=str(hold or "NONE"),
+        activate=act if isinstance(act, str) else None,
+    )
+    conflicts += _duplicates("PRESENTATION.NAV", {**nav, "ACTIVATE": act}, PPT_NAV_ORDER + ("ACTIVATE",))
+    if presentation.interact_hold != "NONE":
+        conflicts += _duplicates("PRESENTATION.INTERACT", inter, PPT_INTERACT_ORDER)
+    for tok in PPT_NAV_ORDER:
+        if nav.get(tok) == PPT_CLICK_GESTURE:
+            conflicts.append(f"PRESENTATION.NAV: {PPT_CLICK_GESTURE} -> {tok} (also the fixed PPT click)")
+
+    version = settings.get("version", 1) if isinstance(settings, dict) else 1
+    return BindingTable(
+        version=int(version) if str(version).isdigit() else 1,
+        mouse=mouse,
+        keyboard=keyboard,
+        presentation=presentation,
+        conflicts=tuple(conflicts),
+    )
+
+
+DEFAULT_BINDINGS = compile_bindings(DEFAULT_SETTINGS)
@@ -0,0 +1,258 @@
+# py/gestureos_agent/camneg.py
+# ---------------------------------------------------------------------------
+# Webcam format negotiation (FOURCC / resolution / FPS)
+#
+# 웹캠 드라이버는 cap.set()을 조용히 무시하는 경우가 많아서, 후보 포맷을 순서대로
+# 걸어보고 실제 값(get)과 실제 프레임 전달 속도를 재서 고른다.
+# - 선호 순서: MJPG@60 -> MJPG@30 -> YUY2@30 -> 드라이버 기본값 (요청 해상도 우선, 안 되면 640x480)
+# - 요청 해상도가 맞고 측정 fps가 요청 fps의 85% 이상이면 바로 채택 (나머지는 probe 안 함)
+# - 채택된 포맷은 장치(backend:index) + 요청 해상도별로 캐시 -> 다음 실행은 probe 생략
+#
+# 캐시 파일: %TEMP%/GestureOS_camera/formats.json
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+
+# 기본 저장 폴더 (learner 프로필과 같은 TEMP 규칙)
+CAM_CACHE_DIR = os.path.join(os.getenv("TEMP", "."), "GestureOS_camera")
+CAM_CACHE_PATH = os.path.join(CAM_CACHE_DIR, "formats.json")
+
+# 측정: 포맷 전환 직후 프레임은 느리므로 warmup 후 frames장 / 최대 max_sec
+PROBE_WARMUP = 2
+PROBE_FRAMES = 10
+PROBE_MAX_SEC = 0.8
+ACCEPT_RATIO = 0.85
+# 캐시된 포맷 재확인 (짧은 read)
+CHECK_FRAMES = 5
+CHECK_MAX_SEC = 0.4
+# warmup read 는 시간 제한이 없다 -> 최악의 경우 시간 계산용 최저 fps
+BUDGET_MIN_FPS = 10.0
+
+
+def fourcc_str(v) -> str:
+    try:
+        n = int(v)
+    except Exception:
+        return ""
+    if n <= 0:
+        return ""
+    s = "".join(chr((n >> (8 * i)) & 0xFF) for i in range(4))
+    return s if s.isprintable() else ""
+
+
+@dataclass(frozen=True)
+class CameraFormat:
+    fourcc: str  # "MJPG" | "YUY2" | "" (driver default)
+    width: int
+    height: int
+    fps: float = 0.0
+
+    def label(self) -> str:
+        fps = f"@{self.fps:g}" if self.fps else ""
+        return f"{self.fourcc or 'default'} {self.width}x{self.height}{fps}"
+
+    def to_dict(self) -> dict:
+        return {"fourcc": self.fourcc, "width": int(self.width), "height": int(self.height), "fps": float(self.fps)}
+
+    @staticmethod
+    def from_dict(d: dict) -> "CameraFormat":
+        return CameraFormat(
+            fourcc=str(d.get("fourcc") or ""),
+            width=int(d.get("width", 640)),
+            height=int(d.get("height", 480)),
+            fps=float(d.get("fps") or 0.0),
+        )
+
+
+def candidates(width: int, height: int, fps_pref: Sequence[float] = (60.0, 30.0)) -> List[CameraFormat]:
+    """Formats to try, most preferred first."""
+    sizes = [(int(width), int(height))]
+    if sizes[0] != (640, 480):
+        sizes.append((640, 480))
+
+    out: List[CameraFormat] = []
+    for w, h in sizes:
+        for fps in fps_pref:
+            out.append(CameraFormat("MJPG", w, h, float(fps)))
+        out.append(CameraFormat("YUY2", w, h, 30.0))
+        out.append(CameraFormat("", w, h, 30.0))
+    return out
+
+
+def negotiate_budget_sec(width: int, height: int, fps_pref: Sequence[float] = (60.0, 30.0)) -> float:
+    """Worst-case wall time of a cached-format check + a full negotiate() (no candidate accepted)."""
+    per_probe = PROBE_MAX_SEC + (PROBE_WARMUP + 1) / BUDGET_MIN_FPS
+    check = CHECK_MAX_SEC + (PROBE_WARMUP + 1) / BUDGET_MIN_FPS
+    return check + len(candidates(width, height, fps_pref)) * per_probe
+
+
+def apply_format(cap, f: CameraFormat):
+    # FOURCC first: DSHOW/MSMF pick the size list from the current pixel format
+    if f.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*f.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(f.width))
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(f.height))
+    if f.fps:
+        cap.set(cv2.CAP_PROP_FPS, float(f.fps))
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+def read_format(cap) -> CameraFormat:
+    """What the driver claims it is delivering."""
+    try:
+        return CameraFormat(
+            fourcc=fourcc_str(cap.get(cv2.CAP_PROP_FOURCC)),
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0),
+            fps=float(cap.get(cv2.CAP_PROP_FPS) or 0.0),
+        )
+    except Exception:
+        return CameraFormat("", 0, 0, 0.0)
+
+
+def measure_fps(cap, frames: int = PROBE_FRAMES, max_sec: float = PROBE_MAX_SEC, warmup: int = PROBE_WARMUP):
+    """Read frames and time them. Returns (fps, (h, w)) or (0.0, None) if nothing came through."""
+    shape = None
+    for _ in range(max(0, int(warmup))):
+        ok, frame = cap.read()
+        if not ok or frame is None:
+            return 0.0, None
+        shape = frame.shape[:2]
+
+    n = 0
+    t0 = time.perf_counter()
+    while n < frames and (time.perf_counter() - t0) < max_sec:
+        ok, frame = cap.read()
+        if not ok or frame is None:
+            break
+        shape = frame.shape[:2]
+        n += 1
+    dt = time.perf_counter() - t0
+    if shape is None:
+        return 0.0, None
+    return (n / dt if dt > 0 and n > 0 else 0.0), shape
+
+
+@dataclass(frozen=True)
+class Negotiated:
+    requested: CameraFormat
+    actual: CameraFormat  # driver-reported, size = real frame size
+    measured_fps: float
+    probes: int
+
+    def status(self) -> dict:
+        return {
+            "format": self.actual.label(),
+            "fourcc": self.actual.fourcc,
+            "width": int(self.actual.width),
+            "height": int(self.actual.height),
+            "fps": round(float(self.actual.fps), 1),
+            "measuredFps": round(float(self.measured_fps), 1),
+            "requested": self.requested.label(),
+        }
+
+
+def negotiate(cap, width: int, height: int, fps_pref: Sequence[float] = (60.0, 30.0)) -> Optional[Negotiated]:
+    """
+    Probe candidates() on an open cv2.VideoCapture and leave it in the best format.
+    Best = requested size, then highest measured fps, then MJPG.
+    """
+    best: Optional[Tuple[tuple, Negotiated]] = None
+    probes = 0
+    for cand in candidates(width, height, fps_pref):
+        try:
+            apply_format(cap, cand)
+            fps, shape = measure_fps(cap)
+        except Exception:
+            continue
+        probes += 1
+        if shape is None:
+            continue
+
+        actual = read_format(cap)
+        actual = CameraFormat(actual.fourcc, int(shape[1]), int(shape[0]), actual.fps)
+        res = Negotiated(cand, actual, fps, probes)
+        size_ok = (actual.width, actual.height) == (cand.width, cand.height)
+        print(f"[CAM] probe {cand.label()} -> {actual.label()} measured={fps:.1f}fps", flush=True)
+
+        if size_ok and (actual.width, actual.height) == (int(width), int(height)) and fps >= ACCEPT_RATIO * cand.fps:
+            return res
+
+        key = (
+            (actual.width, actual.height) == (int(width), int(height)),
+            size_ok,
+            round(fps),
+            actual.fourcc == "MJPG",
+        )
+        if best is None or key > best[0]:
+            best = (key, res)
+
+    if best is None:
+        return None
+    res = best[1]
+    # the last probe may not be the winner -> put the winner back
+    apply_format(cap, res.requested)
+    return Negotiated(res.requested, res.actual, res.measured_fps, probes)
+
+
+class FormatCache:
+    """Winning format per device + requested size, persisted as JSON."""
+
+    def __init__(self, path: str = CAM_CACHE_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, dict]] = None
+
+    @staticmethod
+    def key(device: str, width: int, height: int) -> str:
+        return f"{device}:{int(width)}x{int(height)}"
+
+    def _load(self) -> Dict[str, dict]:
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    d = json.load(f)
+                self._data = d if isinstance(d, dict) else {}
+            except Exception:
+                self._data = {}
+        return self._data
+
+    def get(self, key: str) -> Optional[CameraFormat]:
+        with self._lock:
+            d = self._load().get(key)
+        if not isinstance(d, dict):
+            return None
+        try:
+            return CameraFormat.from_dict(d.get("format") or {})
+        except Exception:
+            return None
+
+    def put(self, key: str, fmt: CameraFormat, measured_fps: float = 0.0):
+        with self._lock:
+            data = self._load()
+            data[key] = {"format": fmt.to_dict(), "measuredFps": round(float(measured_fps), 1), "ts": time.time()}
+            self._save(data)
+
+    def drop(self, key: str):
+        with self._lock:
+            data = self._load()
+            if data.pop(key, None) is not None:
+                self._save(data)
+
+    def _save(self, data: Dict[str, dict]):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print("[CAM] format cache write failed:", e, flush=True)
@@ -0,0 +1,186 @@
+# py/gestureos_agent/capture.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from .timeutil import now
+from .sources import FrameSource
+
+
+class FrameCapture:
+    """
+    Dedicated capture stage.
+
+    - owns the FrameSource and reads it on its own thread
+    - publishes only the newest frame (+ capture timestamp) into a single slot;
+      a frame that was never consumed is dropped instead of queued
+    - non-realtime sources (file/synthetic at max speed) are lossless instead:
+      the thread waits until the slot is consumed, so every frame is processed
+    - reopen/retry (retry_sec) lives here, so the inference loop never blocks on the driver
+    """
+
+    def __init__(
+        self,
+        source: FrameSource,
+        retry_sec: float = 2.0,
+        poll_sec: float = 0.05,
+        name: str = "camera",
+    ):
+        self.source = source
+        self.retry_sec = float(retry_sec)
+        self.poll_sec = float(poll_sec)
+        self.name = str(name)
+
+        self._cap: Optional[FrameSource] = None
+        self.ok = False
+        self.err = ""
+        # source reached its end (file without loop) -> consumer should stop
+        self.eof = False
+        self._last_try_wall = 0.0
+
+        # single-slot buffer
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_ts = 0.0
+
+        # counters (STATUS)
+        self.captured = 0
+        self.processed = 0
+        self.dropped = 0
+
+        self._stop = threading.Event()
+        self._first_try = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------- lifecycle ----------------
+    def start(self, wait_first_open: float = 3.0):
+        """
+        Start the capture thread. Waits (bounded) for the first open attempt.
+        The bound grows by the source's open budget (camera format probing on a cold cache).
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"{self.name}-capture", daemon=True)
+        self._thread.start()
+        if wait_first_open > 0:
+            self._first_try.wait(timeout=float(wait_first_open) + float(self.source.open_budget_sec()))
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        th = self._thread
+        if th is not None:
+            th.join(timeout=1.0)
+        self._thread = None
+        self._close()
+
+    # ---------------- camera ----------------
+    def _try_open(self) -> bool:
+        self._last_try_wall = time.time()
+        try:
+            self.source.open()
+            self._cap = self.source
+            self.ok = True
+            self.err = ""
+            print(f"[PY] {self.name} opened", flush=True)
+            return True
+        except Exception as e:
+            self._cap = None
+            self.ok = False
+            self.err = f"{type(e).__name__}: {e}"
+            print(f"[PY] {self.name} not available:", self.err, flush=True)
+            return False
+        finally:
+            self._first_try.set()
+
+    def _close(self):
+        if self._cap is not None:
+            try:
+                self._cap.release()
+            except Exception:
+                pass
+        self._cap = None
+        self.ok = False
+
+    # ---------------- thread ----------------
+    def _loop(self):
+        self._try_open()
+
+        while not self._stop.is_set():
+            if self._cap is None:
+                if (time.time() - self._last_try_wall) >= self.retry_sec:
+                    self._try_open()
+                else:
+                    self._stop.wait(self.poll_sec)
+                continue
+
+            try:
+                ok, frame = self._cap.read()
+            except Exception as e:
+                ok, frame = False, None
+                self.err = f"{type(e).__name__}: {e}"
+
+            if not ok or frame is None:
+                if getattr(self._cap, "exhausted", False):
+                    self.err = "source_finished"
+                    self._close()
+                    self.eof = True
+                    with self._cond:
+                        self._cond.notify_all()
+                    break
+                if not self.err:
+                    self.err = "camera_read_failed"
+                self._close()
+                continue
+
+            self._publish(frame, now())
+
+        self._close()
+
+    def _publish(self, frame, ts: float):
+        with self._cond:
+            if not self.source.realtime:
+                # lossless: wait for the consumer instead of dropping
+                while self._frame is not None and not self._stop.is_set():
+                    self._cond.wait(timeout=0.1)
+            if self._frame is not None:
+                # previous frame was never consumed -> drop it (no queueing)
+                self.dropped += 1
+            self._frame = frame
+            self._frame_ts = float(ts)
+            self.captured += 1
+            self._cond.notify()
+
+    # ---------------- consumer ----------------
+    def read(self, timeout: float = 0.1) -> Tuple[Optional[Any], float]:
+        """
+        Take the newest frame out of the slot.
+        Returns (frame, capture_ts) or (None, 0.0) on timeout / camera loss.
+        """
+        with self._cond:
+            if self._frame is None:
+                self._cond.wait(timeout=max(0.0, float(timeout)))
+            frame = self._frame
+            ts = self._frame_ts
+            if frame is None:
+                return None, 0.0
+            self._frame = None
+            self.processed += 1
+            self._cond.notify_all()
+            return frame, ts
+
+    def finished(self) -> bool:
+        """True once a non-looping source hit its end and the last frame was consumed."""
+        with self._cond:
+            return bool(self.eof and self._frame is None)
+
+    def stats(self) -> dict:
+        return {
+            "captured": int(self.captured),
+            "processed": int(self.processed),
+            "dropped": int(self.dropped),
+        }
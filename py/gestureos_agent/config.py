@@ -26,6 +26,24 @@ class AgentConfig:
     # websocket
     ws_url: str = DEFAULT_WS_URL
 
+    # frame source: camera | camera:N | file:PATH | dir:PATH | synthetic
+    source: str = "camera"
+    # native: play files/synthetic at their own FPS, max: as fast as possible (benchmark)
+    source_rate: str = "native"
+    source_loop: bool = False
+
+    # adaptive MediaPipe input: crop around the last hand bbox / downscale (roi.py)
+    roi: bool = False
+    # run MediaPipe Hands in a separate process (shared-memory frames, mp_worker.py)
+    mp_worker: bool = False
+
+    # replay a recorded landmark session (.gosr) instead of camera + mediapipe
+    replay: str = ""
+    # max: as fast as possible, realtime: keep the recorded frame timing
+    replay_speed: str = "max"
+    # optional: write every STATUS payload as a JSON line (diff two runs)
+    replay_dump: str = ""
+
     # control mapping (normalized 0~1)
     control_box: tuple = (0.22, 0.28, 0.78, 0.95)
     control_gain: float = 1.10
@@ -73,6 +91,40 @@ def parse_cli(argv: Optional[Iterable[str]] = None) -> Tuple[str, AgentConfig]:
             ws_url = str(argv[i + 1]).strip()
 
 
+    # frame source selection
+    source = "camera"
+    source_rate = "native"
+    for i, a in enumerate(argv):
+        if a.startswith("--source="):
+            source = a.split("=", 1)[1].strip()
+        elif a == "--source" and i + 1 < len(argv):
+            source = str(argv[i + 1]).strip()
+        elif a.startswith("--source-rate="):
+            source_rate = a.split("=", 1)[1].strip().lower()
+        elif a == "--source-rate" and i + 1 < len(argv):
+            source_rate = str(argv[i + 1]).strip().lower()
+    if source_rate not in ("native", "max"):
+        print("[PY] invalid --source-rate, fallback native:", source_rate)
+        source_rate = "native"
+    source_loop = ("--source-loop" in args)
+
+    # session replay (gestureos_agent/replay.py)
+    replay = ""
+    replay_speed = "max"
+    replay_dump = ""
+    for i, a in enumerate(argv):
+        if a.startswith("--replay="):
+            replay = a.split("=", 1)[1].strip()
+        elif a == "--replay" and i + 1 < len(argv):
+            replay = str(argv[i + 1]).strip()
+        elif a.startswith("--replay-speed="):
+            replay_speed = a.split("=", 1)[1].strip().lower()
+        elif a.startswith("--replay-dump="):
+            replay_dump = a.split("=", 1)[1].strip()
+    if replay_speed not in ("max", "realtime"):
+        print("[PY] invalid --replay-speed, fallback max:", replay_speed)
+        replay_speed = "max"
+
     # rush input selection
     rush_input = None
     for i, a in enumerate(argv):
@@ -95,6 +147,9 @@ def parse_cli(argv: Optional[Iterable[str]] = None) -> Tuple[str, AgentConfig]:
 
     force_cursor_left = ("--cursor-left" in args)
 
+    roi = ("--roi" in args)
+    mp_worker = ("--mp-worker" in args)
+
     cfg = AgentConfig(
         headless=headless,
         no_ws=no_ws,
@@ -105,5 +160,13 @@ def parse_cli(argv: Optional[Iterable[str]] = None) -> Tuple[str, AgentConfig]:
         start_vkey=start_vkey,
         force_cursor_left=force_cursor_left,
         ws_url=ws_url,
+        source=source,
+        source_rate=source_rate,
+        source_loop=source_loop,
+        roi=roi,
+        mp_worker=mp_worker,
+        replay=replay,
+        replay_speed=replay_speed,
+        replay_dump=replay_dump,
     )
     return agent_kind, cfg
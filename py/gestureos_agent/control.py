@@ -6,10 +6,16 @@ from typing import Optional, Tuple
 
 import os
 import ctypes
+import threading
+import time
 
 import pyautogui
 
+from .filters import CursorFilter
 from .mathutil import clamp01
+from .predict import CursorPredictor
+from .screen import get_screen
+from .timeutil import now
 
 pyautogui.FAILSAFE = False
 pyautogui.PAUSE = 0
@@ -56,43 +62,10 @@ if _IS_WIN:
     class _INPUT(ctypes.Structure):
         _fields_ = [("type", wintypes.DWORD), ("u", _INPUT_UNION)]
 
-    class _POINT(ctypes.Structure):
-        _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
-
-    def _get_cursor_xy() -> Tuple[int, int]:
-        pt = _POINT()
-        ok = user32.GetCursorPos(ctypes.byref(pt))
-        if not ok:
-            return (0, 0)
-        return (int(pt.x), int(pt.y))
-
-    def _virtual_screen_rect() -> Tuple[int, int, int, int]:
-        # virtual screen (multi-monitor)
-        SM_XVIRTUALSCREEN = 76
-        SM_YVIRTUALSCREEN = 77
-        SM_CXVIRTUALSCREEN = 78
-        SM_CYVIRTUALSCREEN = 79
-        vx = int(user32.GetSystemMetrics(SM_XVIRTUALSCREEN))
-        vy = int(user32.GetSystemMetrics(SM_YVIRTUALSCREEN))
-        vw = int(user32.GetSystemMetrics(SM_CXVIRTUALSCREEN))
-        vh = int(user32.GetSystemMetrics(SM_CYVIRTUALSCREEN))
-        vw = max(1, vw)
-        vh = max(1, vh)
-        return (vx, vy, vw, vh)
-
     def _sendinput_move_abs_virtual(x: int, y: int):
-        vx, vy, vw, vh = _virtual_screen_rect()
-
-        # clamp to virtual screen
-        x = max(vx, min(vx + vw - 1, int(x)))
-        y = max(vy, min(vy + vh - 1, int(y)))
-
-        # Convert to [0..65535] absolute coordinates across virtual desktop
-        # When using MOUSEEVENTF_VIRTUALDESK, mapping is across the entire virtual screen.
-        denom_x = max(1, vw - 1)
-        denom_y = max(1, vh - 1)
-        ax = int((x - vx) * 65535 / denom_x)
-        ay = int((y - vy) * 65535 / denom_y)
+        # clamp to virtual screen + convert to [0..65535] absolute coordinates across virtual desktop
+        # (MOUSEEVENTF_VIRTUALDESK: mapping is across the entire virtual screen; rect is cached)
+        ax, ay = get_screen().to_absolute(x, y)
 
         mi = _MOUSEINPUT(
             dx=ax,
@@ -106,6 +79,174 @@ if _IS_WIN:
         user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(_INPUT))
 
 
+# =============================================================================
+# screen pixel helpers (shared by ControlMapper.move_cursor and CursorInjector)
+# =============================================================================
+# geometry / cursor come from the shared screen cache (no GetSystemMetrics / GetCursorPos per move)
+def _norm_to_px(norm_x: float, norm_y: float) -> Tuple[int, int]:
+    # virtual screen coord (multi-monitor on Windows)
+    return get_screen().norm_to_px(norm_x, norm_y)
+
+
+def _cursor_px() -> Tuple[int, int]:
+    # last injected position while fresh, otherwise the OS cursor
+    return get_screen().cursor_px() or (0, 0)
+
+
+def _move_px(x: int, y: int):
+    if _IS_WIN:
+        # ✅ Win11 smooth: SendInput absolute move
+        _sendinput_move_abs_virtual(x, y)
+    else:
+        pyautogui.moveTo(x, y, _pause=False)
+    get_screen().note_injected(x, y)
+
+
+# =============================================================================
+# High-rate cursor injector
+# =============================================================================
+class CursorInjector:
+    """
+    프레임 루프(30~60Hz)가 준 목표 위치 사이를 hz(기본 240)로 보간해서 커서를 움직이는 스레드.
+    - set_target(): 프레임마다. 현재 보간 위치 -> 새 목표를 한 프레임 간격(측정값) 동안 선형 이동
+    - deadzone: 새 목표가 현재 OS 커서와 deadzone_px 안이면 무시 (기존 move_cursor와 같은 기준)
+    - flush(): 버튼 Down/Up 직전에 호출 -> 보간을 끝내고 목표 위치로 바로 이동 (클릭 위치 = 손 위치)
+    - 같은 픽셀이면 move를 보내지 않는다
+    """
+
+    def __init__(self, hz: float = 240.0, deadzone_px: int = 10):
+        self.hz = max(30.0, float(hz))
+        self.deadzone_px = int(deadzone_px)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._from: Optional[Tuple[float, float]] = None
+        self._to: Optional[Tuple[float, float]] = None
+        self._t0 = 0.0
+        self._dur = 1.0 / 30.0
+        self._last_target_ts = 0.0
+        self._last_px: Optional[Tuple[int, int]] = None
+
+        self.targets = 0
+        self.moves = 0
+        self.flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="CursorInjector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        th, self._thread = self._thread, None
+        if th is not None:
+            th.join(timeout=1.0)
+
+    def _pos_at(self, t: float) -> Optional[Tuple[float, float]]:
+        # caller holds the lock
+        if self._to is None:
+            return None
+        if self._from is None:
+            return self._to
+        a = (t - self._t0) / self._dur
+        if a >= 1.0:
+            return self._to
+        a = max(0.0, a)
+        fx, fy = self._from
+        tx, ty = self._to
+        return (fx + (tx - fx) * a, fy + (ty - fy) * a)
+
+    def set_target(self, norm_x: float, norm_y: float, frame_ts: float):
+        """frame_ts: capture time of the frame this target came from (for the frame interval)."""
+        tx, ty = clamp01(norm_x), clamp01(norm_y)
+        px, py = _norm_to_px(tx, ty)
+        cx, cy = _cursor_px()
+        t = time.perf_counter()
+        with self._lock:
+            dt = float(frame_ts) - self._last_target_ts
+            self._last_target_ts = float(frame_ts)
+            if 0.0 < dt < 0.25:
+                # interpolate over one (measured) frame interval
+                self._dur = max(1.0 / 240.0, min(0.1, 0.7 * self._dur + 0.3 * dt))
+
+            idle = self._to is None or (t - self._t0) >= self._dur
+            if idle and abs(px - cx) < self.deadzone_px and abs(py - cy) < self.deadzone_px:
+                return
+            cur = self._pos_at(t)
+            if cur is None or dt <= 0.0 or dt >= 0.25:
+                # first target / after a pause: jump
+                cur = (tx, ty)
+            self._from = cur
+            self._to = (tx, ty)
+            self._t0 = t
+            self.targets += 1
+        self._wake.set()
+
+    def flush(self):
+        """Finish the current glide now (call right before a button down/up)."""
+        with self._lock:
+            to = self._to
+            if to is None:
+                return
+            self._from = None
+            self._t0 = 0.0
+            px = _norm_to_px(*to)
+            if px != self._last_px:
+                _move_px(*px)
+                self._last_px = px
+                self.moves += 1
+            self.flushes += 1
+
+    def _run(self):
+        period = 1.0 / self.hz
+        next_t = time.perf_counter()
+        while not self._stop.is_set():
+            t = time.perf_counter()
+            with self._lock:
+                pos = self._pos_at(t)
+                gliding = pos is not None and self._from is not None and (t - self._t0) < self._dur
+                if pos is not None:
+                    px = _norm_to_px(*pos)
+                    if px != self._last_px:
+                        try:
+                            _move_px(*px)
+                            self._last_px = px
+                            self.moves += 1
+                        except Exception:
+                            pass
+            if not gliding:
+                # target reached: sleep until the next set_target()
+                self._wake.clear()
+                self._wake.wait(0.25)
+                next_t = time.perf_counter()
+                continue
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.perf_counter()
+
+    def status(self) -> dict:
+        return {
+            "hz": float(self.hz),
+            "running": bool(self.running),
+            "targets": int(self.targets),
+            "moves": int(self.moves),
+            "flushes": int(self.flushes),
+            "glideMs": round(self._dur * 1000.0, 1),
+        }
+
+
 @dataclass
 class ControlMapper:
     control_box: Tuple[float, float, float, float]
@@ -114,13 +255,31 @@ class ControlMapper:
     deadzone_px: int
     move_interval_sec: float
 
-    ema_x: Optional[float] = None
-    ema_y: Optional[float] = None
     last_move_ts: float = 0.0
 
-    def reset_ema(self):
-        self.ema_x = None
-        self.ema_y = None
+    # "one_euro" (speed-adaptive, per-mode params) | "ema" (fixed ema_alpha)
+    filter_kind: str = "one_euro"
+    cursor_filter: Optional[CursorFilter] = None
+    # latency compensation: "off" | "cv" | "kalman"
+    predict_kind: str = "off"
+    predictor: Optional[CursorPredictor] = None
+    # high-rate injector thread (None = move once per frame, throttled by move_interval_sec)
+    injector: Optional[CursorInjector] = None
+
+    def __post_init__(self):
+        if self.cursor_filter is None:
+            self.cursor_filter = CursorFilter(self.filter_kind, ema_alpha=self.ema_alpha)
+        if self.predictor is None:
+            self.predictor = CursorPredictor(self.predict_kind)
+
+    def reset_filter(self):
+        """Forget the smoothing / prediction history (cursor jumps to the next raw position)."""
+        self.cursor_filter.reset()
+        self.predictor.reset()
+
+    def set_filter_mode(self, mode: str):
+        # per-mode One Euro params (DRAW: low lag, MOUSE: low jitter); resets the filter state
+        self.cursor_filter.set_mode(mode)
 
     def set_gain(self, g: float):
         self.gain = float(g)
@@ -136,43 +295,46 @@ class ControlMapper:
         uy = 0.5 + (uy - 0.5) * self.gain
         return clamp01(ux), clamp01(uy)
 
-    def apply_ema(self, nx: float, ny: float) -> Tuple[float, float]:
-        if self.ema_x is None:
-            self.ema_x, self.ema_y = nx, ny
-        else:
-            a = self.ema_alpha
-            self.ema_x = a * nx + (1.0 - a) * self.ema_x
-            self.ema_y = a * ny + (1.0 - a) * self.ema_y
-        return self.ema_x, self.ema_y
+    def apply_filter(self, nx: float, ny: float, t: float) -> Tuple[float, float]:
+        """Cursor smoothing on screen-normalized coords (t = frame time)."""
+        return self.cursor_filter(nx, ny, t)
+
+    def predict(
+        self, nx: float, ny: float, t: float, hold: bool = False, capture_ts: Optional[float] = None
+    ) -> Tuple[float, float]:
+        """
+        Extrapolate the filtered cursor by the measured capture -> move latency.
+        t = frame time (velocity), capture_ts = when the camera frame was grabbed (latency; defaults to t).
+        hold=True (PINCH click / drag) passes the position through. No-op while predict_kind is "off".
+        """
+        p = self.predictor
+        if p.enabled:
+            p.observe_latency(now() - (t if capture_ts is None else capture_ts))
+        return p(nx, ny, t, hold=hold)
 
     def move_cursor(self, norm_x: float, norm_y: float, now_ts: float):
+        inj = self.injector
+        if inj is not None and inj.running:
+            # the injector thread interpolates at its own rate (no per-frame throttle)
+            inj.set_target(norm_x, norm_y, now_ts)
+            return
+
         # throttle
         if (now_ts - self.last_move_ts) < self.move_interval_sec:
             return
         self.last_move_ts = now_ts
 
-        if _IS_WIN:
-            # virtual screen coord
-            vx, vy, vw, vh = _virtual_screen_rect()
-            x = int(vx + clamp01(norm_x) * max(1, vw))
-            y = int(vy + clamp01(norm_y) * max(1, vh))
-            x = max(vx, min(vx + vw - 1, x))
-            y = max(vy, min(vy + vh - 1, y))
-
-            # deadzone vs current cursor
-            cx, cy = _get_cursor_xy()
-            if abs(x - cx) < int(self.deadzone_px) and abs(y - cy) < int(self.deadzone_px):
-                return
+        x, y = _norm_to_px(norm_x, norm_y)
 
-            # ✅ Win11 smooth: SendInput absolute move
-            _sendinput_move_abs_virtual(x, y)
+        # deadzone vs current cursor
+        cx, cy = _cursor_px()
+        if abs(x - cx) < int(self.deadzone_px) and abs(y - cy) < int(self.deadzone_px):
             return
 
-        # non-windows fallback
-        sx, sy = pyautogui.size()
-        x = int(clamp01(norm_x) * sx)
-        y = int(clamp01(norm_y) * sy)
-        cur = pyautogui.position()
-        if abs(x - cur.x) < int(self.deadzone_px) and abs(y - cur.y) < int(self.deadzone_px):
-            return
-        pyautogui.moveTo(x, y, _pause=False)
+        _move_px(x, y)
+
+    def flush_cursor(self):
+        """Before a mouse button event: land the injector on its target first."""
+        inj = self.injector
+        if inj is not None and inj.running:
+            inj.flush()
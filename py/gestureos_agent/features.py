@@ -0,0 +1,146 @@
+# py/gestureos_agent/features.py
+# ---------------------------------------------------------------------------
+# Per-hand features, computed at most once per hand per frame
+#
+# 한 프레임 안에서 같은 손을 여러 곳(rush picker / 손 선택 / pinch threshold / 제스처 /
+# learner)이 다시 분석하던 것을 HandFeatures 하나로 모은다.
+# - 모든 값은 처음 접근할 때 계산하고 저장 (lazy memo, __slots__)
+# - 프레임이 바뀌면 새 HandFeatures를 만든다 (landmark 배열이 바뀌므로 invalidate 없음)
+#
+#   f = HandFeatures(lm)
+#   f.palm_center      (cx, cy)
+#   f.palm_scale       |lm0 - lm9| (xy)
+#   f.extended         (index, middle, ring, pinky) tip above PIP
+#   f.pinch_ratio      |lm4 - lm8| / palm_scale (None if palm too small)
+#   f.vector           learner feature: wrist-relative, palm-scaled float32[63]
+#   f.gesture(th)      rule gesture (gestures.classify_gesture semantics), memo per threshold
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .gestures import rule_gesture
+from .landmarks import PALM_IDX, as_landmarks
+
+
+class HandFeatures:
+    __slots__ = (
+        "lm",
+        "_palm",
+        "_scale",
+        "_ext",
+        "_folded",
+        "_pinch",
+        "_vec",
+        "_gest_th",
+        "_gest",
+    )
+
+    def __init__(self, lm):
+        self.lm: np.ndarray = as_landmarks(lm)
+        self._palm: Optional[Tuple[float, float]] = None
+        self._scale: Optional[float] = None
+        self._ext: Optional[Tuple[bool, bool, bool, bool]] = None
+        self._folded: Optional[int] = None
+        self._pinch: Optional[float] = None
+        self._vec: Optional[np.ndarray] = None
+        self._gest_th: Optional[float] = None
+        self._gest: Optional[str] = None
+
+    @staticmethod
+    def of(x) -> Optional["HandFeatures"]:
+        """HandFeatures as-is, landmarks -> new HandFeatures, None -> None."""
+        if x is None or isinstance(x, HandFeatures):
+            return x
+        return HandFeatures(x)
+
+    def __len__(self) -> int:
+        return len(self.lm)
+
+    # ---------------- geometry ----------------
+    @property
+    def palm_center(self) -> Tuple[float, float]:
+        if self._palm is None:
+            a = self.lm.item
+            sx = 0.0
+            sy = 0.0
+            for i in PALM_IDX:
+                sx += a(i, 0)
+                sy += a(i, 1)
+            self._palm = (sx / 5.0, sy / 5.0)
+        return self._palm
+
+    @property
+    def palm_scale(self) -> float:
+        if self._scale is None:
+            a = self.lm.item
+            self._scale = math.hypot(a(0, 0) - a(9, 0), a(0, 1) - a(9, 1))
+        return self._scale
+
+    @property
+    def extended(self) -> Tuple[bool, bool, bool, bool]:
+        if self._ext is None:
+            y = self.lm.item
+            self._ext = (y(8, 1) < y(6, 1), y(12, 1) < y(10, 1), y(16, 1) < y(14, 1), y(20, 1) < y(18, 1))
+        return self._ext
+
+    @property
+    def folded(self) -> int:
+        """Fingers whose tip is strictly below the PIP (is_fist: >= 3)."""
+        if self._folded is None:
+            y = self.lm.item
+            self._folded = (
+                (y(8, 1) > y(6, 1)) + (y(12, 1) > y(10, 1)) + (y(16, 1) > y(14, 1)) + (y(20, 1) > y(18, 1))
+            )
+        return self._folded
+
+    @property
+    def pinch_dist(self) -> float:
+        if self._pinch is None:
+            a = self.lm.item
+            self._pinch = math.hypot(a(4, 0) - a(8, 0), a(4, 1) - a(8, 1))
+        return self._pinch
+
+    @property
+    def pinch_ratio(self) -> Optional[float]:
+        s = self.palm_scale
+        if s < 1e-6:
+            return None
+        return float(self.pinch_dist / s)
+
+    def pinch_thresh(self, ratio: float, fallback: float = 0.06) -> float:
+        """Pinch distance threshold scaled by palm size (HandsAgent's ratio-based threshold)."""
+        s = self.palm_scale
+        if s < 1e-6:
+            return float(fallback)
+        return float(max(0.01, min(0.20, ratio * s)))
+
+    # ---------------- learner ----------------
+    @property
+    def vector(self) -> Optional[np.ndarray]:
+        """Wrist-relative, palm-scaled float32[63] (MLPLearner.extract_array)."""
+        if self._vec is None:
+            if len(self.lm) != 21:
+                return None
+            pts = self.lm - self.lm[0]
+            scale = float(np.sqrt(np.dot(pts[9], pts[9])))
+            if scale < 1e-6:
+                scale = float(np.sqrt((pts * pts).sum(axis=1)).max())
+                if scale < 1e-6:
+                    scale = 1.0
+            pts *= np.float32(1.0 / scale)
+            self._vec = pts.reshape(-1)
+        return self._vec
+
+    # ---------------- rule gesture ----------------
+    def gesture(self, pinch_thresh: float = 0.06) -> str:
+        th = float(pinch_thresh)
+        if self._gest is None or self._gest_th != th:
+            a = self.lm.item
+            v_gap = math.hypot(a(8, 0) - a(12, 0), a(8, 1) - a(12, 1))
+            self._gest = rule_gesture(self.folded, self.extended, self.pinch_dist, v_gap, th)
+            self._gest_th = th
+        return self._gest
@@ -0,0 +1,199 @@
+# py/gestureos_agent/filters.py
+# ---------------------------------------------------------------------------
+# Cursor / landmark smoothing: One Euro filter (+ the old fixed-alpha EMA)
+#
+# 고정 alpha EMA는 jitter를 줄이면 lag가 늘고, lag를 줄이면 떨린다.
+# One Euro (Casiez et al., CHI 2012): 속도에 따라 cutoff를 올린다.
+#   - 손이 멈춰 있으면 cutoff = min_cutoff (강하게 smoothing -> jitter 감소)
+#   - 빨리 움직이면 cutoff = min_cutoff + beta * |speed| (lag 감소)
+#   - dt는 프레임 시각 t로 계산 -> replay 결정성 유지, fps 변화에도 같은 특성
+#
+# 단위: 커서는 화면 정규화 좌표(0~1), speed = 화면폭/초.
+# 모드별 기본값: DRAW = 낮은 lag, MOUSE 등 = 낮은 jitter. UPDATE_SETTINGS로 변경.
+#
+# OneEuroFilter는 float 와 ndarray 둘 다 받는다 -> (21, 3) landmark 전체를 한 번에 필터링.
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+FILTER_KINDS = ("one_euro", "ema")
+
+# 이 시간 이상 샘플이 끊기면 (손 놓침 등) 이전 상태를 버리고 새로 시작
+STALE_SEC = 0.5
+
+
+@dataclass(frozen=True)
+class OneEuroParams:
+    min_cutoff: float = 1.0  # Hz, 정지 시 cutoff (작을수록 jitter↓ lag↑)
+    beta: float = 0.0  # speed 계수 (클수록 빠른 움직임에서 lag↓)
+    d_cutoff: float = 1.0  # Hz, speed 추정용 cutoff
+
+    def to_dict(self) -> dict:
+        return {"min_cutoff": float(self.min_cutoff), "beta": float(self.beta), "d_cutoff": float(self.d_cutoff)}
+
+    @staticmethod
+    def from_dict(d: dict, base: Optional["OneEuroParams"] = None) -> "OneEuroParams":
+        """Partial dicts keep the base values. camelCase keys accepted."""
+        base = base or OneEuroParams()
+
+        def pick(snake: str, camel: str, cur: float, lo: float, hi: float) -> float:
+            v = d.get(snake, d.get(camel, None))
+            if v is None:
+                return cur
+            return max(lo, min(hi, float(v)))
+
+        return OneEuroParams(
+            min_cutoff=pick("min_cutoff", "minCutoff", base.min_cutoff, 0.01, 30.0),
+            beta=pick("beta", "beta", base.beta, 0.0, 1000.0),
+            d_cutoff=pick("d_cutoff", "dCutoff", base.d_cutoff, 0.01, 30.0),
+        )
+
+
+# cursor (screen-normalized) defaults per mode
+DEFAULT_ONE_EURO: Dict[str, OneEuroParams] = {
+    "MOUSE": OneEuroParams(min_cutoff=0.8, beta=6.0, d_cutoff=1.0),
+    "VKEY": OneEuroParams(min_cutoff=0.8, beta=6.0, d_cutoff=1.0),
+    "KEYBOARD": OneEuroParams(min_cutoff=0.8, beta=6.0, d_cutoff=1.0),
+    "PRESENTATION": OneEuroParams(min_cutoff=0.8, beta=6.0, d_cutoff=1.0),
+    "DRAW": OneEuroParams(min_cutoff=2.0, beta=20.0, d_cutoff=1.0),
+}
+DEFAULT_ONE_EURO_FALLBACK = DEFAULT_ONE_EURO["MOUSE"]
+
+
+def _alpha(cutoff, dt: float):
+    # cutoff: float or ndarray
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """One Euro filter over a float or an ndarray (element-wise)."""
+
+    __slots__ = ("params", "x_prev", "dx_prev", "t_prev")
+
+    def __init__(self, params: OneEuroParams = OneEuroParams()):
+        self.params = params
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev: Optional[float] = None
+
+    def reset(self):
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = None
+
+    def __call__(self, x, t: float):
+        if self.x_prev is None or self.t_prev is None or (t - self.t_prev) > STALE_SEC:
+            self.x_prev = x.copy() if isinstance(x, np.ndarray) else x
+            self.dx_prev = x * 0.0
+            self.t_prev = float(t)
+            return x
+
+        dt = float(t) - self.t_prev
+        if dt <= 1e-6:
+            # same timestamp (duplicate frame): keep the last output
+            return self.x_prev
+
+        p = self.params
+        dx = (x - self.x_prev) / dt
+        a_d = _alpha(p.d_cutoff, dt)
+        dx_hat = a_d * dx + (1.0 - a_d) * self.dx_prev
+
+        a = _alpha(p.min_cutoff + p.beta * abs(dx_hat), dt)
+        x_hat = a * x + (1.0 - a) * self.x_prev
+
+        self.x_prev = x_hat
+        self.dx_prev = dx_hat
+        self.t_prev = float(t)
+        return x_hat
+
+
+class CursorFilter:
+    """
+    2D cursor smoothing used by ControlMapper.
+    kind "one_euro": per-mode OneEuroParams, kind "ema": the old fixed-alpha EMA.
+    """
+
+    def __init__(self, kind: str = "one_euro", ema_alpha: float = 0.22, params: Optional[Dict[str, OneEuroParams]] = None):
+        self.kind = kind if kind in FILTER_KINDS else "one_euro"
+        self.ema_alpha = float(ema_alpha)
+        self.params: Dict[str, OneEuroParams] = dict(DEFAULT_ONE_EURO if params is None else params)
+        self.mode = "MOUSE"
+        self._fx = OneEuroFilter(self.params_for(self.mode))
+        self._fy = OneEuroFilter(self.params_for(self.mode))
+        self._ema: Optional[Tuple[float, float]] = None
+
+    def params_for(self, mode: str) -> OneEuroParams:
+        return self.params.get(str(mode).upper(), DEFAULT_ONE_EURO_FALLBACK)
+
+    def reset(self):
+        self._fx.reset()
+        self._fy.reset()
+        self._ema = None
+
+    def set_mode(self, mode: str):
+        self.mode = str(mode).upper()
+        p = self.params_for(self.mode)
+        self._fx.params = p
+        self._fy.params = p
+        self.reset()
+
+    def set_kind(self, kind: str):
+        kind = str(kind).strip().lower().replace("-", "_")
+        if kind in ("oneeuro", "1euro", "one_euro_filter"):
+            kind = "one_euro"
+        if kind in FILTER_KINDS and kind != self.kind:
+            self.kind = kind
+            self.reset()
+
+    def set_params(self, mode: str, d: dict):
+        mode_u = str(mode).upper()
+        self.params[mode_u] = OneEuroParams.from_dict(d, self.params_for(mode_u))
+        if mode_u == self.mode:
+            self._fx.params = self.params[mode_u]
+            self._fy.params = self.params[mode_u]
+
+    def __call__(self, nx: float, ny: float, t: float) -> Tuple[float, float]:
+        if self.kind == "ema":
+            if self._ema is None:
+                self._ema = (nx, ny)
+            else:
+                a = self.ema_alpha
+                ex, ey = self._ema
+                self._ema = (a * nx + (1.0 - a) * ex, a * ny + (1.0 - a) * ey)
+            return self._ema
+        return self._fx(float(nx), t), self._fy(float(ny), t)
+
+    def status(self) -> dict:
+        out = {"kind": self.kind, "mode": self.mode}
+        if self.kind == "ema":
+            out["emaAlpha"] = float(self.ema_alpha)
+        else:
+            p = self.params_for(self.mode)
+            out.update({"minCutoff": float(p.min_cutoff), "beta": float(p.beta), "dCutoff": float(p.d_cutoff)})
+        return out
+
+
+class LandmarkFilter:
+    """One Euro over whole (21, 3) landmark arrays, one state per hand label (vectorized)."""
+
+    def __init__(self, params: OneEuroParams = OneEuroParams(min_cutoff=1.5, beta=10.0, d_cutoff=1.0)):
+        self.params = params
+        self._f: Dict[str, OneEuroFilter] = {}
+
+    def reset(self):
+        self._f.clear()
+
+    def __call__(self, key: str, lm: np.ndarray, t: float) -> np.ndarray:
+        """Filters lm in place (same dtype) and returns it."""
+        f = self._f.get(key)
+        if f is None:
+            f = self._f[key] = OneEuroFilter(self.params)
+        out = f(lm.astype(np.float64), t)
+        lm[...] = out
+        return lm
@@ -0,0 +1,66 @@
+# py/gestureos_agent/framebuf.py
+# ---------------------------------------------------------------------------
+# Copy-free frame path helpers
+#
+# - 카메라 프레임은 그대로(미러링 안 함) 추론하고, 미러링은 landmark 좌표에서 한다
+#   (x -> 1 - x, handedness Left/Right swap; MediaPipe는 미러된 selfie 입력을 가정하므로)
+# - 색 변환(BGR->RGB)과 preview용 미러 이미지는 프레임마다 새로 만들지 않고
+#   한 번 잡아둔 버퍼에 dst= 로 덮어쓴다 (크기가 바뀔 때만 재할당)
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from .landmarks import as_landmarks, mirror_x
+
+_SWAP_HANDED = {"Left": "Right", "Right": "Left"}
+
+
+def mirror_hands(hands_meta: List[dict]) -> List[dict]:
+    """Raw-frame landmarks -> mirrored (user's view) landmarks, in place."""
+    for h in hands_meta:
+        lm = h.get("lm")
+        if lm is not None:
+            h["lm"] = mirror_x(as_landmarks(lm))
+        handed = h.get("handed")
+        if handed in _SWAP_HANDED:
+            h["handed"] = _SWAP_HANDED[handed]
+    return hands_meta
+
+
+class FrameBuffers:
+    """Scratch images reused every frame (one per purpose, reallocated only on size change)."""
+
+    def __init__(self):
+        self._bufs: Dict[str, np.ndarray] = {}
+        self.allocs = 0
+
+    def _get(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        buf = self._bufs.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            self._bufs[name] = buf
+            self.allocs += 1
+        return buf
+
+    def rgb(self, bgr: np.ndarray) -> np.ndarray:
+        """BGR -> RGB into the reused 'rgb' buffer (MediaPipe copies its input, so reuse is safe)."""
+        dst = self._get("rgb", bgr.shape)
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=dst)
+        return dst
+
+    def mirrored(self, bgr: np.ndarray) -> np.ndarray:
+        """Mirrored copy for the preview window (only built when the preview is shown)."""
+        dst = self._get("preview", bgr.shape)
+        cv2.flip(bgr, 1, dst=dst)
+        return dst
+
+    def release(self):
+        self._bufs.clear()
+
+    def nbytes(self) -> int:
+        return int(sum(b.nbytes for b in self._bufs.values()))
+
@@ -0,0 +1,238 @@
+# py/gestureos_agent/gesture_batch.py
+# ---------------------------------------------------------------------------
+# Vectorized rule gestures over (N, 21, 3) landmark stacks
+#
+# gestures.classify_gesture()와 같은 규칙 / 같은 순서 (FIST > PINCH_INDEX > V_SIGN > OPEN_PALM > OTHER)
+# 를 N개 손에 대해 NumPy 한 번에 계산한다. pinch distance / palm center / palm scale도 같이 나온다.
+# - 좌표는 float64로 올려서 계산 (스칼라 경로의 a.item() -> Python float 과 같은 정밀도)
+#   (np.hypot vs math.hypot: 거리는 1 ulp 차이가 날 수 있음, 제스처 결과는 같음)
+# - 라이브 루프(손 1~2개)는 HandFeatures 스칼라 경로가 더 빠르다 (bench_gesture_batch.py)
+# - pinch threshold: 고정값, 손별 배열, 또는 ratio 기반 (HandFeatures.pinch_thresh 와 같은 clamp)
+#
+# 오프라인: 녹화된 세션(.gosr)의 모든 손을 한 번에 분류 (분석 / 회귀 비교용)
+#   python -m gestureos_agent.gesture_batch SESSION.gosr [--ratio=0.35] [--out=g.jsonl] [--check]
+#   --check : 모든 손을 classify_gesture()로도 분류해서 결과가 같은지 확인
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .landmarks import LM_DTYPE, N_LM, PALM_IDX, PIP_IDX, TIP_IDX
+
+# gesture codes (int8). index = code
+GESTURES = ("NONE", "FIST", "PINCH_INDEX", "V_SIGN", "OPEN_PALM", "OTHER")
+G_NONE, G_FIST, G_PINCH, G_V, G_OPEN, G_OTHER = range(len(GESTURES))
+_NAMES = np.array(GESTURES, dtype=object)
+
+PINCH_FALLBACK = 0.06
+V_GAP = 0.06
+
+
+def stack_hands(hands: Sequence) -> np.ndarray:
+    """List of (21, 3) arrays (or HandFeatures) -> (N, 21, 3) float32."""
+    if not hands:
+        return np.empty((0, N_LM, 3), dtype=LM_DTYPE)
+    return np.stack([getattr(h, "lm", h) for h in hands]).astype(LM_DTYPE, copy=False)
+
+
+def pinch_thresh_batch(palm_scale: np.ndarray, ratio: Union[float, np.ndarray], fallback: float = PINCH_FALLBACK) -> np.ndarray:
+    """Ratio-based pinch threshold per hand (HandFeatures.pinch_thresh)."""
+    th = np.clip(np.asarray(ratio, dtype=np.float64) * palm_scale, 0.01, 0.20)
+    return np.where(palm_scale < 1e-6, float(fallback), th)
+
+
+@dataclass
+class BatchGestures:
+    codes: np.ndarray  # (N,) int8, index into GESTURES
+    pinch_dist: np.ndarray  # (N,) |4-8| (xy)
+    palm: np.ndarray  # (N, 2) palm center
+    palm_scale: np.ndarray  # (N,) |0-9| (xy)
+    pinch_thresh: np.ndarray  # (N,) threshold actually used
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[0])
+
+    @property
+    def names(self) -> List[str]:
+        return _NAMES[self.codes].tolist()
+
+    @property
+    def pinch_ratio(self) -> np.ndarray:
+        """|4-8| / palm scale, NaN where the palm is too small (HandFeatures.pinch_ratio -> None)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.palm_scale < 1e-6, np.nan, self.pinch_dist / self.palm_scale)
+
+
+def classify_batch(
+    lms,
+    pinch_thresh: Union[float, np.ndarray] = PINCH_FALLBACK,
+    pinch_ratio: Union[None, float, np.ndarray] = None,
+) -> BatchGestures:
+    """
+    lms: (N, 21, 3) array or list of hands.
+    pinch_ratio given -> threshold = clamp(ratio * palm_scale, 0.01, 0.20) (fallback 0.06 for tiny palms),
+    otherwise pinch_thresh (scalar or (N,)) is used as-is.
+    """
+    if not isinstance(lms, np.ndarray):
+        lms = stack_hands(lms)
+    a = np.asarray(lms, dtype=np.float64).reshape(-1, N_LM, 3)
+    n = a.shape[0]
+
+    x = a[:, :, 0]
+    y = a[:, :, 1]
+
+    y_tip = y[:, TIP_IDX]
+    y_pip = y[:, PIP_IDX]
+    ext = y_tip < y_pip  # (N, 4) index, middle, ring, pinky
+    folded = np.count_nonzero(y_tip > y_pip, axis=1)
+
+    pinch = np.hypot(x[:, 4] - x[:, 8], y[:, 4] - y[:, 8])
+    v_gap = np.hypot(x[:, 8] - x[:, 12], y[:, 8] - y[:, 12])
+    scale = np.hypot(x[:, 0] - x[:, 9], y[:, 0] - y[:, 9])
+    # sequential sum (same rounding as the scalar palm_center loop)
+    palm = np.zeros((n, 2), dtype=np.float64)
+    for i in PALM_IDX:
+        palm += a[:, i, :2]
+    palm /= 5.0
+
+    if pinch_ratio is not None:
+        th = pinch_thresh_batch(scale, pinch_ratio)
+    else:
+        th = np.broadcast_to(np.asarray(pinch_thresh, dtype=np.float64), (n,))
+
+    # rule order: first match wins -> assign in reverse priority
+    codes = np.full(n, G_OTHER, dtype=np.int8)
+    codes[ext.all(axis=1)] = G_OPEN
+    codes[ext[:, 0] & ext[:, 1] & ~ext[:, 2] & ~ext[:, 3] & (v_gap > V_GAP)] = G_V
+    codes[pinch < th] = G_PINCH
+    codes[folded >= 3] = G_FIST
+
+    return BatchGestures(codes=codes, pinch_dist=pinch, palm=palm, palm_scale=scale, pinch_thresh=np.array(th))
+
+
+# ---------------------------------------------------------------------------
+# offline: whole recorded sessions
+# ---------------------------------------------------------------------------
+@dataclass
+class SessionGestures:
+    """One row per recorded hand (frames with 2 hands -> 2 rows)."""
+
+    frame: np.ndarray  # (M,) frame index in the session
+    t: np.ndarray  # (M,) frame time
+    handed: np.ndarray  # (M,) -1 None, 0 Left, 1 Right (session_rec codes)
+    lm: np.ndarray  # (M, 21, 3)
+    result: BatchGestures
+    n_frames: int = 0
+
+    def counts(self) -> dict:
+        c = Counter(self.result.names)
+        return {g: int(c.get(g, 0)) for g in GESTURES[1:]}
+
+    def rows(self):
+        names = self.result.names
+        hmap = {-1: None, 0: "Left", 1: "Right"}
+        for i in range(len(names)):
+            yield {
+                "frame": int(self.frame[i]),
+                "t": float(self.t[i]),
+                "handed": hmap.get(int(self.handed[i])),
+                "gesture": names[i],
+                "pinch": round(float(self.result.pinch_dist[i]), 6),
+                "palm": [round(float(v), 6) for v in self.result.palm[i]],
+            }
+
+
+def load_session_hands(path: str):
+    """All hands of a .gosr session -> (frame, t, handed, lm[M, 21, 3]), n_frames."""
+    from .session_rec import SessionReader
+
+    _CODES = {"Left": 0, "Right": 1}
+    frame: List[int] = []
+    ts: List[float] = []
+    handed: List[int] = []
+    lms: List[np.ndarray] = []
+    n_frames = 0
+    for t, hands in SessionReader(path).frames():
+        for h in hands:
+            frame.append(n_frames)
+            ts.append(t)
+            handed.append(_CODES.get(h.get("handed"), -1))
+            lms.append(h["lm"])
+        n_frames += 1
+    return (
+        np.asarray(frame, dtype=np.int64),
+        np.asarray(ts, dtype=np.float64),
+        np.asarray(handed, dtype=np.int8),
+        stack_hands(lms),
+        n_frames,
+    )
+
+
+def classify_session(
+    path: str,
+    pinch_thresh: float = PINCH_FALLBACK,
+    pinch_ratio: Optional[float] = None,
+) -> SessionGestures:
+    frame, ts, handed, lm, n_frames = load_session_hands(path)
+    res = classify_batch(lm, pinch_thresh=pinch_thresh, pinch_ratio=pinch_ratio)
+    return SessionGestures(frame=frame, t=ts, handed=handed, lm=lm, result=res, n_frames=n_frames)
+
+
+def check_against_scalar(sg: SessionGestures) -> List[int]:
+    """Rows where classify_batch disagrees with gestures.classify_gesture (should be empty)."""
+    from .gestures import classify_gesture
+
+    names = sg.result.names
+    th = sg.result.pinch_thresh
+    return [i for i in range(len(names)) if classify_gesture(sg.lm[i], float(th[i])) != names[i]]
+
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    path = ""
+    out = ""
+    ratio: Optional[float] = None
+    thresh = PINCH_FALLBACK
+    check = False
+    for a in argv:
+        if a.startswith("--ratio="):
+            ratio = float(a.split("=", 1)[1])
+        elif a.startswith("--thresh="):
+            thresh = float(a.split("=", 1)[1])
+        elif a.startswith("--out="):
+            out = a.split("=", 1)[1]
+        elif a == "--check":
+            check = True
+        elif not a.startswith("--"):
+            path = a
+    if not path:
+        print("usage: python -m gestureos_agent.gesture_batch SESSION.gosr [--ratio=0.35|--thresh=0.06] [--out=g.jsonl] [--check]")
+        return 2
+
+    sg = classify_session(path, pinch_thresh=thresh, pinch_ratio=ratio)
+    print(f"[GEST] {path}: {sg.n_frames} frames, {len(sg.result)} hands", flush=True)
+    for g, c in sg.counts().items():
+        print(f"  {g:<12}{c:>8}")
+
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            for row in sg.rows():
+                f.write(json.dumps(row, ensure_ascii=False, sort_keys=True))
+                f.write("\n")
+        print("[GEST] rows ->", out, flush=True)
+
+    if check:
+        bad = check_against_scalar(sg)
+        print(f"[GEST] check vs classify_gesture: {len(bad)} mismatches", flush=True)
+        return 1 if bad else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,59 +1,88 @@
-from typing import List, Tuple, Optional
-from .mathutil import dist_xy
+import math
+from typing import Optional, Tuple
 
-# MediaPipe Hands landmark: list[(x,y,z)] length 21
-LM = List[Tuple[float, float, float]]
+import numpy as np
+
+from .landmarks import PALM_IDX, PIP_IDX, TIP_IDX, as_landmarks
+
+# MediaPipe Hands landmark: (21, 3) float32 array (landmarks.py); list[(x,y,z)] also accepted
+# NOTE: 21개짜리 배열에 numpy 연산(fancy index/mean)을 쓰면 호출 오버헤드가 더 크다
+#       -> 필요한 좌표만 a.item(i, j)로 읽는다 (tuple/list 생성 없음)
+LM = np.ndarray
+
+
+def _tip_dist(a: np.ndarray, i: int, j: int) -> float:
+    return math.hypot(a.item(i, 0) - a.item(j, 0), a.item(i, 1) - a.item(j, 1))
 
 def finger_extended(lm: LM, tip: int, pip: int) -> bool:
     # tip y가 pip y보다 위(작음)면 펴짐
-    return lm[tip][1] < lm[pip][1]
+    a = as_landmarks(lm)
+    return a.item(tip, 1) < a.item(pip, 1)
+
+def _extended(a: np.ndarray) -> Tuple[bool, bool, bool, bool]:
+    y = a.item
+    return (y(8, 1) < y(6, 1), y(12, 1) < y(10, 1), y(16, 1) < y(14, 1), y(20, 1) < y(18, 1))
 
 def is_fist(lm: LM) -> bool:
-    tips = [8, 12, 16, 20]
-    pips = [6, 10, 14, 18]
+    a = as_landmarks(lm)
     folded = 0
-    for t, p in zip(tips, pips):
-        if lm[t][1] > lm[p][1]:
+    for t, p in zip(TIP_IDX, PIP_IDX):
+        if a.item(t, 1) > a.item(p, 1):
             folded += 1
     return folded >= 3
 
 def is_open_palm(lm: LM) -> bool:
-    idx = finger_extended(lm, 8, 6)
-    mid = finger_extended(lm, 12, 10)
-    ring = finger_extended(lm, 16, 14)
-    pinky = finger_extended(lm, 20, 18)
-    return idx and mid and ring and pinky
+    return all(_extended(as_landmarks(lm)))
 
 def is_pinch_index(lm: LM, thresh: float = 0.06) -> bool:
-    return dist_xy((lm[4][0], lm[4][1]), (lm[8][0], lm[8][1])) < thresh
+    return _tip_dist(as_landmarks(lm), 4, 8) < thresh
 
 def is_two_finger(lm: LM) -> bool:
-    idx = finger_extended(lm, 8, 6)
-    mid = finger_extended(lm, 12, 10)
-    ring = finger_extended(lm, 16, 14)
-    pinky = finger_extended(lm, 20, 18)
+    idx, mid, ring, pinky = _extended(as_landmarks(lm))
     return idx and mid and (not ring) and (not pinky)
 
 def is_v_sign(lm: LM) -> bool:
     if not is_two_finger(lm):
         return False
-    return dist_xy((lm[8][0], lm[8][1]), (lm[12][0], lm[12][1])) > 0.06
+    return _tip_dist(as_landmarks(lm), 8, 12) > 0.06
 
-def classify_gesture(lm: Optional[LM], pinch_thresh: float = 0.06) -> str:
-    if lm is None:
-        return "NONE"
-    if is_fist(lm):
+def rule_gesture(folded: int, extended, pinch_dist: float, v_gap: float, pinch_thresh: float = 0.06) -> str:
+    """
+    Rule order shared by classify_gesture() and features.HandFeatures:
+    FIST > PINCH_INDEX > V_SIGN > OPEN_PALM > OTHER
+    folded: fingers with tip below PIP, extended: (index, middle, ring, pinky),
+    pinch_dist: |4-8|, v_gap: |8-12|
+    """
+    if folded >= 3:
         return "FIST"
-    if is_pinch_index(lm, pinch_thresh):
+    if pinch_dist < pinch_thresh:
         return "PINCH_INDEX"
-    if is_v_sign(lm):
+    idx, mid, ring, pinky = extended
+    if idx and mid and (not ring) and (not pinky) and v_gap > 0.06:
         return "V_SIGN"
-    if is_open_palm(lm):
+    if idx and mid and ring and pinky:
         return "OPEN_PALM"
     return "OTHER"
 
+def classify_gesture(lm: Optional[LM], pinch_thresh: float = 0.06) -> str:
+    if lm is None:
+        return "NONE"
+    gesture = getattr(lm, "gesture", None)
+    if gesture is not None:
+        # features.HandFeatures (memoized)
+        return gesture(pinch_thresh)
+    a = as_landmarks(lm)
+    y = a.item
+    folded = (y(8, 1) > y(6, 1)) + (y(12, 1) > y(10, 1)) + (y(16, 1) > y(14, 1)) + (y(20, 1) > y(18, 1))
+    return rule_gesture(folded, _extended(a), _tip_dist(a, 4, 8), _tip_dist(a, 8, 12), pinch_thresh)
+
 def palm_center(lm: LM) -> Tuple[float, float]:
-    idx = [0, 5, 9, 13, 17]
-    xs = [lm[i][0] for i in idx]
-    ys = [lm[i][1] for i in idx]
-    return (sum(xs) / len(xs), sum(ys) / len(ys))
+    if hasattr(lm, "palm_center"):
+        return lm.palm_center
+    a = as_landmarks(lm)
+    sx = 0.0
+    sy = 0.0
+    for i in PALM_IDX:
+        sx += a.item(i, 0)
+        sy += a.item(i, 1)
+    return (sx / 5.0, sy / 5.0)
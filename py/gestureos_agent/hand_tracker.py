@@ -0,0 +1,199 @@
+# py/gestureos_agent/hand_tracker.py
+# ---------------------------------------------------------------------------
+# Persistent hand identity across frames
+#
+# MediaPipe handedness는 프레임마다 따로 나와서 가끔 한 프레임 뒤집힌다 (Right -> Left -> Right).
+# 그걸 그대로 쓰면 cursor/other 손이 그 프레임만 바뀌어서 커서가 튄다.
+#   - 손마다 track(id)을 유지: palm center + 속도로 예측한 위치와의 거리가 최소인 매칭
+#     (손 수가 작아서 전수 탐색 = 최적, gate 밖이면 새 track)
+#   - 안 보여도 keep_sec 동안 track 유지 -> 짧게 놓쳤다 다시 잡혀도 같은 id / 같은 handed
+#   - handed = track별 handedness 투표 EMA + hysteresis (한두 프레임 뒤집힘은 무시)
+#     EMA(side)가 반대쪽으로 label_hold x score 를 넘어야 바뀐다 (0 근처에서 바뀌면 2프레임 flip에도 뒤집힘)
+#     alpha 0.25 / hold 0.5: score 0.8~0.95 에서 4~5프레임 연속 반대 투표가 있어야 전환
+#
+# hands_agent 의 cursor/other 선택과 rush_lr(왼/오 lane)가 같은 track을 쓴다.
+# 시간은 프레임 시각 t -> replay 결정성 유지.
+# 비용/효과: python bench/bench_hand_tracker.py
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (handed label or None, handedness score, palm cx, palm cy)
+Detection = Tuple[Optional[str], float, float, float]
+
+
+@dataclass
+class HandTrack:
+    id: int
+    cx: float
+    cy: float
+    t: float  # last seen
+    vx: float = 0.0
+    vy: float = 0.0
+    side: float = 0.0  # handedness vote EMA: +1 Right .. -1 Left
+    handed: Optional[str] = None  # stable label (hysteresis on side)
+    score: float = 0.0  # last handedness score
+    hits: int = 1
+    seen: bool = True  # matched this frame
+
+    def predict(self, t: float, max_dt: float = 0.1) -> Tuple[float, float]:
+        dt = min(max_dt, max(0.0, t - self.t))
+        return self.cx + self.vx * dt, self.cy + self.vy * dt
+
+
+def _signed(label: Optional[str], score: float) -> Optional[float]:
+    if label == "Right":
+        return abs(score)
+    if label == "Left":
+        return -abs(score)
+    return None
+
+
+def min_cost_match(cost: Sequence[Sequence[float]], gate: float) -> Tuple[int, ...]:
+    """Detection i -> track j (or -1 = new). Pairs at/over gate are not allowed; unmatched costs gate."""
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    best_cost = [math.inf]
+    best: List[Tuple[int, ...]] = [tuple([-1] * n)]
+    pick: List[int] = []
+
+    def rec(i: int, used: int, acc: float):
+        if acc >= best_cost[0]:
+            return
+        if i == n:
+            best_cost[0] = acc
+            best[0] = tuple(pick)
+            return
+        row = cost[i]
+        for j in range(m):
+            if not (used >> j) & 1 and row[j] < gate:
+                pick.append(j)
+                rec(i + 1, used | (1 << j), acc + row[j])
+                pick.pop()
+        pick.append(-1)
+        rec(i + 1, used, acc + gate)
+        pick.pop()
+
+    rec(0, 0, 0.0)
+    return best[0]
+
+
+class HandTracker:
+    def __init__(
+        self,
+        gate: float = 0.25,
+        keep_sec: float = 0.30,
+        label_alpha: float = 0.25,
+        label_hold: float = 0.50,
+        label_weight: float = 0.05,
+        max_tracks: int = 4,
+    ):
+        self.gate = float(gate)  # image-normalized palm distance
+        self.keep_sec = float(keep_sec)
+        self.label_alpha = float(label_alpha)
+        self.label_hold = float(label_hold)  # switch threshold on side, as a fraction of the vote score
+        self.label_weight = float(label_weight)  # extra cost when the detection label disagrees with the track
+        self.max_tracks = int(max_tracks)
+
+        self.tracks: List[HandTrack] = []
+        self._next_id = 1
+        self.label_flips = 0  # detections whose label disagreed with their stable track label
+
+    def reset(self):
+        self.tracks = []
+
+    def visible(self) -> List[HandTrack]:
+        return [tr for tr in self.tracks if tr.seen]
+
+    def get(self, track_id: Optional[int]) -> Optional[HandTrack]:
+        for tr in self.tracks:
+            if tr.id == track_id:
+                return tr
+        return None
+
+    def _cost(self, tr: HandTrack, d: Detection, t: float) -> float:
+        px, py = tr.predict(t)
+        c = math.hypot(d[2] - px, d[3] - py)
+        if d[0] is not None and tr.handed is not None and d[0] != tr.handed:
+            c += self.label_weight
+        return c
+
+    def _vote(self, tr: HandTrack, label: Optional[str], score: float):
+        s = _signed(label, score)
+        if s is None:
+            return
+        tr.score = float(score)
+        if tr.handed is None:
+            tr.side = s
+            tr.handed = label
+            return
+        if label != tr.handed:
+            self.label_flips += 1
+        a = self.label_alpha
+        tr.side = (1.0 - a) * tr.side + a * s
+        hold = self.label_hold * abs(s)
+        if tr.side > hold:
+            tr.handed = "Right"
+        elif tr.side < -hold:
+            tr.handed = "Left"
+
+    def update(self, t: float, dets: Sequence[Detection]) -> List[Optional[HandTrack]]:
+        """One frame of detections -> the track of each detection (same order)."""
+        t = float(t)
+        self.tracks = [tr for tr in self.tracks if (t - tr.t) <= self.keep_sec]
+        for tr in self.tracks:
+            tr.seen = False
+
+        dets = list(dets)
+        out: List[Optional[HandTrack]] = [None] * len(dets)
+        if not dets:
+            return out
+
+        cost = [[self._cost(tr, d, t) for tr in self.tracks] for d in dets]
+        assign = min_cost_match(cost, self.gate)
+
+        for i, (d, j) in enumerate(zip(dets, assign)):
+            label, score, cx, cy = d
+            if j >= 0:
+                tr = self.tracks[j]
+                dt = t - tr.t
+                if dt > 1e-6:
+                    ivx = (cx - tr.cx) / dt
+                    ivy = (cy - tr.cy) / dt
+                    tr.vx = 0.5 * ivx + 0.5 * tr.vx
+                    tr.vy = 0.5 * ivy + 0.5 * tr.vy
+                tr.cx, tr.cy, tr.t = float(cx), float(cy), t
+                tr.hits += 1
+                tr.seen = True
+                self._vote(tr, label, score)
+            else:
+                tr = HandTrack(id=self._next_id, cx=float(cx), cy=float(cy), t=t)
+                self._next_id += 1
+                self._vote(tr, label, score)
+                self.tracks.append(tr)
+            out[i] = tr
+
+        if len(self.tracks) > self.max_tracks:
+            # drop the longest-missing tracks first
+            keep = sorted(self.tracks, key=lambda tr: (not tr.seen, -tr.t))[: self.max_tracks]
+            ids = {tr.id for tr in keep}
+            self.tracks = [tr for tr in self.tracks if tr.id in ids]
+        return out
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "tracks": [
+                {
+                    "id": tr.id,
+                    "handed": tr.handed,
+                    "seen": bool(tr.seen),
+                    "x": round(float(tr.cx), 4),
+                    "y": round(float(tr.cy), 4),
+                }
+                for tr in self.tracks
+            ],
+            "labelFlips": int(self.label_flips),
+        }
@@ -0,0 +1,73 @@
+# py/gestureos_agent/landmarks.py
+# ---------------------------------------------------------------------------
+# Hand landmarks as one (21, 3) float32 array per hand
+#
+# MediaPipe 결과에서 한 번만 만들고 (from_mediapipe), 이후 gestures / learner / ROI /
+# mirror / STATUS payload가 같은 배열을 그대로 쓴다 (프레임마다 tuple 21개 x 여러 번 생성 X).
+#
+# 호환: ndarray는 기존 list[(x, y, z)] 코드가 쓰던 lm[i][j], x, y, z = lm[i], len(lm),
+# for (x, y, z) in lm 를 그대로 지원한다. 다른 점은 truthiness 뿐이라 (`if not lm` -> 에러)
+# 호출부는 `lm is None`으로 검사한다. 진짜 tuple 리스트가 필요하면 as_tuples().
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+N_LM = 21
+LM_DTYPE = np.float32
+
+# landmark index tuples, shared by gestures / features / gesture_batch
+# (plain tuples: scalar loops iterate them, numpy fancy-indexes with them)
+# wrist + MCPs (palm_center)
+PALM_IDX = (0, 5, 9, 13, 17)
+# finger tips / PIPs (index, middle, ring, pinky)
+TIP_IDX = (8, 12, 16, 20)
+PIP_IDX = (6, 10, 14, 18)
+
+
+def _coords(points) -> Iterator[float]:
+    for p in points:
+        yield p.x
+        yield p.y
+        yield p.z
+
+
+def from_mediapipe(lm_obj) -> np.ndarray:
+    """NormalizedLandmarkList -> (21, 3) float32 (no per-point tuples)."""
+    pts = lm_obj.landmark
+    return np.fromiter(_coords(pts), dtype=LM_DTYPE, count=3 * len(pts)).reshape(-1, 3)
+
+
+def as_landmarks(lm) -> Optional[np.ndarray]:
+    """Array as-is, list of (x, y, z) -> (N, 3) float32. None stays None."""
+    if lm is None:
+        return None
+    if isinstance(lm, np.ndarray) and lm.dtype == LM_DTYPE and lm.ndim == 2:
+        return lm
+    return np.asarray(lm, dtype=LM_DTYPE).reshape(-1, 3)
+
+
+def is_hand(lm) -> bool:
+    return lm is not None and len(lm) == N_LM
+
+
+def as_tuples(lm) -> Optional[List[Tuple[float, float, float]]]:
+    """Legacy list-of-tuples view (Python floats)."""
+    if lm is None:
+        return None
+    return [tuple(p) for p in as_landmarks(lm).tolist()]
+
+
+def mirror_x(lm: np.ndarray) -> np.ndarray:
+    """x -> 1 - x in place."""
+    xs = lm[:, 0]
+    np.subtract(1.0, xs, out=xs)
+    return lm
+
+
+def to_payload(lm) -> list:
+    if lm is None:
+        return []
+    return [{"x": x, "y": y, "z": z} for x, y, z in as_landmarks(lm).tolist()]
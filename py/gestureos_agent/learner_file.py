@@ -0,0 +1,138 @@
+# py/gestureos_agent/learner_file.py
+# ---------------------------------------------------------------------------
+# Learner profile files: binary .npz (JSON header + raw arrays) and mlp_v1 JSON
+#
+# mlp_v1 JSON 은 가중치를 중첩 float 리스트로 저장 -> 쓰기 / json.load 가 느리고 파일도 크다.
+# set_profile 마다 save + load 를 하므로 프로필 전환이 그만큼 느렸음.
+#   <profile>.npz  schema "mlp_v2" (np.savez, 압축 없음, allow_pickle=False 로 읽음)
+#     header              : uint8 = UTF-8 JSON (설정, 라벨, proto sigma/n, train_metrics, json_sig)
+#     mlp.<hand>.<key>    : mean std W1 b1 W2 b2 W3 b3 (학습 dtype float32 그대로 -> 무손실)
+#     proto.<hand>        : centroid 행렬 float64 (행 순서 = header 의 라벨 순서)
+#   <profile>.json mlp_v1: 서버(Java LearnerProfileFileStore)가 DB 동기화에 그대로 읽고 쓰는 파일.
+#     에이전트는 내용이 바뀔 때만 다시 쓴다. npz header 의 json_sig (크기 + crc32) 가
+#     지금 JSON 과 다르면 (서버가 DB 에서 받아 새로 씀 / npz 이전 버전 프로필) JSON 을 읽어 npz 로 옮긴다.
+# 쓰기는 모두 임시 파일 -> os.replace (읽는 쪽이 반쯤 쓴 파일을 보지 않음).
+# 비용: python bench/bench_learner.py --io
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+SCHEMA = "mlp_v2"
+JSON_SCHEMA = "mlp_v1"
+HANDS = ("cursor", "other")
+MLP_KEYS = ("mean", "std", "W1", "b1", "W2", "b2", "W3", "b3")
+
+
+def _sig(data: bytes) -> List[int]:
+    return [len(data), zlib.crc32(data) & 0xFFFFFFFF]
+
+
+def file_sig(path: str) -> Optional[List[int]]:
+    """[size, crc32] of a file (None if missing/unreadable)."""
+    try:
+        with open(path, "rb") as f:
+            return _sig(f.read())
+    except OSError:
+        return None
+
+
+def _replace(tmp: str, path: str, data: bytes):
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def to_json_obj(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Profile state (arrays or lists) -> mlp_v1 JSON object."""
+    obj = dict(state)
+    obj["schema"] = JSON_SCHEMA
+    obj.pop("json_sig", None)
+    obj["mlp"] = {
+        hand: {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in (m or {}).items()}
+        for hand, m in (state.get("mlp") or {}).items()
+    }
+    return obj
+
+
+def write_json_atomic(path: str, state: Dict[str, Any]) -> List[int]:
+    """mlp_v1 JSON, 임시 파일 -> os.replace. 쓴 내용의 json_sig 반환"""
+    data = json.dumps(to_json_obj(state), ensure_ascii=False).encode("utf-8")
+    _replace(path + ".tmp", path, data)
+    return _sig(data)
+
+
+def read_json(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        data = f.read()
+    obj = json.loads(data.decode("utf-8"))
+    if not isinstance(obj, dict):
+        raise ValueError("profile json is not an object")
+    obj["json_sig"] = _sig(data)
+    return obj
+
+
+def write_npz_atomic(path: str, state: Dict[str, Any], json_sig: Optional[List[int]]):
+    """Profile state -> <profile>.npz (schema mlp_v2), 임시 파일 -> os.replace."""
+    header = {k: v for k, v in state.items() if k not in ("mlp", "proto", "json_sig")}
+    header["schema"] = SCHEMA
+    header["json_sig"] = json_sig
+    arrays: Dict[str, np.ndarray] = {}
+
+    mlp_h = {}
+    for hand, m in (state.get("mlp") or {}).items():
+        if not m or not m.get("labels"):
+            mlp_h[hand] = {}
+            continue
+        mlp_h[hand] = {"labels": [str(l) for l in m["labels"]]}
+        for k in MLP_KEYS:
+            arrays[f"mlp.{hand}.{k}"] = np.asarray(m[k], dtype=np.float32)
+    header["mlp"] = mlp_h
+
+    proto_h = {}
+    for hand, models in (state.get("proto") or {}).items():
+        labels = [lab for lab, pm in (models or {}).items() if pm.get("centroid")]
+        proto_h[hand] = {lab: {"sigma": float(models[lab]["sigma"]), "n": int(models[lab].get("n", 0))} for lab in labels}
+        if labels:
+            arrays[f"proto.{hand}"] = np.asarray([models[lab]["centroid"] for lab in labels], dtype=np.float64)
+    header["proto"] = proto_h
+
+    arrays["header"] = np.frombuffer(json.dumps(header, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def read_npz(path: str) -> Dict[str, Any]:
+    """<profile>.npz -> profile state (mlp 는 float32 배열, proto centroid 는 리스트 = JSON 과 같은 값)."""
+    with np.load(path, allow_pickle=False) as z:
+        header = json.loads(bytes(z["header"]).decode("utf-8"))
+        if header.get("schema") != SCHEMA:
+            raise ValueError(f"unknown profile schema {header.get('schema')!r}")
+        mlp = {}
+        for hand, mh in (header.get("mlp") or {}).items():
+            if not mh:
+                mlp[hand] = {}
+                continue
+            m: Dict[str, Any] = {"labels": list(mh["labels"])}
+            for k in MLP_KEYS:
+                m[k] = z[f"mlp.{hand}.{k}"]
+            mlp[hand] = m
+        proto = {}
+        for hand, ph in (header.get("proto") or {}).items():
+            proto[hand] = {}
+            if not ph:
+                continue
+            cents = z[f"proto.{hand}"].tolist()
+            for lab, c in zip(ph, cents):
+                proto[hand][lab] = {"centroid": c, "sigma": float(ph[lab]["sigma"]), "n": int(ph[lab].get("n", 0))}
+    state = dict(header)
+    state["mlp"] = mlp
+    state["proto"] = proto
+    return state
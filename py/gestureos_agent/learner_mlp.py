@@ -1,12 +1,17 @@
 import os
-import json
 import time
 import math
 import shutil
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from .features import HandFeatures
+from .learner_file import file_sig, read_json, read_npz, write_json_atomic, write_npz_atomic
+from .sample_store import SampleStore, Samples
+
 
 # 프로필별 모델 저장 폴더 설정 (환경변수 TEMP가 없으면 현재 디렉토리 사용)
 _BASE_DIR = os.path.join(os.getenv("TEMP", "."), "GestureOS_learner_profiles")
@@ -17,6 +22,27 @@ os.makedirs(_BASE_DIR, exist_ok=True)
 # 한 라벨(제스처)당 최대 수집 가능한 샘플 수 제한
 MAX_SAMPLES_PER_LABEL = 900
 
+# 학습 시간 상한 (양손 합계, 초). 넘으면 그때까지 가장 좋았던(val loss) 가중치로 끝냄
+TRAIN_BUDGET_SEC = float(os.getenv("GESTUREOS_TRAIN_BUDGET_SEC", "8.0"))
+# 이 정확도 미만인 라벨은 STATUS learnMetrics needMore 에 올림 (캡처 더 필요)
+NEED_MORE_ACC = 0.90
+
+
+@dataclass(frozen=True)
+class TrainParams:
+    batch_size: int = 64  # 0 = full batch
+    max_epochs: int = 200
+    lr: float = 0.002
+    val_frac: float = 0.15  # 라벨별로 떼어 두는 검증 비율 (0 = 검증 없음)
+    patience: int = 10  # val loss 가 이만큼 epoch 동안 안 좋아지면 중단 (0 = 끔)
+    min_delta: float = 1e-4
+    seed: int = 42
+
+
+TRAIN_PARAMS = TrainParams(batch_size=int(os.getenv("GESTUREOS_TRAIN_BATCH", "64")))
+# 이전 방식 (full batch 220 epoch, lr 0.01, 검증 없음) -> 같은 샘플이면 같은 가중치
+LEGACY_TRAIN_PARAMS = TrainParams(batch_size=0, max_epochs=220, lr=0.01, val_frac=0.0, patience=0)
+
 
 def _sanitize_profile(name: str) -> str:
     """파일명으로 사용하기 부적절한 문자를 제거하거나 변경하는 함수"""
@@ -50,17 +76,9 @@ def _pinch_ratio(lm) -> Optional[float]:
     try:
         if lm is None or len(lm) != 21: # 랜드마크 데이터가 유효하지 않으면 None
             return None
-        x0, y0, _ = lm[0] # 손목 좌표
-        x9, y9, _ = lm[9] # 중지 시작 마디 좌표
-        # 손바닥의 대략적인 크기 계산
-        palm = math.sqrt((x0 - x9) ** 2 + (y0 - y9) ** 2)
-        if palm < 1e-6: # 0으로 나누기 방지
-            return None
-        x4, y4, _ = lm[4] # 엄지 끝
-        x8, y8, _ = lm[8] # 검지 끝
-        # 엄지와 검지 사이의 거리 계산
-        pinch = math.sqrt((x4 - x8) ** 2 + (y4 - y8) ** 2)
-        return float(pinch / palm) # 비율 반환
+        # 손바닥 크기(손목 0번 ~ 중지 시작 마디 9번) 대비 엄지 끝(4)-검지 끝(8) 거리
+        # (HandFeatures가 넘어오면 이번 프레임에 이미 계산된 값을 그대로 씀)
+        return HandFeatures.of(lm).pinch_ratio
     except Exception:
         return None
 
@@ -72,6 +90,444 @@ def _softmax(z: np.ndarray) -> np.ndarray:
     return e / np.sum(e, axis=1, keepdims=True)
 
 
+class CompiledMLP:
+    """
+    추론 전용으로 한 번 컴파일된 MLP (self.mlp[hand] JSON dict -> 연속 float32 배열).
+    - 입력 정규화 (x - mean) / std 를 첫 레이어에 접어 넣음: W1' = W1 / std, b1' = b1 - (mean / std) @ W1
+      (float64로 계산 후 float32로 저장)
+    - 활성값 버퍼를 미리 잡아 두고 np.dot(out=...) 로 재사용 -> 프레임마다 할당/리스트 변환 없음
+    - 버퍼를 공유하므로 한 스레드(프레임 루프)에서만 호출
+    """
+
+    def __init__(self, m: Dict[str, Any]):
+        self.labels: Tuple[str, ...] = tuple(str(l) for l in m["labels"])
+        mean = np.asarray(m["mean"], dtype=np.float64)
+        std = np.asarray(m["std"], dtype=np.float64) + 1e-6
+        W1 = np.asarray(m["W1"], dtype=np.float64)
+        b1 = np.asarray(m["b1"], dtype=np.float64)
+
+        self.W1 = np.ascontiguousarray(W1 / std[:, None], dtype=np.float32)
+        self.b1 = np.ascontiguousarray(b1 - (mean / std) @ W1, dtype=np.float32)
+        self.W2 = np.ascontiguousarray(m["W2"], dtype=np.float32)
+        self.b2 = np.ascontiguousarray(m["b2"], dtype=np.float32)
+        self.W3 = np.ascontiguousarray(m["W3"], dtype=np.float32)
+        self.b3 = np.ascontiguousarray(m["b3"], dtype=np.float32)
+        if not (self.W1.shape[1] == self.W2.shape[0] and self.W2.shape[1] == self.W3.shape[0] == len(self.b2)
+                and self.W3.shape[1] == len(self.b3) == len(self.labels) and len(self.b1) == self.W1.shape[1]):
+            raise ValueError("inconsistent MLP shapes")
+
+        self.dim = int(self.W1.shape[0])
+        self._x = np.zeros((self.dim,), dtype=np.float32)
+        self._a1 = np.zeros((self.W1.shape[1],), dtype=np.float32)
+        self._a2 = np.zeros((self.W2.shape[1],), dtype=np.float32)
+        self._z = np.zeros((self.W3.shape[1],), dtype=np.float32)
+
+    def predict(self, vec) -> Tuple[Optional[str], float]:
+        x = vec
+        if not (isinstance(x, np.ndarray) and x.dtype == np.float32 and x.ndim == 1 and x.flags.c_contiguous):
+            x = self._x
+            x[:] = np.asarray(vec, dtype=np.float32).reshape(-1)
+        if x.shape[0] != self.dim:
+            return None, 0.0
+
+        a1, a2, z = self._a1, self._a2, self._z
+        np.dot(x, self.W1, out=a1); a1 += self.b1; np.maximum(a1, 0.0, out=a1)
+        np.dot(a1, self.W2, out=a2); a2 += self.b2; np.maximum(a2, 0.0, out=a2)
+        np.dot(a2, self.W3, out=z); z += self.b3
+
+        # softmax 의 argmax 확률만 필요
+        idx = int(z.argmax())
+        z -= z[idx]
+        np.exp(z, out=z)
+        return self.labels[idx], float(1.0 / z.sum())
+
+
+def compile_mlp(m: Optional[Dict[str, Any]]) -> Optional[CompiledMLP]:
+    """self.mlp[hand] (JSON dict) -> CompiledMLP, 비었거나 깨졌으면 None (프로토타입 모델로 fallback)"""
+    if not m or not m.get("labels"):
+        return None
+    try:
+        return CompiledMLP(m)
+    except Exception as e:
+        print("[LEARN] compile mlp failed:", e, flush=True)
+        return None
+
+
+class TrainCancelled(Exception):
+    """학습 취소 (cancel_training / rollback / reset / 프로필 변경 / 새 학습 요청)"""
+
+
+def _build_proto(samples: Samples, min_samples: int) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """간단한 평균값 기반 모델 생성 (MLP가 동작 안할 때의 대비책)"""
+    proto: Dict[str, Dict[str, Dict[str, Any]]] = {"cursor": {}, "other": {}}
+    for hand, mp in samples.items():
+        for label, vecs in mp.items():
+            if len(vecs) < min_samples:
+                continue
+            X = np.asarray(vecs, dtype=np.float64)
+            # 1. 해당 제스처의 모든 샘플의 평균(Centroid) 계산
+            c = X.mean(axis=0)
+            # 2. 평균으로부터의 표준편차(Sigma) 계산 (얼마나 일관적인지)
+            s2 = float(((X - c) ** 2).sum(axis=1).mean())
+            sigma = math.sqrt(s2) + 1e-6
+
+            proto.setdefault(hand, {})[label] = {"centroid": c.tolist(), "sigma": float(sigma), "n": int(len(X))}
+    return proto
+
+
+def _calibrate_pinch_ratio(pos: List[float], neg: List[float]) -> Optional[float]:
+    """핀치 제스처를 판단하는 기준점(Threshold)을 수집된 데이터를 바탕으로 자동 설정 (샘플 부족 시 None)"""
+    if len(pos) < 10: return None
+
+    pos_arr = np.asarray(pos, dtype=np.float32)
+    if len(neg) >= 10:
+        neg_arr = np.asarray(neg, dtype=np.float32)
+        # 핀치 데이터의 상위 85% 지점과 일반 데이터의 하위 15% 지점의 중간을 문턱값으로 설정
+        pos_hi = float(np.quantile(pos_arr, 0.85))
+        neg_lo = float(np.quantile(neg_arr, 0.15))
+        thr = (pos_hi + neg_lo) * 0.5
+    else:
+        # 일반 데이터가 없으면 핀치 중간값의 120% 수준으로 설정
+        thr = float(np.median(pos_arr) * 1.20)
+
+    # 너무 작거나 큰 값이 되지 않도록 범위 제한 (0.12 ~ 0.60)
+    return float(max(0.12, min(0.60, thr)))
+
+
+def _train_mlp(
+    mp: Dict[str, np.ndarray],
+    min_samples: int,
+    default_labels: List[str],
+    on_epoch: Optional[Callable[[int, int, float, Optional[float]], None]] = None,
+    params: Optional[TrainParams] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    넘파이(Numpy)만을 이용해 직접 MLP 학습을 수행하는 핵심 로직 -> (mlp[hand] 형태의 dict, metrics)
+    ({} = 학습 불가)
+    - 라벨별 검증 split, 섞은 mini-batch Adam, val loss early stopping (가장 좋았던 가중치로 복원)
+    - deadline (time.monotonic 기준)을 넘으면 그 epoch 에서 멈춤
+    on_epoch(epoch, max_epochs, train_loss, val_loss): 진행 상황 콜백 (TrainCancelled 를 던지면 중단)
+    """
+    p = params or TRAIN_PARAMS
+    # 학습 가능한 라벨 필터링 (최소 샘플 수 이상인 것들만)
+    labels = []
+    for l in default_labels:
+        if len(mp.get(l, [])) >= min_samples:
+            labels.append(l)
+    for l, vs in mp.items():
+        if l not in labels and len(vs) >= min_samples:
+            labels.append(l)
+
+    # 분류할 클래스가 최소 2개는 있어야 학습 가능
+    if len(labels) < 2:
+        return {}, {}
+
+    # 라벨별 (n, dim) 배열을 이어 붙임 (샘플 저장소의 매핑에서 모은 float32 배열, 리스트도 가능)
+    parts = [np.asarray(mp[lab], dtype=np.float32) for lab in labels]
+    X = np.concatenate(parts, axis=0)
+    y = np.repeat(np.arange(len(labels), dtype=np.int64), [len(a) for a in parts])
+    k = len(labels)
+
+    # 라벨별(층화) 검증 분리: 각 라벨에서 val_frac 만큼 무작위로 떼어 둠 (학습용은 최소 1개 남김)
+    srng = np.random.default_rng(p.seed + 1)
+    tr_parts: List[np.ndarray] = []
+    va_parts: List[np.ndarray] = []
+    for yi in range(k):
+        idx = np.flatnonzero(y == yi)
+        nv = min(len(idx) - 1, int(round(len(idx) * p.val_frac))) if p.val_frac > 0 else 0
+        if nv > 0:
+            idx = srng.permutation(idx)
+            va_parts.append(idx[:nv])
+        tr_parts.append(idx[nv:])
+    tr = np.concatenate(tr_parts)
+    va = np.concatenate(va_parts) if va_parts else np.zeros((0,), dtype=np.int64)
+    Xtr, ytr = X[tr], y[tr]
+    n, d = Xtr.shape # n: 학습 샘플 수, d: 특징 차원(63)
+
+    # 데이터 표준화 (평균 0, 표준편차 1로 변환) - 학습 split 기준
+    mean = Xtr.mean(axis=0)
+    std = Xtr.std(axis=0) + 1e-6
+    Xn = (Xtr - mean) / std
+    Xv = (X[va] - mean) / std
+    yv = y[va]
+
+    # 레이어 구조: 입력(63) -> 은닉1(128) -> 은닉2(64) -> 출력(라벨 수)
+    h1, h2 = 128, 64
+
+    # 가중치 초기화 (Xavier/Glorot Initialization)
+    rng = np.random.default_rng(p.seed)
+    def xavier(in_dim, out_dim):
+        lim = math.sqrt(6.0 / float(in_dim + out_dim))
+        return rng.uniform(-lim, lim, size=(in_dim, out_dim)).astype(np.float32)
+
+    W1 = xavier(d, h1); b1 = np.zeros((h1,), dtype=np.float32)
+    W2 = xavier(h1, h2); b2 = np.zeros((h2,), dtype=np.float32)
+    W3 = xavier(h2, k); b3 = np.zeros((k,), dtype=np.float32)
+    params = [W1, b1, W2, b2, W3, b3]
+
+    # Adam 최적화 알고리즘 파라미터
+    lr = p.lr
+    beta1, beta2 = 0.9, 0.999
+    eps = 1e-8
+    # 모멘텀 및 속도 변수 초기화
+    ms = [np.zeros_like(w) for w in params]
+    vs = [np.zeros_like(w) for w in params]
+
+    def relu(a): return np.maximum(a, 0.0)
+
+    def adam_step(param, grad, m, v, t):
+        """가중치를 업데이트하는 Adam 한 단계 수행"""
+        m[:] = beta1 * m + (1.0 - beta1) * grad
+        v[:] = beta2 * v + (1.0 - beta2) * (grad * grad)
+        mh = m / (1.0 - beta1 ** t)
+        vh = v / (1.0 - beta2 ** t)
+        param[:] = param - lr * mh / (np.sqrt(vh) + eps)
+
+    def forward(Xb):
+        z1 = Xb @ W1 + b1
+        a1 = relu(z1)
+        z2 = a1 @ W2 + b2
+        a2 = relu(z2)
+        return z1, a1, z2, a2, _softmax(a2 @ W3 + b3)
+
+    def nll(probs, yb) -> float:
+        return max(0.0, float(-np.mean(np.log(probs[np.arange(len(yb)), yb] + 1e-12)))) if len(yb) else 0.0
+
+    bs = n if p.batch_size <= 0 else min(int(p.batch_size), n)
+    t0 = time.monotonic()
+    step = 0
+    epoch = 0
+    stop = "max_epochs"
+    best_val = math.inf
+    best_w: Optional[List[np.ndarray]] = None
+    bad = 0
+    train_loss = val_loss = 0.0
+    for epoch in range(1, p.max_epochs + 1):
+        # 매 epoch 섞은 mini-batch (full batch면 순서 그대로)
+        order = np.arange(n) if bs >= n else srng.permutation(n)
+        tot = 0.0
+        for s0 in range(0, n, bs):
+            bi = order[s0:s0 + bs]
+            Xb = Xn[bi] if bs < n else Xn
+            yb = ytr[bi] if bs < n else ytr
+            m = len(yb)
+
+            # 순전파 (Forward Pass)
+            z1, a1, z2, a2, probs = forward(Xb)
+            tot += nll(probs, yb) * m
+
+            # 역전파 (Backward Pass - 그레디언트 계산)
+            dlog = probs
+            dlog[np.arange(m), yb] -= 1.0 # Cross Entropy 오차 계산
+            dlog /= float(m)
+
+            dW3 = a2.T @ dlog
+            db3 = dlog.sum(axis=0)
+            da2 = dlog @ W3.T
+            dz2 = da2; dz2[z2 <= 0.0] = 0.0 # ReLU 미분
+
+            dW2 = a1.T @ dz2
+            db2 = dz2.sum(axis=0)
+            da1 = dz2 @ W2.T
+            dz1 = da1; dz1[z1 <= 0.0] = 0.0
+
+            dW1 = Xb.T @ dz1
+            db1 = dz1.sum(axis=0)
+
+            # 가중치 업데이트
+            step += 1
+            for w, g, mm, vv in zip(params, (dW1, db1, dW2, db2, dW3, db3), ms, vs):
+                adam_step(w, g, mm, vv, step)
+
+        train_loss = tot / float(n)
+        val_loss = nll(forward(Xv)[4], yv) if len(yv) else train_loss
+        if on_epoch is not None:
+            on_epoch(epoch, p.max_epochs, train_loss, val_loss if len(yv) else None)
+
+        # early stopping: 가장 좋은 val loss 의 가중치를 기억
+        if len(yv):
+            if val_loss < best_val - p.min_delta:
+                best_val = val_loss
+                best_w = [w.copy() for w in params]
+                bad = 0
+            else:
+                bad += 1
+                if p.patience > 0 and bad >= p.patience:
+                    stop = "early_stop"
+                    break
+        if deadline is not None and time.monotonic() >= deadline:
+            stop = "budget"
+            break
+
+    if best_w is not None:
+        for w, b in zip(params, best_w):
+            w[:] = b
+
+    # 라벨별 정확도 (학습 / 검증 split, 최종 가중치)
+    pred_tr = forward(Xn)[4].argmax(axis=1)
+    pred_va = forward(Xv)[4].argmax(axis=1) if len(yv) else np.zeros((0,), dtype=np.int64)
+    per_label: Dict[str, Dict[str, Any]] = {}
+    need_more: List[str] = []
+    for yi, lab in enumerate(labels):
+        mt = ytr == yi
+        mv = yv == yi
+        acc_tr = float((pred_tr[mt] == yi).mean()) if mt.any() else None
+        acc_va = float((pred_va[mv] == yi).mean()) if mv.any() else None
+        per_label[lab] = {
+            "n": int(mt.sum() + mv.sum()),
+            "train": round(acc_tr, 4) if acc_tr is not None else None,
+            "val": round(acc_va, 4) if acc_va is not None else None,
+        }
+        acc = acc_va if acc_va is not None else acc_tr
+        if acc is not None and acc < NEED_MORE_ACC:
+            need_more.append(lab)
+    metrics = {
+        "nTrain": int(n),
+        "nVal": int(len(yv)),
+        "epochs": int(epoch),
+        "stop": stop,
+        "ms": round((time.monotonic() - t0) * 1000.0, 1),
+        "trainLoss": round(float(nll(forward(Xn)[4], ytr)), 5),
+        "valLoss": round(float(best_val if best_w is not None else val_loss), 5) if len(yv) else None,
+        "trainAcc": round(float((pred_tr == ytr).mean()), 4),
+        "valAcc": round(float((pred_va == yv).mean()), 4) if len(yv) else None,
+        "labels": per_label,
+        "needMore": need_more,
+    }
+
+    # 학습된 결과물 (float32 배열 그대로: npz 에는 그대로, mlp_v1 JSON 에는 리스트로 저장)
+    mlp = {
+        "labels": labels,
+        "mean": mean.astype(np.float32),
+        "std": std.astype(np.float32),
+        "W1": W1, "b1": b1,
+        "W2": W2, "b2": b2,
+        "W3": W3, "b3": b3,
+    }
+    return mlp, metrics
+
+
+class TrainJob:
+    """
+    백그라운드 학습 1회.
+    - 시작 시점 샘플/핀치 버퍼의 스냅샷으로 proto, 핀치 문턱값, MLP, 컴파일 모델까지 만든다
+      (학습 중에 캡처가 계속 들어와도 영향 없음)
+    - 진행 상황(hand / epoch / loss)은 STATUS learnTrain 으로 나감
+    - 결과는 MLPLearner.poll_training() 이 프레임 경계에서 한 번에 교체
+    state: running -> ready (파일 저장 완료, 교체 대기) -> done / cancelled / error
+    """
+
+    def __init__(
+        self,
+        gen: int,
+        profile: str,
+        samples,
+        pinch_pos,
+        pinch_neg,
+        min_samples: int,
+        default_labels,
+        params: Optional[TrainParams] = None,
+        budget_sec: float = TRAIN_BUDGET_SEC,
+    ):
+        self.gen = int(gen)
+        self.profile = profile
+        self.samples: Samples = samples
+        self.pinch_pos: Dict[str, List[float]] = pinch_pos
+        self.pinch_neg: Dict[str, List[float]] = pinch_neg
+        self.min_samples = int(min_samples)
+        self.default_labels = list(default_labels)
+        self.params = params or TRAIN_PARAMS
+        self.budget_sec = float(budget_sec)
+
+        self.state = "running"
+        self.hand = ""
+        self.epoch = 0
+        self.epochs = 0
+        self.loss: Optional[float] = None
+        self.val_loss: Optional[float] = None
+        self.progress = 0.0
+        self.error = ""
+        self.t0 = time.time()
+        self.t1: Optional[float] = None
+        self._cancel = threading.Event()
+        self._hand_i = 0
+
+        # 결과 (state == ready 이후 유효)
+        self.proto: Dict[str, Dict[str, Dict[str, Any]]] = {"cursor": {}, "other": {}}
+        self.pinch: Dict[str, float] = {}
+        self.mlp: Dict[str, Dict[str, Any]] = {"cursor": {}, "other": {}}
+        self.compiled: Dict[str, Optional[CompiledMLP]] = {"cursor": None, "other": None}
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.ts: Optional[float] = None
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _on_epoch(self, epoch: int, epochs: int, loss: float, val_loss: Optional[float]):
+        if self._cancel.is_set():
+            raise TrainCancelled()
+        self.epoch, self.epochs, self.loss, self.val_loss = int(epoch), int(epochs), float(loss), val_loss
+        self.progress = (self._hand_i + epoch / float(max(1, epochs))) / float(max(1, len(self.samples)))
+
+    def run(self):
+        try:
+            self.proto = _build_proto(self.samples, self.min_samples)
+            for hand in ("cursor", "other"):
+                thr = _calibrate_pinch_ratio(self.pinch_pos.get(hand) or [], self.pinch_neg.get(hand) or [])
+                if thr is not None:
+                    self.pinch[hand] = thr
+
+            self.mlp = {"cursor": {}, "other": {}}
+            hands = list(self.samples.items())
+            end = (time.monotonic() + self.budget_sec) if self.budget_sec > 0 else None
+            for i, (hand, mp) in enumerate(hands):
+                if self._cancel.is_set():
+                    raise TrainCancelled()
+                self._hand_i = i
+                self.hand = hand
+                # 남은 시간을 남은 손끼리 나눔 (앞 손이 예산을 다 쓰지 않게)
+                deadline = None
+                if end is not None:
+                    deadline = time.monotonic() + max(0.0, end - time.monotonic()) / float(len(hands) - i)
+                mlp, metrics = _train_mlp(
+                    mp, self.min_samples, self.default_labels, self._on_epoch, params=self.params, deadline=deadline
+                )
+                self.mlp[hand] = mlp
+                if metrics:
+                    self.metrics[hand] = metrics
+
+            self.compiled = {hand: compile_mlp(self.mlp.get(hand)) for hand in ("cursor", "other")}
+            self.ts = time.time()
+            self.progress = 1.0
+            self.state = "ready"
+        except TrainCancelled:
+            self.state = "cancelled"
+        except Exception as e:
+            self.state = "error"
+            self.error = str(e)
+        self.t1 = time.time()
+
+    def status(self) -> dict:
+        end = self.t1 if self.t1 is not None else time.time()
+        return {
+            "state": self.state,
+            "profile": self.profile,
+            "hand": self.hand,
+            "epoch": int(self.epoch),
+            "epochs": int(self.epochs),
+            "loss": round(float(self.loss), 5) if self.loss is not None else None,
+            "valLoss": round(float(self.val_loss), 5) if self.val_loss is not None else None,
+            "progress": round(float(self.progress), 3),
+            "elapsedMs": round((end - self.t0) * 1000.0, 1),
+            "error": self.error,
+        }
+
+
 class MLPLearner:
     """
     사용자 프로필별 MLP(다층 퍼셉트론) 학습기.
@@ -90,98 +546,118 @@ class MLPLearner:
         self.min_samples: int = 50 # 학습에 필요한 최소 샘플 수
         self.min_conf: float = 0.70 # 예측 결과의 최소 신뢰도 문턱값
 
-        # 수집된 제스처 샘플 저장소 (cursor: 마우스 손, other: 반대 손)
-        self.samples: Dict[str, Dict[str, List[List[float]]]] = {"cursor": {}, "other": {}}
-
-        # 핀치 제스처 인식을 위한 보정용 버퍼
+        # 핀치 제스처 인식을 위한 보정용 버퍼 (프로필을 열 때 샘플 저장소의 핀치 비율로 채움)
         self._pinch_pos: Dict[str, List[float]] = {"cursor": [], "other": []} # 핀치 중일 때의 비율들
         self._pinch_neg: Dict[str, List[float]] = {"cursor": [], "other": []} # 핀치가 아닐 때의 비율들
         self.pinch_ratio_thresh: Dict[str, float] = {"cursor": 0.35, "other": 0.35} # 핀치 판단 기준점
 
-        # 실제 학습된 가중치와 파라미터가 저장되는 딕셔너리
+        # 실제 학습된 가중치와 파라미터가 저장되는 딕셔너리 (labels + float32 배열, JSON 에서 읽었으면 리스트)
         self.mlp: Dict[str, Dict[str, Any]] = {"cursor": {}, "other": {}}
+        # 추론용으로 컴파일된 모델 (load/train/set_profile/reset 때 self.mlp 로부터 다시 만듦)
+        self.compiled: Dict[str, Optional[CompiledMLP]] = {"cursor": None, "other": None}
 
         # MLP 학습 데이터가 부족할 때 사용하는 백업용 모델 (중심점 방식)
         self.proto: Dict[str, Dict[str, Dict[str, Any]]] = {"cursor": {}, "other": {}}
 
         self.last_pred: Optional[dict] = None # 마지막 예측 결과
         self.last_train_ts: Optional[float] = None # 마지막 학습 시간
+        # 마지막 학습의 손별 결과 (라벨별 train/val 정확도, epoch, 중단 이유, needMore) -> STATUS learnMetrics
+        self.train_metrics: Dict[str, Dict[str, Any]] = {}
 
         # 현재 데이터 수집(캡처) 중인 상태 정보
         self.capture: Optional[dict] = None
 
-        self.load() # 초기화 시 저장된 모델 불러오기
+        # 백그라운드 학습 (TRAIN_TRAIN): 스냅샷으로 학습 -> 모델 파일 저장 -> 프레임 경계에서 교체
+        # _train_lock: 학습 세대(_train_gen) / 교체 대기(_ready) / 모델 파일 쓰기
+        self._train_lock = threading.RLock()
+        self._train_gen = 0
+        self._ready: Optional[TrainJob] = None
+        self.train_job: Optional[TrainJob] = None # 마지막으로 시작한 학습 (STATUS)
+
+        # 서버 동기화용 mlp_v1 JSON 을 마지막으로 쓴/읽은 상태 (내용이 같으면 save 가 JSON 을 다시 쓰지 않음)
+        self._json_src: Optional[tuple] = None
+        self._json_sig: Optional[List[int]] = None
+
+        # 수집된 제스처 샘플 저장소 (프로필별 <profile>.samples 파일, cursor: 마우스 손, other: 반대 손)
+        self.store: Optional[SampleStore] = None
+
+        self.load() # 초기화 시 저장된 모델 / 샘플 저장소 불러오기
 
     # ---------- 경로 헬퍼 함수 ----------
     def _model_path(self, profile: Optional[str] = None) -> str:
-        """JSON 모델 파일이 저장될 전체 경로 반환"""
+        """JSON 모델 파일(mlp_v1, 서버 동기화용)이 저장될 전체 경로 반환"""
         p = _sanitize_profile(profile or self.profile)
         return os.path.join(_BASE_DIR, f"{p}.json")
 
+    def _npz_path(self, profile: Optional[str] = None) -> str:
+        """바이너리 모델 파일(mlp_v2, 에이전트가 읽는 파일) 경로 반환"""
+        p = _sanitize_profile(profile or self.profile)
+        return os.path.join(_BASE_DIR, f"{p}.npz")
+
     def _bak_path(self, profile: Optional[str] = None) -> str:
         """학습 전 백업용 파일(.bak) 경로 반환"""
         return self._model_path(profile) + ".bak"
 
+    def _samples_path(self, profile: Optional[str] = None) -> str:
+        """학습 샘플 저장소(append-only 레코드 파일) 경로 반환"""
+        p = _sanitize_profile(profile or self.profile)
+        return os.path.join(_BASE_DIR, f"{p}.samples")
+
+    def _open_store(self):
+        """현재 프로필의 샘플 저장소를 열고 핀치 보정 버퍼를 저장된 샘플로 채움"""
+        try:
+            self.store = SampleStore(self._samples_path(), cap=MAX_SAMPLES_PER_LABEL)
+            self._pinch_pos, self._pinch_neg = self.store.pinch_buffers()
+        except Exception as e:
+            print("[LEARN] sample store open failed:", e, flush=True)
+
+    def _profile_files(self, profile: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(모델 파일, 백업 파일) 쌍: JSON / npz"""
+        js, npz = self._model_path(profile), self._npz_path(profile)
+        return [(js, js + ".bak"), (npz, npz + ".bak")]
+
     def has_backup(self) -> bool:
         """백업 파일 존재 여부 확인"""
         try:
-            return os.path.exists(self._bak_path())
+            return any(os.path.exists(bak) for _, bak in self._profile_files())
         except Exception:
             return False
 
     # ---------- 데이터 특징 추출 ----------
-    def extract(self, lm) -> Optional[List[float]]:
+    def extract_array(self, lm) -> Optional[np.ndarray]:
         """
-        손가락 좌표를 머신러닝 모델이 학습하기 좋은 형태로 가공(정규화).
+        손가락 좌표를 머신러닝 모델이 학습하기 좋은 형태로 가공(정규화) -> float32[63].
         1. 모든 좌표를 손목(0번) 기준으로 이동 (Translation Invariance)
         2. 중지 마디(9번)까지의 거리를 기준으로 전체 크기 조절 (Scale Invariance)
         """
-        if not lm or len(lm) != 21:
+        if lm is None or len(lm) != 21:
             return None
+        # 계산은 HandFeatures.vector (프레임당 한 번, 손 선택/제스처와 공유)
+        return HandFeatures.of(lm).vector
 
-        # 1. 원점 이동: 손목을 (0,0,0)으로 만듦
-        x0, y0, z0 = lm[0]
-        pts = [(x - x0, y - y0, z - z0) for (x, y, z) in lm]
-
-        # 2. 스케일 정규화: 손 크기에 상관없게 만듦
-        sx, sy, sz = pts[9]  # 9번 마디 기준
-        scale = math.sqrt(sx * sx + sy * sy + sz * sz)
-        if scale < 1e-6: # 너무 작으면 대체 스케일링
-            scale = max((math.sqrt(x * x + y * y + z * z) for (x, y, z) in pts), default=1.0)
-            if scale < 1e-6:
-                scale = 1.0
-
-        inv = 1.0 / scale
-        vec: List[float] = []
-        for (x, y, z) in pts:
-            # 모든 좌표에 역수를 곱해 정규화된 63개의 숫자 리스트 생성 (21개 마디 * 3차원)
-            vec.extend([x * inv, y * inv, z * inv])
-        return vec
-
-    def _ensure(self, hand: str, label: str):
-        """데이터를 저장하기 전 딕셔너리 구조가 있는지 확인 및 생성"""
-        hand = "cursor" if hand != "other" else "other"
-        self.samples.setdefault(hand, {})
-        self.samples[hand].setdefault(label, [])
+    def extract(self, lm) -> Optional[List[float]]:
+        """extract_array()의 list 버전"""
+        vec = self.extract_array(lm)
+        return vec.tolist() if vec is not None else None
 
     def add_sample(self, hand: str, label: str, lm) -> bool:
-        """실시간으로 들어오는 손 좌표(lm)를 학습용 데이터셋에 추가"""
-        vec = self.extract(lm) # 특징 추출
-        if vec is None:
+        """실시간으로 들어오는 손 좌표(lm)를 학습용 데이터셋(샘플 저장소 파일)에 추가"""
+        vec = self.extract_array(lm) # 특징 추출
+        if vec is None or self.store is None:
             return False
 
         hand = "cursor" if hand != "other" else "other"
         label = str(label)
-        self._ensure(hand, label)
-        arr = self.samples[hand][label]
-        arr.append(vec) # 리스트에 추가
-        
-        # 샘플 수가 너무 많아지면 오래된 것부터 삭제 (메모리 및 효율 관리)
-        if len(arr) > MAX_SAMPLES_PER_LABEL:
-            del arr[: len(arr) - MAX_SAMPLES_PER_LABEL]
+        r = _pinch_ratio(lm)
+        # 파일 끝에 레코드 추가 (라벨당 MAX_SAMPLES_PER_LABEL 넘으면 오래된 것부터 무효)
+        try:
+            if not self.store.append(hand, label, vec, pinch=r):
+                return False
+        except OSError as e:
+            print("[LEARN] sample append failed:", e, flush=True)
+            return False
 
         # 핀치 제스처일 경우 핀치 비율도 따로 저장하여 나중에 문턱값 계산에 사용
-        r = _pinch_ratio(lm)
         if r is not None:
             if label == "PINCH_INDEX":
                 self._pinch_pos[hand].append(float(r))
@@ -196,229 +672,149 @@ class MLPLearner:
 
     def counts(self) -> Dict[str, Dict[str, int]]:
         """현재 각 제스처별로 수집된 샘플 개수 반환"""
-        out: Dict[str, Dict[str, int]] = {}
-        for hand, mp in self.samples.items():
-            out[hand] = {lab: len(vs) for lab, vs in mp.items()}
-        return out
+        if self.store is None:
+            return {"cursor": {}, "other": {}}
+        return self.store.counts()
+
+    def export_samples(self, path: Optional[str] = None) -> Tuple[str, int]:
+        """현재 프로필의 샘플을 .npz 로 내보냄 (기본: <프로필 폴더>/datasets/<profile>-<시각>.npz) -> (경로, 개수)"""
+        if not path:
+            path = os.path.join(_BASE_DIR, "datasets", f"{self.profile}-{time.strftime('%Y%m%d-%H%M%S')}.npz")
+        n = self.store.export(path, meta={"profile": self.profile}) if self.store is not None else 0
+        return path, n
+
+    def import_samples(self, path: str, replace: bool = False) -> int:
+        """export_samples 로 만든 .npz 의 샘플을 현재 프로필에 추가 (replace=True 면 기존 샘플 대신)"""
+        if self.store is None:
+            return 0
+        n = self.store.import_(path, replace=replace)
+        self._pinch_pos, self._pinch_neg = self.store.pinch_buffers()
+        return n
 
     # ---------- 학습 로직 ----------
     def _backup_before_train(self):
-        """학습이 잘못될 경우를 대비해 기존 모델을 .bak 파일로 복사"""
-        try:
-            src = self._model_path()
-            if os.path.exists(src):
-                shutil.copyfile(src, self._bak_path())
-        except Exception:
-            pass
-
-    def _build_proto(self):
-        """간단한 평균값 기반 모델 생성 (MLP가 동작 안할 때의 대비책)"""
-        self.proto = {"cursor": {}, "other": {}}
-        for hand, mp in self.samples.items():
-            for label, vecs in mp.items():
-                if len(vecs) < self.min_samples:
-                    continue
-                dim = len(vecs[0])
-                # 1. 해당 제스처의 모든 샘플의 평균(Centroid) 계산
-                c = [0.0] * dim
-                for v in vecs:
-                    for i in range(dim):
-                        c[i] += v[i]
-                n = float(len(vecs))
-                for i in range(dim):
-                    c[i] /= n
-
-                # 2. 평균으로부터의 표준편차(Sigma) 계산 (얼마나 일관적인지)
-                s2 = 0.0
-                for v in vecs:
-                    d = _l2(v, c)
-                    s2 += d * d
-                s2 /= max(1.0, n)
-                sigma = math.sqrt(s2) + 1e-6
-
-                self.proto[hand][label] = {"centroid": c, "sigma": float(sigma), "n": int(n)}
-
-    def _train_mlp_for_hand(self, hand: str, mp: Dict[str, List[List[float]]]):
-        """넘파이(Numpy)만을 이용해 직접 MLP 학습을 수행하는 핵심 로직"""
-        # 학습 가능한 라벨 필터링 (최소 샘플 수 이상인 것들만)
-        labels = []
-        for l in self.DEFAULT_LABELS:
-            if len(mp.get(l, [])) >= self.min_samples:
-                labels.append(l)
-        for l, vs in mp.items():
-            if l not in labels and len(vs) >= self.min_samples:
-                labels.append(l)
-
-        # 분류할 클래스가 최소 2개는 있어야 학습 가능
-        if len(labels) < 2:
-            self.mlp[hand] = {}
-            return
-
-        # 데이터를 넘파이 배열로 변환
-        X_list: List[List[float]] = []
-        y_list: List[int] = []
-        for yi, lab in enumerate(labels):
-            for v in mp.get(lab, []):
-                X_list.append(v)
-                y_list.append(yi)
-
-        X = np.asarray(X_list, dtype=np.float32)
-        y = np.asarray(y_list, dtype=np.int64)
-        n, d = X.shape # n: 샘플 수, d: 특징 차원(63)
-
-        # 데이터 표준화 (평균 0, 표준편차 1로 변환)
-        mean = X.mean(axis=0)
-        std = X.std(axis=0) + 1e-6
-        Xn = (X - mean) / std
-
-        # 레이어 구조: 입력(63) -> 은닉1(128) -> 은닉2(64) -> 출력(라벨 수)
-        h1, h2 = 128, 64
-        k = len(labels)
-
-        # 가중치 초기화 (Xavier/Glorot Initialization)
-        rng = np.random.default_rng(42)
-        def xavier(in_dim, out_dim):
-            lim = math.sqrt(6.0 / float(in_dim + out_dim))
-            return rng.uniform(-lim, lim, size=(in_dim, out_dim)).astype(np.float32)
-
-        W1 = xavier(d, h1); b1 = np.zeros((h1,), dtype=np.float32)
-        W2 = xavier(h1, h2); b2 = np.zeros((h2,), dtype=np.float32)
-        W3 = xavier(h2, k); b3 = np.zeros((k,), dtype=np.float32)
-
-        # Adam 최적화 알고리즘 파라미터
-        lr = 0.01
-        beta1, beta2 = 0.9, 0.999
-        eps = 1e-8
-        # 모멘텀 및 속도 변수 초기화
-        mW1 = np.zeros_like(W1); vW1 = np.zeros_like(W1)
-        mb1 = np.zeros_like(b1); vb1 = np.zeros_like(b1)
-        mW2 = np.zeros_like(W2); vW2 = np.zeros_like(W2)
-        mb2 = np.zeros_like(b2); vb2 = np.zeros_like(b2)
-        mW3 = np.zeros_like(W3); vW3 = np.zeros_like(W3)
-        mb3 = np.zeros_like(b3); vb3 = np.zeros_like(b3)
-
-        def relu(a): return np.maximum(a, 0.0)
-
-        def adam_step(param, grad, m, v, t):
-            """가중치를 업데이트하는 Adam 한 단계 수행"""
-            m[:] = beta1 * m + (1.0 - beta1) * grad
-            v[:] = beta2 * v + (1.0 - beta2) * (grad * grad)
-            mh = m / (1.0 - beta1 ** t)
-            vh = v / (1.0 - beta2 ** t)
-            param[:] = param - lr * mh / (np.sqrt(vh) + eps)
-
-        # 220회 반복 학습 (Epochs)
-        epochs = 220
-        for t in range(1, epochs + 1):
-            # 순전파 (Forward Pass)
-            z1 = Xn @ W1 + b1
-            a1 = relu(z1)
-            z2 = a1 @ W2 + b2
-            a2 = relu(z2)
-            logits = a2 @ W3 + b3
-            probs = _softmax(logits)
-
-            # 역전파 (Backward Pass - 그레디언트 계산)
-            dlog = probs
-            dlog[np.arange(n), y] -= 1.0 # Cross Entropy 오차 계산
-            dlog /= float(n)
-
-            dW3 = a2.T @ dlog
-            db3 = dlog.sum(axis=0)
-            da2 = dlog @ W3.T
-            dz2 = da2; dz2[z2 <= 0.0] = 0.0 # ReLU 미분
-
-            dW2 = a1.T @ dz2
-            db2 = dz2.sum(axis=0)
-            da1 = dz2 @ W2.T
-            dz1 = da1; dz1[z1 <= 0.0] = 0.0
-
-            dW1 = Xn.T @ dz1
-            db1 = dz1.sum(axis=0)
-
-            # 가중치 업데이트
-            adam_step(W1, dW1, mW1, vW1, t)
-            adam_step(b1, db1, mb1, vb1, t)
-            adam_step(W2, dW2, mW2, vW2, t)
-            adam_step(b2, db2, mb2, vb2, t)
-            adam_step(W3, dW3, mW3, vW3, t)
-            adam_step(b3, db3, mb3, vb3, t)
-
-        # 학습된 결과물 저장 (리스트 형태로 변환하여 JSON 저장 가능하게 함)
-        self.mlp[hand] = {
-            "labels": labels,
-            "mean": mean.astype(np.float32).tolist(),
-            "std": std.astype(np.float32).tolist(),
-            "W1": W1.tolist(), "b1": b1.tolist(),
-            "W2": W2.tolist(), "b2": b2.tolist(),
-            "W3": W3.tolist(), "b3": b3.tolist(),
-        }
-
-    def _calibrate_pinch_ratio(self, hand: str):
-        """핀치 제스처를 판단하는 기준점(Threshold)을 수집된 데이터를 바탕으로 자동 설정"""
-        pos = self._pinch_pos.get(hand) or [] # 핀치 샘플들
-        neg = self._pinch_neg.get(hand) or [] # 일반 샘플들
-        if len(pos) < 10: return
-
-        pos_arr = np.asarray(pos, dtype=np.float32)
-        if len(neg) >= 10:
-            neg_arr = np.asarray(neg, dtype=np.float32)
-            # 핀치 데이터의 상위 85% 지점과 일반 데이터의 하위 15% 지점의 중간을 문턱값으로 설정
-            pos_hi = float(np.quantile(pos_arr, 0.85))
-            neg_lo = float(np.quantile(neg_arr, 0.15))
-            thr = (pos_hi + neg_lo) * 0.5
-        else:
-            # 일반 데이터가 없으면 핀치 중간값의 120% 수준으로 설정
-            thr = float(np.median(pos_arr) * 1.20)
-
-        # 너무 작거나 큰 값이 되지 않도록 범위 제한 (0.12 ~ 0.60)
-        thr = float(max(0.12, min(0.60, thr)))
-        self.pinch_ratio_thresh[hand] = thr
+        """학습이 잘못될 경우를 대비해 기존 모델(JSON / npz)을 .bak 파일로 복사"""
+        for src, bak in self._profile_files():
+            try:
+                if os.path.exists(src):
+                    shutil.copyfile(src, bak)
+                elif os.path.exists(bak):
+                    os.remove(bak) # 짝이 안 맞는 이전 백업은 지움
+            except Exception:
+                pass
+
+    def _start_job(self) -> TrainJob:
+        """진행 중/교체 대기 중인 학습은 취소하고 현재 샘플 스냅샷으로 새 학습 준비"""
+        with self._train_lock:
+            self._cancel_training_locked()
+            self._train_gen += 1
+            # 저장소 매핑에서 라벨별 float32 배열로 모음 -> 이후 프레임 스레드의 캡처와 독립
+            samples = self.store.snapshot() if self.store is not None else {"cursor": {}, "other": {}}
+            job = TrainJob(
+                self._train_gen,
+                self.profile,
+                samples,
+                {hand: list(v) for hand, v in self._pinch_pos.items()},
+                {hand: list(v) for hand, v in self._pinch_neg.items()},
+                self.min_samples,
+                self.DEFAULT_LABELS,
+            )
+            self.train_job = job
+            return job
+
+    def _finish_job(self, job: TrainJob) -> bool:
+        """
+        끝난 학습: 백업 -> job 의 모델을 파일에 저장 -> 교체 대기 (세대가 바뀌었으면 버림).
+        _ready 는 파일 쓰기가 끝난 뒤에 세운다 -> 프레임 스레드의 poll_training 이 쓰기를 기다리지 않음
+        """
+        with self._train_lock:
+            if job.state != "ready":
+                return False
+            if job.gen != self._train_gen or job.cancelled:
+                job.state = "cancelled"
+                return False
+            self._backup_before_train()
+            self.save(job)
+            self._ready = job
+            return True
 
     def train(self):
-        """전체 학습 프로세스 실행 (백업 -> 보조모델 생성 -> 핀치 보정 -> MLP 학습 -> 저장)"""
-        self._backup_before_train()
-        self._build_proto()
-        self._calibrate_pinch_ratio("cursor")
-        self._calibrate_pinch_ratio("other")
+        """전체 학습을 이 스레드에서 바로 실행 (스냅샷 -> 보조모델/핀치 보정/MLP -> 백업 -> 저장 -> 교체)"""
+        job = self._start_job()
+        job.run()
+        self._finish_job(job)
+        self.poll_training()
+
+    def train_async(self) -> TrainJob:
+        """TRAIN_TRAIN: 백그라운드 스레드에서 학습 (새 요청이 오면 진행 중인 학습은 취소)"""
+        job = self._start_job()
+
+        def _run():
+            job.run()
+            ok = self._finish_job(job)
+            st = job.status()
+            if ok:
+                print(f"[LEARN] train done profile={job.profile} in {st['elapsedMs']:.0f}ms loss={st['loss']} (swap on next frame)", flush=True)
+            else:
+                print(f"[LEARN] train {job.state} profile={job.profile} {job.error}".rstrip(), flush=True)
 
-        self.mlp = {"cursor": {}, "other": {}}
-        for hand, mp in self.samples.items():
-            self._train_mlp_for_hand(hand, mp)
+        print(f"[LEARN] train start profile={job.profile} counts={self.counts()}", flush=True)
+        threading.Thread(target=_run, name="learner-train", daemon=True).start()
+        return job
 
-        self.last_train_ts = time.time()
-        self.save() # 학습 완료 후 파일로 저장
+    def poll_training(self) -> bool:
+        """
+        프레임 경계에서 호출 (predict 와 같은 스레드): 끝난 학습이 있으면 모델을 한 번에 교체.
+        predict 는 교체 전 또는 후의 완성된 모델만 본다.
+        """
+        if self._ready is None:
+            return False
+        with self._train_lock:
+            job, self._ready = self._ready, None
+            if job is None or job.gen != self._train_gen:
+                return False
+            self.proto = job.proto
+            self.pinch_ratio_thresh.update(job.pinch)
+            self.mlp = job.mlp
+            self.compiled = job.compiled
+            self.train_metrics = job.metrics
+            self.last_train_ts = job.ts
+            job.state = "done"
+            return True
+
+    def _cancel_training_locked(self) -> bool:
+        job = self.train_job
+        active = job is not None and job.state in ("running", "ready")
+        self._train_gen += 1
+        if job is not None:
+            job.cancel()
+            if job.state == "ready":
+                job.state = "cancelled"
+        if self._ready is not None:
+            # 파일에는 이미 새 모델이 저장됨 -> 메모리(교체 전) 모델로 되돌림
+            self._ready = None
+            self.save()
+        return active
+
+    def cancel_training(self) -> bool:
+        """TRAIN_CANCEL (rollback / reset / 프로필 변경 때도 호출): 진행 중이거나 교체 대기 중인 학습 취소"""
+        with self._train_lock:
+            return self._cancel_training_locked()
+
+    def train_status(self) -> Optional[dict]:
+        job = self.train_job
+        return job.status() if job is not None else None
 
     # ---------- 예측(Inference) ----------
-    def _predict_mlp(self, hand: str, vec: List[float]) -> Tuple[Optional[str], float]:
-        """MLP 모델을 사용하여 제스처 예측"""
-        m = self.mlp.get(hand) or {}
-        if not m: return None, 0.0
-
-        labels = m.get("labels") or []
-        if not labels: return None, 0.0
-
-        # 저장된 가중치들을 넘파이로 변환
-        mean = np.asarray(m.get("mean"), dtype=np.float32)
-        std = np.asarray(m.get("std"), dtype=np.float32)
-        x = np.asarray(vec, dtype=np.float32)
-        x = (x - mean) / (std + 1e-6) # 입력 데이터 정규화
-        x = x.reshape(1, -1)
-
-        W1 = np.asarray(m.get("W1"), dtype=np.float32); b1 = np.asarray(m.get("b1"), dtype=np.float32)
-        W2 = np.asarray(m.get("W2"), dtype=np.float32); b2 = np.asarray(m.get("b2"), dtype=np.float32)
-        W3 = np.asarray(m.get("W3"), dtype=np.float32); b3 = np.asarray(m.get("b3"), dtype=np.float32)
-
-        # 신경망 계산 (Forward)
-        z1 = x @ W1 + b1; a1 = np.maximum(z1, 0.0)
-        z2 = a1 @ W2 + b2; a2 = np.maximum(z2, 0.0)
-        logits = a2 @ W3 + b3
-        p = _softmax(logits)[0] # 확률 계산
-
-        idx = int(np.argmax(p)) # 가장 확률이 높은 인덱스
-        conf = float(p[idx]) # 그때의 확률(신뢰도)
-        lab = str(labels[idx]) # 해당 라벨 이름
-        return lab, conf
+    def _compile(self):
+        """self.mlp (JSON dict) -> self.compiled (추론용), 가중치가 바뀔 때마다 호출"""
+        self.compiled = {hand: compile_mlp(self.mlp.get(hand)) for hand in ("cursor", "other")}
+
+    def _predict_mlp(self, hand: str, vec) -> Tuple[Optional[str], float]:
+        """MLP 모델을 사용하여 제스처 예측 (컴파일된 모델, 없으면 None)"""
+        cm = self.compiled.get(hand)
+        if cm is None: return None, 0.0
+        return cm.predict(vec)
 
     def _predict_proto(self, hand: str, vec: List[float]) -> Tuple[Optional[str], float]:
         """평균값 기반 모델로 제스처 예측 (MLP 미학습 시 사용)"""
@@ -443,7 +839,7 @@ class MLPLearner:
         """공식 외부 인터페이스: 현재 손의 제스처와 신뢰도 반환"""
         if not self.enabled: return None, 0.0
 
-        vec = self.extract(lm)
+        vec = self.extract_array(lm)
         if vec is None: return None, 0.0
 
         hand = "cursor" if hand != "other" else "other"
@@ -452,7 +848,7 @@ class MLPLearner:
         lab, conf = self._predict_mlp(hand, vec)
         # 2순위: MLP 결과가 없으면 프로토타입(평균) 모델 사용
         if lab is None:
-            lab, conf = self._predict_proto(hand, vec)
+            lab, conf = self._predict_proto(hand, vec.tolist())
 
         if lab is None: return None, float(conf)
         # 설정된 최소 신뢰도보다 낮으면 결과 무시
@@ -509,9 +905,9 @@ class MLPLearner:
         """다른 프로필로 변경 (변경 전 현재 상태 저장 및 새 상태 로드)"""
         p = _sanitize_profile(profile)
         if p == self.profile: return
+        self.cancel_training() # 이전 프로필 샘플로 만든 학습은 버림
         self.save()
-        # 내부 메모리 데이터 초기화
-        self.samples = {"cursor": {}, "other": {}}
+        # 내부 메모리 데이터 초기화 (샘플은 프로필별 파일에 남아 있음 -> load 가 새 프로필 저장소를 엶)
         self._pinch_pos = {"cursor": [], "other": []}
         self._pinch_neg = {"cursor": [], "other": []}
         self.capture = None
@@ -524,9 +920,8 @@ class MLPLearner:
         try:
             names: set[str] = set()
             for fn in os.listdir(_BASE_DIR):
-                if not fn.endswith(".json"): continue
-                if fn.endswith(".json.bak"): continue
-                base = fn[:-5] # .json 확장자 제외
+                base, ext = os.path.splitext(fn) # .json / .npz / .samples (.bak, .tmp 제외)
+                if ext not in (".json", ".npz", ".samples"): continue
                 if base: names.add(_sanitize_profile(base))
             names.add("default")
             names.add(_sanitize_profile(self.profile))
@@ -539,7 +934,6 @@ class MLPLearner:
     def _write_empty_model(self, path: str, profile: str):
         """초기 상태의 빈 모델 파일을 생성"""
         obj = {
-            "schema": "mlp_v1",
             "profile": _sanitize_profile(profile),
             "enabled": bool(self.enabled),
             "min_samples": int(self.min_samples),
@@ -550,13 +944,13 @@ class MLPLearner:
             "proto": {"cursor": {}, "other": {}},
         }
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(obj, f, ensure_ascii=False)
+        write_json_atomic(path, obj)
 
     def create_profile(self, profile: str, copy_from_current: bool = True, switch: bool = True) -> str:
         """새 프로필 생성 (현재 설정을 복사할 수도 있음)"""
         p = _sanitize_profile(profile)
         if not p: p = "default"
+        if switch: self.cancel_training()
 
         try:
             if copy_from_current: self.save()
@@ -566,7 +960,12 @@ class MLPLearner:
         try:
             if copy_from_current:
                 src = self._model_path(self.profile)
-                if os.path.exists(src): shutil.copyfile(src, dst)
+                if os.path.exists(src):
+                    shutil.copyfile(src, dst)
+                    # npz 도 복사 (json_sig 가 같으므로 새 프로필도 npz 로 바로 읽음)
+                    if os.path.exists(self._npz_path(self.profile)): shutil.copyfile(self._npz_path(self.profile), self._npz_path(p))
+                    # 학습 샘플도 복사 (새 프로필에서 이어서 캡처 / 재학습)
+                    if os.path.exists(self._samples_path(self.profile)): shutil.copyfile(self._samples_path(self.profile), self._samples_path(p))
                 else: self._write_empty_model(dst, p)
             else: self._write_empty_model(dst, p)
         except Exception:
@@ -589,7 +988,7 @@ class MLPLearner:
             except Exception: self.profile = "default"
 
         ok = False
-        for path in (self._model_path(p), self._bak_path(p)):
+        for path in [f for pair in self._profile_files(p) for f in pair] + [self._samples_path(p)]:
             try:
                 if os.path.exists(path):
                     os.remove(path)
@@ -603,20 +1002,23 @@ class MLPLearner:
         d = _sanitize_profile(dst)
         if s == "default" or d == "default": return False
         if s == d: return True
+        if s == _sanitize_profile(self.profile): self.cancel_training()
 
         try:
             if s == _sanitize_profile(self.profile): self.save()
         except Exception: pass
 
-        src_path = self._model_path(s); dst_path = self._model_path(d)
-        if not os.path.exists(src_path): return False
-        if os.path.exists(dst_path): return False
+        src_files = self._profile_files(s); dst_files = self._profile_files(d)
+        if not any(os.path.exists(path) for path, _ in src_files): return False
+        if any(os.path.exists(path) for path, _ in dst_files): return False
 
         try:
-            shutil.move(src_path, dst_path) # 메인 파일 이동
-            src_bak = self._bak_path(s); dst_bak = self._bak_path(d)
-            if os.path.exists(src_bak) and (not os.path.exists(dst_bak)):
-                shutil.move(src_bak, dst_bak) # 백업 파일도 같이 이동
+            for (src_path, src_bak), (dst_path, dst_bak) in zip(src_files, dst_files):
+                if os.path.exists(src_path): shutil.move(src_path, dst_path) # 메인 파일 이동 (JSON / npz)
+                if os.path.exists(src_bak) and (not os.path.exists(dst_bak)):
+                    shutil.move(src_bak, dst_bak) # 백업 파일도 같이 이동
+            if os.path.exists(self._samples_path(s)) and not os.path.exists(self._samples_path(d)):
+                shutil.move(self._samples_path(s), self._samples_path(d)) # 학습 샘플
         except Exception: return False
 
         if s == _sanitize_profile(self.profile):
@@ -627,52 +1029,107 @@ class MLPLearner:
 
     # ---------- 복구/저장/로드 ----------
     def rollback(self) -> bool:
-        """학습이 마음에 들지 않을 때 이전 백업(.bak) 파일로 되돌림"""
-        try:
-            bak = self._bak_path()
-            if not os.path.exists(bak): return False
-            shutil.copyfile(bak, self._model_path())
-            self.load()
-            return True
-        except Exception: return False
+        """
+        학습이 마음에 들지 않을 때 이전 백업(.bak) 파일로 되돌림.
+        진행 중/교체 대기 중인 학습은 먼저 취소 (.bak 은 마지막으로 교체된 학습 직전 모델)
+        """
+        with self._train_lock:
+            self._cancel_training_locked()
+            try:
+                if not os.path.exists(self._bak_path()): return False
+                for path, bak in self._profile_files():
+                    # npz.bak 이 없으면 (npz 이전 백업) JSON 만 되돌림 -> json_sig 가 달라서 load 가 JSON 을 읽음
+                    if os.path.exists(bak): shutil.copyfile(bak, path)
+                self.load()
+                return True
+            except Exception: return False
 
     def reset(self):
         """현재 프로필의 모든 학습 데이터 및 모델 초기화"""
-        self.samples = {"cursor": {}, "other": {}}
+        self.cancel_training()
+        if self.store is not None:
+            try: self.store.clear()
+            except OSError as e: print("[LEARN] sample store clear failed:", e, flush=True)
         self._pinch_pos = {"cursor": [], "other": []}
         self._pinch_neg = {"cursor": [], "other": []}
         self.mlp = {"cursor": {}, "other": {}}
         self.proto = {"cursor": {}, "other": {}}
+        self._compile()
+        self.train_metrics = {}
         self.last_pred = None
         self.last_train_ts = None
         self.capture = None
         self.save()
 
-    def save(self):
-        """현재의 모든 상태(MLP 가중치, 프로토타입 등)를 JSON 파일로 저장"""
-        try:
-            obj = {
-                "schema": "mlp_v1",
+    def _state(self, job: Optional[TrainJob] = None) -> Dict[str, Any]:
+        """저장할 상태 (job, 없으면 교체 대기 중인 학습 결과가 있으면 그것). 배열/리스트는 복사하지 않고 그대로 참조"""
+        with self._train_lock:
+            if job is None:
+                job = self._ready
+            return {
                 "profile": self.profile,
                 "enabled": bool(self.enabled),
                 "min_samples": int(self.min_samples),
                 "min_conf": float(self.min_conf),
-                "last_train_ts": self.last_train_ts,
-                "pinch_ratio_thresh": dict(self.pinch_ratio_thresh),
-                "mlp": self.mlp,
-                "proto": self.proto,
+                "last_train_ts": job.ts if job is not None else self.last_train_ts,
+                "pinch_ratio_thresh": dict(self.pinch_ratio_thresh, **(job.pinch if job is not None else {})),
+                "mlp": job.mlp if job is not None else self.mlp,
+                "proto": job.proto if job is not None else self.proto,
+                "train_metrics": job.metrics if job is not None else self.train_metrics,
             }
-            with open(self._model_path(), "w", encoding="utf-8") as f:
-                json.dump(obj, f, ensure_ascii=False)
-        except Exception: pass
+
+    @staticmethod
+    def _json_key(obj: Dict[str, Any]) -> tuple:
+        """JSON 내용이 바뀌었는지 판단용: 설정 값 + mlp/proto/metrics 객체 (학습/로드/리셋 때마다 새 객체)"""
+        scal = tuple(obj[k] for k in ("profile", "enabled", "min_samples", "min_conf", "last_train_ts"))
+        return (scal + tuple(sorted(obj["pinch_ratio_thresh"].items())), obj["mlp"], obj["proto"], obj["train_metrics"])
+
+    def _json_changed(self, key: tuple) -> bool:
+        prev = self._json_src
+        return prev is None or prev[0] != key[0] or any(a is not b for a, b in zip(prev[1:], key[1:]))
+
+    def save(self, job: Optional[TrainJob] = None):
+        """
+        현재의 모든 상태(MLP 가중치, 프로토타입 등)를 npz 로 저장 (job / 교체 대기 중인 학습 결과가 있으면 그것을 저장).
+        서버 동기화용 mlp_v1 JSON 은 내용이 바뀌었을 때만 먼저 다시 쓴다.
+        """
+        try:
+            with self._train_lock:
+                obj = self._state(job)
+                key = self._json_key(obj)
+                path = self._model_path()
+                if self._json_changed(key) or not os.path.exists(path):
+                    self._json_sig = write_json_atomic(path, obj)
+                    self._json_src = key
+                write_npz_atomic(self._npz_path(), obj, self._json_sig)
+        except Exception as e:
+            print("[LEARN] save failed:", e, flush=True)
 
     def load(self):
-        """JSON 파일로부터 모델과 설정을 불러와 현재 인스턴스에 적용"""
+        """
+        npz 에서 모델과 설정을 불러와 현재 인스턴스에 적용.
+        npz 가 없거나 JSON 과 짝이 안 맞으면 (json_sig 불일치: 서버가 DB 에서 받아 쓴 JSON, npz 이전 프로필)
+        mlp_v1 JSON 을 읽고 npz 로 옮겨 저장.
+        """
+        self._json_src = None
+        self._json_sig = None
+        if self.store is None or self.store.path != self._samples_path():
+            self._open_store() # 프로필이 바뀌었으면 (생성 / set_profile / rename / replay) 그 프로필의 샘플
         try:
-            path = self._model_path()
-            if not os.path.exists(path): return
-            with open(path, "r", encoding="utf-8") as f:
-                obj = json.load(f)
+            path, npz = self._model_path(), self._npz_path()
+            sig = file_sig(path)
+            obj = None
+            if os.path.exists(npz):
+                try: obj = read_npz(npz)
+                except Exception as e: print("[LEARN] profile npz unreadable, using json:", e, flush=True)
+            migrate = obj is None or (sig is not None and obj.get("json_sig") != sig)
+            if migrate:
+                if sig is None: return
+                try: obj = read_json(path)
+                except Exception as e:
+                    if obj is None: raise
+                    print("[LEARN] profile json unreadable, using npz:", e, flush=True)
+                    migrate = False
 
             self.enabled = bool(obj.get("enabled", self.enabled))
             self.min_samples = max(50, int(obj.get("min_samples", self.min_samples)))
@@ -689,4 +1146,15 @@ class MLPLearner:
 
             self.mlp = obj.get("mlp", self.mlp) or self.mlp
             self.proto = obj.get("proto", self.proto) or self.proto
-        except Exception: pass
\ No newline at end of file
+            self.train_metrics = obj.get("train_metrics") or {}
+
+            if sig is not None and (migrate or obj.get("json_sig") == sig):
+                # 디스크의 JSON 이 지금 상태와 같음 -> 바뀌기 전까지 save 는 npz 만 씀
+                self._json_src = self._json_key(self._state())
+                self._json_sig = sig
+            if migrate:
+                write_npz_atomic(npz, self._state(), sig)
+                print(f"[LEARN] profile {self.profile}: mlp_v1 json -> npz", flush=True)
+        except Exception: pass
+        finally:
+            self._compile()
\ No newline at end of file
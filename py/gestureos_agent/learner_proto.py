@@ -5,6 +5,8 @@ import math
 import shutil
 from typing import Dict, List, Optional, Tuple, Any
 
+from .landmarks import as_tuples
+
 # 프로필별 모델 저장 폴더
 _BASE_DIR = os.path.join(os.getenv("TEMP", "."), "GestureOS_learner_profiles")
 os.makedirs(_BASE_DIR, exist_ok=True)
@@ -81,10 +83,11 @@ class ProtoLearner:
 
     # ---------- core ----------
     def extract(self, lm) -> Optional[List[float]]:
-        """lm: [(x,y,z), ...] length 21"""
-        if not lm or len(lm) != 21:
+        """lm: (21, 3) array or [(x,y,z), ...] length 21"""
+        if lm is None or len(lm) != 21:
             return None
 
+        lm = as_tuples(lm)  # Python floats (samples are saved as JSON)
         x0, y0, z0 = lm[0]
         pts = [(x - x0, y - y0, z - z0) for (x, y, z) in lm]
 
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Callable
 import os
 import time
 import ctypes
@@ -79,14 +80,30 @@ class DrawHandler:
     last_cut_ts: float = 0.0
     cut_fired: bool = False
 
+    # pen down/up 직전 호출 (커서 injector 보간 중이면 목표 위치로 먼저 착지 -> 획이 손 위치에서 시작/끝)
+    before_button: Callable[[], None] | None = None
+
+    def _pen(self, down: bool):
+        if self.before_button is not None:
+            try:
+                self.before_button()
+            except Exception:
+                pass
+        if _IS_WIN:
+            if down:
+                _send_left_down()
+            else:
+                _send_left_up()
+        elif down:
+            pyautogui.mouseDown(_pause=False)
+        else:
+            pyautogui.mouseUp(_pause=False)
+
     def reset(self):
         self.pinch_start_ts = None
         if self.down:
             try:
-                if _IS_WIN:
-                    _send_left_up()
-                else:
-                    pyautogui.mouseUp(_pause=False)
+                self._pen(False)
             except Exception:
                 pass
         self.down = False
@@ -107,10 +124,7 @@ class DrawHandler:
 
             if (not self.down) and ((t - self.pinch_start_ts) >= self.down_debounce_sec):
                 try:
-                    if _IS_WIN:
-                        _send_left_down()
-                    else:
-                        pyautogui.mouseDown(_pause=False)
+                    self._pen(True)
                     self.down = True
                 except Exception:
                     pass
@@ -118,10 +132,7 @@ class DrawHandler:
             self.pinch_start_ts = None
             if self.down:
                 try:
-                    if _IS_WIN:
-                        _send_left_up()
-                    else:
-                        pyautogui.mouseUp(_pause=False)
+                    self._pen(False)
                 except Exception:
                     pass
                 self.down = False
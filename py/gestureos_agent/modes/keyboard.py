@@ -2,13 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
 
 import os
 import time
 import ctypes
 from ctypes import wintypes
 
+from ..bindings import DEFAULT_BINDINGS, KeyboardBindings
+
 # -----------------------------------------------------------------------------
 # KEYBOARD MODE (Windows): robust key injection
 #
@@ -160,28 +161,6 @@ def _send_vk(vk_code: int):
     arr = (INPUT * 2)(inp_down, inp_up)
     _send_inputs(arr)
 
-def _pick_token(gesture: str, mapping: Dict[str, str], order: list[str]) -> Optional[str]:
-    g = str(gesture or "").upper()
-    for tok in order:
-        if g == str(mapping.get(tok, "")).upper():
-            return tok
-    return None
-
-DEFAULT_BASE: Dict[str, str] = {
-    "LEFT": "FIST",
-    "RIGHT": "V_SIGN",
-    "DOWN": "OPEN_PALM",
-    "UP": "PINCH_INDEX",
-}
-
-DEFAULT_FN: Dict[str, str] = {
-    "BACKSPACE": "FIST",
-    "SPACE": "OPEN_PALM",
-    "ENTER": "PINCH_INDEX",
-    "ESC": "V_SIGN",
-}
-
-DEFAULT_FN_HOLD = "PINCH_INDEX"
 
 @dataclass
 class KeyboardHandler:
@@ -283,36 +262,26 @@ class KeyboardHandler:
         cursor_gesture: str,
         got_other: bool,
         other_gesture: str,
-        bindings: dict | None = None,
+        bindings: KeyboardBindings | None = None,
     ):
         if not can_inject:
             self.reset()
             return
 
-        bindings = bindings or {}
-
-        base_map_in = dict(bindings.get("BASE") or {})
-        fn_map_in = dict(bindings.get("FN") or {})
-        fn_hold = str(bindings.get("FN_HOLD") or DEFAULT_FN_HOLD).upper()
-
-        base_map: Dict[str, str] = dict(DEFAULT_BASE)
-        fn_map: Dict[str, str] = dict(DEFAULT_FN)
-
-        for k, v in base_map_in.items():
-            base_map[str(k).upper()] = str(v).upper()
-        for k, v in fn_map_in.items():
-            fn_map[str(k).upper()] = str(v).upper()
+        # compiled once per UPDATE_SETTINGS (bindings.compile_bindings)
+        b = bindings or DEFAULT_BINDINGS.keyboard
 
-        if got_other and str(other_gesture).upper() == fn_hold:
+        if got_other and str(other_gesture).upper() == b.fn_hold:
             self.mod_until = t + self.mod_grace_sec
         mod_active = t < self.mod_until
 
         token = None
         if got_cursor:
+            g = str(cursor_gesture or "").upper()
             if mod_active:
-                token = _pick_token(cursor_gesture, fn_map, ["BACKSPACE", "SPACE", "ENTER", "ESC"])
+                token = b.fn_by_gesture.get(g)
             if token is None:
-                token = _pick_token(cursor_gesture, base_map, ["LEFT", "RIGHT", "UP", "DOWN"])
+                token = b.base_by_gesture.get(g)
 
         if token is None:
             self.last_token = None
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Callable, Optional
 import os
 import time
 import ctypes
@@ -75,6 +76,7 @@ class MouseClickDrag:
     PINCH_INDEX 같은 제스처를 "왼쪽 버튼 Down/Up"으로 매핑.
     - pinch 유지: 드래그(Down 유지)
     - pinch 해제: Up
+    - before_button: Down/Up 직전 호출 (커서 injector 스레드가 보간 중이면 목표 위치로 먼저 착지)
     """
     down: bool = False
     dragging: bool = False
@@ -83,10 +85,19 @@ class MouseClickDrag:
     up_hold_sec: float = 0.02
     _cand_ts: float = 0.0
     _cand_state: str = ""  # "DOWN" or "UP"
+    before_button: Optional[Callable[[], None]] = None
+
+    def _button(self, flags: int):
+        if self.before_button is not None:
+            try:
+                self.before_button()
+            except Exception:
+                pass
+        _send_mouse(flags)
 
     def reset(self):
         if self.down:
-            _send_mouse(MOUSEEVENTF_LEFTUP)
+            self._button(MOUSEEVENTF_LEFTUP)
         self.down = False
         self.dragging = False
         self._cand_ts = 0.0
@@ -108,7 +119,7 @@ class MouseClickDrag:
                 self._cand_state = "DOWN"
                 self._cand_ts = t
             if (t - self._cand_ts) >= self.down_hold_sec:
-                _send_mouse(MOUSEEVENTF_LEFTDOWN)
+                self._button(MOUSEEVENTF_LEFTDOWN)
                 self.down = True
                 self.dragging = True
                 self._cand_state = ""
@@ -120,7 +131,7 @@ class MouseClickDrag:
                 self._cand_state = "UP"
                 self._cand_ts = t
             if (t - self._cand_ts) >= self.up_hold_sec:
-                _send_mouse(MOUSEEVENTF_LEFTUP)
+                self._button(MOUSEEVENTF_LEFTUP)
                 self.down = False
                 self.dragging = False
                 self._cand_state = ""
@@ -133,9 +144,13 @@ class MouseClickDrag:
 
 @dataclass
 class MouseRightClick:
-    """우클릭: 트리거 제스처(기본 V_SIGN) 감지 시 Down+Up 1회 발동"""
+    """
+    우클릭: 트리거 제스처(기본 V_SIGN) 감지 시 Down+Up 1회 발동
+    - before_button: Down 직전 호출 (MouseClickDrag 와 같음, 메뉴가 손 위치에 열리게)
+    """
     cooldown_sec: float = 0.45
     last_ts: float = 0.0
+    before_button: Optional[Callable[[], None]] = None
 
     def reset(self):
         self.last_ts = 0.0
@@ -154,6 +169,11 @@ class MouseRightClick:
         if t < (self.last_ts + self.cooldown_sec):
             return
 
+        if self.before_button is not None:
+            try:
+                self.before_button()
+            except Exception:
+                pass
         _send_mouse(MOUSEEVENTF_RIGHTDOWN)
         _send_mouse(MOUSEEVENTF_RIGHTUP)
         self.last_ts = t
@@ -2,21 +2,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
 
 import pyautogui
 
+from ..bindings import DEFAULT_BINDINGS, PresentationBindings
+
 pyautogui.FAILSAFE = False
 pyautogui.PAUSE = 0
 
 
-def _pick_token(gesture: str, mapping: Dict[str, str], order: list[str]) -> Optional[str]:
-    for tok in order:
-        if gesture == mapping.get(tok):
-            return tok
-    return None
-
-
 @dataclass
 class PresentationHandler:
     """PRESENTATION mode (PPT) - 안전/직관 버전 (전역 '양손 브이'와 겹침 방지)
@@ -126,16 +120,15 @@ class PresentationHandler:
         cursor_gesture: str,
         got_other: bool,
         other_gesture: str,
-        bindings: dict | None = None,
+        bindings: PresentationBindings | None = None,
     ):
         if not can_inject:
             self.reset()
             return
 
-        bindings = bindings or {}
-        nav: Dict[str, str] = dict(bindings.get("NAV") or {})
-        inter: Dict[str, str] = dict(bindings.get("INTERACT") or {})
-        interact_hold = (bindings.get("INTERACT_HOLD") or "NONE")
+        # compiled once per UPDATE_SETTINGS (bindings.compile_bindings)
+        b = bindings or DEFAULT_BINDINGS.presentation
+        interact_hold = b.interact_hold
 
         # 예전 로직 호환
         if cursor_gesture == "KNIFE":
@@ -164,17 +157,17 @@ class PresentationHandler:
         # -------------------------
         if token is None and got_cursor and got_other and interact_hold and interact_hold != "NONE":
             if other_gesture == interact_hold:
-                token = _pick_token(cursor_gesture, inter, ["TAB", "SHIFT_TAB", "ENTER", "PLAY_PAUSE"])
+                token = b.interact_by_gesture.get(cursor_gesture)
 
         # -------------------------
         # 1손 제스처(슬라이드 이동)
         # -------------------------
         if token is None and got_cursor:
-            token = _pick_token(cursor_gesture, nav, ["NEXT", "PREV"])
+            token = b.nav_by_gesture.get(cursor_gesture)
 
         # (옵션) 클릭 매핑(기본 NONE). PPT 모드 클릭은 hands_agent의 MouseClickDrag가 담당.
         if token is None and got_cursor:
-            if cursor_gesture == inter.get("ACTIVATE"):
+            if cursor_gesture == b.activate:
                 token = "ACTIVATE"
 
         if token is None:
@@ -8,8 +8,11 @@
 # - HandsAgent가 기대하는 형태로 pack(dict: cx/cy)를 반환
 #
 # 반환
-# - process(frame_bgr, t) -> (left_pack, right_pack)
+# - process(frame_bgr, t, mirror_x=False) -> (left_pack, right_pack)
 #   left_pack/right_pack: None 또는 {"cx":x01, "cy":y01, "area":float, "color":"BLUE|RED", "ts":t}
+#   mirror_x / flip_mirror: 픽셀을 뒤집지 않고 결과 cx만 1-cx로 미러링
+#
+# HSV / mask 이미지는 프레임 크기별로 한 번만 할당하고 dst= 로 재사용한다.
 # ---------------------------------------------------------------------------
 
 from __future__ import annotations
@@ -79,37 +82,57 @@ class ColorStickTracker:
         self.smooth_alpha = float(smooth_alpha)
         self.debug = bool(debug)
 
-        # last stable positions (normalized)
+        # last stable positions (normalized, raw/unmirrored frame)
         self._last_blue: Optional[Tuple[float, float]] = None
         self._last_red: Optional[Tuple[float, float]] = None
 
+        # HSV windows as arrays (built once)
+        self._blue_lo = np.array([self.BLUE_H_LO, self.s_min, self.v_min], dtype=np.uint8)
+        self._blue_hi = np.array([self.BLUE_H_HI, 255, 255], dtype=np.uint8)
+        self._red1_lo = np.array([self.RED_H1_LO, self.s_min, self.v_min], dtype=np.uint8)
+        self._red1_hi = np.array([self.RED_H1_HI, 255, 255], dtype=np.uint8)
+        self._red2_lo = np.array([self.RED_H2_LO, self.s_min, self.v_min], dtype=np.uint8)
+        self._red2_hi = np.array([self.RED_H2_HI, 255, 255], dtype=np.uint8)
+
+        # reusable per-frame images (allocated on first frame / size change)
+        self._shape: Optional[Tuple[int, int]] = None
+        self._hsv: Optional[np.ndarray] = None
+        self._m1: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+        self._mask_b: Optional[np.ndarray] = None
+        self._mask_r: Optional[np.ndarray] = None
+
         # optional debug windows
         self._dbg_name = "[RUSH_COLOR] masks" if self.debug else None
 
     # ---------------- core helpers ----------------
 
+    def _ensure_buffers(self, h: int, w: int):
+        if self._shape == (h, w):
+            return
+        self._shape = (h, w)
+        self._hsv = np.empty((h, w, 3), dtype=np.uint8)
+        self._m1 = np.empty((h, w), dtype=np.uint8)
+        self._m2 = np.empty((h, w), dtype=np.uint8)
+        self._mask_b = np.empty((h, w), dtype=np.uint8)
+        self._mask_r = np.empty((h, w), dtype=np.uint8)
+
     def _build_mask_blue(self, hsv: np.ndarray) -> np.ndarray:
-        lo = np.array([self.BLUE_H_LO, self.s_min, self.v_min], dtype=np.uint8)
-        hi = np.array([self.BLUE_H_HI, 255, 255], dtype=np.uint8)
-        return cv2.inRange(hsv, lo, hi)
+        return cv2.inRange(hsv, self._blue_lo, self._blue_hi, dst=self._m1)
 
     def _build_mask_red(self, hsv: np.ndarray) -> np.ndarray:
-        lo1 = np.array([self.RED_H1_LO, self.s_min, self.v_min], dtype=np.uint8)
-        hi1 = np.array([self.RED_H1_HI, 255, 255], dtype=np.uint8)
-        lo2 = np.array([self.RED_H2_LO, self.s_min, self.v_min], dtype=np.uint8)
-        hi2 = np.array([self.RED_H2_HI, 255, 255], dtype=np.uint8)
-        m1 = cv2.inRange(hsv, lo1, hi1)
-        m2 = cv2.inRange(hsv, lo2, hi2)
-        return cv2.bitwise_or(m1, m2)
-
-    def _postprocess_mask(self, mask: np.ndarray) -> np.ndarray:
+        m1 = cv2.inRange(hsv, self._red1_lo, self._red1_hi, dst=self._m1)
+        m2 = cv2.inRange(hsv, self._red2_lo, self._red2_hi, dst=self._m2)
+        return cv2.bitwise_or(m1, m2, dst=self._m1)
+
+    def _postprocess_mask(self, mask: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         # denoise (pepper)
-        mask = cv2.medianBlur(mask, 5)
-        # open -> remove small dots, close -> fill holes
+        mask = cv2.medianBlur(mask, 5, dst=out)
+        # open -> remove small dots, close -> fill holes (in place)
         if self.open_iters > 0:
-            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel, iterations=self.open_iters)
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel, dst=mask, iterations=self.open_iters)
         if self.close_iters > 0:
-            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel, iterations=self.close_iters)
+            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel, dst=mask, iterations=self.close_iters)
         return mask
 
     def _bgr_fallback_mask(self, frame_bgr: np.ndarray, color: str) -> np.ndarray:
@@ -195,19 +218,20 @@ class ColorStickTracker:
 
     # ---------------- public ----------------
 
-    def process(self, frame_bgr: np.ndarray, t: float) -> Tuple[Optional[Dict], Optional[Dict]]:
+    def process(self, frame_bgr: np.ndarray, t: float, mirror_x: bool = False) -> Tuple[Optional[Dict], Optional[Dict]]:
         """Return (left_pack(BLUE), right_pack(RED))."""
         if frame_bgr is None:
             return (None, None)
 
-        if self.flip_mirror:
-            frame_bgr = cv2.flip(frame_bgr, 1)
+        # mirror in coordinates, not pixels
+        mirror = bool(mirror_x) != self.flip_mirror
 
         h, w = frame_bgr.shape[:2]
-        hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
+        self._ensure_buffers(h, w)
+        hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV, dst=self._hsv)
 
         # BLUE
-        mask_b = self._postprocess_mask(self._build_mask_blue(hsv))
+        mask_b = self._postprocess_mask(self._build_mask_blue(hsv), out=self._mask_b)
         cnts_b = self._contours_from_mask(mask_b)
         blue = self._pick_best(cnts_b, w=w, h=h, last01=self._last_blue)
         if blue is None and self.use_bgr_fallback:
@@ -216,7 +240,7 @@ class ColorStickTracker:
             blue = self._pick_best(cnts_b, w=w, h=h, last01=self._last_blue)
 
         # RED
-        mask_r = self._postprocess_mask(self._build_mask_red(hsv))
+        mask_r = self._postprocess_mask(self._build_mask_red(hsv), out=self._mask_r)
         cnts_r = self._contours_from_mask(mask_r)
         red = self._pick_best(cnts_r, w=w, h=h, last01=self._last_red)
         if red is None and self.use_bgr_fallback:
@@ -230,12 +254,12 @@ class ColorStickTracker:
         if blue is not None:
             bx, by = self._smooth(self._last_blue, (blue.cx01, blue.cy01))
             self._last_blue = (bx, by)
-            left_pack = {"cx": bx, "cy": by, "area": float(blue.area), "color": "BLUE", "ts": float(t)}
+            left_pack = {"cx": (1.0 - bx) if mirror else bx, "cy": by, "area": float(blue.area), "color": "BLUE", "ts": float(t)}
 
         if red is not None:
             rx, ry = self._smooth(self._last_red, (red.cx01, red.cy01))
             self._last_red = (rx, ry)
-            right_pack = {"cx": rx, "cy": ry, "area": float(red.area), "color": "RED", "ts": float(t)}
+            right_pack = {"cx": (1.0 - rx) if mirror else rx, "cy": ry, "area": float(red.area), "color": "RED", "ts": float(t)}
 
         # Optional debug window: show masks side-by-side
         if self.debug:
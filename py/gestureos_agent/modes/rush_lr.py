@@ -1,11 +1,9 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
-from ..gestures import palm_center, classify_gesture
+from typing import Any, List, Optional, Tuple
+from ..features import HandFeatures
 
 @dataclass
 class RushLRPicker:
-    deadband: float = 0.06
-    swap_frames: int = 4
     onehand_keep_sec: float = 0.25
 
     state: dict = None
@@ -13,17 +11,20 @@ class RushLRPicker:
 
     def __post_init__(self):
         if self.state is None:
-            self.state = {"left": None, "right": None, "pending_swap": 0}
+            self.state = {"left": None, "right": None, "left_id": None, "right_id": None}
 
     def reset(self):
         self.state["left"] = None
         self.state["right"] = None
-        self.state["pending_swap"] = 0
+        self.state["left_id"] = None
+        self.state["right_id"] = None
         self.last_twohand_ts = 0.0
 
     def _pack(self, lm):
-        cx, cy = palm_center(lm)
-        return {"cx": cx, "cy": cy, "gesture": classify_gesture(lm)}
+        # lm: landmarks or the frame's HandFeatures (palm centre / gesture already memoized)
+        f = HandFeatures.of(lm)
+        cx, cy = f.palm_center
+        return {"cx": cx, "cy": cy, "gesture": f.gesture()}
 
     def _dist2(self, a, b):
         if a is None or b is None:
@@ -32,77 +33,57 @@ class RushLRPicker:
         dy = a["cy"] - b["cy"]
         return dx * dx + dy * dy
 
-    def pick(self, t: float, hands_list: List[Tuple[str | None, Any]]):
+    def pick(self, t: float, hands_list: List[Tuple[Optional[int], Any]]):
         """
-        hands_list: [(label, lm), ...]
+        hands_list: [(track_id, lm), ...] (track ids from HandTracker, stable across frames)
         Returns (left_pack, right_pack) where each pack is dict(cx,cy,gesture)
+
+        Lanes follow the hand identity: a new pair (first two-hand frame after more than
+        onehand_keep_sec with one hand) splits by x, after that each track keeps its lane
+        (crossed hands stay in their lanes) -> no per-frame swap logic here.
         """
         if not hands_list:
             self.reset()
             return None, None
 
         packs = []
-        for label, lm in hands_list:
+        for tid, lm in hands_list:
             if lm is None:
                 continue
-            packs.append(self._pack(lm))
+            packs.append((tid, self._pack(lm)))
 
         if not packs:
             return None, None
 
+        st = self.state
         if len(packs) == 1:
-            p = packs[0]
+            tid, p = packs[0]
             if t - self.last_twohand_ts < self.onehand_keep_sec:
-                dl = self._dist2(p, self.state["left"])
-                dr = self._dist2(p, self.state["right"])
-                if dl < dr:
-                    self.state["left"] = p
-                    return self.state["left"], self.state["right"]
+                if tid is not None and tid == st["left_id"]:
+                    lane = "left"
+                elif tid is not None and tid == st["right_id"]:
+                    lane = "right"
                 else:
-                    self.state["right"] = p
-                    return self.state["left"], self.state["right"]
-
-            self.state["left"] = None
-            self.state["right"] = p
-            self.state["pending_swap"] = 0
+                    # new track while the other hand is briefly gone: nearest lane
+                    lane = "left" if self._dist2(p, st["left"]) < self._dist2(p, st["right"]) else "right"
+                st[lane] = p
+                st[lane + "_id"] = tid
+                return st["left"], st["right"]
+
+            st["left"] = None
+            st["left_id"] = None
+            st["right"] = p
+            st["right_id"] = tid
             return None, p
 
-        packs.sort(key=lambda p: p["cx"])
-        left_now = packs[0]
-        right_now = packs[-1]
+        packs.sort(key=lambda x: x[1]["cx"])
+        (lid, lp), (rid, rp) = packs[0], packs[-1]
+        same_pair = (t - self.last_twohand_ts) < self.onehand_keep_sec
         self.last_twohand_ts = t
 
-        if self.state["left"] is None and self.state["right"] is None:
-            self.state["left"] = left_now
-            self.state["right"] = right_now
-            self.state["pending_swap"] = 0
-            return self.state["left"], self.state["right"]
-
-        if abs(right_now["cx"] - left_now["cx"]) < self.deadband:
-            cost_keep = self._dist2(left_now, self.state["left"]) + self._dist2(right_now, self.state["right"])
-            cost_swap = self._dist2(left_now, self.state["right"]) + self._dist2(right_now, self.state["left"])
-            if cost_swap < cost_keep:
-                self.state["left"] = right_now
-                self.state["right"] = left_now
-            else:
-                self.state["left"] = left_now
-                self.state["right"] = right_now
-            self.state["pending_swap"] = 0
-            return self.state["left"], self.state["right"]
-
-        cost_keep = self._dist2(left_now, self.state["left"]) + self._dist2(right_now, self.state["right"])
-        cost_swap = self._dist2(left_now, self.state["right"]) + self._dist2(right_now, self.state["left"])
-        want_swap = (cost_swap + 1e-9) < cost_keep
-
-        if want_swap:
-            self.state["pending_swap"] += 1
-            if self.state["pending_swap"] >= self.swap_frames:
-                self.state["left"] = right_now
-                self.state["right"] = left_now
-                self.state["pending_swap"] = 0
-        else:
-            self.state["pending_swap"] = 0
-            self.state["left"] = left_now
-            self.state["right"] = right_now
+        if same_pair and ((lid is not None and lid == st["right_id"]) or (rid is not None and rid == st["left_id"])):
+            (lid, lp), (rid, rp) = (rid, rp), (lid, lp)
 
-        return self.state["left"], self.state["right"]
+        st["left"], st["left_id"] = lp, lid
+        st["right"], st["right_id"] = rp, rid
+        return st["left"], st["right"]
@@ -0,0 +1,290 @@
+# py/gestureos_agent/mp_worker.py
+# ---------------------------------------------------------------------------
+# Out-of-process MediaPipe Hands (--mp-worker)
+#
+# 메인 프로세스(제스처/WS/preview)와 MediaPipe를 다른 프로세스로 분리해서 GIL 경쟁을 없앤다.
+# - 프레임: multiprocessing.shared_memory ring buffer (slot 단위, 피클링 없음)
+# - 요청 : (seq, slot, h, w, probe, reset) 만 Queue로 전달 (probe/reset: --roi, roi.py 헤더 참고)
+# - 결과 : (seq, hands, infer_ms) / hands = [(handed, score, float32[21,3]), ...]
+# - 프로세스는 spawn (main.py의 mp.set_start_method("spawn")와 동일, Windows 기본값)
+#
+# landmarks: (21, 3) float32 배열 그대로 주고받는다 (landmarks.py)
+#
+# 파이프라인: frame N+1을 submit 해두고 frame N 결과를 후처리한다 (depth = 미리 보내는 프레임 수).
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from .landmarks import from_mediapipe
+
+# NOTE: inference runs on the raw (unmirrored) camera frame; the agent mirrors x and swaps
+# handedness afterwards (framebuf.mirror_hands), so labels are left as MediaPipe reports them here.
+MIRROR_MODE = False
+
+HANDS_KW = dict(
+    static_image_mode=False,
+    max_num_hands=2,
+    model_complexity=0,
+    min_detection_confidence=0.5,
+    min_tracking_confidence=0.5,
+)
+# --roi periodic full-frame probe: own instance, palm detection every call (tracking state untouched)
+PROBE_KW = dict(HANDS_KW, static_image_mode=True)
+
+
+def reset_tracking(hands, make):
+    """Drop the tracking ROI of a Hands instance (input moved to other coordinates)."""
+    fn = getattr(hands, "reset", None)
+    if fn is not None:
+        fn()
+        return hands
+    hands.close()
+    return make()
+
+
+def parse_hands(res) -> List[Tuple[Optional[str], float, Any]]:
+    """MediaPipe result -> [(handed, score, landmarks), ...] (landmarks = (21, 3) float32)."""
+    out: List[Tuple[Optional[str], float, Any]] = []
+    if not res.multi_hand_landmarks:
+        return out
+
+    labels: List[Optional[str]] = []
+    scores: List[float] = []
+    if res.multi_handedness:
+        for h in res.multi_handedness:
+            cls = h.classification[0]
+            labels.append(getattr(cls, "label", None))
+            try:
+                scores.append(float(getattr(cls, "score", 0.0)))
+            except Exception:
+                scores.append(0.0)
+    else:
+        labels = [None] * len(res.multi_hand_landmarks)
+        scores = [0.0] * len(res.multi_hand_landmarks)
+
+    for i, lm_obj in enumerate(res.multi_hand_landmarks):
+        lm = from_mediapipe(lm_obj)
+        handed = labels[i] if i < len(labels) else None
+        score = scores[i] if i < len(scores) else 0.0
+
+        # Swap handedness if we mirrored the frame
+        if MIRROR_MODE and handed in ("Left", "Right"):
+            handed = "Right" if handed == "Left" else "Left"
+
+        out.append((handed, float(score), lm))
+    return out
+
+
+# =============================================================================
+# worker process
+# =============================================================================
+def _worker_main(shm_name: str, slot_bytes: int, req_q, res_q):
+    os.environ.setdefault("GLOG_minloglevel", "2")
+    try:
+        import cv2
+        import mediapipe as mediapipe
+
+        shm = shared_memory.SharedMemory(name=shm_name)
+        mp_hands = mediapipe.solutions.hands
+        hands = mp_hands.Hands(**HANDS_KW)
+    except Exception as e:
+        # parent falls back right away instead of waiting for start_timeout
+        res_q.put(("error", repr(e)))
+        return
+    probe = None
+    res_q.put(("ready", os.getpid()))
+
+    try:
+        while True:
+            req = req_q.get()
+            if req is None:
+                break
+            seq, slot, h, w, is_probe, reset = req
+            t0 = time.perf_counter()
+            bgr = np.ndarray((h, w, 3), dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+            del bgr
+            try:
+                if is_probe:
+                    if probe is None:
+                        probe = mp_hands.Hands(**PROBE_KW)
+                    out = parse_hands(probe.process(rgb))
+                else:
+                    if reset:
+                        hands = reset_tracking(hands, lambda: mp_hands.Hands(**HANDS_KW))
+                    out = parse_hands(hands.process(rgb))
+            except Exception as e:
+                print("[MP_WORKER] process error:", e, flush=True)
+                out = []
+            res_q.put((seq, out, (time.perf_counter() - t0) * 1000.0))
+    finally:
+        for inst in (hands, probe):
+            try:
+                if inst is not None:
+                    inst.close()
+            except Exception:
+                pass
+        shm.close()
+
+
+# =============================================================================
+# main-process side
+# =============================================================================
+class HandsWorker:
+    """
+    submit(bgr, probe, reset) -> seq : copy the frame into a free ring slot and queue it
+    collect(timeout) -> (seq, hands_meta, infer_ms) | None   (results come back in submit order)
+    """
+
+    def __init__(self, slots: int = 3, start_timeout: float = 20.0, drain_timeout: float = 2.0):
+        self.slots = max(2, int(slots))
+        self.start_timeout = float(start_timeout)
+        self.drain_timeout = float(drain_timeout)  # per frame, collecting in-flight frames before a resize
+
+        self._ctx = mp.get_context("spawn")
+        self._proc = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._req_q = None
+        self._res_q = None
+        self.slot_bytes = 0
+
+        self._seq = 0
+        self.inflight = 0
+        self._done = deque()  # results collected early (ring resize), handed out first by collect()
+        self.infer_ms = 0.0  # EMA, worker side
+        self.ok = False
+        self.err = ""
+
+    # ---------------- lifecycle ----------------
+    def start(self, slot_bytes: int) -> bool:
+        self.stop()
+        self.slot_bytes = int(slot_bytes)
+        try:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.slots)
+            self._req_q = self._ctx.Queue()
+            self._res_q = self._ctx.Queue()
+            self._proc = self._ctx.Process(
+                target=_worker_main,
+                args=(self._shm.name, self.slot_bytes, self._req_q, self._res_q),
+                name="mp-hands-worker",
+                daemon=True,
+            )
+            self._proc.start()
+            msg = self._wait_hello()
+            if isinstance(msg, tuple) and msg and msg[0] == "error":
+                raise RuntimeError(f"worker init failed: {msg[1]}")
+            if not (isinstance(msg, tuple) and msg and msg[0] == "ready"):
+                raise RuntimeError(f"unexpected worker hello: {msg!r}")
+            self.ok = True
+            self.err = ""
+            print(f"[MP_WORKER] started pid={msg[1]} slots={self.slots} slot={self.slot_bytes // 1024}KB", flush=True)
+            return True
+        except Exception as e:
+            self.err = f"{type(e).__name__}: {e}"
+            print("[MP_WORKER] start failed:", self.err, flush=True)
+            self.stop()
+            return False
+
+    def _wait_hello(self):
+        """First message from the worker; short slices so a worker that died during init is seen at once."""
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            try:
+                return self._res_q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+            if not self._proc.is_alive():
+                # it may have posted ("error", ...) right before exiting
+                try:
+                    return self._res_q.get(timeout=0.2)
+                except queue.Empty:
+                    raise RuntimeError(f"worker exited during init (exitcode={self._proc.exitcode})") from None
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"no hello from worker in {self.start_timeout:.0f}s")
+
+    def stop(self):
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            try:
+                self._req_q.put(None)
+                proc.join(timeout=1.5)
+            except Exception:
+                pass
+            if proc.is_alive():
+                try:
+                    proc.terminate()
+                except Exception:
+                    pass
+        shm, self._shm = self._shm, None
+        if shm is not None:
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
+        self.ok = False
+        self.inflight = 0
+
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.is_alive()
+
+    # ---------------- frames ----------------
+    def submit(self, bgr: np.ndarray, probe: bool = False, reset: bool = False) -> int:
+        """Caller must keep inflight < slots (collect first)."""
+        h, w = int(bgr.shape[0]), int(bgr.shape[1])
+        need = h * w * 3
+        if (not self.ok) or need > self.slot_bytes:
+            # first frame or a bigger resolution -> (re)allocate the ring.
+            # frames in flight (always, at depth >= 1) are finished by the old process first.
+            while self.ok and self.inflight:
+                res = self._take(self.drain_timeout)
+                if res is None:
+                    raise RuntimeError(self.err or f"no result in {self.drain_timeout}s before resize")
+                self._done.append(res)
+            if not self.start(max(need, self.slot_bytes)):
+                raise RuntimeError(self.err or "worker start failed")
+
+        seq = self._seq
+        self._seq += 1
+        slot = seq % self.slots
+        dst = np.ndarray((h, w, 3), dtype=np.uint8, buffer=self._shm.buf, offset=slot * self.slot_bytes)
+        np.copyto(dst, bgr)
+        del dst
+        self._req_q.put((seq, slot, h, w, bool(probe), bool(reset)))
+        self.inflight += 1
+        return seq
+
+    def collect(self, timeout: Optional[float] = None):
+        """Next result in order, or None on timeout (None timeout = non-blocking)."""
+        if self._done:
+            return self._done.popleft()
+        return self._take(timeout)
+
+    def _take(self, timeout: Optional[float]):
+        if self.inflight <= 0 or self._res_q is None:
+            return None
+        try:
+            if timeout is None:
+                seq, hands, infer_ms = self._res_q.get_nowait()
+            else:
+                seq, hands, infer_ms = self._res_q.get(timeout=max(0.0, float(timeout)))
+        except queue.Empty:
+            if not self.alive():
+                self.ok = False
+                self.err = "worker_died"
+                self.inflight = 0
+            return None
+
+        self.inflight -= 1
+        self.infer_ms = float(infer_ms) if self.infer_ms <= 0.0 else (0.9 * self.infer_ms + 0.1 * float(infer_ms))
+        hands_meta = [{"handed": hd, "score": float(sc), "lm": arr} for hd, sc, arr in hands]
+        return seq, hands_meta, float(infer_ms)
@@ -0,0 +1,166 @@
+# py/gestureos_agent/perf.py
+# ---------------------------------------------------------------------------
+# Per-stage latency stats for the frame loop
+#
+# 사용법 (한 프레임):
+#   perf.begin()
+#   ... schedule ...        perf.lap("schedule")
+#   ... cvtColor ...        perf.lap("cvtColor")
+#   ...
+#   perf.end_frame()
+#
+# - lap(stage)는 직전 mark 이후 경과 시간을 stage에 더한다 (같은 stage 여러 번 -> 합산)
+# - end_frame()에서 프레임 단위로 rolling window(deque)에 넣는다
+# - percentiles는 STATUS/PERF_DUMP 때만 계산 (프레임 루프에서는 append만)
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+# 60fps 기준 프레임 예산
+FRAME_BUDGET_MS = 1000.0 / 60.0
+
+# STATUS에 나가는 순서 (없는 stage는 생략)
+STAGE_ORDER = (
+    "capture",
+    "schedule",
+    "cvtColor",
+    "mediapipe",
+    "color",
+    "handedness",
+    "classify",
+    "learner",
+    "modes",
+    "inject",
+    "status",
+    "preview",
+)
+
+
+class PerfStats:
+    """Rolling p50/p95/p99 per stage (milliseconds, perf_counter based)."""
+
+    def __init__(self, window: int = 600, enabled: bool = True, budget_ms: float = FRAME_BUDGET_MS):
+        self.window = max(10, int(window))
+        self.enabled = bool(enabled)
+        self.budget_ms = float(budget_ms)
+
+        self._hist: Dict[str, Deque[float]] = {}
+        self._total: Deque[float] = deque(maxlen=self.window)
+        self._cur: Dict[str, float] = {}
+        self._t0 = 0.0
+        self._mark = 0.0
+        self.frames = 0
+
+    # ---------------- frame loop ----------------
+    def begin(self):
+        if not self.enabled:
+            return
+        self._cur.clear()
+        self._t0 = self._mark = time.perf_counter()
+
+    def lap(self, stage: str):
+        """Charge the time since the previous mark to `stage`."""
+        if not self.enabled or self._mark <= 0.0:
+            return
+        t = time.perf_counter()
+        self._cur[stage] = self._cur.get(stage, 0.0) + (t - self._mark) * 1000.0
+        self._mark = t
+
+    def add(self, stage: str, ms: float):
+        """Record a value measured elsewhere (e.g. frame age from the capture thread)."""
+        if not self.enabled:
+            return
+        self._cur[stage] = self._cur.get(stage, 0.0) + float(ms)
+
+    def end_frame(self):
+        if not self.enabled or self._t0 <= 0.0:
+            return
+        total = (time.perf_counter() - self._t0) * 1000.0
+        for stage, ms in self._cur.items():
+            h = self._hist.get(stage)
+            if h is None:
+                h = self._hist[stage] = deque(maxlen=self.window)
+            h.append(ms)
+        self._total.append(total)
+        self._cur.clear()
+        self._t0 = self._mark = 0.0
+        self.frames += 1
+
+    def reset(self):
+        self._hist.clear()
+        self._total.clear()
+        self._cur.clear()
+        self._t0 = self._mark = 0.0
+        self.frames = 0
+
+    # ---------------- reporting ----------------
+    def _stages(self) -> List[str]:
+        known = [s for s in STAGE_ORDER if s in self._hist]
+        extra = sorted(s for s in self._hist if s not in STAGE_ORDER)
+        return known + extra
+
+    @staticmethod
+    def _pcts(values) -> Optional[np.ndarray]:
+        if not values:
+            return None
+        return np.percentile(np.fromiter(values, dtype=np.float64), (50, 95, 99))
+
+    def compact(self) -> dict:
+        """Small STATUS block: {"ms": {stage: [p50, p95, p99]}, "total": [...], ...}"""
+        ms: Dict[str, List[float]] = {}
+        for s in self._stages():
+            p = self._pcts(self._hist[s])
+            if p is not None:
+                ms[s] = [round(float(v), 2) for v in p]
+
+        total = self._pcts(self._total)
+        over = 0.0
+        if self._total:
+            arr = np.fromiter(self._total, dtype=np.float64)
+            over = float(np.count_nonzero(arr > self.budget_ms)) * 100.0 / float(arr.size)
+
+        return {
+            "ms": ms,
+            "total": [round(float(v), 2) for v in total] if total is not None else [],
+            "budgetMs": round(self.budget_ms, 2),
+            "overBudgetPct": round(over, 1),
+            "n": len(self._total),
+        }
+
+    def summary(self) -> dict:
+        """Full table for PERF_DUMP (adds mean/max per stage)."""
+        stages = {}
+        for s in self._stages() + ["total"]:
+            h = self._total if s == "total" else self._hist[s]
+            if not h:
+                continue
+            arr = np.fromiter(h, dtype=np.float64)
+            p50, p95, p99 = np.percentile(arr, (50, 95, 99))
+            stages[s] = {
+                "p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "mean": round(float(arr.mean()), 3),
+                "max": round(float(arr.max()), 3),
+                "n": int(arr.size),
+            }
+        out = self.compact()
+        return {
+            "stages": stages,
+            "budgetMs": out["budgetMs"],
+            "overBudgetPct": out["overBudgetPct"],
+            "frames": int(self.frames),
+        }
+
+    def format_table(self) -> str:
+        s = self.summary()
+        lines = [f"[PERF] {s['frames']} frames, budget {s['budgetMs']}ms, over budget {s['overBudgetPct']}%"]
+        lines.append(f"  {'stage':<11}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}")
+        for name, r in s["stages"].items():
+            lines.append(f"  {name:<11}{r['p50']:>8.2f}{r['p95']:>8.2f}{r['p99']:>8.2f}{r['max']:>8.2f}")
+        return "\n".join(lines)
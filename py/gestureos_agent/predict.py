@@ -0,0 +1,204 @@
+# py/gestureos_agent/predict.py
+# ---------------------------------------------------------------------------
+# Latency-compensating cursor predictor (optional)
+#
+# 카메라 노출 + MediaPipe + 후처리 + 주입 사이에 수십 ms가 지나서 커서가 손보다 늦다.
+# 필터 출력(화면 정규화 좌표)을 측정된 파이프라인 지연만큼 앞으로 외삽한다.
+#   - "cv"     : 속도 EMA (constant velocity)
+#   - "kalman" : 축별 constant-velocity Kalman (위치/속도 상태)
+#   - 지연 = 프레임 캡처 시각 -> move 직전 (EMA) + extra_ms (주입/디스플레이), max_ms로 clamp
+#   - 급정지: 직전 프레임 실제 이동 속도가 추정 속도보다 훨씬 작으면 lead를 그 비율로 줄인다
+#   - lead 자체도 max_lead로 clamp, 느린 움직임(min_speed 미만)은 외삽 안 함 (jitter 증폭 방지)
+#   - hold (PINCH 클릭/드래그 중): 외삽 끄고 raw 그대로 + 놓은 뒤 release_sec 동안도 off (클릭 drift 방지)
+#
+# STATUS cursorPredict: raw / predicted 위치, lead, 사용한 지연 -> 튜닝용
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+PREDICT_KINDS = ("off", "cv", "kalman")
+
+
+class _Kalman1D:
+    """Constant-velocity Kalman filter for one axis (state: position, velocity)."""
+
+    __slots__ = ("q", "r", "x", "v", "p00", "p01", "p11")
+
+    def __init__(self, q: float, r: float):
+        self.q = float(q)  # process noise (acceleration spectral density)
+        self.r = float(r)  # measurement noise variance
+        self.x: Optional[float] = None
+        self.v = 0.0
+        self.p00 = self.p01 = self.p11 = 0.0
+
+    def reset(self):
+        self.x = None
+        self.v = 0.0
+
+    def update(self, z: float, dt: float):
+        if self.x is None:
+            self.x, self.v = z, 0.0
+            self.p00, self.p01, self.p11 = self.r, 0.0, 1.0
+            return
+        # predict
+        q = self.q
+        x = self.x + self.v * dt
+        p00 = self.p00 + dt * (2.0 * self.p01 + dt * self.p11) + q * dt * dt * dt / 3.0
+        p01 = self.p01 + dt * self.p11 + q * dt * dt / 2.0
+        p11 = self.p11 + q * dt
+        # correct
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        y = z - x
+        self.x = x + k0 * y
+        self.v = self.v + k1 * y
+        self.p00 = (1.0 - k0) * p00
+        self.p01 = (1.0 - k0) * p01
+        self.p11 = p11 - k1 * p01
+
+
+class CursorPredictor:
+    def __init__(
+        self,
+        kind: str = "off",
+        extra_ms: float = 8.0,
+        max_ms: float = 100.0,
+        max_lead: float = 0.04,
+        min_speed: float = 0.05,
+        stop_ratio: float = 0.5,
+        release_sec: float = 0.15,
+        kalman_q: float = 50.0,
+        kalman_r: float = 1e-5,
+    ):
+        self.kind = kind if kind in PREDICT_KINDS else "off"
+        self.extra_ms = float(extra_ms)
+        self.max_ms = float(max_ms)
+        self.max_lead = float(max_lead)  # screen-normalized
+        self.min_speed = float(min_speed)  # screen widths / s
+        self.stop_ratio = float(stop_ratio)
+        self.release_sec = float(release_sec)
+        self._kx = _Kalman1D(kalman_q, kalman_r)
+        self._ky = _Kalman1D(kalman_q, kalman_r)
+
+        self.latency_ms = 0.0  # EMA of capture -> move
+        self._last: Optional[Tuple[float, float, float]] = None  # (x, y, t)
+        self._v = (0.0, 0.0)
+        self._inst_speed = 0.0
+        self._held_until = 0.0
+        self.raw: Tuple[float, float] = (0.0, 0.0)
+        self.pred: Tuple[float, float] = (0.0, 0.0)
+        self.lead = 0.0
+        self.active = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.kind != "off"
+
+    def set_kind(self, kind: str):
+        kind = str(kind).strip().lower()
+        if kind in ("none", "0", "false", ""):
+            kind = "off"
+        if kind in ("constant_velocity", "velocity"):
+            kind = "cv"
+        if kind in PREDICT_KINDS and kind != self.kind:
+            self.kind = kind
+            self.reset()
+
+    def reset(self):
+        self._kx.reset()
+        self._ky.reset()
+        self._last = None
+        self._v = (0.0, 0.0)
+        self._inst_speed = 0.0
+        self.lead = 0.0
+        self.active = False
+
+    def observe_latency(self, latency_s: float):
+        ms = max(0.0, float(latency_s) * 1000.0)
+        self.latency_ms = ms if self.latency_ms <= 0.0 else (0.9 * self.latency_ms + 0.1 * ms)
+
+    def horizon_s(self) -> float:
+        return max(0.0, min(self.max_ms, self.latency_ms + self.extra_ms)) / 1000.0
+
+    def _velocity(self, x: float, y: float, t: float) -> Tuple[float, float]:
+        last = self._last
+        self._last = (x, y, t)
+        if last is None or (t - last[2]) > 0.5:
+            self._kx.reset()
+            self._ky.reset()
+            self._v = (0.0, 0.0)
+            self._inst_speed = 0.0
+            if self.kind == "kalman":
+                self._kx.update(x, 0.0)
+                self._ky.update(y, 0.0)
+            return self._v
+        dt = t - last[2]
+        if dt <= 1e-6:
+            return self._v
+
+        ivx = (x - last[0]) / dt
+        ivy = (y - last[1]) / dt
+        self._inst_speed = math.hypot(ivx, ivy)
+        if self.kind == "kalman":
+            self._kx.update(x, dt)
+            self._ky.update(y, dt)
+            self._v = (self._kx.v, self._ky.v)
+        else:
+            vx, vy = self._v
+            self._v = (0.5 * ivx + 0.5 * vx, 0.5 * ivy + 0.5 * vy)
+        return self._v
+
+    def __call__(self, x: float, y: float, t: float, hold: bool = False) -> Tuple[float, float]:
+        """x, y: filtered cursor (0~1) at frame time t. hold=True during PINCH click/drag."""
+        self.raw = (x, y)
+        if not self.enabled:
+            self.pred = (x, y)
+            self.lead = 0.0
+            self.active = False
+            return x, y
+
+        vx, vy = self._velocity(x, y, t)
+
+        if hold:
+            self._held_until = t + self.release_sec
+        speed = math.hypot(vx, vy)
+        if hold or t < self._held_until or speed < self.min_speed:
+            self.pred = (x, y)
+            self.lead = 0.0
+            self.active = False
+            return x, y
+
+        h = self.horizon_s()
+        dx, dy = vx * h, vy * h
+
+        # sudden stop: the last step was much slower than the velocity estimate -> trust the step
+        if self._inst_speed < self.stop_ratio * speed:
+            k = self._inst_speed / max(1e-9, speed)
+            dx, dy = dx * k, dy * k
+
+        lead = math.hypot(dx, dy)
+        if lead > self.max_lead:
+            k = self.max_lead / lead
+            dx, dy = dx * k, dy * k
+            lead = self.max_lead
+
+        px = min(1.0, max(0.0, x + dx))
+        py = min(1.0, max(0.0, y + dy))
+        self.pred = (px, py)
+        self.lead = lead
+        self.active = True
+        return px, py
+
+    def status(self) -> dict:
+        return {
+            "kind": self.kind,
+            "active": bool(self.active),
+            "raw": [round(float(self.raw[0]), 5), round(float(self.raw[1]), 5)],
+            "pred": [round(float(self.pred[0]), 5), round(float(self.pred[1]), 5)],
+            "lead": round(float(self.lead), 5),
+            "latencyMs": round(float(self.latency_ms), 1),
+            "horizonMs": round(self.horizon_s() * 1000.0, 1),
+        }
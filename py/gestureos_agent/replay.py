@@ -0,0 +1,215 @@
+# py/gestureos_agent/replay.py
+# ---------------------------------------------------------------------------
+# Deterministic session replay
+#
+# session_rec.py로 녹화한 .gosr 파일을 카메라/MediaPipe 없이 HandsAgent에 다시 흘려보낸다.
+#   - 헤더의 초기 상태(mode/enabled/lock/settings/learner profile) 복원
+#   - WS 명령은 녹화된 순서 그대로 _on_command()로
+#   - 프레임은 녹화된 t 그대로 _process_hands()로 (입력 주입은 항상 off)
+#
+# 같은 세션을 두 번 돌리면 STATUS 덤프(--dump)가 바이트 단위로 같아야 한다.
+# 코드 변경 전/후 덤프를 diff 해서 제스처 동작 회귀를 잡는 용도.
+#
+#   python -m gestureos_agent.replay SESSION.gosr [--speed=max|realtime] [--dump=out.jsonl]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import sys
+import time
+from dataclasses import replace
+from typing import Any, Optional
+
+from .config import AgentConfig
+from .session_rec import SessionReader
+
+# 녹화 당시 파일/프로세스를 건드리는 명령은 재생하지 않는다
+# (learner 프로필 저장/학습, 녹화 제어). 학습 상태는 헤더의 프로필을 그대로 쓴다.
+_SKIP_PREFIXES = ("TRAIN_", "REC_")
+
+
+class _StatusSink:
+    """Stands in for WSClient during replay: collects STATUS payloads instead of sending."""
+
+    def __init__(self, dump_path: str = ""):
+        self.enabled = True
+        self.connected = False
+        self.sent = 0
+        self._fp = open(dump_path, "w", encoding="utf-8") if dump_path else None
+
+    def start(self):
+        pass
+
+    def send_dict(self, payload: dict):
+        self.sent += 1
+        if self._fp is not None:
+            # timings differ run to run -> keep the dump deterministic
+            if "perf" in payload:
+                payload = {k: v for k, v in payload.items() if k != "perf"}
+            self._fp.write(json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str))
+            self._fp.write("\n")
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+class SessionReplay:
+    """
+    Feeds a recorded session into a HandsAgent.
+    Only _process_hands() is timed, so `stats()` is the post-inference cost per frame.
+    """
+
+    def __init__(self, path: str, speed: str = "max", dump: str = "", cfg: Optional[AgentConfig] = None):
+        # agent import is deferred so that `session_rec` stays usable on its own
+        from .agents.hands_agent import HandsAgent
+
+        self.path = str(path)
+        self.speed = "realtime" if str(speed).lower() == "realtime" else "max"
+        self.reader = SessionReader(self.path)
+
+        base = cfg or AgentConfig(
+            headless=True,
+            no_ws=False,
+            no_inject=True,
+            start_enabled=False,
+            start_keyboard=False,
+            start_rush=False,
+            start_vkey=False,
+            force_cursor_left=False,
+        )
+        # replay never injects input and never opens a preview window
+        base = replace(base, headless=True, no_ws=False, no_inject=True, replay=self.path)
+
+        self.agent = HandsAgent(base)
+        self.agent.preview = False
+        self.sink = _StatusSink(dump)
+        self.agent.ws = self.sink
+
+        self.frames = 0
+        self.commands = 0
+        self.process_sec = 0.0
+        self.wall_sec = 0.0
+
+    # ---------------- state ----------------
+    def _restore_state(self, st: dict):
+        a = self.agent
+        if st.get("settings"):
+            a.apply_settings(st["settings"])
+
+        mode = str(st.get("mode", "MOUSE")).upper()
+        if mode != str(a.mode).upper():
+            a.apply_set_mode(mode)
+
+        a.enabled = bool(st.get("enabled", a.enabled))
+        a.locked = bool(st.get("locked", a.locked))
+        a.ui_locked = bool(st.get("uiLocked", a.ui_locked))
+        if st.get("cursorHand") in ("Left", "Right"):
+            a.cursor_hand_label = str(st["cursorHand"])
+
+        prof = str(st.get("learnProfile", "") or "")
+        if prof and prof != a.learner.profile:
+            # set_profile()는 현재 프로필을 먼저 저장하므로 load()만 한다
+            a.learner.profile = prof
+            a.learner.load()
+        if "learnEnabled" in st:
+            a.learner.enabled = bool(st["learnEnabled"])
+
+    # ---------------- run ----------------
+    def run(self) -> dict:
+        a = self.agent
+        self._restore_state(self.reader.state)
+
+        fps = 0.0
+        prev_t: Optional[float] = None
+        wall0 = time.perf_counter()
+        rec0: Optional[float] = None
+
+        for tag, t, obj in self.reader:
+            if self.speed == "realtime":
+                if rec0 is None:
+                    rec0 = t
+                lag = (t - rec0) - (time.perf_counter() - wall0)
+                if lag > 0:
+                    time.sleep(lag)
+
+            if tag == "C":
+                typ = str(obj.get("type", "")).upper()
+                if typ.startswith(_SKIP_PREFIXES):
+                    continue
+                a._on_command(obj)
+                self.commands += 1
+                continue
+
+            if prev_t is not None:
+                dt = max(t - prev_t, 1e-6)
+                fps = 0.9 * fps + 0.1 * (1.0 / dt)
+            prev_t = t
+
+            t0 = time.perf_counter()
+            a.perf.begin()
+            a._process_hands(t, obj, frame=None, fps=fps)
+            a.perf.end_frame()
+            self.process_sec += time.perf_counter() - t0
+            self.frames += 1
+
+        self.wall_sec = time.perf_counter() - wall0
+        self.sink.close()
+        return self.stats()
+
+    def stats(self) -> dict:
+        n = max(1, self.frames)
+        return {
+            "frames": int(self.frames),
+            "commands": int(self.commands),
+            "statusSent": int(self.sink.sent),
+            "processMsPerFrame": 1000.0 * self.process_sec / n,
+            "wallSec": float(self.wall_sec),
+        }
+
+
+def run_replay(cfg: AgentConfig) -> dict:
+    """main.py --replay entry point."""
+    rp = SessionReplay(
+        cfg.replay,
+        speed=getattr(cfg, "replay_speed", "max"),
+        dump=getattr(cfg, "replay_dump", ""),
+        cfg=cfg,
+    )
+    st = rp.run()
+    if rp.agent.perf.frames:
+        print(rp.agent.perf.format_table(), flush=True)
+    print(
+        "[REPLAY] {frames} frames, {commands} cmds, {statusSent} status, "
+        "{processMsPerFrame:.3f} ms/frame (process), {wallSec:.2f}s wall".format(**st),
+        flush=True,
+    )
+    return st
+
+
+def main(argv: Optional[Any] = None) -> int:
+    from .config import parse_cli
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    path = next((a for a in argv if not a.startswith("-")), "")
+    if path:
+        argv = [a for a in argv if a != path] + [f"--replay={path}"]
+    _, cfg = parse_cli(argv)
+    if not cfg.replay:
+        print("usage: python -m gestureos_agent.replay SESSION.gosr [--speed=max|realtime] [--dump=out.jsonl]")
+        return 2
+
+    # short aliases for the module CLI
+    for a in argv:
+        if a.startswith("--speed="):
+            cfg = replace(cfg, replay_speed=a.split("=", 1)[1].strip().lower())
+        elif a.startswith("--dump="):
+            cfg = replace(cfg, replay_dump=a.split("=", 1)[1].strip())
+
+    run_replay(cfg)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,246 @@
+# py/gestureos_agent/roi.py
+# ---------------------------------------------------------------------------
+# Adaptive inference ROI for MediaPipe Hands
+#
+# 직전 프레임 손 bbox(hands_meta, full-frame 정규화 좌표) 주변만 잘라서 MediaPipe에 넣는다.
+# - ROI는 정사각형 + padding, 손이 ROI 안쪽 margin을 벗어날 때만 다시 잡는다 (tracker 안정)
+# - ROI가 크면(손이 카메라에 가까움) max_side로 다운스케일 (거의 full이면 full frame 다운스케일)
+# - ROI에서 손을 놓치면 다음 프레임은 full frame, LOSS_GRACE_SEC 지나면 ROI 해제
+# - 두 번째 손이 ROI 밖에서 들어오는 경우를 위해 full_every 프레임마다 full frame
+#
+# MediaPipe Hands(static_image_mode=False)는 직전 결과로 다음 프레임의 손 ROI를 잡는다 (palm 검출 생략).
+# 같은 인스턴스에 full frame과 crop을 번갈아 넣으면 그 ROI가 엉뚱한 좌표계가 되어 palm 검출을 다시 한다.
+# - probe   : 주기적 full frame은 tracking 인스턴스가 아닌 별도 static_image_mode 인스턴스로 (tracking 상태 유지)
+# - moved   : tracking 인스턴스 입력의 좌표계가 바뀜 (crop 재배치 / crop <-> full) -> hands.reset()
+# 비용: python bench/bench_roi.py (mediapipe 필요) -> full / crop / probe+crop 시퀀스의 프레임당 ms,
+#   한 인스턴스(이전 방식) vs probe 인스턴스 분리 비교.
+#   STATUS roi.trackResets / roi.probeFrames 로 빈도를 확인 (reset은 손이 margin을 벗어날 때만).
+#
+# 결과 landmark는 map_back()으로 full-frame 정규화 좌표로 되돌린다
+# (ControlMapper / HUD / learner는 ROI를 모른다).
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+
+from .landmarks import as_landmarks
+
+
+@dataclass(frozen=True)
+class RoiRect:
+    """Pixel rect in the full frame + the downscale applied to the crop."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    frame_w: int
+    frame_h: int
+    scale: float = 1.0
+
+    @property
+    def w(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def h(self) -> int:
+        return self.y1 - self.y0
+
+    def norm(self) -> List[float]:
+        fw, fh = float(self.frame_w), float(self.frame_h)
+        return [self.x0 / fw, self.y0 / fh, self.x1 / fw, self.y1 / fh]
+
+
+def hands_bbox(hands_meta: List[dict]) -> Optional[Tuple[float, float, float, float]]:
+    """Union bbox (normalized x0, y0, x1, y1) of all hands."""
+    bb: Optional[List[float]] = None
+    for h in hands_meta or []:
+        lm = h.get("lm")
+        if lm is None or len(lm) == 0:
+            continue
+        a = as_landmarks(lm)
+        lo = a[:, :2].min(axis=0)
+        hi = a[:, :2].max(axis=0)
+        cur = [float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1])]
+        if bb is None:
+            bb = cur
+        else:
+            bb = [min(bb[0], cur[0]), min(bb[1], cur[1]), max(bb[2], cur[2]), max(bb[3], cur[3])]
+    return tuple(bb) if bb is not None else None
+
+
+class AdaptiveRoi:
+    def __init__(
+        self,
+        loss_grace_sec: float = 0.30,
+        hard_loss_sec: float = 0.55,
+        pad: float = 0.60,
+        min_frac: float = 0.40,
+        margin: float = 0.08,
+        max_side: int = 320,
+        full_every: int = 15,
+    ):
+        self.loss_grace_sec = float(loss_grace_sec)
+        self.hard_loss_sec = float(hard_loss_sec)
+        self.pad = float(pad)            # padding around the hand bbox (x bbox size, per side)
+        self.min_frac = float(min_frac)  # min ROI side (x min(frame_w, frame_h))
+        self.margin = float(margin)      # re-center when the hand gets this close to the ROI edge
+        self.max_side = int(max_side)    # downscale crops larger than this (px)
+        self.full_every = max(1, int(full_every))
+
+        self.rect: Optional[RoiRect] = None
+        self._bbox: Optional[Tuple[float, float, float, float]] = None
+        self._last_seen = 0.0
+        self._force_full = True
+        self._n = 0
+
+        # per-plan flags for the caller (see header)
+        self.probe = False   # this full frame goes to the probe instance, not the tracking one
+        self.moved = False   # tracking instance input changed coordinates -> reset its tracking
+        self._track_src: object = None  # rect (or None = full frame) the tracking instance saw last
+
+        # STATUS counters
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.probe_frames = 0
+        self.track_resets = 0
+
+    def reset(self):
+        self.rect = None
+        self._bbox = None
+        self._force_full = True
+
+    # ---------------- planning ----------------
+    def plan(self, frame_w: int, frame_h: int, t: float) -> Optional[RoiRect]:
+        """Rect to crop for this frame, or None for full frame (sets .probe / .moved)."""
+        r = self._plan(frame_w, frame_h, t)
+        self.probe = r is None and self.rect is not None and not self._force_full
+        self.moved = False
+        if self.probe:
+            self.probe_frames += 1
+        elif r != self._track_src:
+            self._track_src = r
+            self.moved = True
+            self.track_resets += 1
+        return r
+
+    def _plan(self, frame_w: int, frame_h: int, t: float) -> Optional[RoiRect]:
+        self._n += 1
+
+        lost = (t - self._last_seen)
+        if self._bbox is None or lost > self.hard_loss_sec:
+            self.reset()
+        elif lost > self.loss_grace_sec:
+            # hand lost for a while: search the whole frame, keep the bbox until HARD_LOSS
+            self.rect = None
+
+        if (
+            self._bbox is None
+            or self._force_full
+            or lost > self.loss_grace_sec
+            or (self._n % self.full_every) == 0
+        ):
+            self.full_frames += 1
+            return None
+
+        if self.rect is None or self.rect.frame_w != frame_w or self.rect.frame_h != frame_h or not self._fits(self.rect):
+            self.rect = self._make_rect(frame_w, frame_h)
+
+        self.roi_frames += 1
+        return self.rect
+
+    def _side(self, fw: int, fh: int) -> int:
+        """Square ROI side (px) for the current hand bbox."""
+        x0, y0, x1, y1 = self._bbox
+        side = max((x1 - x0) * fw, (y1 - y0) * fh) * (1.0 + 2.0 * self.pad)
+        side = max(side, self.min_frac * min(fw, fh))
+        return int(min(side, min(fw, fh)))
+
+    def _fits(self, r: RoiRect) -> bool:
+        """Hand bbox still inside the ROI (with margin) and the ROI not way too large for it."""
+        x0, y0, x1, y1 = self._bbox
+        rx0, ry0, rx1, ry1 = r.norm()
+        mx = self.margin * (rx1 - rx0)
+        my = self.margin * (ry1 - ry0)
+        if x0 < rx0 + mx or y0 < ry0 + my or x1 > rx1 - mx or y1 > ry1 - my:
+            return False
+        return r.w <= 1.6 * self._side(r.frame_w, r.frame_h)
+
+    def _make_rect(self, fw: int, fh: int) -> RoiRect:
+        x0, y0, x1, y1 = self._bbox
+        side = self._side(fw, fh)
+
+        # ROI covering most of the frame (hand close to the camera) -> no crop,
+        # but the hand is big enough that a downscaled full frame still tracks fine
+        if side * side >= 0.7 * fw * fh:
+            scale = 1.0
+            if self.max_side > 0 and min(fw, fh) > self.max_side:
+                scale = float(self.max_side) / float(min(fw, fh))
+            return RoiRect(0, 0, fw, fh, fw, fh, scale)
+
+        cx = 0.5 * (x0 + x1) * fw
+        cy = 0.5 * (y0 + y1) * fh
+        rx0 = int(round(cx - side / 2))
+        ry0 = int(round(cy - side / 2))
+        rx0 = max(0, min(fw - side, rx0))
+        ry0 = max(0, min(fh - side, ry0))
+
+        scale = 1.0
+        if self.max_side > 0 and side > self.max_side:
+            scale = float(self.max_side) / float(side)
+        return RoiRect(rx0, ry0, rx0 + side, ry0 + side, fw, fh, scale)
+
+    # ---------------- crop / map ----------------
+    @staticmethod
+    def crop(frame_bgr, r: RoiRect):
+        """BGR crop (view) -> resized copy when r.scale < 1."""
+        sub = frame_bgr[r.y0 : r.y1, r.x0 : r.x1]
+        if r.scale < 1.0:
+            size = (max(1, int(r.w * r.scale)), max(1, int(r.h * r.scale)))
+            sub = cv2.resize(sub, size, interpolation=cv2.INTER_AREA)
+        return sub
+
+    @staticmethod
+    def map_back(hands_meta: List[dict], r: RoiRect) -> List[dict]:
+        """ROI-normalized landmarks -> full-frame normalized (z follows the x scale like MediaPipe)."""
+        sx = r.w / float(r.frame_w)
+        sy = r.h / float(r.frame_h)
+        ox = r.x0 / float(r.frame_w)
+        oy = r.y0 / float(r.frame_h)
+        for h in hands_meta:
+            lm = h.get("lm")
+            if lm is None:
+                continue
+            a = as_landmarks(lm)
+            a *= (sx, sy, sx)
+            a[:, 0] += ox
+            a[:, 1] += oy
+            h["lm"] = a
+        return hands_meta
+
+    # ---------------- feedback ----------------
+    def update(self, hands_meta: List[dict], t: float, used: Optional[RoiRect]):
+        """Feed back this frame's (full-frame) result."""
+        bb = hands_bbox(hands_meta)
+        if bb is not None:
+            self._bbox = bb
+            self._last_seen = float(t)
+            self._force_full = False
+        elif used is not None:
+            # lost inside the ROI -> next frame searches the full frame
+            self._force_full = True
+
+    def status(self) -> dict:
+        r = self.rect
+        return {
+            "active": r is not None and not self._force_full,
+            "rect": [round(v, 3) for v in r.norm()] if r is not None else None,
+            "scale": round(r.scale, 3) if r is not None else 1.0,
+            "roiFrames": int(self.roi_frames),
+            "fullFrames": int(self.full_frames),
+            "probeFrames": int(self.probe_frames),
+            "trackResets": int(self.track_resets),
+        }
@@ -0,0 +1,142 @@
+# py/gestureos_agent/rules.py
+# ---------------------------------------------------------------------------
+# Declarative hold / cooldown gesture rules
+#
+# "양손 FIST 0.9s 홀드, cooldown 1.5s" 같은 조합을 코드 대신 데이터(HoldRule)로 적는다.
+#   - 프레임마다 한 번: 미리 계산된 손 상태(RuleFrame: cursor/other 제스처, 손 유무, mode, flags)로 평가
+#   - 규칙 순서 = 우선순위 (앞 규칙이 먼저 평가/발동, 발동 후 바뀐 flags를 뒤 규칙이 본다)
+#   - 홀드: 조건이 처음 맞은 프레임부터 잼, 조건이 한 프레임이라도 깨지면 리셋,
+#           hold_sec 이상 + cooldown 지나면 발동 -> 홀드 리셋 (계속 들고 있으면 다시 hold_sec 후 발동)
+#   - cooldown_key 가 같은 규칙끼리 cooldown 공유 (예: APP_START / APP_STOP)
+#   - cursor 제스처별 후보 규칙을 미리 나눠 둠 -> 규칙 수가 늘어도 매 프레임 후보만 평가
+#     (나머지는 홀드 중이던 것만 리셋)
+#
+# 시간은 프레임 시각 t -> replay 결정성 유지.
+# 비용: python bench/bench_rules.py (규칙 수별 us/frame)
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class HoldRule:
+    name: str
+    hold_sec: float
+    cursor: Optional[str] = None  # cursor-hand gesture (None = any)
+    other: Optional[str] = None  # other-hand gesture (None = any)
+    need_cursor: bool = False
+    need_other: bool = False
+    require: FrozenSet[str] = frozenset()  # flags that must be set
+    forbid: FrozenSet[str] = frozenset()  # flags that must be clear
+    modes: Optional[FrozenSet[str]] = None  # only in these modes (None = all)
+    not_modes: FrozenSet[str] = frozenset()
+    cooldown_sec: float = 0.0
+    cooldown_key: str = ""  # shared cooldown ("" = per rule)
+
+    def matches(self, f: "RuleFrame") -> bool:
+        if self.need_cursor and not f.got_cursor:
+            return False
+        if self.need_other and not f.got_other:
+            return False
+        if self.cursor is not None and f.cursor != self.cursor:
+            return False
+        if self.other is not None and f.other != self.other:
+            return False
+        if self.require and not (self.require <= f.flags):
+            return False
+        if self.forbid and (self.forbid & f.flags):
+            return False
+        if self.modes is not None and f.mode not in self.modes:
+            return False
+        if f.mode in self.not_modes:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class RuleFrame:
+    t: float
+    cursor: str = "NONE"
+    other: str = "NONE"
+    got_cursor: bool = False
+    got_other: bool = False
+    mode: str = ""
+    flags: FrozenSet[str] = frozenset()
+
+
+# on_fire(rule, frame) -> new flags for the rules after it (None = unchanged)
+OnFire = Callable[[HoldRule, RuleFrame], Optional[FrozenSet[str]]]
+
+
+class RuleEngine:
+    def __init__(self, rules: Sequence[HoldRule]):
+        names = [r.name for r in rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate rule names: {names}")
+        self.rules: Tuple[HoldRule, ...] = tuple(rules)
+        self._order = {r.name: i for i, r in enumerate(self.rules)}
+
+        # cursor gesture -> candidate rules (table order); rules with cursor=None are in every list
+        wild = tuple(r for r in self.rules if r.cursor is None)
+        self._any = wild
+        self._by_cursor: Dict[str, Tuple[HoldRule, ...]] = {}
+        for g in {r.cursor for r in self.rules if r.cursor is not None}:
+            self._by_cursor[g] = tuple(r for r in self.rules if r.cursor is None or r.cursor == g)
+
+        self._start: Dict[str, float] = {}  # name -> hold start (only rules currently holding)
+        self._last_fire: Dict[str, float] = {}  # cooldown key -> last fire t
+        self.matched: Tuple[str, ...] = ()
+        self.fired: Tuple[str, ...] = ()
+
+    def reset(self, names: Optional[Iterable[str]] = None):
+        """Drop hold timers (cooldowns are kept)."""
+        if names is None:
+            self._start.clear()
+            return
+        for n in names:
+            self._start.pop(n, None)
+
+    def update(self, frame: RuleFrame, on_fire: Optional[OnFire] = None) -> Tuple[str, ...]:
+        """One pass over the candidate rules. Returns the names fired this frame (in order)."""
+        t = frame.t
+        stale = set(self._start)
+        matched: List[str] = []
+        fired: List[str] = []
+        start = self._start
+        for r in self._by_cursor.get(frame.cursor, self._any):
+            if not r.matches(frame):
+                continue
+            name = r.name
+            matched.append(name)
+            stale.discard(name)
+            t0 = start.get(name)
+            if t0 is None:
+                start[name] = t0 = t
+            if (t - t0) < r.hold_sec:
+                continue
+            key = r.cooldown_key or name
+            if t < self._last_fire.get(key, 0.0) + r.cooldown_sec:
+                continue
+            self._last_fire[key] = t
+            start.pop(name, None)
+            fired.append(name)
+            if on_fire is not None:
+                flags = on_fire(r, frame)
+                if flags is not None:
+                    frame = replace(frame, flags=flags)
+        for name in stale:
+            start.pop(name, None)
+        self.matched = tuple(matched)
+        self.fired = tuple(fired)
+        return self.fired
+
+    def progress(self, t: float) -> Dict[str, float]:
+        """Holding rules -> 0..1 of their hold time (HUD / tuning)."""
+        out = {}
+        for name, t0 in sorted(self._start.items(), key=lambda kv: self._order[kv[0]]):
+            h = self.rules[self._order[name]].hold_sec
+            out[name] = round(min(1.0, (t - t0) / h), 3) if h > 0 else 1.0
+        return out
+
@@ -0,0 +1,330 @@
+# py/gestureos_agent/sample_store.py
+# ---------------------------------------------------------------------------
+# Per-profile training sample store (append-only, fixed-width records, memory-mapped)
+#
+# 예전에는 MLPLearner.samples (Python float 리스트) 가 메모리에만 있어서 재시작하면 캡처가 다 사라졌다.
+#   <profile>.samples : 64 byte 헤더 (magic, version, dim) + 레코드 배열
+#     레코드 (packed): t f8 (캡처 wall time) | pinch f4 (NaN = 없음) | hand u1 (0 cursor, 1 other)
+#                      | label S32 (UTF-8) | vec f4[dim] (HandFeatures.vector)
+#   - 캡처는 레코드 하나씩 파일 끝에 append (수정/삭제 없음)
+#   - MAX_SAMPLES_PER_LABEL: (hand, label) 별로 가장 최근 cap 개만 유효. 오래된 레코드가
+#     유효 레코드보다 많아지면 유효 레코드만 새 파일에 써서 os.replace (compact)
+#   - 학습 스냅샷: np.memmap 으로 매핑 -> 유효 인덱스로 vec 를 라벨별 float32 배열로 바로 모음
+#     (Python 리스트를 만들지 않음, 매핑은 스냅샷 동안만 열림)
+#   - 프로세스가 append 도중 죽어서 끝에 남은 반쪽 레코드는 다음 open 때 잘라냄
+# export / import: 유효 레코드를 .npz (schema samples_v1, allow_pickle=False) 로 주고받는다.
+#   python -m gestureos_agent.sample_store info STORE.samples
+#   python -m gestureos_agent.sample_store export STORE.samples OUT.npz
+#   python -m gestureos_agent.sample_store import STORE.samples IN.npz [--replace]
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"GOSAMPL1"
+VERSION = 1
+HEADER = struct.Struct("<8sII")  # magic, version, dim
+HEADER_SIZE = 64
+LABEL_BYTES = 32
+HANDS = ("cursor", "other")
+EXPORT_SCHEMA = "samples_v1"
+PINCH_KEEP = 2000  # MLPLearner 의 핀치 보정 버퍼 크기
+
+Samples = Dict[str, Dict[str, np.ndarray]]
+
+
+def record_dtype(dim: int) -> np.dtype:
+    return np.dtype([
+        ("t", "<f8"),
+        ("pinch", "<f4"),
+        ("hand", "u1"),
+        ("label", f"S{LABEL_BYTES}"),
+        ("vec", "<f4", (int(dim),)),
+    ])
+
+
+def _header(dim: int) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, int(dim)).ljust(HEADER_SIZE, b"\0")
+
+
+def _group_keys(rec: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """레코드별 (hand, label) 그룹 번호 = hand * len(labels) + label 순번."""
+    labels, inv = np.unique(np.asarray(rec["label"]), return_inverse=True)
+    return labels, rec["hand"].astype(np.int64) * len(labels) + inv.reshape(-1)
+
+
+def _live_groups(key: np.ndarray, cap: int) -> List[np.ndarray]:
+    """그룹별 가장 최근 cap 개 레코드의 인덱스 (그룹 순서 = 유효 레코드가 처음 나온 순서)."""
+    groups = [np.flatnonzero(key == k)[-cap:] for k in np.unique(key)]
+    groups.sort(key=lambda g: int(g[0]))
+    return groups
+
+
+def live_index(rec: np.ndarray, cap: int) -> np.ndarray:
+    """(hand, label) 별 가장 최근 cap 개 레코드의 인덱스 (파일 순서)."""
+    if len(rec) == 0:
+        return np.zeros((0,), dtype=np.int64)
+    _, key = _group_keys(rec)
+    return np.sort(np.concatenate(_live_groups(key, cap)))
+
+
+def group_arrays(rec: np.ndarray, cap: int) -> Samples:
+    """유효 레코드 -> {hand: {label: float32 (n, dim)}}, 그룹마다 rec["vec"] 에서 한 번에 모음."""
+    out: Samples = {hand: {} for hand in HANDS}
+    if len(rec) == 0:
+        return out
+    labels, key = _group_keys(rec)
+    vec = rec["vec"]
+    for g in _live_groups(key, cap):
+        h, li = divmod(int(key[g[0]]), len(labels))
+        out[HANDS[h]][labels[li].decode("utf-8")] = np.ascontiguousarray(vec[g], dtype=np.float32)
+    return out
+
+
+class SampleStore:
+    """한 프로필의 샘플 파일. append / counts / snapshot 은 여러 스레드에서 호출돼도 됨 (내부 lock)."""
+
+    def __init__(self, path: str, dim: int = 63, cap: int = 900):
+        self.path = path
+        self.dim = int(dim)
+        self.cap = int(cap)
+        self.dtype = record_dtype(self.dim)
+        self._lock = threading.Lock()
+        self.n = 0  # 파일의 레코드 수 (유효 + 오래된 것)
+        self._group_n: Dict[Tuple[int, bytes], int] = {}
+        self._open()
+
+    # ---------- file ----------
+    def _open(self):
+        self.n = 0
+        self._group_n = {}
+        if not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as f:
+            head = f.read(HEADER.size)
+        ok = len(head) == HEADER.size
+        if ok:
+            magic, version, dim = HEADER.unpack(head)
+            ok = magic == MAGIC and version == VERSION and dim == self.dim
+        if not ok or size < HEADER_SIZE:
+            # 다른 형식 / 다른 특징 차원 -> 옆으로 치우고 새로 시작
+            print(f"[LEARN] sample store {self.path}: bad header, moved to .old", flush=True)
+            os.replace(self.path, self.path + ".old")
+            return
+        n, rest = divmod(size - HEADER_SIZE, self.dtype.itemsize)
+        if rest:
+            with open(self.path, "r+b") as f:
+                f.truncate(HEADER_SIZE + n * self.dtype.itemsize)
+        self.n = int(n)
+        if self.n:
+            rec = self._map()
+            self._reindex(rec)
+            del rec
+            self._maybe_compact()
+
+    def _map(self) -> np.ndarray:
+        if self.n == 0:
+            return np.zeros((0,), dtype=self.dtype)
+        return np.memmap(self.path, dtype=self.dtype, mode="r", offset=HEADER_SIZE, shape=(self.n,))
+
+    def _write_all(self, rec: np.ndarray):
+        """헤더 + rec 를 임시 파일에 쓰고 os.replace."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_header(self.dim))
+            f.write(np.ascontiguousarray(rec, dtype=self.dtype).tobytes())
+        os.replace(tmp, self.path)
+
+    def _reindex(self, rec: np.ndarray):
+        self.n = 0
+        self._group_n = {}
+        self._count(rec)
+
+    def _count(self, rec: np.ndarray):
+        self.n += len(rec)
+        for r_hand, r_label in zip(rec["hand"].tolist(), rec["label"].tolist()):
+            k = (int(r_hand), r_label)
+            self._group_n[k] = self._group_n.get(k, 0) + 1
+
+    def n_live(self) -> int:
+        return sum(min(c, self.cap) for c in self._group_n.values())
+
+    def _maybe_compact(self):
+        dead = self.n - self.n_live()
+        if dead <= max(self.n_live(), self.cap):
+            return
+        rec = self._map()
+        live = np.array(rec[live_index(rec, self.cap)])
+        del rec
+        try:
+            self._write_all(live)
+        except OSError as e:
+            # Windows: 다른 곳에서 매핑 중이면 교체 실패 -> 다음 append 때 다시
+            print("[LEARN] sample store compact skipped:", e, flush=True)
+            return
+        self._reindex(live)
+
+    # ---------- write ----------
+    def append(self, hand: str, label: str, vec, pinch: Optional[float] = None, t: Optional[float] = None) -> bool:
+        """샘플 1개를 파일 끝에 추가 (라벨이 LABEL_BYTES 보다 길거나 차원이 다르면 False)."""
+        lab = str(label).encode("utf-8")
+        v = np.asarray(vec, dtype=np.float32).reshape(-1)
+        if len(lab) > LABEL_BYTES or v.shape[0] != self.dim:
+            return False
+        r = np.zeros((1,), dtype=self.dtype)
+        r["t"] = time.time() if t is None else float(t)
+        r["pinch"] = np.nan if pinch is None else float(pinch)
+        r["hand"] = 1 if hand == "other" else 0
+        r["label"] = lab
+        r["vec"][0] = v
+        with self._lock:
+            self._append_locked(r)
+        return True
+
+    def _append_locked(self, rec: np.ndarray):
+        new = self.n == 0 or not os.path.exists(self.path)
+        if new:
+            self._write_all(rec)
+            self._reindex(rec)
+        else:
+            with open(self.path, "ab") as f:
+                f.write(rec.tobytes())
+            self._count(rec)
+        self._maybe_compact()
+
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                self._write_all(np.zeros((0,), dtype=self.dtype))
+            self.n = 0
+            self._group_n = {}
+
+    # ---------- read ----------
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """{hand: {label: 유효 샘플 수}} (MLPLearner.counts / STATUS learnCounts)."""
+        out: Dict[str, Dict[str, int]] = {hand: {} for hand in HANDS}
+        with self._lock:
+            for (h, lab), c in self._group_n.items():
+                out[HANDS[h]][lab.decode("utf-8")] = min(c, self.cap)
+        return out
+
+    def live_records(self) -> np.ndarray:
+        """유효 레코드 복사본 (파일 순서). 매핑은 이 안에서만 열림."""
+        with self._lock:
+            rec = self._map()
+            out = np.array(rec[live_index(rec, self.cap)])
+            del rec
+        return out
+
+    def snapshot(self) -> Samples:
+        """학습용: {hand: {label: float32 (n, dim)}}, 매핑된 레코드에서 바로 모음."""
+        with self._lock:
+            rec = self._map()
+            out = group_arrays(rec, self.cap)
+            del rec
+        return out
+
+    def pinch_buffers(self, keep: int = PINCH_KEEP) -> Tuple[Dict[str, List[float]], Dict[str, List[float]]]:
+        """유효 레코드의 핀치 비율 -> (PINCH_INDEX 것, 나머지) 손별 최근 keep 개 (재시작 후 핀치 보정용)."""
+        rec = self.live_records()
+        pos: Dict[str, List[float]] = {hand: [] for hand in HANDS}
+        neg: Dict[str, List[float]] = {hand: [] for hand in HANDS}
+        ok = ~np.isnan(rec["pinch"])
+        is_pos = rec["label"] == b"PINCH_INDEX"
+        for h, hand in enumerate(HANDS):
+            m = ok & (rec["hand"] == h)
+            pos[hand] = rec["pinch"][m & is_pos][-keep:].astype(np.float64).tolist()
+            neg[hand] = rec["pinch"][m & ~is_pos][-keep:].astype(np.float64).tolist()
+        return pos, neg
+
+    # ---------- export / import ----------
+    def export(self, path: str, meta: Optional[dict] = None) -> int:
+        """유효 레코드 -> .npz (schema samples_v1), 임시 파일 -> os.replace. 내보낸 레코드 수 반환."""
+        rec = self.live_records()
+        header = dict(meta or {})
+        header.update({"schema": EXPORT_SCHEMA, "dim": self.dim, "hands": list(HANDS), "count": int(len(rec))})
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                header=np.frombuffer(json.dumps(header, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+                t=rec["t"], pinch=rec["pinch"], hand=rec["hand"], label=rec["label"], vec=rec["vec"],
+            )
+        os.replace(tmp, path)
+        return int(len(rec))
+
+    def import_(self, path: str, replace: bool = False) -> int:
+        """
+        .npz (samples_v1) 레코드를 추가 (replace=True 면 기존 샘플을 지우고) -> 추가된 레코드 수.
+        이미 있는 것과 똑같은 레코드는 건너뜀 (같은 파일을 두 번 가져와도 중복 없음).
+        가져온 레코드는 기존 것보다 뒤에 붙으므로 cap 을 넘으면 기존(오래된) 샘플부터 밀려남.
+        """
+        with np.load(path, allow_pickle=False) as z:
+            header = json.loads(bytes(z["header"]).decode("utf-8"))
+            if header.get("schema") != EXPORT_SCHEMA:
+                raise ValueError(f"unknown sample schema {header.get('schema')!r}")
+            if int(header.get("dim", -1)) != self.dim:
+                raise ValueError(f"sample dim {header.get('dim')} != {self.dim}")
+            rec = np.zeros((len(z["t"]),), dtype=self.dtype)
+            for k in ("t", "pinch", "hand", "label", "vec"):
+                rec[k] = z[k]
+        if np.any(rec["hand"] >= len(HANDS)):
+            raise ValueError("bad hand index in samples")
+        with self._lock:
+            if replace and self.n:
+                self._write_all(np.zeros((0,), dtype=self.dtype))
+                self.n = 0
+                self._group_n = {}
+            elif self.n:
+                cur = self._map()
+                have = {r.tobytes() for r in np.array(cur[live_index(cur, self.cap)])}
+                del cur
+                rec = rec[np.fromiter((r.tobytes() not in have for r in rec), dtype=bool, count=len(rec))]
+            if len(rec):
+                self._append_locked(rec)
+        return int(len(rec))
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"path": self.path, "records": int(self.n), "live": int(self.n_live()), "dim": self.dim}
+
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    replace = "--replace" in argv
+    args = [a for a in argv if not a.startswith("--")]
+    usage = "usage: python -m gestureos_agent.sample_store info|export|import STORE.samples [FILE.npz] [--replace]"
+    if len(args) < 2 or args[0] not in ("info", "export", "import") or (args[0] != "info" and len(args) < 3):
+        print(usage)
+        return 2
+
+    from .learner_mlp import MAX_SAMPLES_PER_LABEL
+
+    st = SampleStore(args[1], cap=MAX_SAMPLES_PER_LABEL)
+    if args[0] == "export":
+        n = st.export(args[2], meta={"profile": os.path.splitext(os.path.basename(args[1]))[0]})
+        print(f"[LEARN] exported {n} samples -> {args[2]}", flush=True)
+    elif args[0] == "import":
+        n = st.import_(args[2], replace=replace)
+        print(f"[LEARN] imported {n} samples <- {args[2]}", flush=True)
+    info = st.info()
+    print(f"[LEARN] {info['path']}: {info['records']} records, {info['live']} live, dim {info['dim']}", flush=True)
+    for hand, mp in st.counts().items():
+        for lab, c in mp.items():
+            print(f"  {hand:<7}{lab:<16}{c:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# py/gestureos_agent/scheduler.py
+# ---------------------------------------------------------------------------
+# Idle-aware inference scheduler
+#
+# 손이 idle_after_sec 동안 안 보이면 ACTIVE -> IDLE.
+# IDLE에서는 MediaPipe를 probe_hz로만 돌리고, 그 사이 프레임은 추론 생략.
+# 다운샘플 grayscale 프레임 차분(motion)이 임계값을 넘거나 probe에서 손이 잡히면 즉시 ACTIVE.
+#
+#   sched.should_infer(frame_bgr, t) -> bool   (추론할 프레임인가)
+#   sched.observe(found_hands, t)               (추론 결과 피드백)
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional
+
+import cv2
+import numpy as np
+
+ACTIVE = "ACTIVE"
+IDLE = "IDLE"
+
+
+class MotionDetector:
+    """Mean absolute difference between consecutive tiny grayscale frames (0..255)."""
+
+    def __init__(self, size=(80, 60)):
+        self.size = (int(size[0]), int(size[1]))
+        self._prev: Optional[np.ndarray] = None
+        self._cur = np.empty((self.size[1], self.size[0]), dtype=np.uint8)
+        self._diff = np.empty_like(self._cur)
+        self.last = 0.0
+
+    def reset(self):
+        self._prev = None
+        self.last = 0.0
+
+    def score(self, frame_bgr) -> float:
+        small = cv2.resize(frame_bgr, self.size, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._cur)
+        if self._prev is None:
+            self._prev = self._cur.copy()
+            self.last = 0.0
+            return 0.0
+        cv2.absdiff(self._cur, self._prev, dst=self._diff)
+        self._prev, self._cur = self._cur, self._prev
+        self.last = float(self._diff.mean())
+        return self.last
+
+
+class InferenceScheduler:
+    def __init__(
+        self,
+        idle_after_sec: float = 3.0,
+        probe_hz: float = 8.0,
+        motion: bool = True,
+        motion_thresh: float = 4.0,
+    ):
+        self.idle_after_sec = float(idle_after_sec)
+        self.probe_period = 1.0 / max(0.5, float(probe_hz))
+        self.motion_thresh = float(motion_thresh)
+        self.motion: Optional[MotionDetector] = MotionDetector() if motion else None
+
+        self.state = ACTIVE
+        self._last_hand_t = 0.0
+        self._last_infer_t = 0.0
+        self._infer_ts: Deque[float] = deque(maxlen=256)
+        self.skipped = 0
+        self.wakeups = 0
+
+    def _wake(self, t: float):
+        if self.state != ACTIVE:
+            self.state = ACTIVE
+            self.wakeups += 1
+        # give the hand a full idle_after_sec window again
+        self._last_hand_t = t
+
+    def should_infer(self, frame_bgr, t: float) -> bool:
+        if self._last_hand_t <= 0.0:
+            self._last_hand_t = t
+
+        if self.state == ACTIVE:
+            if (t - self._last_hand_t) >= self.idle_after_sec:
+                self.state = IDLE
+                if self.motion is not None:
+                    self.motion.reset()
+            else:
+                return self._mark(t)
+
+        # IDLE: motion snaps back to full rate, otherwise probe at probe_hz
+        if self.motion is not None and frame_bgr is not None:
+            if self.motion.score(frame_bgr) >= self.motion_thresh:
+                self._wake(t)
+                return self._mark(t)
+
+        if (t - self._last_infer_t) >= self.probe_period:
+            return self._mark(t)
+
+        self.skipped += 1
+        return False
+
+    def _mark(self, t: float) -> bool:
+        self._last_infer_t = t
+        self._infer_ts.append(t)
+        return True
+
+    def observe(self, found_hands: bool, t: float):
+        if found_hands:
+            self._wake(t)
+
+    def force_active(self, t: float):
+        """Mode/enable changes etc.: don't wait for the next probe."""
+        self._wake(t)
+
+    def infer_hz(self, t: float, window: float = 2.0) -> float:
+        n = 0
+        for ts in reversed(self._infer_ts):
+            if (t - ts) > window:
+                break
+            n += 1
+        return n / window
+
+    def status(self, t: float) -> dict:
+        return {
+            "state": self.state,
+            "inferHz": round(self.infer_hz(t), 1),
+            "probeHz": round(1.0 / self.probe_period, 1),
+            "idleAfterSec": float(self.idle_after_sec),
+            "motion": round(self.motion.last, 2) if self.motion is not None else None,
+            "skipped": int(self.skipped),
+        }
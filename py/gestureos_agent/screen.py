@@ -0,0 +1,220 @@
+# py/gestureos_agent/screen.py
+# ---------------------------------------------------------------------------
+# Shared virtual-screen geometry + cursor position cache
+#
+# move_cursor / SendInput 절대좌표 변환 / STATUS pointer 가 매 호출마다
+# GetSystemMetrics x4 + GetCursorPos 를 부르던 것을 한 곳에 모은다.
+#   - virtual screen rect: 캐시, poll_sec(기본 1s)마다 또는 invalidate() 때 다시 읽음
+#     (모니터 추가/해상도 변경은 최대 poll_sec 늦게 반영)
+#   - cursor: 우리가 마지막으로 주입한 위치를 기억 -> cursor_ttl 안에서는 syscall 없이 그 값
+#     (그 밖에는 실제로 읽고 그 값도 cursor_ttl 동안 재사용)
+#
+# backend:
+#   Win32Backend  : GetSystemMetrics / GetCursorPos (Windows)
+#   PyAutoGuiBackend : pyautogui.size() / position() (그 외 OS, lazy import)
+#   StaticBackend : 고정 rect / cursor + 호출 횟수 (Linux에서 캐시 로직 테스트용 stub)
+#
+# control.py / agents/hands_agent.py / phone/xr_bridge.py 가 get_screen() 하나를 공유한다.
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import ctypes
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+Rect = Tuple[int, int, int, int]  # (left, top, width, height)
+
+SCREEN_POLL_SEC = float(os.environ.get("GESTUREOS_SCREEN_POLL_SEC", "1.0"))
+CURSOR_TTL_SEC = float(os.environ.get("GESTUREOS_CURSOR_TTL_SEC", "0.25"))
+
+_SM_XVIRTUALSCREEN = 76
+_SM_YVIRTUALSCREEN = 77
+_SM_CXVIRTUALSCREEN = 78
+_SM_CYVIRTUALSCREEN = 79
+
+
+class _POINT(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
+
+
+class Win32Backend:
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+
+    def virtual_rect(self) -> Rect:
+        u = self._user32
+        vx = int(u.GetSystemMetrics(_SM_XVIRTUALSCREEN))
+        vy = int(u.GetSystemMetrics(_SM_YVIRTUALSCREEN))
+        vw = int(u.GetSystemMetrics(_SM_CXVIRTUALSCREEN))
+        vh = int(u.GetSystemMetrics(_SM_CYVIRTUALSCREEN))
+        return (vx, vy, max(1, vw), max(1, vh))
+
+    def cursor_pos(self) -> Optional[Tuple[int, int]]:
+        pt = _POINT()
+        if not self._user32.GetCursorPos(ctypes.byref(pt)):
+            return None
+        return (int(pt.x), int(pt.y))
+
+
+class PyAutoGuiBackend:
+    def virtual_rect(self) -> Rect:
+        import pyautogui
+
+        sx, sy = pyautogui.size()
+        return (0, 0, max(1, int(sx)), max(1, int(sy)))
+
+    def cursor_pos(self) -> Optional[Tuple[int, int]]:
+        import pyautogui
+
+        cur = pyautogui.position()
+        return (int(cur.x), int(cur.y))
+
+
+class StaticBackend:
+    """Fixed geometry for tests. Change .rect / .cursor and watch the call counters."""
+
+    def __init__(self, rect: Rect = (0, 0, 1920, 1080), cursor: Optional[Tuple[int, int]] = (960, 540)):
+        self.rect = tuple(int(v) for v in rect)
+        self.cursor = cursor
+        self.rect_calls = 0
+        self.cursor_calls = 0
+
+    def virtual_rect(self) -> Rect:
+        self.rect_calls += 1
+        return self.rect  # type: ignore[return-value]
+
+    def cursor_pos(self) -> Optional[Tuple[int, int]]:
+        self.cursor_calls += 1
+        return self.cursor
+
+
+def default_backend():
+    return Win32Backend() if os.name == "nt" else PyAutoGuiBackend()
+
+
+class ScreenGeometry:
+    def __init__(self, backend=None, poll_sec: float = SCREEN_POLL_SEC, cursor_ttl: float = CURSOR_TTL_SEC, clock=time.monotonic):
+        self.backend = backend if backend is not None else default_backend()
+        self.poll_sec = float(poll_sec)
+        self.cursor_ttl = float(cursor_ttl)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._rect: Optional[Rect] = None
+        self._rect_ts = 0.0
+        self._cursor: Optional[Tuple[int, int]] = None
+        self._cursor_ts = -1e9
+
+        self.refreshes = 0
+        self.cursor_queries = 0
+        self.changes = 0
+
+    # ---------------- geometry ----------------
+    def invalidate(self):
+        """Display changed (WM_DISPLAYCHANGE etc.): re-read on next use."""
+        with self._lock:
+            self._rect = None
+
+    def rect(self) -> Rect:
+        t = self._clock()
+        r = self._rect
+        if r is not None and (t - self._rect_ts) < self.poll_sec:
+            return r
+        with self._lock:
+            if self._rect is not None and (t - self._rect_ts) < self.poll_sec:
+                return self._rect
+            try:
+                new = tuple(int(v) for v in self.backend.virtual_rect())
+            except Exception:
+                new = self._rect or (0, 0, 1920, 1080)
+            if self._rect is not None and new != self._rect:
+                self.changes += 1
+                print(f"[SCREEN] virtual screen changed -> {new}", flush=True)
+            self._rect = new  # type: ignore[assignment]
+            self._rect_ts = t
+            self.refreshes += 1
+            return self._rect  # type: ignore[return-value]
+
+    def norm_to_px(self, nx: float, ny: float) -> Tuple[int, int]:
+        vx, vy, vw, vh = self.rect()
+        nx = 0.0 if nx < 0.0 else (1.0 if nx > 1.0 else float(nx))
+        ny = 0.0 if ny < 0.0 else (1.0 if ny > 1.0 else float(ny))
+        x = int(vx + nx * vw)
+        y = int(vy + ny * vh)
+        return max(vx, min(vx + vw - 1, x)), max(vy, min(vy + vh - 1, y))
+
+    def px_to_norm(self, x: float, y: float) -> Tuple[float, float]:
+        vx, vy, vw, vh = self.rect()
+        x01 = (x - vx) / max(1, vw)
+        y01 = (y - vy) / max(1, vh)
+        x01 = 0.0 if x01 < 0.0 else (1.0 if x01 > 1.0 else float(x01))
+        y01 = 0.0 if y01 < 0.0 else (1.0 if y01 > 1.0 else float(y01))
+        return x01, y01
+
+    def to_absolute(self, x: float, y: float) -> Tuple[int, int]:
+        """Pixel -> SendInput MOUSEEVENTF_ABSOLUTE|VIRTUALDESK (0..65535), clamped to the virtual screen."""
+        vx, vy, vw, vh = self.rect()
+        x = max(vx, min(vx + vw - 1, int(x)))
+        y = max(vy, min(vy + vh - 1, int(y)))
+        ax = int((x - vx) * 65535 / max(1, vw - 1))
+        ay = int((y - vy) * 65535 / max(1, vh - 1))
+        return ax, ay
+
+    # ---------------- cursor ----------------
+    def note_injected(self, x: int, y: int):
+        """We just moved the cursor here (no need to ask the OS for a while)."""
+        self._cursor = (int(x), int(y))
+        self._cursor_ts = self._clock()
+
+    def cursor_px(self, fresh: bool = False) -> Optional[Tuple[int, int]]:
+        t = self._clock()
+        c = self._cursor
+        if (not fresh) and c is not None and (t - self._cursor_ts) < self.cursor_ttl:
+            return c
+        try:
+            c = self.backend.cursor_pos()
+        except Exception:
+            c = None
+        self.cursor_queries += 1
+        if c is not None:
+            self._cursor = (int(c[0]), int(c[1]))
+            self._cursor_ts = t
+        return c
+
+    def cursor_norm01(self, fresh: bool = False) -> Tuple[Optional[float], Optional[float]]:
+        c = self.cursor_px(fresh=fresh)
+        if c is None:
+            return (None, None)
+        return self.px_to_norm(c[0], c[1])
+
+    def status(self) -> dict:
+        r = self._rect
+        return {
+            "rect": list(r) if r is not None else None,
+            "refreshes": int(self.refreshes),
+            "changes": int(self.changes),
+            "cursorQueries": int(self.cursor_queries),
+        }
+
+
+_screen: Optional[ScreenGeometry] = None
+_screen_lock = threading.Lock()
+
+
+def get_screen() -> ScreenGeometry:
+    """Process-wide cache (created on first use with the platform backend)."""
+    global _screen
+    if _screen is None:
+        with _screen_lock:
+            if _screen is None:
+                _screen = ScreenGeometry()
+    return _screen
+
+
+def set_screen(screen: Optional[ScreenGeometry]):
+    """Swap the shared cache (tests: ScreenGeometry(StaticBackend(...)))."""
+    global _screen
+    with _screen_lock:
+        _screen = screen
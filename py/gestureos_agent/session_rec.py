@@ -0,0 +1,202 @@
+# py/gestureos_agent/session_rec.py
+# ---------------------------------------------------------------------------
+# Landmark session recorder (.gosr)
+#
+# MediaPipe가 만든 결과(hands_meta)와 WS 명령을 프레임 순서대로 기록한다.
+# replay.py가 이 파일을 cv2/MediaPipe 없이 HandsAgent._process_hands()에 다시 흘려보낸다.
+#
+# File layout (little-endian):
+#   header : b"GOSR" | u16 version | u32 json_len | json(utf-8)   (initial agent state)
+#   records: u8 tag + body
+#     'F' frame  : f64 t | u8 n_hands | n * (i8 handed | f32 score | 63 * f32 landmarks)
+#     'C' command: f64 t | u32 len | json(utf-8)                   (WS command as received)
+#
+# handed: -1=None, 0=Left, 1=Right
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .landmarks import as_landmarks
+
+MAGIC = b"GOSR"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHI")
+_FRAME = struct.Struct("<dB")
+_HAND = struct.Struct("<bf63f")
+_HAND_HEAD = struct.Struct("<bf")  # _HAND without the landmarks (those go through numpy)
+_LM_BYTES = _HAND.size - _HAND_HEAD.size
+_CMD = struct.Struct("<dI")
+
+TAG_FRAME = b"F"
+TAG_CMD = b"C"
+
+_HANDED_TO_CODE = {"Left": 0, "Right": 1}
+_CODE_TO_HANDED = {0: "Left", 1: "Right"}
+
+# 기본 저장 폴더 (learner 프로필과 같은 TEMP 규칙)
+SESSION_DIR = os.path.join(os.getenv("TEMP", "."), "GestureOS_sessions")
+
+
+def default_session_path() -> str:
+    return os.path.join(SESSION_DIR, time.strftime("session_%Y%m%d_%H%M%S.gosr"))
+
+
+class SessionRecorder:
+    """Thread-safe writer. Frames come from the frame loop, commands from the WS thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fp = None
+        self.path: Optional[str] = None
+        self.frames = 0
+        self.commands = 0
+        self.started_ts = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self._fp is not None
+
+    def start(self, path: Optional[str] = None, state: Optional[dict] = None) -> str:
+        """Open a new session file (closes the previous one)."""
+        self.stop()
+        path = str(path or default_session_path())
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        head = json.dumps(state or {}, ensure_ascii=False, default=str).encode("utf-8")
+        fp = open(path, "wb")
+        fp.write(_HEADER.pack(MAGIC, VERSION, len(head)))
+        fp.write(head)
+
+        with self._lock:
+            self._fp = fp
+            self.path = path
+            self.frames = 0
+            self.commands = 0
+            self.started_ts = time.time()
+        print("[REC] start ->", path, flush=True)
+        return path
+
+    def stop(self):
+        with self._lock:
+            fp, self._fp = self._fp, None
+        if fp is None:
+            return
+        try:
+            fp.flush()
+            fp.close()
+        except Exception:
+            pass
+        print(f"[REC] stop ({self.frames} frames, {self.commands} cmds) -> {self.path}", flush=True)
+
+    def write_frame(self, t: float, hands_meta: List[dict]):
+        if self._fp is None:
+            return
+        hands = [h for h in (hands_meta or []) if h.get("lm") is not None and len(h["lm"]) == 21][:255]
+        parts = [TAG_FRAME, _FRAME.pack(float(t), len(hands))]
+        for h in hands:
+            code = _HANDED_TO_CODE.get(h.get("handed"), -1)
+            parts.append(_HAND_HEAD.pack(code, float(h.get("score", 0.0))))
+            parts.append(as_landmarks(h["lm"]).astype("<f4", copy=False).tobytes())
+        buf = b"".join(parts)
+        with self._lock:
+            if self._fp is None:
+                return
+            self._fp.write(buf)
+            self.frames += 1
+
+    def write_command(self, t: float, data: dict):
+        if self._fp is None:
+            return
+        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        buf = TAG_CMD + _CMD.pack(float(t), len(body)) + body
+        with self._lock:
+            if self._fp is None:
+                return
+            self._fp.write(buf)
+            self.commands += 1
+
+    def status(self) -> dict:
+        return {
+            "active": bool(self.active),
+            "path": str(self.path or ""),
+            "frames": int(self.frames),
+        }
+
+
+class SessionReader:
+    """
+    Iterates a .gosr file.
+    Yields ("F", t, hands_meta) or ("C", t, command_dict).
+    hands_meta matches HandsAgent._infer_hands(): [{"handed", "score", "lm"}, ...]
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._buf = f.read()
+
+        if len(self._buf) < _HEADER.size:
+            raise ValueError(f"not a session file: {self.path}")
+        magic, version, head_len = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"bad magic in {self.path}")
+        if version > VERSION:
+            raise ValueError(f"unsupported session version {version}")
+
+        off = _HEADER.size
+        self.state: Dict[str, Any] = json.loads(self._buf[off : off + head_len].decode("utf-8") or "{}")
+        self._data_off = off + head_len
+
+    def __iter__(self) -> Iterator[Tuple[str, float, Any]]:
+        buf = self._buf
+        off = self._data_off
+        n = len(buf)
+        while off < n:
+            start = off
+            tag = buf[off : off + 1]
+            off += 1
+            if tag == TAG_FRAME:
+                if off + _FRAME.size > n:
+                    break
+                t, nh = _FRAME.unpack_from(buf, off)
+                off += _FRAME.size
+                if off + nh * _HAND.size > n:
+                    break
+                hands = []
+                for _ in range(nh):
+                    code, score = _HAND_HEAD.unpack_from(buf, off)
+                    off += _HAND_HEAD.size
+                    lm = np.frombuffer(buf, dtype="<f4", count=63, offset=off).reshape(21, 3).astype(np.float32)
+                    off += _LM_BYTES
+                    hands.append({"handed": _CODE_TO_HANDED.get(code), "score": float(score), "lm": lm})
+                yield ("F", float(t), hands)
+            elif tag == TAG_CMD:
+                if off + _CMD.size > n:
+                    break
+                t, ln = _CMD.unpack_from(buf, off)
+                off += _CMD.size
+                if off + ln > n:
+                    break
+                data = json.loads(buf[off : off + ln].decode("utf-8"))
+                off += ln
+                yield ("C", float(t), data)
+            else:
+                raise ValueError(f"corrupt session record at byte {off - 1}")
+        else:
+            return
+        # recorder killed mid-write (buffered file, flushed only in stop()) -> keep the complete records
+        print(f"[REC] truncated tail at byte {start}", flush=True)
+
+    def frames(self) -> Iterator[Tuple[float, List[dict]]]:
+        for tag, t, obj in self:
+            if tag == "F":
+                yield t, obj
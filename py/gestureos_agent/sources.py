@@ -0,0 +1,525 @@
+# py/gestureos_agent/sources.py
+# ---------------------------------------------------------------------------
+# Frame sources for the agents (camera / video file / image dir / synthetic)
+#
+# 공통 인터페이스 (cv2.VideoCapture와 같은 모양):
+#   open()            -> 실패 시 RuntimeError
+#   read()            -> (ok, frame_bgr)
+#   release()
+#   realtime (bool)   -> True면 소비자가 느릴 때 프레임 drop, False면 모든 프레임 처리
+#   exhausted (bool)  -> 파일 끝(EOF) 도달 (loop=False일 때)
+#   describe()        -> STATUS/로그용 짧은 문자열
+#   status()          -> STATUS용 dict (camera: 협상된 포맷 + 실제 전달 fps)
+#
+# --source 예시:
+#   camera | camera:1 | file:clip.mp4 | dir:frames/ | synthetic
+# ---------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .camneg import (
+    CHECK_FRAMES,
+    CHECK_MAX_SEC,
+    CameraFormat,
+    FormatCache,
+    Negotiated,
+    apply_format,
+    measure_fps,
+    negotiate,
+    negotiate_budget_sec,
+)
+
+_IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class FrameSource:
+    """Base class. Subclasses implement _open/_read/_release."""
+
+    kind = "base"
+
+    def __init__(self, realtime: bool = True):
+        self.realtime = bool(realtime)
+        self.exhausted = False
+
+    def open(self):
+        self.exhausted = False
+        self._open()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        return self._read()
+
+    def release(self):
+        try:
+            self._release()
+        except Exception:
+            pass
+
+    def describe(self) -> str:
+        return self.kind
+
+    def status(self) -> dict:
+        return {}
+
+    def open_budget_sec(self) -> float:
+        """Extra time open() may legitimately take on top of the device open (format probing)."""
+        return 0.0
+
+    # ---- subclass hooks ----
+    def _open(self):
+        raise NotImplementedError
+
+    def _read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        raise NotImplementedError
+
+    def _release(self):
+        pass
+
+
+class _Pacer:
+    """Sleep so that frames come out at `fps` (native-rate playback)."""
+
+    def __init__(self, fps: float):
+        self.period = 1.0 / max(1e-3, float(fps))
+        self._next = 0.0
+
+    def reset(self):
+        self._next = 0.0
+
+    def wait(self):
+        t = time.perf_counter()
+        if self._next <= 0.0:
+            self._next = t
+        dt = self._next - t
+        if dt > 0:
+            time.sleep(dt)
+        else:
+            # fell behind: don't try to catch up with a burst
+            self._next = t
+        self._next += self.period
+
+
+# =============================================================================
+# Live camera
+# =============================================================================
+class CameraSource(FrameSource):
+    """
+    Live webcam.
+    - indices/backends are tried in order (first opened wins)
+    - verify_read=True: a first frame must be readable, otherwise try the next combo
+    - negotiate=True: probe FOURCC/size/FPS (camneg.py), cached per device in `cache`
+    - request_resolution(w, h): switch size at runtime (applied on the capture thread)
+    """
+
+    kind = "camera"
+
+    def __init__(
+        self,
+        indices: Sequence[int] = (0,),
+        backends: Sequence[Optional[int]] = (cv2.CAP_DSHOW, None),
+        width: int = 640,
+        height: int = 480,
+        fps: Optional[float] = None,
+        verify_read: bool = False,
+        negotiate: bool = False,
+        cache: Optional[FormatCache] = None,
+    ):
+        super().__init__(realtime=True)
+        self.indices = list(indices)
+        self.backends = list(backends)
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = fps
+        self.verify_read = bool(verify_read)
+        self.negotiate = bool(negotiate)
+        self.cache = cache
+
+        self._cap = None
+        self.index: Optional[int] = None
+        self.backend: Optional[int] = None
+
+        # negotiated format (None = plain cap.set, not verified)
+        self.format: Optional[Negotiated] = None
+        self.format_cached = False
+        # (w, h) requested from another thread, applied in _read()
+        self._pending: Optional[Tuple[int, int]] = None
+        self.reconfigs = 0
+        # delivery rate (timestamps of the last reads)
+        self._read_ts: Deque[float] = deque(maxlen=60)
+
+    def _make(self, idx: int, be: Optional[int]):
+        try:
+            return cv2.VideoCapture(idx, be) if be is not None else cv2.VideoCapture(idx)
+        except Exception:
+            return None
+
+    def _configure(self, cap, idx: int, be: Optional[int]):
+        if self.negotiate:
+            self._negotiate(cap, self._device_key(cap, idx, be))
+            return
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            cap.set(cv2.CAP_PROP_FPS, float(self.fps))
+
+    @staticmethod
+    def _device_key(cap, idx: int, be: Optional[int]) -> str:
+        # OpenCV has no stable device id; backend name + index is the best we get
+        try:
+            name = cap.getBackendName()
+        except Exception:
+            name = str(be) if be is not None else "any"
+        return f"{name}:{int(idx)}"
+
+    def _fps_pref(self) -> Tuple[float, ...]:
+        prefs = [float(self.fps)] if self.fps else [60.0]
+        if 30.0 not in prefs:
+            prefs.append(30.0)
+        return tuple(prefs)
+
+    def _negotiate(self, cap, device: str):
+        """Cached format if it still delivers the right size, otherwise a full probe."""
+        key = FormatCache.key(device, self.width, self.height)
+        self.format_cached = False
+
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            apply_format(cap, cached)
+            fps, shape = measure_fps(cap, frames=CHECK_FRAMES, max_sec=CHECK_MAX_SEC)
+            if shape is not None and (shape[1], shape[0]) == (cached.width, cached.height):
+                actual = CameraFormat(cached.fourcc, cached.width, cached.height, cached.fps)
+                self.format = Negotiated(cached, actual, fps, 0)
+                self.format_cached = True
+                print(f"[CAM] {device} cached format {cached.label()} ({fps:.1f}fps)", flush=True)
+                return
+            print(f"[CAM] {device} cached format {cached.label()} no longer works, probing", flush=True)
+            self.cache.drop(key)
+
+        res = negotiate(cap, self.width, self.height, self._fps_pref())
+        self.format = res
+        if res is None:
+            print(f"[CAM] {device} negotiation failed (no frames)", flush=True)
+            return
+        print(
+            f"[CAM] {device} negotiated {res.actual.label()} measured={res.measured_fps:.1f}fps "
+            f"({res.probes} probes)",
+            flush=True,
+        )
+        if self.cache is not None:
+            self.cache.put(key, res.requested, res.measured_fps)
+
+    def _open(self):
+        for idx in self.indices:
+            for be in self.backends:
+                cap = self._make(idx, be)
+                if cap is None or not cap.isOpened():
+                    try:
+                        if cap is not None:
+                            cap.release()
+                    except Exception:
+                        pass
+                    continue
+
+                self._configure(cap, idx, be)
+
+                if self.verify_read:
+                    ok, frame = cap.read()
+                    if not ok or frame is None:
+                        try:
+                            cap.release()
+                        except Exception:
+                            pass
+                        continue
+
+                self._cap = cap
+                self.index = int(idx)
+                self.backend = be
+                return
+
+        raise RuntimeError("webcam open failed")
+
+    def _read(self):
+        if self._cap is None:
+            return False, None
+        if self._pending is not None:
+            self._apply_pending()
+        ok, frame = self._cap.read()
+        if ok:
+            self._read_ts.append(time.perf_counter())
+        return ok, frame
+
+    def _release(self):
+        if self._cap is not None:
+            self._cap.release()
+        self._cap = None
+        self._read_ts.clear()
+
+    # ---------------- runtime reconfiguration ----------------
+    def request_resolution(self, width: int, height: int):
+        """Thread-safe: the capture thread switches before its next read."""
+        self._pending = (max(16, int(width)), max(16, int(height)))
+
+    def _apply_pending(self):
+        w, h = self._pending
+        self._pending = None
+        if (w, h) == (self.width, self.height) and self.format is not None:
+            return
+        self.width, self.height = w, h
+        self.reconfigs += 1
+        print(f"[CAM] switching to {w}x{h}", flush=True)
+        try:
+            if self.negotiate:
+                self._negotiate(self._cap, self._device_key(self._cap, self.index or 0, self.backend))
+            else:
+                self._configure(self._cap, self.index or 0, self.backend)
+            self._read_ts.clear()
+            if self.negotiate and self.format is None:
+                raise RuntimeError("no frames after switch")
+        except Exception as e:
+            # some drivers only take a new size on a fresh handle
+            print("[CAM] live switch failed, reopening:", e, flush=True)
+            self._release()
+            self._open()
+
+    def delivery_fps(self) -> float:
+        ts = self._read_ts
+        if len(ts) < 2:
+            return 0.0
+        dt = ts[-1] - ts[0]
+        return (len(ts) - 1) / dt if dt > 0 else 0.0
+
+    def open_budget_sec(self) -> float:
+        return negotiate_budget_sec(self.width, self.height, self._fps_pref()) if self.negotiate else 0.0
+
+    def describe(self) -> str:
+        idx = self.index if self.index is not None else (self.indices[0] if self.indices else 0)
+        return f"camera:{idx}"
+
+    def status(self) -> dict:
+        out = {
+            "requestedSize": [int(self.width), int(self.height)],
+            "negotiated": self.format is not None,
+            "cached": bool(self.format_cached),
+            "deliveryFps": round(self.delivery_fps(), 1),
+            "reconfigs": int(self.reconfigs),
+        }
+        if self.format is not None:
+            out.update(self.format.status())
+        return out
+
+
+# =============================================================================
+# Video file / image directory
+# =============================================================================
+class VideoFileSource(FrameSource):
+    """
+    Recorded clip (anything cv2.VideoCapture can decode) or a directory of images.
+    - realtime=True : played at native rate (file FPS, or `fps` for image dirs)
+    - realtime=False: as fast as possible, every frame is processed (benchmark)
+    """
+
+    kind = "file"
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False, fps: float = 30.0):
+        super().__init__(realtime=realtime)
+        self.path = str(path)
+        self.loop = bool(loop)
+        self.fps = float(fps)
+
+        self._cap = None
+        self._files: List[str] = []
+        self._idx = 0
+        self._pacer: Optional[_Pacer] = None
+
+    @property
+    def is_dir(self) -> bool:
+        return os.path.isdir(self.path)
+
+    def _open(self):
+        if self.is_dir:
+            self.kind = "dir"
+            self._files = sorted(
+                os.path.join(self.path, fn)
+                for fn in os.listdir(self.path)
+                if fn.lower().endswith(_IMAGE_EXTS)
+            )
+            if not self._files:
+                raise RuntimeError(f"no images in {self.path}")
+            self._idx = 0
+        else:
+            if not os.path.exists(self.path):
+                raise RuntimeError(f"video not found: {self.path}")
+            cap = cv2.VideoCapture(self.path)
+            if not cap.isOpened():
+                raise RuntimeError(f"video open failed: {self.path}")
+            self._cap = cap
+            try:
+                native = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+            except Exception:
+                native = 0.0
+            if native > 1.0:
+                self.fps = native
+
+        self._pacer = _Pacer(self.fps) if self.realtime else None
+
+    def _rewind(self) -> bool:
+        if not self.loop:
+            self.exhausted = True
+            return False
+        if self._cap is not None:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._idx = 0
+        return True
+
+    def _read_once(self):
+        if self._cap is not None:
+            return self._cap.read()
+        if self._idx >= len(self._files):
+            return False, None
+        frame = cv2.imread(self._files[self._idx], cv2.IMREAD_COLOR)
+        self._idx += 1
+        return (frame is not None), frame
+
+    def _read(self):
+        ok, frame = self._read_once()
+        if not ok or frame is None:
+            if not self._rewind():
+                return False, None
+            ok, frame = self._read_once()
+            if not ok or frame is None:
+                self.exhausted = True
+                return False, None
+
+        if self._pacer is not None:
+            self._pacer.wait()
+        return True, frame
+
+    def _release(self):
+        if self._cap is not None:
+            self._cap.release()
+        self._cap = None
+        if self._pacer is not None:
+            self._pacer.reset()
+
+    def describe(self) -> str:
+        return f"{self.kind}:{os.path.basename(self.path.rstrip(os.sep)) or self.path}"
+
+
+# =============================================================================
+# Synthetic generator
+# =============================================================================
+class SyntheticSource(FrameSource):
+    """
+    Deterministic generated frames (no camera needed).
+    Moving skin-tone blob + BLUE/RED sticks, so both the hands loop and the
+    RUSH_COLOR tracker get something to chew on.
+    """
+
+    kind = "synthetic"
+
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 480,
+        fps: float = 30.0,
+        realtime: bool = True,
+        frames: int = 0,
+    ):
+        super().__init__(realtime=realtime)
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = float(fps)
+        self.frames = int(frames)  # 0 = endless
+
+        self._n = 0
+        self._bg: Optional[np.ndarray] = None
+        self._pacer: Optional[_Pacer] = None
+
+    def _open(self):
+        h, w = self.height, self.width
+        # static gradient background (cheap to copy each frame)
+        gx = np.linspace(40, 90, w, dtype=np.float32)[None, :]
+        gy = np.linspace(30, 70, h, dtype=np.float32)[:, None]
+        base = (gx + gy).astype(np.uint8)
+        self._bg = np.dstack([base, base, base])
+        self._n = 0
+        self._pacer = _Pacer(self.fps) if self.realtime else None
+
+    def _read(self):
+        if self._bg is None:
+            return False, None
+        if self.frames and self._n >= self.frames:
+            self.exhausted = True
+            return False, None
+
+        h, w = self.height, self.width
+        k = self._n / max(1.0, self.fps)
+        self._n += 1
+
+        frame = self._bg.copy()
+
+        # "hand" blob
+        cx = int(w * (0.5 + 0.25 * np.sin(k * 1.3)))
+        cy = int(h * (0.55 + 0.15 * np.cos(k * 0.9)))
+        cv2.ellipse(frame, (cx, cy), (w // 12, h // 8), 0, 0, 360, (120, 160, 210), -1)
+
+        # sticks (BLUE=left, RED=right)
+        bx = int(w * (0.25 + 0.08 * np.sin(k * 2.1)))
+        rx = int(w * (0.75 + 0.08 * np.cos(k * 1.7)))
+        top = int(h * (0.30 + 0.10 * np.sin(k * 1.1)))
+        cv2.rectangle(frame, (bx - 8, top), (bx + 8, top + h // 3), (220, 60, 30), -1)
+        cv2.rectangle(frame, (rx - 8, top), (rx + 8, top + h // 3), (30, 40, 220), -1)
+
+        if self._pacer is not None:
+            self._pacer.wait()
+        return True, frame
+
+    def _release(self):
+        self._bg = None
+
+    def describe(self) -> str:
+        return f"synthetic:{self.width}x{self.height}"
+
+
+# =============================================================================
+# factory (config.parse_cli --source / --source-rate / --source-loop)
+# =============================================================================
+def make_source(
+    spec: str = "camera",
+    rate: str = "native",
+    loop: bool = False,
+    width: int = 640,
+    height: int = 480,
+    camera_kwargs: Optional[dict] = None,
+) -> FrameSource:
+    """Build a FrameSource from a CLI spec string."""
+    s = str(spec or "camera").strip()
+    kind, _, arg = s.partition(":")
+    kind = kind.strip().lower()
+    realtime = str(rate or "native").strip().lower() != "max"
+
+    if kind in ("", "camera", "cam"):
+        kw = dict(camera_kwargs or {})
+        if arg.strip():
+            kw["indices"] = (int(arg),)
+        kw.setdefault("width", width)
+        kw.setdefault("height", height)
+        return CameraSource(**kw)
+
+    if kind in ("file", "video", "dir"):
+        if not arg:
+            raise ValueError(f"--source {kind}: needs a path (e.g. {kind}:clip.mp4)")
+        return VideoFileSource(arg, realtime=realtime, loop=loop)
+
+    if kind in ("synthetic", "synth"):
+        frames = int(arg) if arg.strip().isdigit() else 0
+        return SyntheticSource(width=width, height=height, realtime=realtime, frames=frames)
+
+    raise ValueError(f"unknown --source: {spec}")
@@ -169,6 +169,15 @@ def main():
     _set_dpi_awareness()
 
     from gestureos_agent.config import parse_cli
+
+    # --replay=SESSION.gosr: recorded landmarks only (no camera / HUD / phone)
+    _, _replay_cfg = parse_cli()
+    if getattr(_replay_cfg, "replay", ""):
+        from gestureos_agent.replay import run_replay
+
+        run_replay(_replay_cfg)
+        return
+
     from gestureos_agent.hud_overlay import OverlayHUD
     import gestureos_agent.hud_overlay as ho
     from gestureos_agent.cursor_system import apply_invisible_cursor, restore_system_cursors
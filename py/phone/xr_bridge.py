@@ -1,6 +1,8 @@
 # xr_bridge.py (FINAL)
 import json
+import os
 import socket
+import sys
 import time
 import threading
 from collections import deque
@@ -10,6 +12,10 @@ from ctypes import wintypes
 
 import mss
 
+# virtual-screen geometry cache shared with the agent (py/gestureos_agent/screen.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestureos_agent.screen import get_screen  # noqa: E402
+
 # =========================
 # CONFIG
 # =========================
@@ -76,11 +82,6 @@ def get_monitor_rect(monitor_index: int):
 # =========================
 user32 = ctypes.windll.user32
 
-SM_XVIRTUALSCREEN = 76
-SM_YVIRTUALSCREEN = 77
-SM_CXVIRTUALSCREEN = 78
-SM_CYVIRTUALSCREEN = 79
-
 INPUT_MOUSE = 0
 INPUT_KEYBOARD = 1
 
@@ -168,11 +169,8 @@ def _send_input(*inputs: INPUT):
 
 
 def _virtual_screen_rect():
-    left = user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
-    top = user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
-    w = user32.GetSystemMetrics(SM_CXVIRTUALSCREEN)
-    h = user32.GetSystemMetrics(SM_CYVIRTUALSCREEN)
-    return int(left), int(top), int(w), int(h)
+    # cached (re-read at GESTUREOS_SCREEN_POLL_SEC), not 4x GetSystemMetrics per move at TICK_HZ
+    return get_screen().rect()
 
 
 def _mouse_abs_xy(x: float, y: float):
@@ -202,6 +200,7 @@ def mouse_move_to(x: float, y: float):
         ),
     )
     _send_input(inp)
+    get_screen().note_injected(int(x), int(y))
 
 
 def mouse_left_down():